@@ -1,9 +1,7 @@
 import streamlit as st
-import streamlit_shadcn_ui as ui
-import pandas as pd
 from pathlib import Path
-import yaml
 import os
+import time
 
 from config import (
     APP_TITLE, APP_ICON, RUBRICS_DIR, TECHNIQUES_DIR, OPENROUTER_API_KEY, CSS_FILE
@@ -12,12 +10,20 @@ from config import (
 import config
 from datetime import datetime
 from pathlib import Path
-from utils.llm_client import LLMClient
+from utils.llm_client import LLMClient, interleave_streams
 from utils.rubric_builder import RubricBuilder
+from utils.rubric_parser import RubricParser, RubricWatcher, rubric_fingerprint
 from utils.prompt_analyzer import PromptAnalyzer
 from utils.evaluator import Evaluator
 from utils.report_generator import ReportGenerator
-from utils.auto_evaluator import AutoEvaluator
+from utils.auto_evaluator import ENSEMBLE_AGGREGATES, AutoEvaluator
+from utils.response_cache import ResponseCache
+from utils.score_cache import ScoreCache
+from utils.evaluation_store import EvaluationStore
+from utils.metrics import FanoutSink, JsonlSink, RingBufferSink, format_summary
+
+# pandas, yaml, streamlit_shadcn_ui, utils.leaderboard and utils.tournament (numpy) are imported
+# inside the pages that use them, so a cold start only loads what the first page needs
 
 # Set page config
 st.set_page_config(
@@ -27,8 +33,34 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+@st.cache_resource
+def get_response_cache():
+    """Shared on-disk response cache, opened once per process."""
+    return ResponseCache(config.RESPONSE_CACHE_PATH)
+
+@st.cache_resource
+def get_score_cache():
+    """Shared on-disk cache of pointwise judge scores, opened once per process."""
+    return ScoreCache(config.SCORE_CACHE_PATH)
+
+@st.cache_resource
+def get_evaluation_store():
+    """Shared append-only evaluation store, opened once per process."""
+    return EvaluationStore(config.EVALUATION_STORE_PATH)
+
+@st.cache_resource
+def get_metrics_log():
+    """Process-wide JSONL log of every LLM call."""
+    return JsonlSink(config.METRICS_PATH)
+
+@st.cache_resource
+def start_rubric_watcher():
+    """Keep parsed rubrics warm, reparsing them in the background when edited."""
+    return RubricWatcher(RubricParser(config.RUBRICS_DIR)).start()
+
 # Initialize Utils
 rubric_builder = RubricBuilder(config.RUBRICS_DIR)
+start_rubric_watcher()
 prompt_analyzer = PromptAnalyzer(config.TECHNIQUES_DIR)
 evaluator = Evaluator()
 
@@ -61,6 +93,13 @@ if "eval_mode" not in st.session_state:
     st.session_state.eval_mode = "Manual Evaluation"
 if "auto_eval_data" not in st.session_state:
     st.session_state.auto_eval_data = None
+if "response_timings" not in st.session_state:
+    st.session_state.response_timings = [{}, {}]
+if "llm_metrics" not in st.session_state:
+    st.session_state.llm_metrics = RingBufferSink()
+if "manual_evaluation" not in st.session_state:
+    # Stored id, preference and justification of the current manual evaluation
+    st.session_state.manual_evaluation = None
 
 def main():
     # Inject Custom CSS
@@ -72,22 +111,43 @@ def main():
     
     # Sidebar
     st.sidebar.title("Navigation")
-    page = st.sidebar.radio("Go to", ["Generate & Evaluate", "Prompt Analysis", "Rubric Builder"])
+    page = st.sidebar.radio("Go to", ["Generate & Evaluate", "Tournament", "Prompt Analysis", "Rubric Builder", "Leaderboard"])
     
     # API Key Handling
     api_key = st.sidebar.text_input("OpenRouter API Key", type="password", value=OPENROUTER_API_KEY)
     if api_key:
-        llm_client = LLMClient(api_key=api_key)
+        llm_client = LLMClient(
+            api_key=api_key,
+            cache=get_response_cache(),
+            metrics=FanoutSink([st.session_state.llm_metrics, get_metrics_log()]),
+            on_error=st.error
+        )
     else:
         st.sidebar.warning("Please enter your OpenRouter API Key to use AI features.")
         llm_client = None
 
     if page == "Generate & Evaluate":
         render_generate_page(llm_client)
+    elif page == "Tournament":
+        render_tournament_page(llm_client)
     elif page == "Prompt Analysis":
         render_prompt_analysis_page(prompt_analyzer, llm_client)
     elif page == "Rubric Builder":
         render_rubric_builder(rubric_builder)
+    elif page == "Leaderboard":
+        render_leaderboard_page()
+    
+    # Rendered last so it includes the calls made on this rerun
+    render_usage_sidebar()
+
+def render_usage_sidebar():
+    """Show token, cost and latency totals for this session's LLM calls."""
+    usage = st.session_state.llm_metrics.summary()
+    if not usage["calls"]:
+        return
+    with st.sidebar.expander(f"📈 API Usage (${usage['cost']:.4f})"):
+        for line in format_summary(usage):
+            st.caption(line)
 
 def render_generate_page(llm_client):
     st.header("1. Generate Responses")
@@ -105,9 +165,9 @@ def render_generate_page(llm_client):
     
     # Fetch free models
     if llm_client:
-        free_models = llm_client.get_free_models()
-        model_options = [f"{m['name']} ({m['id']})" for m in free_models]
-        model_ids = {f"{m['name']} ({m['id']})": m['id'] for m in free_models}
+        catalog = llm_client.get_model_catalog()
+        model_options = catalog.free_options
+        model_ids = catalog.free_label_to_id
         
         if not model_options:
             st.warning("No free models available. Please check your API key or try again later.")
@@ -180,16 +240,8 @@ def render_generate_page(llm_client):
     
     # Generate button
     if st.button("🚀 Generate Responses", key="btn_generate", type="primary") and llm_client and prompt:
-        with st.spinner("Generating responses..."):
-            response_a, response_b = llm_client.generate_dual_responses(
-                prompt,
-                st.session_state.model_a,
-                st.session_state.model_b,
-                params_a=st.session_state.params_a,
-                params_b=st.session_state.params_b
-            )
-            st.session_state.responses = [response_a, response_b]
-            st.rerun()
+        stream_dual_responses_to_panes(llm_client, prompt)
+        st.rerun()
 
     # Display responses and regeneration controls
     if st.session_state.responses:
@@ -201,15 +253,7 @@ def render_generate_page(llm_client):
             new_prompt = st.text_area("Modify prompt and regenerate:", value=st.session_state.current_prompt, height=100)
             if st.button("🔄 Regenerate Both with New Prompt"):
                 st.session_state.current_prompt = new_prompt
-                with st.spinner("Regenerating both responses..."):
-                    response_a, response_b = llm_client.regenerate_both_responses(
-                        new_prompt,
-                        st.session_state.model_a,
-                        st.session_state.model_b,
-                        params_a=st.session_state.params_a,
-                        params_b=st.session_state.params_b
-                    )
-                    st.session_state.responses = [response_a, response_b]
+                stream_dual_responses_to_panes(llm_client, new_prompt)
                 st.rerun()
         
         # Display Responses Side-by-Side with regeneration controls
@@ -228,9 +272,11 @@ def render_generate_page(llm_client):
                         **st.session_state.params_a
                     )
                     st.session_state.responses[0] = response_a
+                    st.session_state.response_timings[0] = {}
                 st.rerun()
             
             st.markdown(st.session_state.responses[0])
+            render_timing_caption(st.session_state.response_timings[0])
         
         with r_col2:
             st.subheader("Response B")
@@ -245,21 +291,15 @@ def render_generate_page(llm_client):
                         **st.session_state.params_b
                     )
                     st.session_state.responses[1] = response_b
+                    st.session_state.response_timings[1] = {}
                 st.rerun()
             
             st.markdown(st.session_state.responses[1])
+            render_timing_caption(st.session_state.response_timings[1])
         
         # Regenerate both button
         if st.button("🔄 Regenerate Both Responses", type="secondary"):
-            with st.spinner("Regenerating both responses..."):
-                response_a, response_b = llm_client.regenerate_both_responses(
-                    st.session_state.current_prompt,
-                    st.session_state.model_a,
-                    st.session_state.model_b,
-                    params_a=st.session_state.params_a,
-                    params_b=st.session_state.params_b
-                )
-                st.session_state.responses = [response_a, response_b]
+            stream_dual_responses_to_panes(llm_client, st.session_state.current_prompt)
             st.rerun()
         
         st.divider()
@@ -334,16 +374,27 @@ def render_generate_page(llm_client):
                         
                     st.divider()
                 
+                manual_preferred = st.radio(
+                    "Preferred Response:",
+                    ["A", "B"],
+                    index=0 if st.session_state.preferred_response == "A" else 1,
+                    horizontal=True,
+                    key="manual_preferred"
+                )
+                
                 if st.button("Submit Evaluations", type="primary"):
                     res_a = evaluator.format_results(rubric, scores_a)
                     res_b = evaluator.format_results(rubric, scores_b)
                     
+                    st.session_state.preferred_response = manual_preferred
                     st.session_state.evaluation_complete = True
                     st.session_state.final_scores = {"a": res_a['final_score'], "b": res_b['final_score']}
                     st.session_state.current_scores_a = scores_a
                     st.session_state.current_scores_b = scores_b
                     st.session_state.auto_eval_data = None  # Clear any auto-eval data
                     
+                    record_manual_evaluation(rubric, scores_a, scores_b, res_a, res_b)
+                    
             else:
                 # ===== AUTO-EVALUATION FLOW (LLM-as-Judge) =====
                 st.markdown("---")
@@ -352,9 +403,9 @@ def render_generate_page(llm_client):
                 
                 # Judge model selection
                 if llm_client:
-                    free_models_judge = llm_client.get_free_models()
-                    judge_model_options = [f"{m['name']} ({m['id']})" for m in free_models_judge]
-                    judge_model_ids = {f"{m['name']} ({m['id']})": m['id'] for m in free_models_judge}
+                    judge_catalog = llm_client.get_model_catalog()
+                    judge_model_options = judge_catalog.free_options
+                    judge_model_ids = judge_catalog.free_label_to_id
                     
                     if judge_model_options:
                         selected_judge = st.selectbox(
@@ -365,18 +416,73 @@ def render_generate_page(llm_client):
                         )
                         judge_model_id = judge_model_ids[selected_judge]
                         
+                        sharded_judging = st.checkbox(
+                            "⚡ Judge each dimension in parallel",
+                            key="sharded_judging",
+                            help="Send one small judge call per dimension concurrently. Faster end-to-end, and a malformed answer only re-runs that dimension."
+                        )
+                        
+                        pointwise_judging = st.checkbox(
+                            "♻️ Score each response separately",
+                            key="pointwise_judging",
+                            help="Judge each response on its own and compare the scores; a head-to-head call is only made when they are close. Scores are cached, so re-judging a response you already scored is free. Replaces the parallel-dimension option."
+                        )
+                        
+                        swap_positions = st.checkbox(
+                            "⚖️ Judge in both orders",
+                            key="swap_positions",
+                            help="Run the judge with A shown first and with B shown first, in parallel, and reconcile the two. Cancels the judge's bias towards one position at the cost of a second call, not extra waiting. Replaces the parallel-dimension option; not used with separate scoring."
+                        )
+                        
+                        extra_judges = st.multiselect(
+                            "👥 Extra judges (ensemble)",
+                            [option for option in judge_model_options if option != selected_judge],
+                            key="extra_judges",
+                            help="Judge with several models at once. Per-dimension scores are combined and the result is ready as soon as a majority agrees on the preferred response, without waiting for slow judges. Replaces the options above."
+                        )
+                        ensemble = [judge_model_id] + [judge_model_ids[option] for option in extra_judges]
+                        aggregate = "median"
+                        if extra_judges:
+                            aggregate = st.radio(
+                                "Combine dimension scores by",
+                                ENSEMBLE_AGGREGATES,
+                                horizontal=True,
+                                key="ensemble_aggregate"
+                            )
+                        
                         if st.button("🤖 Run Auto-Evaluation", key="btn_auto_eval", type="primary"):
-                            auto_eval = AutoEvaluator(llm_client)
+                            auto_eval = AutoEvaluator(llm_client, score_cache=get_score_cache())
                             
                             with st.spinner("🤖 LLM Judge is analyzing both responses..."):
                                 try:
-                                    result = auto_eval.auto_evaluate(
-                                        prompt=st.session_state.current_prompt,
-                                        response_a=st.session_state.responses[0],
-                                        response_b=st.session_state.responses[1],
-                                        rubric=rubric,
-                                        judge_model=judge_model_id
-                                    )
+                                    judge_started = time.monotonic()
+                                    if extra_judges:
+                                        result = auto_eval.evaluate_ensemble(
+                                            st.session_state.current_prompt,
+                                            st.session_state.responses[0],
+                                            st.session_state.responses[1],
+                                            rubric,
+                                            ensemble,
+                                            aggregate
+                                        )
+                                    elif pointwise_judging:
+                                        result = auto_eval.compare_pointwise(
+                                            st.session_state.current_prompt,
+                                            st.session_state.responses[0],
+                                            st.session_state.responses[1],
+                                            rubric,
+                                            judge_model_id
+                                        )
+                                    else:
+                                        result = auto_eval.auto_evaluate(
+                                            prompt=st.session_state.current_prompt,
+                                            response_a=st.session_state.responses[0],
+                                            response_b=st.session_state.responses[1],
+                                            rubric=rubric,
+                                            judge_model=judge_model_id,
+                                            sharded=sharded_judging and not swap_positions,
+                                            swap_positions=swap_positions
+                                        )
                                     
                                     # Store auto-evaluation results in session state
                                     st.session_state.auto_eval_data = result
@@ -391,6 +497,14 @@ def render_generate_page(llm_client):
                                     st.session_state.evaluation_complete = True
                                     st.session_state.final_scores = {"a": res_a['final_score'], "b": res_b['final_score']}
                                     
+                                    record_evaluation(
+                                        "auto", rubric, result['scores_a'], result['scores_b'], res_a, res_b,
+                                        preferred_response=result['preferred_response'],
+                                        judge_model=", ".join(ensemble) if extra_judges else judge_model_id,
+                                        justification=result['justification'],
+                                        judge_time=time.monotonic() - judge_started
+                                    )
+                                    
                                     st.rerun()
                                     
                                 except Exception as e:
@@ -400,6 +514,45 @@ def render_generate_page(llm_client):
                 if st.session_state.auto_eval_data and st.session_state.evaluation_complete:
                     st.success("✅ Auto-Evaluation Complete!")
                     
+                    judge_usage = st.session_state.auto_eval_data.get('judge_usage', {})
+                    if judge_usage.get('prompt_tokens'):
+                        st.caption(
+                            f"🧮 Judge tokens: {judge_usage['prompt_tokens']:,} prompt "
+                            f"({judge_usage.get('cached_tokens', 0):,} served from provider cache), "
+                            f"{judge_usage.get('completion_tokens', 0):,} completion"
+                        )
+                    cached_scores = st.session_state.auto_eval_data.get('cached_scores')
+                    if cached_scores:
+                        st.caption(f"♻️ {cached_scores} of 2 responses scored from the score cache")
+                    if 'judges' in st.session_state.auto_eval_data:
+                        import pandas as pd
+                        
+                        ensemble_data = st.session_state.auto_eval_data
+                        answered = sum(1 for judge in ensemble_data['judges'] if judge['status'] == 'ok')
+                        caption = f"👥 {answered} of {len(ensemble_data['judges'])} judges answered, {ensemble_data['agreement']:.0%} agree on the preferred response"
+                        if ensemble_data['early_stop']:
+                            caption += "; the rest were cancelled once a majority agreed"
+                        st.caption(caption)
+                        st.dataframe(pd.DataFrame([
+                            {
+                                "Judge": judge['model'],
+                                "Status": judge['status'],
+                                "Preferred": judge['preferred_response'] or "",
+                                "Latency": f"{judge['latency']:.2f}s" if judge['latency'] is not None else "",
+                                "Error": judge['error'] or "",
+                            }
+                            for judge in ensemble_data['judges']
+                        ]), hide_index=True)
+                    if 'position_consistent' in st.session_state.auto_eval_data:
+                        agreement = st.session_state.auto_eval_data['position_agreement']
+                        if st.session_state.auto_eval_data['position_consistent']:
+                            st.caption(f"⚖️ Same preference in both orders; {agreement:.0%} of dimension scores identical")
+                        else:
+                            st.warning(f"⚖️ The judge's preference flipped when the responses were swapped ({agreement:.0%} of dimension scores identical); the reconciled scores decide.")
+                    parse_stage = st.session_state.auto_eval_data.get('parse_stage', 'direct')
+                    if parse_stage != 'direct':
+                        st.caption(f"🔧 Judge output was malformed and recovered by {parse_stage.replace('_', ' ')}")
+                    
                     # Show dimension-by-dimension results
                     st.markdown("### 📊 Dimension Scores")
                     
@@ -438,6 +591,8 @@ def render_generate_page(llm_client):
                 res_a = evaluator.format_results(rubric, st.session_state.current_scores_a)
                 res_b = evaluator.format_results(rubric, st.session_state.current_scores_b)
 
+                import streamlit_shadcn_ui as ui
+                
                 st.markdown("### Final Score Comparison")
                 res_col1, res_col2 = st.columns(2)
                 with res_col1:
@@ -480,29 +635,39 @@ def render_generate_page(llm_client):
                     )
                     st.session_state.preferred_response = preferred
                 
+                # A manual rating's stored row follows the preference and justification given here
+                if st.session_state.manual_evaluation and not st.session_state.auto_eval_data:
+                    update_manual_evaluation(preferred, user_justification)
+                
                 # Report Model Selection
                 with col_model:
                     if llm_client:
-                        free_models_export = llm_client.get_free_models()
-                        export_model_options = [f"{m['name']} ({m['id']})" for m in free_models_export]
-                        export_model_ids = {f"{m['name']} ({m['id']})": m['id'] for m in free_models_export}
+                        export_catalog = llm_client.get_model_catalog()
+                        export_model_options = export_catalog.free_options
+                        export_model_ids = export_catalog.free_label_to_id
                         
                         if export_model_options:
-                            default_idx = 0
-                            if st.session_state.report_model and st.session_state.report_model in export_model_ids.values():
-                                for idx, model_id in enumerate(export_model_ids.values()):
-                                    if model_id == st.session_state.report_model:
-                                        default_idx = idx
-                                        break
+                            default_idx = export_catalog.free_option_index(st.session_state.report_model)
                             
                             selected_export_model = st.selectbox(
                                 "Report Analysis Model:",
                                 export_model_options,
                                 index=default_idx,
-                                help="Select which model will generate the enhanced response and reasoning analysis"
+                                help="Select which model will generate the reasoning analysis and optional sections"
                             )
                             st.session_state.report_model = export_model_ids[selected_export_model]
                 
+                include_enhanced = st.checkbox(
+                    "Include an enhanced version of the preferred response",
+                    key="include_enhanced",
+                    help="Adds one more LLM section; it is generated in parallel with the others."
+                )
+                include_critique = st.checkbox(
+                    "Include a critique of the non-preferred response",
+                    key="include_critique",
+                    help="Adds one more LLM section; it is generated in parallel with the others."
+                )
+                
                 # Export Button
                 export_enabled = (
                     st.session_state.evaluation_complete
@@ -539,23 +704,33 @@ def render_generate_page(llm_client):
                         'preferred_response': st.session_state.preferred_response,
                         'timestamp': timestamp,
                         'evaluator': evaluator_label,
-                        'report_model': st.session_state.report_model
+                        'report_model': st.session_state.report_model,
+                        'usage': st.session_state.llm_metrics.summary()
                     }
                     
                     report_gen = ReportGenerator(llm_client)
                     
-                    with st.spinner("🤖 Generating enhanced analysis and reasoning..."):
+                    # Deterministic sections render immediately; LLM sections fill in as they finish
+                    live_preview = st.empty()
+                    
+                    def show_progress(partial_report):
+                        live_preview.markdown(partial_report)
+                    
+                    report_filename = f"evaluation_report_{timestamp}.md"
+                    
+                    with st.spinner("🤖 Generating report analysis..."):
                         try:
+                            # Sections are written to disk as they complete and the
+                            # file is moved into place atomically at the end
                             report_content = report_gen.generate_report(
                                 session_data,
-                                st.session_state.report_model
+                                st.session_state.report_model,
+                                include_enhanced=include_enhanced,
+                                include_critique=include_critique,
+                                on_update=show_progress,
+                                output_path=Path('evaluations') / report_filename
                             )
-                            
-                            eval_dir = Path('evaluations')
-                            eval_dir.mkdir(exist_ok=True)
-                            report_filename = f"evaluation_report_{timestamp}.md"
-                            report_path = eval_dir / report_filename
-                            report_path.write_text(report_content, encoding='utf-8')
+                            live_preview.empty()
                             
                             st.success(f"✅ Report generated successfully: `{report_filename}`")
                             
@@ -576,15 +751,252 @@ def render_generate_page(llm_client):
                 if not export_enabled and not user_justification.strip():
                     st.info("💡 Please provide your comparative justification above to enable export.")
 
+def record_evaluation(mode, rubric, scores_a, scores_b, res_a, res_b,
+                      preferred_response=None, judge_model=None, justification="", judge_time=None):
+    """Queue the evaluation for the local store; it is written in the background."""
+    get_evaluation_store().submit(evaluation_record(
+        mode, rubric, scores_a, scores_b, res_a, res_b,
+        preferred_response, judge_model, justification, judge_time
+    ))
+
+def record_manual_evaluation(rubric, scores_a, scores_b, res_a, res_b):
+    """Store a manual rating once per response pair and rubric; submitting again revises the same row."""
+    store = get_evaluation_store()
+    preferred = st.session_state.preferred_response
+    justification = st.session_state.user_justification
+    fingerprint = rubric_fingerprint(rubric)
+    try:
+        current = st.session_state.manual_evaluation
+        if current is None or current["rubric"] != fingerprint:
+            evaluation_id = store.add(evaluation_record(
+                "manual", rubric, scores_a, scores_b, res_a, res_b,
+                preferred_response=preferred, justification=justification
+            ))
+        else:
+            evaluation_id = current["id"]
+            store.update(evaluation_id, {
+                "scores_a": scores_a,
+                "scores_b": scores_b,
+                "final_score_a": res_a['final_score'],
+                "final_score_b": res_b['final_score'],
+                "preferred_response": preferred,
+                "justification": justification,
+            })
+    except Exception as e:
+        st.warning(f"Could not record the evaluation: {str(e)}")
+        return
+    st.session_state.manual_evaluation = {
+        "id": evaluation_id, "rubric": fingerprint, "preferred_response": preferred, "justification": justification
+    }
+
+def update_manual_evaluation(preferred, justification):
+    """Save a changed preference or justification on the stored manual rating."""
+    current = st.session_state.manual_evaluation
+    changes = {
+        key: value
+        for key, value in (("preferred_response", preferred), ("justification", justification))
+        if current[key] != value
+    }
+    if not changes:
+        return
+    try:
+        get_evaluation_store().update(current["id"], changes)
+    except Exception as e:
+        st.warning(f"Could not update the stored evaluation: {str(e)}")
+        return
+    current.update(changes)
+
+def evaluation_record(mode, rubric, scores_a, scores_b, res_a, res_b,
+                      preferred_response=None, judge_model=None, justification="", judge_time=None):
+    """Build an evaluation store record from the current session."""
+    timings = {"response_a": st.session_state.response_timings[0],
+               "response_b": st.session_state.response_timings[1]}
+    if judge_time is not None:
+        timings["judge"] = round(judge_time, 3)
+    
+    return {
+        "mode": mode,
+        "prompt": st.session_state.current_prompt,
+        "model_a": st.session_state.model_a,
+        "model_b": st.session_state.model_b,
+        "params_a": st.session_state.params_a,
+        "params_b": st.session_state.params_b,
+        "rubric": rubric,
+        "judge_model": judge_model,
+        "scores_a": scores_a,
+        "scores_b": scores_b,
+        "final_score_a": res_a['final_score'],
+        "final_score_b": res_b['final_score'],
+        "preferred_response": preferred_response,
+        "justification": justification,
+        "timings": timings,
+    }
+
+def stream_dual_responses_to_panes(llm_client, prompt):
+    """Stream both responses side by side, then store them in session state."""
+    streams = llm_client.stream_dual_responses(
+        prompt,
+        st.session_state.model_a,
+        st.session_state.model_b,
+        params_a=st.session_state.params_a,
+        params_b=st.session_state.params_b
+    )
+    
+    pane_cols = st.columns(2)
+    placeholders = []
+    for col, label, model in zip(pane_cols, ["A", "B"], [st.session_state.model_a, st.session_state.model_b]):
+        with col:
+            st.subheader(f"Response {label}")
+            st.caption(f"Model: {model}")
+            placeholders.append(st.empty())
+    
+    texts = ["", ""]
+    for side, delta in interleave_streams(streams):
+        texts[side] += delta
+        placeholders[side].markdown(texts[side] + "▌")
+    
+    for side, stream in enumerate(streams):
+        placeholders[side].markdown(stream.text)
+    
+    st.session_state.responses = [stream.text for stream in streams]
+    st.session_state.response_timings = [stream.stats() for stream in streams]
+    # New responses start a new manual evaluation
+    st.session_state.manual_evaluation = None
+
+def render_timing_caption(timings):
+    """Show time-to-first-token and total generation time when available."""
+    if timings.get("total_time") is None:
+        return
+    ttft = timings.get("time_to_first_token")
+    ttft_text = f"{ttft:.2f}s" if ttft is not None else "n/a"
+    st.caption(f"⏱️ First token: {ttft_text} | Total: {timings['total_time']:.2f}s")
+
+def render_tournament_page(llm_client):
+    import pandas as pd
+    from utils.tournament import SCHEDULES, Tournament, default_rounds
+    
+    st.header("Model Tournament")
+    st.caption("Rank several models on one prompt. Matches are scheduled in rounds, so only a fraction of all pairs is judged.")
+    
+    if not llm_client:
+        st.warning("Please enter your OpenRouter API key in the sidebar.")
+        return
+    
+    catalog = llm_client.get_model_catalog()
+    model_options = catalog.free_options
+    model_ids = catalog.free_label_to_id
+    if len(model_options) < 3:
+        st.warning("A tournament needs at least 3 free models. Please check your API key or try again later.")
+        return
+    
+    prompt = st.text_area("Enter your prompt:", height=150, value=st.session_state.current_prompt, key="tournament_prompt")
+    selected_models = st.multiselect(
+        "Entrants",
+        model_options,
+        default=model_options[:4],
+        help="Each selected model answers the prompt once; the responses then play each other."
+    )
+    
+    rubric_options = {rubric_builder.get_rubric_display_name(f): f for f in rubric_builder.list_rubrics()}
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_rubric = st.selectbox("Evaluation Rubric", list(rubric_options.keys()), key="tournament_rubric")
+    with col2:
+        selected_judge = st.selectbox("Judge Model", model_options, key="tournament_judge")
+    
+    col3, col4 = st.columns(2)
+    with col3:
+        schedule = st.radio(
+            "Pairing",
+            SCHEDULES,
+            format_func={"swiss": "Swiss system", "active": "Most uncertain pairs"}.get,
+            horizontal=True,
+            help="Swiss pairs entrants with equal records; the other option pairs the entrants whose match the current ratings are least sure about."
+        )
+    with col4:
+        rounds = None
+        if len(selected_models) >= 3:
+            rounds = st.slider(
+                "Rounds", 1, len(selected_models) - 1, default_rounds(len(selected_models)),
+                help="Each round plays every entrant at most once. The default, log2 of the field size, is usually enough to separate it."
+            )
+    
+    if st.button("🏆 Run Tournament", type="primary", disabled=len(selected_models) < 3 or not prompt.strip() or not selected_rubric):
+        models = [model_ids[label] for label in selected_models]
+        with st.spinner(f"Generating {len(models)} responses..."):
+            texts = llm_client.generate_multi_responses(prompt, models)
+        responses = {model: text for model, text in zip(models, texts) if not text.startswith("Error")}
+        failed = [model for model, text in zip(models, texts) if text.startswith("Error")]
+        
+        tournament = Tournament(
+            AutoEvaluator(llm_client, score_cache=get_score_cache()),
+            rubric_builder.load_rubric(rubric_options[selected_rubric]),
+            model_ids[selected_judge],
+            schedule=schedule,
+            rounds=rounds,
+            store=get_evaluation_store()
+        )
+        progress = st.empty()
+        with st.spinner("Judging matches..."):
+            result = tournament.run(
+                prompt,
+                responses,
+                on_round=lambda number, matches: progress.caption(f"Round {number} done: {len(matches)} matches")
+            )
+        progress.empty()
+        result["failed"] = failed
+        st.session_state.tournament_result = {"prompt": prompt, "responses": responses, **result}
+    
+    result = st.session_state.get("tournament_result")
+    if not result:
+        return
+    
+    for model in result["failed"]:
+        st.warning(f"{model} could not generate a response and was left out.")
+    for model, error in result["excluded"].items():
+        st.warning(f"{model} could not be scored and was left out: {error}")
+    
+    played = sum(1 for match in result["matches"] if match["error"] is None)
+    st.caption(
+        f"{played} matches in {result['rounds']} rounds ({result['pairs_possible']} for a full round robin), "
+        f"{result['judge_calls']} judge calls"
+    )
+    
+    st.subheader("Standings")
+    st.dataframe(pd.DataFrame([
+        {
+            "Rank": row["rank"],
+            "Model": row["entrant"],
+            "Rating": round(row["rating"]),
+            "W / L": f"{row['wins']} / {row['losses']}",
+            "Score": f"{row['score']:.2f}/10" if row["score"] is not None else "n/a",
+        }
+        for row in result["standings"]
+    ]), hide_index=True)
+    
+    st.subheader("Matches")
+    for match in result["matches"]:
+        title = f"Round {match['round']}: {match['a']} vs {match['b']}"
+        if match["error"] is not None:
+            st.caption(f"{title}: ❌ {match['error']}")
+            continue
+        with st.expander(f"{title} → {match['winner']}"):
+            st.markdown(match["justification"])
+    
+    st.subheader("Responses")
+    for model, text in result["responses"].items():
+        with st.expander(model):
+            st.markdown(text)
+
 def render_prompt_analysis_page(analyzer, llm_client):
     st.header("Prompt Enhancement Analysis")
     
     prompt = st.text_area("Enter a prompt to analyze:", height=200, value=st.session_state.current_prompt)
     
     if llm_client:
-        free_models = llm_client.get_free_models()
-        model_options = [f"{m['name']} ({m['id']})" for m in free_models]
-        model_ids = {f"{m['name']} ({m['id']})": m['id'] for m in free_models}
+        catalog = llm_client.get_model_catalog()
+        model_options = catalog.free_options
+        model_ids = catalog.free_label_to_id
         
         if not model_options:
             st.warning("No free models available. Please check your API key or try again later.")
@@ -611,6 +1023,8 @@ def render_prompt_analysis_page(analyzer, llm_client):
         st.warning("Please enter your OpenRouter API key in the sidebar to use LLM analysis.")
 
 def render_rubric_builder(builder):
+    import yaml
+    
     st.header("Custom Rubric Builder")
     
     with st.form("rubric_form"):
@@ -637,5 +1051,67 @@ def render_rubric_builder(builder):
             except Exception as e:
                 st.error(f"Invalid YAML: {e}")
 
+def render_leaderboard_page():
+    import pandas as pd
+    from utils.leaderboard import refresh_leaderboard, snapshot_path
+    
+    st.header("Model Leaderboard")
+    st.caption("Elo and Bradley-Terry ratings over every stored pairwise judgement, with 95% bootstrap intervals.")
+    
+    store = get_evaluation_store()
+    store.flush()
+    
+    rubrics = store.rubrics()
+    scope_options = {"All rubrics": None}
+    scope_options.update({f"{r['name'] or 'Unnamed'} ({r['hash'][:8]})": r['hash'] for r in rubrics})
+    scope = st.selectbox("Rubric", list(scope_options.keys()))
+    rubric_key = scope_options[scope]
+    show_intervals = st.checkbox("Show 95% bootstrap intervals", value=True, key="leaderboard_intervals")
+    
+    # Snapshots hold precomputed ratings and intervals; only judgements stored since the
+    # last visit are folded in, and intervals are recomputed only once they are stale
+    with st.spinner("Updating ratings..."):
+        leaderboard = refresh_leaderboard(
+            store,
+            snapshot_path(config.LEADERBOARD_DIR, rubric_key),
+            rubric=rubric_key,
+            samples=200 if show_intervals else 0
+        )
+    
+    table = leaderboard.table()
+    if not table:
+        st.info("No pairwise judgements between different models yet. Evaluate some responses first.")
+        return
+    
+    st.caption(f"{leaderboard.judgements} judgements across {len(table)} models")
+    if show_intervals and leaderboard.intervals and leaderboard.interval_judgements < leaderboard.judgements:
+        st.caption(
+            f"Intervals were computed over {leaderboard.interval_judgements} judgements "
+            "and are refreshed as more arrive."
+        )
+    
+    def interval(row, name):
+        if row[f"{name}_low"] is None:
+            return "n/a"
+        return f"{row[f'{name}_low']:.0f} – {row[f'{name}_high']:.0f}"
+    
+    df = pd.DataFrame([
+        {
+            "Rank": rank,
+            "Model": row["model"],
+            "Bradley-Terry": round(row["bradley_terry"]),
+            "BT 95% CI": interval(row, "bradley_terry"),
+            "Elo": round(row["elo"]),
+            "Elo 95% CI": interval(row, "elo"),
+            "Games": row["games"],
+            "W / L / T": f"{row['wins']} / {row['losses']} / {row['ties']}",
+            "Win Rate": f"{row['win_rate']:.0%}",
+        }
+        for rank, row in enumerate(table, start=1)
+    ])
+    if not show_intervals:
+        df = df.drop(columns=["BT 95% CI", "Elo 95% CI"])
+    st.dataframe(df, hide_index=True)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: cold-start import time of the evaluation core.
+
+Imports each core module in a fresh interpreter (so nothing is cached in
+sys.modules) and reports the median import time and which heavy third-party
+packages the import pulled in. Exits non-zero when a module exceeds the
+budget or loads a UI package, so batch workers and test processes keep their
+fast startup.
+
+Usage (from the streamlit-app directory):
+    python benchmarks/bench_import_time.py [--runs 5] [--budget-ms 250]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CORE_MODULES = [
+    "utils.llm_client",
+    "utils.rubric_parser",
+    "utils.evaluator",
+    "utils.auto_evaluator",
+    "utils.report_generator",
+    "utils.batch_runner",
+]
+
+# Packages the core may use, but only once it actually needs them
+HEAVY_PACKAGES = ["openai", "requests", "numpy", "pandas", "yaml", "dotenv"]
+# Packages the core must never import
+UI_PACKAGES = ["streamlit", "streamlit_shadcn_ui"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [name for name in {packages!r} if name in sys.modules]}}))
+"""
+
+
+def measure(module: str) -> dict:
+    """Import ``module`` in a fresh interpreter; returns its import time and loaded packages."""
+    probe = PROBE.format(module=module, packages=HEAVY_PACKAGES + UI_PACKAGES)
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=APP_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="Maximum median import time per module")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<24} {'median':>9} {'max':>9}  loaded")
+    for module in CORE_MODULES:
+        samples = [measure(module) for _ in range(args.runs)]
+        times = [sample["seconds"] * 1000 for sample in samples]
+        loaded = samples[-1]["loaded"]
+        median = statistics.median(times)
+        print(f"{module:<24} {median:>7.1f}ms {max(times):>7.1f}ms  {', '.join(loaded) or '-'}")
+
+        if median > args.budget_ms:
+            failures.append(f"{module}: {median:.1f}ms exceeds the {args.budget_ms:.0f}ms budget")
+        ui_loaded = [name for name in loaded if name in UI_PACKAGES]
+        if ui_loaded:
+            failures.append(f"{module}: imports UI packages {', '.join(ui_loaded)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
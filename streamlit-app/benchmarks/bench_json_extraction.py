@@ -0,0 +1,129 @@
+"""
+Micro-benchmark: judge-output JSON extraction.
+
+Compares the previous extractor (lazy DOTALL fence regex, then a per-character
+brace scan, then two cleaning regex passes) with the single-pass streaming
+extractor on multi-kilobyte judge outputs, with and without fenced code in
+the dimension comments. With fenced code the old fence regex stops early on
+the wrong block, which the "legacy result valid" column shows.
+
+Usage (from the streamlit-app directory):
+    python benchmarks/bench_json_extraction.py [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.json_extractor import JsonObjectExtractor, extract_json
+
+
+def legacy_extract_json(text: str) -> str:
+    """The extractor AutoEvaluator used before the single-pass scanner."""
+    json_block_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', text, re.DOTALL)
+    if json_block_match:
+        return legacy_clean(json_block_match.group(1).strip())
+
+    first_brace = text.find('{')
+    if first_brace != -1:
+        depth = 0
+        in_string = False
+        escape_next = False
+        for i in range(first_brace, len(text)):
+            ch = text[i]
+            if escape_next:
+                escape_next = False
+                continue
+            if ch == '\\':
+                if in_string:
+                    escape_next = True
+                continue
+            if ch == '"' and not escape_next:
+                in_string = not in_string
+                continue
+            if in_string:
+                continue
+            if ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    return legacy_clean(text[first_brace:i + 1])
+
+        last_brace = text.rfind('}')
+        if last_brace > first_brace:
+            return legacy_clean(text[first_brace:last_brace + 1])
+
+    return text.strip()
+
+
+def legacy_clean(json_str: str) -> str:
+    """The cleaning passes applied by the previous extractor."""
+    json_str = json_str.strip().lstrip('\ufeff')
+    json_str = re.sub(r',\s*([}\]])', r'\1', json_str)
+    json_str = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', json_str)
+    return json_str
+
+
+def make_output(dimensions: int, comment_chars: int, fenced_code: bool) -> str:
+    """Judge output wrapped in prose, optionally with fenced code in its comments."""
+    snippet = "def handler(event):\n    return {\"ok\": True, \"items\": [1, 2, 3]}"
+    if fenced_code:
+        snippet = f"```python\n{snippet}\n```"
+    filler = ("The response handles the main path but misses edge cases. " * 50)[:comment_chars]
+    scores = {
+        f"Dimension {i}": {"score": 1 + i % 3, "comment": f"{filler} Example: {snippet}"}
+        for i in range(dimensions)
+    }
+    judgement = {
+        "scores_a": scores,
+        "scores_b": scores,
+        "preferred_response": "A",
+        "justification": f"A is better. {filler}"
+    }
+    return f"Here is my evaluation:\n\n{json.dumps(judgement, indent=2)}\n\nLet me know if you need more detail."
+
+
+def feed_in_chunks(text: str, size: int = 16) -> str:
+    """Extract by feeding the text in stream-sized chunks."""
+    extractor = JsonObjectExtractor()
+    for i in range(0, len(text), size):
+        if extractor.feed(text[i:i + size]) is not None:
+            break
+    return extractor.finish()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per measurement")
+    args = parser.parse_args()
+
+    for fenced_code in (False, True):
+        print(f"\nComments {'with' if fenced_code else 'without'} fenced code")
+        print(f"{'size':>9} {'legacy':>11} {'single-pass':>12} {'16-char chunks':>15}  legacy result valid")
+        for dimensions, comment_chars in ((4, 300), (8, 1000), (16, 2500), (32, 2500)):
+            text = make_output(dimensions, comment_chars, fenced_code)
+            timings = []
+            for func in (legacy_extract_json, extract_json, feed_in_chunks):
+                seconds = timeit.timeit(lambda: func(text), number=args.repeat)
+                timings.append(seconds / args.repeat * 1e6)
+
+            try:
+                legacy_ok = "scores_a" in json.loads(legacy_extract_json(text))
+            except ValueError:
+                legacy_ok = False
+            assert "scores_a" in json.loads(extract_json(text))
+
+            print(
+                f"{len(text) / 1024:>7.1f}KB {timings[0]:>9.1f}us {timings[1]:>10.1f}us "
+                f"{timings[2]:>13.1f}us  {legacy_ok}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,5 @@
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
@@ -11,16 +7,40 @@ APP_DIR = Path(__file__).parent
 RUBRICS_DIR = APP_DIR / "rubrics"
 TECHNIQUES_DIR = BASE_DIR / "prompt_techniques"
 CSS_FILE = APP_DIR / "assets" / "style.css"
+# Directories below are created by whatever writes to them, not at import
 EVALUATIONS_DIR = APP_DIR / "evaluations"
-
-# Ensure directories exist
-EVALUATIONS_DIR.mkdir(exist_ok=True)
+CACHE_DIR = APP_DIR / ".cache"
+RESPONSE_CACHE_PATH = CACHE_DIR / "responses.sqlite3"
+SCORE_CACHE_PATH = CACHE_DIR / "scores.sqlite3"
+EVALUATION_STORE_PATH = EVALUATIONS_DIR / "evaluations.sqlite3"
+LEADERBOARD_DIR = CACHE_DIR / "leaderboards"
+METRICS_PATH = CACHE_DIR / "llm_calls.jsonl"
 
 # OpenRouter API Configuration
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 OPENROUTER_MODELS_URL = f"{OPENROUTER_BASE_URL}/models"
 
 # App Settings
 APP_TITLE = "AI Engineering Critique"
 APP_ICON = "🧐"
+
+_env_loaded = False
+
+
+def load_environment() -> None:
+    """Load environment variables from .env, once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+
+def __getattr__(name: str):
+    # Settings read from the environment are resolved on first access, so
+    # importing config does not touch .env files
+    if name == "OPENROUTER_API_KEY":
+        load_environment()
+        return os.getenv("OPENROUTER_API_KEY", "")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
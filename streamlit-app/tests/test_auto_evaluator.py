@@ -11,18 +11,40 @@ Tests cover:
   - Score clamping to 1-3 range
   - String scores converted to int
   - Brace-matched extraction with nested objects
+  - Fenced code inside comments does not derail extraction
   - BOM-prefixed JSON
   - Control characters stripped
+  - Judge prompt prefix is byte-identical across pairs and precedes per-pair content
+  - Judge token usage (including provider cache hits) is reported
+  - Sharded mode: per-dimension calls, merging, retrying only failed shards
+  - Repair pipeline: local repair, JSON-only repair call, full retry, stage counters
+  - API failures propagate as typed errors instead of entering the repair pipeline
+  - Pointwise mode: single-response scores cached by (rubric, prompt, response,
+    judge), pairwise results derived from them, tie-break call only when close
+  - Judge calls carry the rubric's JSON schema unless structured output is disabled
+  - Position swap: both orders judged concurrently, mapped back and reconciled,
+    flips flagged and agreement counted
+  - Judge ensemble: concurrent fan-out, median/majority aggregation, early stop
+    once a quorum agrees, per-judge status and latency, failures tolerated
 """
 
 import sys
 import os
+import json
+import re
+import threading
+import time
 import pytest
 
 # Add parent directory to path so we can import utils
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.auto_evaluator import AutoEvaluator
+from utils.auto_evaluator import (
+    AutoEvaluator, JudgeCancelled, build_judge_schema, parse_stage_counts, position_agreement_stats,
+    reset_parse_stage_counts, reset_position_agreement_stats
+)
+from utils.resilience import LLMRateLimitError
+from utils.score_cache import ScoreCache, score_key
 
 
 # ---------------------------------------------------------------------------
@@ -56,6 +78,25 @@ def make_evaluator():
     return AutoEvaluator.__new__(AutoEvaluator)
 
 
+class UsageClient:
+    """LLMClient stand-in returning fixed outputs with provider usage data."""
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.prompts = []
+        self.params = []
+
+    def generate_completion(self, prompt, model, system_prompt="", **params):
+        self.prompts.append(prompt)
+        self.params.append(params)
+        return {
+            "content": self.outputs.pop(0),
+            "model": model,
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 200, "cached_tokens": 800},
+            "from_cache": False
+        }
+
+
 # ---------------------------------------------------------------------------
 # _extract_json tests
 # ---------------------------------------------------------------------------
@@ -94,6 +135,14 @@ class TestExtractJson:
         # Should not include the trailing text
         assert "I hope" not in result
 
+    def test_fenced_code_inside_comments(self):
+        ev = make_evaluator()
+        fenced = VALID_JSON.replace("Could be clearer", "Prefer ```python\\nx = {}\\n``` here")
+        text = f"```json\n{fenced}\n```"
+        data, stage = ev._decode_judge_json(text)
+        assert stage == "direct"
+        assert "```python" in data["scores_a"]["Clarity"]["comment"]
+
     def test_no_json_returns_stripped_text(self):
         ev = make_evaluator()
         text = "  no json here  "
@@ -266,3 +315,507 @@ class TestParseJudgeResponse:
         result = ev._parse_judge_response(text, SAMPLE_RUBRIC)
         assert result['preferred_response'] == 'A'
         assert result['scores_a']['Accuracy']['score'] == 3
+
+
+# ---------------------------------------------------------------------------
+# Judge prompt layout and usage
+# ---------------------------------------------------------------------------
+
+class TestJudgePromptPrefix:
+    def test_prefix_identical_across_pairs(self):
+        ev = make_evaluator()
+        first = ev._build_judge_prompt("Prompt one", "A1", "B1", SAMPLE_RUBRIC)
+        second = ev._build_judge_prompt("A different prompt", "A2", "B2", SAMPLE_RUBRIC)
+        prefix = ev._build_judge_prefix(SAMPLE_RUBRIC)
+        assert first.startswith(prefix)
+        assert second.startswith(prefix)
+        assert "Prompt one" not in prefix
+
+    def test_pair_content_follows_rubric(self):
+        ev = make_evaluator()
+        text = ev._build_judge_prompt("Sort a list", "Answer A", "Answer B", SAMPLE_RUBRIC)
+        assert text.index("Accuracy") < text.index("Sort a list") < text.index("Answer A") < text.index("Answer B")
+
+    def test_prefix_changes_with_rubric(self):
+        ev = make_evaluator()
+        edited = {**SAMPLE_RUBRIC, "name": "Other Rubric"}
+        assert ev._build_judge_prefix(edited) != ev._build_judge_prefix(SAMPLE_RUBRIC)
+
+    def test_usage_reported_across_retries(self):
+        client = UsageClient(["not json", VALID_JSON])
+        result = AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge")
+        assert client.prompts[0] == client.prompts[1]
+        assert result["judge_usage"] == {
+            "prompt_tokens": 2000, "completion_tokens": 400,
+            "cached_tokens": 1600, "uncached_tokens": 400
+        }
+        assert result["parse_stage"] == "full_retry"
+
+
+# ---------------------------------------------------------------------------
+# Sharded judging
+# ---------------------------------------------------------------------------
+
+class ShardClient:
+    """Answers each shard prompt from per-dimension scores; can fail chosen shards once."""
+
+    def __init__(self, scores, fail_once=(), prefer="A"):
+        self.scores = scores
+        self.fail_once = set(fail_once)
+        self.prefer = prefer
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def generate_completion(self, prompt, model, system_prompt="", **params):
+        names = [name for name in self.scores if f"**{name}**" in prompt]
+        with self.lock:
+            self.calls.append(tuple(names))
+            fail = bool(self.fail_once.intersection(names))
+            self.fail_once.difference_update(names)
+        if fail:
+            content = "Sorry, I cannot produce JSON right now"
+        else:
+            content = json.dumps({
+                "scores_a": {n: {"score": self.scores[n][0], "comment": f"{n} A"} for n in names},
+                "scores_b": {n: {"score": self.scores[n][1], "comment": f"{n} B"} for n in names},
+                "preferred_response": self.prefer,
+                "notes": f"notes on {', '.join(names)}"
+            })
+        return {"content": content, "model": model, "usage": {"prompt_tokens": 10}, "from_cache": False}
+
+
+class TestShardedJudging:
+    def test_one_call_per_dimension_merged(self):
+        client = ShardClient({"Accuracy": (1, 3), "Clarity": (3, 3)})
+        result = AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge", sharded=True)
+        assert sorted(client.calls) == [("Accuracy",), ("Clarity",)]
+        assert result["scores_a"]["Accuracy"] == {"score": 1, "comment": "Accuracy A"}
+        assert result["scores_b"]["Clarity"]["score"] == 3
+        # Preference follows the weighted scores, not the shards' stated preference
+        assert result["preferred_response"] == "B"
+        assert "notes on Accuracy" in result["justification"]
+        assert result["judge_usage"]["prompt_tokens"] == 20
+
+    def test_grouped_shards(self):
+        client = ShardClient({"Accuracy": (2, 2), "Clarity": (2, 2)})
+        AutoEvaluator(client).auto_evaluate(
+            "p", "a", "b", SAMPLE_RUBRIC, "judge", sharded=True, dimensions_per_shard=2
+        )
+        assert client.calls == [("Accuracy", "Clarity")]
+
+    def test_only_failed_shard_is_retried(self):
+        client = ShardClient({"Accuracy": (3, 2), "Clarity": (3, 2)}, fail_once={"Clarity"})
+        result = AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge", sharded=True)
+        assert sorted(client.calls) == [("Accuracy",), ("Clarity",), ("Clarity",)]
+        assert result["scores_a"]["Clarity"]["score"] == 3
+
+    def test_tie_broken_by_shard_preference(self):
+        client = ShardClient({"Accuracy": (2, 2), "Clarity": (2, 2)}, prefer="B")
+        result = AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge", sharded=True)
+        assert result["preferred_response"] == "B"
+
+    def test_incomplete_shard_is_an_error(self):
+        ev = make_evaluator()
+        with pytest.raises(ValueError, match="Clarity"):
+            ev._parse_shard_response(
+                '{"scores_a": {"Clarity": {"score": 3}}, "scores_b": {}}',
+                [SAMPLE_RUBRIC["dimensions"][1]]
+            )
+
+    def test_persistent_failure_names_dimensions(self):
+        client = ShardClient({"Accuracy": (3, 3), "Clarity": (3, 3)})
+        client.generate_completion = lambda *a, **k: {"content": "nope", "usage": {}}
+        with pytest.raises(ValueError, match="Accuracy, Clarity"):
+            AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge", sharded=True)
+
+
+# ---------------------------------------------------------------------------
+# Repair pipeline
+# ---------------------------------------------------------------------------
+
+class TestRepairPipeline:
+    def setup_method(self):
+        reset_parse_stage_counts()
+
+    def test_cosmetic_errors_repaired_locally(self):
+        sloppy = VALID_JSON.replace('"A"', "'A'").replace("overall.", 'overall. It "wins".')
+        sloppy = sloppy.rstrip("}").rstrip() + ","
+        client = UsageClient([sloppy])
+        result = AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge")
+        assert len(client.prompts) == 1
+        assert result["parse_stage"] == "local_repair"
+        assert result["preferred_response"] == "A"
+        assert result["judge_calls"] == 1
+        assert parse_stage_counts()["local_repair"] == 1
+
+    def test_structural_errors_use_json_only_repair_call(self):
+        client = UsageClient(['{"scores_a": {"Accuracy": 3}, "verdict": "A"}', VALID_JSON])
+        result = AutoEvaluator(client).auto_evaluate(
+            "ORIGINAL PROMPT", "RESPONSE A TEXT", "RESPONSE B TEXT", SAMPLE_RUBRIC, "judge"
+        )
+        repair_prompt = client.prompts[1]
+        assert '"verdict": "A"' in repair_prompt
+        assert '"preferred_response"' in repair_prompt
+        assert "RESPONSE A TEXT" not in repair_prompt and "ORIGINAL PROMPT" not in repair_prompt
+        assert result["parse_stage"] == "llm_repair"
+        assert result["judge_usage"]["prompt_tokens"] == 2000
+
+    def test_failed_repair_falls_back_to_full_retry(self):
+        client = UsageClient(['{"scores_a": {}}', "still broken", VALID_JSON])
+        result = AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge")
+        assert client.prompts[2] == client.prompts[0]
+        assert result["parse_stage"] == "full_retry"
+        assert result["judge_calls"] == 3
+
+    def test_total_failure_counted(self):
+        client = UsageClient(["no json", "no json either"])
+        with pytest.raises(ValueError, match="Failed to parse"):
+            AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge")
+        assert parse_stage_counts()["failed"] == 1
+
+    def test_api_error_not_parsed(self):
+        class RateLimitedClient(UsageClient):
+            def generate_completion(self, prompt, model, system_prompt="", **params):
+                self.prompts.append(prompt)
+                raise LLMRateLimitError("rate limited", model)
+
+        client = RateLimitedClient([])
+        with pytest.raises(LLMRateLimitError):
+            AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge")
+        assert len(client.prompts) == 1
+
+
+# ---------------------------------------------------------------------------
+# Structured output
+# ---------------------------------------------------------------------------
+
+class TestStructuredJudging:
+    def test_schema_covers_rubric_dimensions(self):
+        schema = build_judge_schema(SAMPLE_RUBRIC)
+        scores = schema["properties"]["scores_a"]
+        assert scores["required"] == ["Accuracy", "Clarity"]
+        assert scores["properties"]["Accuracy"]["properties"]["score"]["enum"] == [1, 2, 3]
+        assert set(schema["required"]) == {"scores_a", "scores_b", "preferred_response", "justification"}
+
+    def test_schema_sent_with_judge_call(self):
+        client = UsageClient([VALID_JSON])
+        AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge")
+        assert client.params[0]["json_schema"] == build_judge_schema(SAMPLE_RUBRIC)
+
+    def test_structured_output_can_be_disabled(self):
+        client = UsageClient([VALID_JSON])
+        AutoEvaluator(client, structured_output=False).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge")
+        assert client.params[0]["json_schema"] is None
+
+
+# ---------------------------------------------------------------------------
+# Pointwise judging
+# ---------------------------------------------------------------------------
+
+def pointwise_json(accuracy, clarity):
+    return json.dumps({
+        "scores": {
+            "Accuracy": {"score": accuracy, "comment": "acc"},
+            "Clarity": {"score": clarity, "comment": "clr"}
+        },
+        "summary": f"scored {accuracy}/{clarity}"
+    })
+
+
+class PointwiseClient:
+    """Judge stand-in scoring each response from a table; answers tie-breaks with B."""
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate_completion(self, prompt, model, system_prompt="", **params):
+        with self.lock:
+            self.prompts.append(prompt)
+        if "nearly identical rubric scores" in prompt:
+            content = json.dumps({"preferred_response": "B", "justification": "B is more concise."})
+        else:
+            response = prompt.rsplit("## Response\n\n", 1)[1]
+            content = self.scores[response]
+        return {"content": content, "model": model, "usage": {"prompt_tokens": 100}, "from_cache": False}
+
+    @property
+    def calls(self):
+        return len(self.prompts)
+
+
+class TestPointwise:
+    SCORES = {
+        "strong": pointwise_json(3, 3),
+        "weak": pointwise_json(1, 2),
+        "close": pointwise_json(3, 2),
+        "broken": '{"scores": {"Accuracy": {"score": 3}}}',
+    }
+
+    def test_scores_cached_across_evaluators(self, tmp_path):
+        cache = ScoreCache(tmp_path / "scores.sqlite3")
+        client = PointwiseClient(self.SCORES)
+        first = AutoEvaluator(client, score_cache=cache).score_response("p", "strong", SAMPLE_RUBRIC, "judge")
+        assert first["scores"]["Accuracy"]["score"] == 3 and not first["from_cache"]
+        assert first["judge_calls"] == 1
+
+        second = AutoEvaluator(client, score_cache=cache).score_response("p", "strong", SAMPLE_RUBRIC, "judge")
+        assert second["from_cache"] and second["judge_calls"] == 0
+        assert second["scores"] == first["scores"] and second["summary"] == "scored 3/3"
+        assert client.calls == 1
+
+    def test_cache_key_covers_rubric_prompt_response_and_judge(self):
+        base = score_key(SAMPLE_RUBRIC, "p", "r", "judge")
+        edited = dict(SAMPLE_RUBRIC, description="changed")
+        assert len({
+            base,
+            score_key(edited, "p", "r", "judge"),
+            score_key(SAMPLE_RUBRIC, "p2", "r", "judge"),
+            score_key(SAMPLE_RUBRIC, "p", "r2", "judge"),
+            score_key(SAMPLE_RUBRIC, "p", "r", "judge2"),
+        }) == 5
+
+    def test_preference_derived_from_scores(self):
+        client = PointwiseClient(self.SCORES)
+        result = AutoEvaluator(client).compare_pointwise("p", "weak", "strong", SAMPLE_RUBRIC, "judge")
+        assert result["preferred_response"] == "B"
+        assert not result["tie_break"] and result["judge_calls"] == 2
+        assert result["scores_a"]["Accuracy"]["score"] == 1
+        assert "scored 3/3" in result["justification"]
+        assert result["judge_usage"]["prompt_tokens"] == 200
+
+    def test_one_against_many_costs_linear_calls(self, tmp_path):
+        client = PointwiseClient(self.SCORES)
+        evaluator = AutoEvaluator(client, score_cache=ScoreCache(tmp_path / "scores.sqlite3"))
+        results = [
+            evaluator.compare_pointwise("p", "strong", "weak", SAMPLE_RUBRIC, "judge")
+            for _ in range(5)
+        ]
+        assert client.calls == 2
+        assert [r["cached_scores"] for r in results] == [0, 2, 2, 2, 2]
+        assert all(r["preferred_response"] == "A" for r in results)
+
+    def test_close_scores_settled_by_tie_break(self):
+        client = PointwiseClient(self.SCORES)
+        result = AutoEvaluator(client).compare_pointwise(
+            "p", "strong", "close", SAMPLE_RUBRIC, "judge", tie_margin=1.0
+        )
+        assert result["tie_break"] and result["judge_calls"] == 3
+        assert result["preferred_response"] == "B"
+        assert "B is more concise." in result["justification"]
+
+    def test_incomplete_scores_retried_then_rejected(self, tmp_path):
+        cache = ScoreCache(tmp_path / "scores.sqlite3")
+        client = PointwiseClient(self.SCORES)
+        with pytest.raises(ValueError, match="no valid score for 'Clarity'"):
+            AutoEvaluator(client, score_cache=cache).score_response("p", "broken", SAMPLE_RUBRIC, "judge")
+        assert client.calls == 2
+        assert cache.stats()["entries"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Position-swapped judging
+# ---------------------------------------------------------------------------
+
+class OrderClient:
+    """Judge stand-in preferring "good" over "bad", or always the first response shown."""
+
+    def __init__(self, position_biased=False, delay=0.0):
+        self.position_biased = position_biased
+        self.delay = delay
+        self.shown_first = []
+        self.lock = threading.Lock()
+
+    def generate_completion(self, prompt, model, system_prompt="", **params):
+        time.sleep(self.delay)
+        first, second = re.search(r"## Response A\n\n(.*)\n\n## Response B\n\n(.*)$", prompt, re.S).groups()
+        with self.lock:
+            self.shown_first.append(first)
+        if self.position_biased:
+            scores = {first: 3, second: 2}
+        else:
+            scores = {"good": 3, "bad": 2}
+        dims = lambda response, clarity: {
+            "Accuracy": {"score": scores[response], "comment": f"{response} shown {'first' if response == first else 'second'}"},
+            "Clarity": {"score": clarity, "comment": "clr"},
+        }
+        data = {
+            # Clarity depends on the position, so one dimension never agrees across orders
+            "scores_a": dims(first, 3),
+            "scores_b": dims(second, 2),
+            "preferred_response": "A" if scores[first] >= scores[second] else "B",
+            "justification": f"{first} vs {second}",
+        }
+        return {"content": json.dumps(data), "model": model, "usage": {"prompt_tokens": 100}, "from_cache": False}
+
+
+class TestPositionSwap:
+    def setup_method(self):
+        reset_position_agreement_stats()
+
+    def test_consistent_preference_kept_and_scores_reconciled(self):
+        client = OrderClient()
+        result = AutoEvaluator(client).auto_evaluate("p", "bad", "good", SAMPLE_RUBRIC, "judge", swap_positions=True)
+        assert sorted(client.shown_first) == ["bad", "good"]
+        assert result["preferred_response"] == "B"
+        assert result["position_consistent"]
+        assert result["orderings"] == {"a_first": "B", "b_first": "B"}
+        assert result["justification"] == "bad vs good"
+        # Accuracy agrees across orders; Clarity flips with the position and keeps the lower score
+        assert result["scores_a"]["Accuracy"]["score"] == 2 and result["scores_b"]["Accuracy"]["score"] == 3
+        assert result["scores_a"]["Clarity"]["score"] == 2 and result["scores_b"]["Clarity"]["score"] == 2
+        assert result["position_agreement"] == 0.5
+        assert result["judge_usage"]["prompt_tokens"] == 200
+
+    def test_position_bias_flagged(self):
+        result = AutoEvaluator(OrderClient(position_biased=True)).auto_evaluate(
+            "p", "bad", "good", SAMPLE_RUBRIC, "judge", swap_positions=True
+        )
+        assert not result["position_consistent"]
+        assert result["orderings"] == {"a_first": "A", "b_first": "B"}
+        assert result["position_agreement"] == 0.0
+        assert result["justification"].startswith("⚠️ Position bias")
+        # Every dimension disagreed and took the lower score, so the scores tie and A is kept
+        assert {name: entry["score"] for name, entry in result["scores_a"].items()} == {"Accuracy": 2, "Clarity": 2}
+        assert {name: entry["score"] for name, entry in result["scores_b"].items()} == {"Accuracy": 2, "Clarity": 2}
+        assert result["preferred_response"] == "A"
+
+    def test_orders_run_concurrently(self):
+        started = time.monotonic()
+        AutoEvaluator(OrderClient(delay=0.3)).auto_evaluate(
+            "p", "bad", "good", SAMPLE_RUBRIC, "judge", swap_positions=True
+        )
+        assert time.monotonic() - started < 0.55
+
+    def test_agreement_stats_recorded(self):
+        evaluator = AutoEvaluator(OrderClient())
+        evaluator.auto_evaluate("p", "bad", "good", SAMPLE_RUBRIC, "judge", swap_positions=True)
+        AutoEvaluator(OrderClient(position_biased=True)).auto_evaluate(
+            "p", "bad", "good", SAMPLE_RUBRIC, "judge", swap_positions=True
+        )
+        evaluator.auto_evaluate("p", "bad", "good", SAMPLE_RUBRIC, "judge")
+        stats = position_agreement_stats()
+        assert stats == {"judgements": 2, "consistent": 1, "consistency_rate": 0.5, "score_agreement": 0.25}
+
+    def test_cannot_combine_with_sharded(self):
+        with pytest.raises(ValueError):
+            AutoEvaluator(OrderClient()).auto_evaluate(
+                "p", "bad", "good", SAMPLE_RUBRIC, "judge", sharded=True, swap_positions=True
+            )
+
+
+# ---------------------------------------------------------------------------
+# Judge ensemble
+# ---------------------------------------------------------------------------
+
+class EnsembleClient:
+    """Judge stand-in whose answer and speed depend on the judge model."""
+
+    def __init__(self, judges):
+        # model -> (delay, preferred_response, Accuracy score of A) or an exception;
+        # a preferred_response of None answers without any JSON
+        self.judges = judges
+        self.called = []
+        self.lock = threading.Lock()
+
+    def generate_completion(self, prompt, model, system_prompt="", **params):
+        with self.lock:
+            self.called.append(model)
+        judge = self.judges[model]
+        if isinstance(judge, Exception):
+            raise judge
+        delay, preferred, accuracy = judge
+        time.sleep(delay)
+        if preferred is None:
+            return {"content": "Still thinking.", "model": model, "usage": {}, "from_cache": False}
+        data = {
+            "scores_a": {"Accuracy": {"score": accuracy, "comment": model}, "Clarity": {"score": 3, "comment": model}},
+            "scores_b": {"Accuracy": {"score": 2, "comment": model}, "Clarity": {"score": 2, "comment": model}},
+            "preferred_response": preferred,
+            "justification": f"{model} prefers {preferred}.",
+        }
+        return {"content": json.dumps(data), "model": model, "usage": {"prompt_tokens": 100}, "from_cache": False}
+
+
+class TestEnsemble:
+    def evaluate(self, judges, **kwargs):
+        client = EnsembleClient(judges)
+        result = AutoEvaluator(client).evaluate_ensemble("p", "a", "b", SAMPLE_RUBRIC, list(judges), **kwargs)
+        return result, client
+
+    def test_quorum_stops_early(self):
+        started = time.monotonic()
+        result, _ = self.evaluate({"fast": (0.05, "A", 3), "quick": (0.1, "A", 3), "slow": (1.0, "B", 1)})
+        assert time.monotonic() - started < 0.5
+        assert result["early_stop"]
+        assert result["preferred_response"] == "A" and result["agreement"] == 1.0
+        by_model = {judge["model"]: judge for judge in result["judges"]}
+        assert by_model["slow"]["status"] == "cancelled" and by_model["slow"]["latency"] is None
+        assert by_model["fast"]["status"] == "ok" and 0.05 <= by_model["fast"]["latency"] < 0.5
+        assert [judge["model"] for judge in result["judges"]] == ["fast", "quick", "slow"]
+        assert result["judge_usage"]["prompt_tokens"] == 200
+
+    def test_quorum_stops_running_judges(self):
+        started = time.monotonic()
+        result, client = self.evaluate({"fast": (0.05, "A", 3), "quick": (0.1, "A", 3), "slow": (0.3, None, 3)})
+        assert time.monotonic() - started < 0.3
+        assert result["early_stop"]
+        # The slow judge was mid-call at the quorum; its unparseable answer is not retried
+        time.sleep(0.5)
+        assert client.called.count("slow") == 1
+
+    @pytest.mark.parametrize("mode", [{"swap_positions": True}, {"sharded": True, "dimensions_per_shard": 1}])
+    def test_cancel_stops_swapped_and_sharded_calls(self, mode):
+        # Each call cancels the evaluation and answers without JSON, so no retry may follow
+        cancel = threading.Event()
+        client = EnsembleClient({"judge": (0.0, None, 3)})
+        original = client.generate_completion
+
+        def generate_completion(*args, **kwargs):
+            cancel.set()
+            return original(*args, **kwargs)
+
+        client.generate_completion = generate_completion
+        with pytest.raises(JudgeCancelled):
+            AutoEvaluator(client).auto_evaluate("p", "a", "b", SAMPLE_RUBRIC, "judge", cancel=cancel, **mode)
+        time.sleep(0.1)
+        # At most the two concurrent first calls (orderings or shards) got out
+        assert 1 <= len(client.called) <= 2
+
+    def test_median_and_majority_aggregation(self):
+        judges = {"one": (0.0, "A", 1), "two": (0.0, "A", 3), "three": (0.0, "A", 3)}
+        median, _ = self.evaluate(judges, quorum=3)
+        assert median["scores_a"]["Accuracy"]["score"] == 3
+        assert not median["early_stop"]
+
+        judges = {"one": (0.0, "A", 1), "two": (0.0, "A", 2), "three": (0.0, "A", 3), "four": (0.0, "A", 3)}
+        median, _ = self.evaluate(judges, quorum=4)
+        majority, _ = self.evaluate(judges, quorum=4, aggregate="majority")
+        # Even-sized medians take the lower middle score
+        assert median["scores_a"]["Accuracy"]["score"] == 2
+        assert majority["scores_a"]["Accuracy"]["score"] == 3
+        assert majority["scores_a"]["Accuracy"]["comment"] in ("three", "four")
+        assert majority["score_agreement"] == (2 + 4 + 4 + 4) / 16
+
+    def test_split_vote_decided_by_aggregated_scores(self):
+        result, _ = self.evaluate({"left": (0.0, "A", 3), "right": (0.0, "B", 3)})
+        assert result["preferred_response"] == "A"
+        assert result["agreement"] == 0.5
+        assert "split" in result["justification"]
+
+    def test_failed_judge_tolerated(self):
+        result, _ = self.evaluate({"down": LLMRateLimitError("rate limited", "down"), "up": (0.0, "B", 2)}, quorum=2)
+        by_model = {judge["model"]: judge for judge in result["judges"]}
+        assert by_model["down"]["status"] == "error" and "rate limited" in by_model["down"]["error"]
+        assert result["preferred_response"] == "B"
+
+    def test_all_judges_failing_raises(self):
+        with pytest.raises(LLMRateLimitError):
+            self.evaluate({"down": LLMRateLimitError("rate limited", "down")})
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            self.evaluate({})
+        with pytest.raises(ValueError):
+            self.evaluate({"one": (0.0, "A", 3)}, aggregate="mean")
@@ -0,0 +1,314 @@
+"""
+Tests for BatchRunner — dataset loading, judging and resumable output.
+
+Tests cover:
+  - Rows with pre-generated responses are judged and written as JSONL
+  - Rows with models trigger generation first
+  - Failed rows are recorded and retried on the next run
+  - Already-judged rows are skipped after a restart
+  - Successful results are appended to the evaluation store
+  - Pointwise mode reuses cached scores across rows
+  - Position-swapped judging flags preferences that flip with the order
+  - Judge ensembles record every judge's status and feed the report's judge table
+  - Consolidated report has one section per row, preferring successful results
+  - Token bucket rate limiting, charging requests larger than the burst in full
+  - Every judge request, including repairs and retries, is rate limited
+"""
+
+import sys
+import os
+import json
+import time
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.batch_runner import BatchRunner, TokenBucket, load_rows, write_batch_report
+from utils.evaluation_store import EvaluationStore
+from utils.score_cache import ScoreCache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+SAMPLE_RUBRIC = {
+    "name": "Test Rubric",
+    "dimensions": [
+        {"name": "Accuracy", "weight": 5.0, "description": "Factual correctness"},
+        {"name": "Clarity", "weight": 5.0, "description": "Clear communication"},
+    ]
+}
+
+JUDGE_JSON = json.dumps({
+    "scores_a": {"Accuracy": {"score": 3, "comment": "ok"}, "Clarity": {"score": 3, "comment": "ok"}},
+    "scores_b": {"Accuracy": {"score": 1, "comment": "bad"}, "Clarity": {"score": 2, "comment": "meh"}},
+    "preferred_response": "A",
+    "justification": "A is better."
+})
+
+
+class StubClient:
+    """Minimal LLMClient stand-in returning canned judge output."""
+
+    def __init__(self, judge_output=JUDGE_JSON):
+        self.judge_output = judge_output
+        self.judge_calls = 0
+        self.generation_calls = 0
+
+    def generate_response(self, prompt, model, system_prompt="", **params):
+        self.judge_calls += 1
+        return self.judge_output
+
+    def generate_completion(self, prompt, model, system_prompt="", **params):
+        return {"content": self.generate_response(prompt, model, system_prompt, **params),
+                "model": model, "usage": {}, "from_cache": False}
+
+    def generate_dual_responses(self, prompt, model_a, model_b, **kwargs):
+        self.generation_calls += 1
+        return f"{model_a} says hi", f"{model_b} says hi"
+
+
+def write_dataset(path, rows):
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+
+
+def read_results(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+# ---------------------------------------------------------------------------
+# BatchRunner tests
+# ---------------------------------------------------------------------------
+
+class TestBatchRunner:
+    def test_judges_rows_with_responses(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [
+            {"id": "r1", "prompt": "p1", "response_a": "a1", "response_b": "b1"},
+            {"id": "r2", "prompt": "p2", "response_a": "a2", "response_b": "b2"},
+        ])
+        runner = BatchRunner(StubClient(), SAMPLE_RUBRIC, "judge", concurrency=2)
+        summary = runner.run(dataset, output)
+
+        assert summary == {"total": 2, "skipped": 0, "succeeded": 2, "failed": 0}
+        results = {r["row_id"]: r for r in read_results(output)}
+        assert set(results) == {"r1", "r2"}
+        assert results["r1"]["preferred_response"] == "A"
+        assert results["r1"]["final_score_a"] == 10.0
+
+    def test_generates_when_models_given(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [{"prompt": "p", "model_a": "m1", "model_b": "m2"}])
+        client = StubClient()
+        BatchRunner(client, SAMPLE_RUBRIC, "judge").run(dataset, output)
+
+        result = read_results(output)[0]
+        assert client.generation_calls == 1
+        assert result["status"] == "ok"
+        assert result["response_a"] == "m1 says hi"
+
+    def test_pointwise_reuses_cached_scores(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [
+            {"id": f"r{i}", "prompt": "p", "response_a": "shared", "response_b": f"b{i}"} for i in range(3)
+        ])
+        scores = {"Accuracy": {"score": 3, "comment": "ok"}, "Clarity": {"score": 2, "comment": "ok"}}
+        client = StubClient(json.dumps({"scores": scores, "summary": "fine"}))
+        runner = BatchRunner(
+            client, SAMPLE_RUBRIC, "judge", concurrency=1, requests_per_minute=60,
+            pointwise=True, score_cache=ScoreCache(tmp_path / "scores.sqlite3")
+        )
+        runner.rate_limiter = RecordingBucket()
+        assert runner.run(dataset, output)["succeeded"] == 3
+
+        results = read_results(output)
+        assert [r["cached_scores"] for r in results] == [0, 1, 1]
+        # Equal scores trigger a tie-break call per row; the shared response is scored once
+        assert client.judge_calls == 4 + 3
+        # Exactly the calls made are charged, tie-breaks included
+        assert runner.rate_limiter.taken == client.judge_calls
+
+    def test_swap_positions_flags_position_bias(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [{"id": "r1", "prompt": "p", "response_a": "a", "response_b": "b"}])
+
+        # The stub judge always prefers whichever response is shown first
+        client = StubClient()
+        runner = BatchRunner(client, SAMPLE_RUBRIC, "judge", swap_positions=True, requests_per_minute=60)
+        runner.rate_limiter = RecordingBucket()
+        assert runner.run(dataset, output)["succeeded"] == 1
+        assert client.judge_calls == runner.rate_limiter.taken == 2
+
+        result = read_results(output)[0]
+        assert result["position_consistent"] is False
+        assert result["orderings"] == {"a_first": "A", "b_first": "B"}
+        report = write_batch_report(output, tmp_path / "report.md", SAMPLE_RUBRIC, "judge").read_text(encoding="utf-8")
+        assert "Preference flipped when swapped" in report
+        assert "**Position-Consistent:** 0 / 1 (0%)" in report
+
+    def test_ensemble_records_judges(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [{"id": "r1", "prompt": "p", "response_a": "a", "response_b": "b"}])
+
+        runner = BatchRunner(StubClient(), SAMPLE_RUBRIC, "j1", ensemble=["j1", "j2", "j3"])
+        assert runner.run(dataset, output)["succeeded"] == 1
+
+        result = read_results(output)[0]
+        assert result["judge_model"] == "j1, j2, j3"
+        assert [judge["model"] for judge in result["judges"]] == ["j1", "j2", "j3"]
+        # Every judge agrees, so at least a quorum answered and preferred A
+        assert sum(judge["status"] == "ok" for judge in result["judges"]) >= 2
+        assert result["preferred_response"] == "A" and result["agreement"] == 1.0
+        report = write_batch_report(output, tmp_path / "report.md", SAMPLE_RUBRIC, "j1, j2, j3").read_text(encoding="utf-8")
+        assert "### Judge Ensemble" in report and "| `j1` |" in report
+
+    def test_failed_rows_are_recorded_and_retried(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [{"id": "r1", "prompt": "p", "response_a": "a", "response_b": "b"}])
+
+        summary = BatchRunner(StubClient("not json"), SAMPLE_RUBRIC, "judge").run(dataset, output)
+        assert summary["failed"] == 1
+        assert read_results(output)[0]["status"] == "error"
+
+        summary = BatchRunner(StubClient(), SAMPLE_RUBRIC, "judge").run(dataset, output)
+        assert summary["succeeded"] == 1
+        assert [r["status"] for r in read_results(output)] == ["error", "ok"]
+
+    def test_resume_skips_completed_rows(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [
+            {"prompt": "p1", "response_a": "a1", "response_b": "b1"},
+            {"prompt": "p2", "response_a": "a2", "response_b": "b2"},
+        ])
+        BatchRunner(StubClient(), SAMPLE_RUBRIC, "judge").run(dataset, output)
+        # Simulate a crash mid-write of a further line
+        with open(output, "a", encoding="utf-8") as f:
+            f.write('{"row_id": "trunc')
+
+        client = StubClient()
+        summary = BatchRunner(client, SAMPLE_RUBRIC, "judge").run(dataset, output)
+        assert summary["skipped"] == 2
+        assert client.judge_calls == 0
+
+    def test_row_ids_are_stable(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        write_dataset(dataset, [{"prompt": "p1", "response_a": "a", "response_b": "b"}])
+        first = [r["row_id"] for r in load_rows(dataset)]
+        second = [r["row_id"] for r in load_rows(dataset)]
+        assert first == second
+
+    def test_results_recorded_in_store(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        write_dataset(dataset, [{"id": "r1", "prompt": "p", "model_a": "m1", "model_b": "m2"}])
+        store = EvaluationStore(tmp_path / "store.sqlite3")
+        BatchRunner(StubClient("not json"), SAMPLE_RUBRIC, "judge", store=store).run(dataset, tmp_path / "out.jsonl")
+        assert store.query() == []
+
+        BatchRunner(StubClient(), SAMPLE_RUBRIC, "judge", store=store).run(dataset, tmp_path / "out.jsonl")
+        records = store.query()
+        assert len(records) == 1
+        assert records[0]["mode"] == "batch"
+        assert records[0]["model_a"] == "m1" and records[0]["final_score_a"] == 10.0
+        store.close()
+
+    def test_consolidated_report(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [
+            {"id": "r1", "prompt": "p1", "response_a": "a1", "response_b": "b1"},
+            {"id": "r2", "prompt": "p2", "response_a": "a2", "response_b": "b2"},
+        ])
+        BatchRunner(StubClient("not json"), SAMPLE_RUBRIC, "judge").run(dataset, output)
+        BatchRunner(StubClient(), SAMPLE_RUBRIC, "judge").run(dataset, output)
+        assert len(read_results(output)) == 4
+
+        report = write_batch_report(output, tmp_path / "report.md", SAMPLE_RUBRIC, "judge").read_text(encoding="utf-8")
+        assert report.count("## Pair ") == 2
+        assert "Failed" not in report.split("## Summary")[0]
+        assert "- **Judged:** 2" in report
+        assert "- **Preferred A / B:** 2 / 0" in report
+
+
+class RecordingBucket:
+    """Rate limiter stand-in counting the tokens taken."""
+
+    def __init__(self):
+        self.taken = 0
+
+    def acquire(self, tokens=1.0):
+        self.taken += tokens
+
+
+class TestRateLimit:
+    def test_repair_and_retry_calls_are_throttled(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [{"id": "r1", "prompt": "p", "response_a": "a", "response_b": "b"}])
+
+        client = StubClient()
+        outputs = iter(["no json here", JUDGE_JSON])
+        client.generate_response = lambda *args, **kwargs: next(outputs)
+        runner = BatchRunner(client, SAMPLE_RUBRIC, "judge", requests_per_minute=60)
+        runner.rate_limiter = RecordingBucket()
+        assert runner.run(dataset, output)["succeeded"] == 1
+        # The unparseable answer is followed by a full retry; both are charged
+        assert runner.rate_limiter.taken == 2
+
+    def test_sharded_batch_respects_rate(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [
+            {"id": f"r{i}", "prompt": "p", "response_a": "a", "response_b": "b"} for i in range(4)
+        ])
+
+        runner = BatchRunner(StubClient(), SAMPLE_RUBRIC, "judge", concurrency=4, sharded=True, requests_per_minute=60)
+        runner.rate_limiter = RecordingBucket()
+        assert runner.run(dataset, output)["succeeded"] == 4
+        # One call per dimension per row, each charged once
+        assert runner.rate_limiter.taken == 4 * len(SAMPLE_RUBRIC["dimensions"])
+
+        runner = BatchRunner(StubClient(), SAMPLE_RUBRIC, "judge", concurrency=4, sharded=True, requests_per_minute=60)
+        runner.rate_limiter = TokenBucket(rate=50.0, capacity=1)
+        started = time.monotonic()
+        assert runner.run(dataset, tmp_path / "out2.jsonl")["succeeded"] == 4
+        # 8 calls at 50/s with a burst of one
+        assert time.monotonic() - started >= 7 / 50 - 0.01
+
+
+    def test_ensemble_charges_each_judge_call(self, tmp_path):
+        dataset = tmp_path / "in.jsonl"
+        output = tmp_path / "out.jsonl"
+        write_dataset(dataset, [{"id": "r1", "prompt": "p", "response_a": "a", "response_b": "b"}])
+
+        client = StubClient()
+        runner = BatchRunner(client, SAMPLE_RUBRIC, "j1", ensemble=["j1", "j2", "j3"], requests_per_minute=60)
+        runner.rate_limiter = RecordingBucket()
+        assert runner.run(dataset, output)["succeeded"] == 1
+        # A judge abandoned by the quorum may still be finishing its call
+        time.sleep(0.1)
+        assert runner.rate_limiter.taken == client.judge_calls
+
+
+class TestTokenBucket:
+    def test_large_request_charged_in_full(self):
+        bucket = TokenBucket(rate=20.0, capacity=2)
+        started = time.monotonic()
+        bucket.acquire(6)
+        # Two tokens are available immediately, the other four take ~0.2s
+        assert time.monotonic() - started >= 0.18
+
+    def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=20.0, capacity=2)
+        started = time.monotonic()
+        for _ in range(4):
+            bucket.acquire()
+        # Two tokens are available immediately, the next two take ~0.1s
+        assert time.monotonic() - started >= 0.08
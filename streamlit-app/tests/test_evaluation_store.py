@@ -0,0 +1,177 @@
+"""
+Tests for EvaluationStore — append-only SQLite store of evaluations.
+
+Tests cover:
+  - Records round-trip with decoded params, scores and timings
+  - Filtering by model, rubric (name or hash), time range and mode
+  - Per-model summaries across both sides, with per-dimension averages
+  - Pairwise comparisons for rating aggregation, incremental by id
+  - Background writes via submit/flush
+  - Updating a stored rating's scores and preference
+  - Rubric hash is the content fingerprint: descriptions and weights both count
+"""
+
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.evaluation_store import EvaluationStore
+from utils.rubric_parser import rubric_fingerprint
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+CODING = {
+    "name": "Coding",
+    "dimensions": [
+        {"name": "Accuracy", "weight": 5.0, "description": "Factual correctness"},
+        {"name": "Clarity", "weight": 5.0, "description": "Clear communication"},
+    ]
+}
+
+WRITING = {
+    "name": "Writing",
+    "dimensions": [{"name": "Style", "weight": 1.0, "description": "Prose quality"}]
+}
+
+
+def make_record(model_a="m1", model_b="m2", rubric=CODING, preferred="A", created_at=None, **extra):
+    names = [dim["name"] for dim in rubric["dimensions"]]
+    return {
+        "mode": "auto",
+        "prompt": "Explain recursion",
+        "model_a": model_a,
+        "model_b": model_b,
+        "params_a": {"temperature": 0.7},
+        "params_b": {"temperature": 1.0},
+        "rubric": rubric,
+        "judge_model": "judge",
+        "scores_a": {name: {"score": 3, "comment": ""} for name in names},
+        "scores_b": {name: {"score": 1, "comment": "bad"} for name in names},
+        "final_score_a": 10.0,
+        "final_score_b": 5.0,
+        "preferred_response": preferred,
+        "timings": {"judge": 1.5},
+        "created_at": created_at,
+        **extra,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EvaluationStore(tmp_path / "evaluations.sqlite3")
+    yield store
+    store.close()
+
+
+# ---------------------------------------------------------------------------
+# EvaluationStore tests
+# ---------------------------------------------------------------------------
+
+class TestEvaluationStore:
+    def test_round_trip(self, store):
+        evaluation_id = store.add(make_record())
+        [record] = store.query()
+        assert record["id"] == evaluation_id
+        assert record["params_a"] == {"temperature": 0.7}
+        assert record["scores_b"]["Accuracy"] == {"score": 1, "comment": "bad"}
+        assert record["timings"] == {"judge": 1.5}
+        assert record["rubric_name"] == "Coding"
+        assert record["rubric_hash"] == rubric_fingerprint(CODING)
+
+    def test_update_revises_manual_rating(self, store):
+        evaluation_id = store.add(make_record(mode="manual", preferred=None))
+        assert store.comparisons()[0]["outcome"] == 1.0
+
+        store.update(evaluation_id, {
+            "preferred_response": "B",
+            "justification": "B explains it better",
+            "scores_a": {"Accuracy": {"score": 1, "comment": "wrong"}, "Clarity": {"score": 1, "comment": ""}},
+        })
+        [record] = store.query()
+        assert record["preferred_response"] == "B" and record["justification"] == "B explains it better"
+        assert record["scores_a"]["Accuracy"] == {"score": 1, "comment": "wrong"}
+        assert store.comparisons()[0]["outcome"] == 0.0
+        assert store.model_summary("m1")["dimensions"] == {"Accuracy": 1.0, "Clarity": 1.0}
+
+        with pytest.raises(ValueError):
+            store.update(evaluation_id, {"model_a": "other"})
+        with pytest.raises(KeyError):
+            store.update(evaluation_id + 1, {"preferred_response": "A"})
+
+    def test_rejects_unknown_mode(self, store):
+        with pytest.raises(ValueError):
+            store.add(make_record(mode="guess"))
+
+    def test_filters(self, store):
+        store.add(make_record(created_at=datetime(2026, 9, 20)))
+        store.add(make_record(model_a="m3", created_at=datetime(2026, 10, 2)))
+        store.add(make_record(rubric=WRITING, created_at=datetime(2026, 10, 5), mode="manual"))
+
+        assert len(store.query(model="m2")) == 3
+        assert len(store.query(model="m3")) == 1
+        assert len(store.query(rubric="Coding")) == 2
+        assert len(store.query(rubric=rubric_fingerprint(WRITING))) == 1
+        assert len(store.query(since=datetime(2026, 10, 1))) == 2
+        assert len(store.query(until=datetime(2026, 10, 1))) == 1
+        assert len(store.query(mode="manual")) == 1
+        newest = store.query(limit=1)
+        assert newest[0]["rubric_name"] == "Writing"
+
+    def test_model_summary(self, store):
+        store.add(make_record(model_a="x", model_b="y", preferred="A"))
+        store.add(make_record(model_a="y", model_b="x", preferred="A"))
+        store.add(make_record(model_a="x", model_b="y", rubric=WRITING))
+
+        summary = store.model_summary("x", rubric="Coding")
+        assert summary["evaluations"] == 2
+        assert summary["wins"] == 1
+        assert summary["win_rate"] == 0.5
+        assert summary["average_score"] == 7.5
+        assert summary["dimensions"] == {"Accuracy": 2.0, "Clarity": 2.0}
+
+        assert store.model_summary("nobody")["win_rate"] is None
+
+    def test_comparisons(self, store):
+        first = store.add(make_record(preferred="B"))
+        store.add(make_record(model_b="m1"))
+        store.add(make_record(preferred=None, mode="manual", final_score_b=10.0))
+        store.add(make_record(rubric=WRITING))
+
+        outcomes = [(c["model_a"], c["model_b"], c["outcome"]) for c in store.comparisons(rubric="Coding")]
+        assert outcomes == [("m1", "m2", 0.0), ("m1", "m2", 0.5)]
+        assert len(store.comparisons(after_id=first)) == 2
+
+        rubrics = store.rubrics()
+        assert [(r["name"], r["evaluations"]) for r in rubrics] == [("Coding", 3), ("Writing", 1)]
+
+    def test_submit_writes_in_background(self, store):
+        for _ in range(5):
+            store.submit(make_record())
+        store.flush()
+        assert store.stats() == {"evaluations": 5, "models": 2}
+        assert store.errors == []
+
+    def test_submit_collects_errors(self, store):
+        store.submit(make_record(mode="guess"))
+        store.flush()
+        assert len(store.errors) == 1
+        assert store.query() == []
+
+
+class TestRubricHash:
+    def test_changes_with_descriptions(self):
+        # The judge sees the descriptions, so editing them starts a new rubric version
+        edited = {**CODING, "dimensions": [{**d, "description": "changed"} for d in CODING["dimensions"]]}
+        assert rubric_fingerprint(edited) != rubric_fingerprint(CODING)
+
+    def test_changes_with_weights(self):
+        edited = {**CODING, "dimensions": [{**d, "weight": 1.0} for d in CODING["dimensions"]]}
+        assert rubric_fingerprint(edited) != rubric_fingerprint(CODING)
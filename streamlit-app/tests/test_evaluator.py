@@ -0,0 +1,113 @@
+"""
+Tests for Evaluator — weighted scoring, single and batched.
+
+Tests cover:
+  - calculate_score / format_results on the default 3/2/1 -> 10/9/5 mapping
+  - Per-rubric score_map overrides
+  - batch_score matches calculate_score row by row, including missing dimensions
+  - Weight-vector overrides for re-scoring
+  - compare_batch win/loss/tie vectors
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.evaluator import Evaluator
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+SAMPLE_RUBRIC = {
+    "name": "Test Rubric",
+    "dimensions": [
+        {"name": "Accuracy", "weight": 5.0, "description": "Factual correctness"},
+        {"name": "Clarity", "weight": 3.0, "description": "Clear communication"},
+        {"name": "Style", "weight": 2.0, "description": "Tone and polish"},
+    ]
+}
+
+
+def ratings(accuracy=None, clarity=None, style=None):
+    data = {}
+    for name, score in (("Accuracy", accuracy), ("Clarity", clarity), ("Style", style)):
+        if score is not None:
+            data[name] = {"score": score, "comment": ""}
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Single-evaluation scoring
+# ---------------------------------------------------------------------------
+
+class TestCalculateScore:
+    def test_all_no_issues(self):
+        assert Evaluator().calculate_score(SAMPLE_RUBRIC, ratings(3, 3, 3)) == 10.0
+
+    def test_default_mapping(self):
+        # (5*9 + 3*5 + 2*10) / 10
+        assert Evaluator().calculate_score(SAMPLE_RUBRIC, ratings(2, 1, 3)) == pytest.approx(8.0)
+
+    def test_missing_dimensions_excluded(self):
+        assert Evaluator().calculate_score(SAMPLE_RUBRIC, ratings(accuracy=2)) == 9.0
+        assert Evaluator().calculate_score(SAMPLE_RUBRIC, {}) == 0.0
+
+    def test_rubric_score_map(self):
+        rubric = {**SAMPLE_RUBRIC, "score_map": {"3": 10, "2": 5, "1": 0}}
+        assert Evaluator().calculate_score(rubric, ratings(2, 1, 3)) == pytest.approx(4.5)
+
+    def test_format_results_details(self):
+        result = Evaluator().format_results(SAMPLE_RUBRIC, ratings(3, 2))
+        details = {d["dimension"]: d for d in result["details"]}
+        assert details["Accuracy"]["score_label"] == "No Issues"
+        assert details["Clarity"]["weighted_score"] == 27.0
+        assert details["Style"]["score_label"] == "Unknown"
+        assert details["Style"]["weighted_score"] == 0.0
+
+
+# ---------------------------------------------------------------------------
+# Batched scoring
+# ---------------------------------------------------------------------------
+
+class TestBatchScore:
+    def test_matches_calculate_score(self):
+        evaluator = Evaluator()
+        rng = np.random.default_rng(0)
+        records = []
+        for row in rng.integers(0, 4, size=(200, 3)):
+            # 0 stands for "dimension not rated"
+            records.append(ratings(*[int(v) if v else None for v in row]))
+
+        result = evaluator.batch_score(SAMPLE_RUBRIC, records)
+        expected = [evaluator.calculate_score(SAMPLE_RUBRIC, r) for r in records]
+        np.testing.assert_allclose(result["final_scores"], expected)
+
+    def test_contributions_sum_to_final(self):
+        matrix = np.array([[3, 2, 1], [1, np.nan, 3]], dtype=float)
+        result = Evaluator().batch_score(SAMPLE_RUBRIC, matrix)
+        np.testing.assert_allclose(result["contributions"].sum(axis=1), result["final_scores"])
+        assert result["contributions"][1, 1] == 0.0
+
+    def test_weight_override(self):
+        matrix = np.array([[3, 1, 1]], dtype=float)
+        result = Evaluator().batch_score(SAMPLE_RUBRIC, matrix, weights=[1, 0, 0])
+        assert result["final_scores"][0] == 10.0
+
+    def test_weight_shape_checked(self):
+        with pytest.raises(ValueError, match="Expected 3 weights"):
+            Evaluator().batch_score(SAMPLE_RUBRIC, np.ones((1, 3)), weights=[1, 2])
+
+    def test_compare_batch_outcomes(self):
+        scores_a = np.array([[3, 3, 3], [1, 1, 1], [2, 2, 2]], dtype=float)
+        scores_b = np.array([[2, 2, 2], [3, 3, 3], [2, 2, 2]], dtype=float)
+        result = Evaluator().compare_batch(SAMPLE_RUBRIC, scores_a, scores_b)
+        assert result["outcome"].tolist() == [1, -1, 0]
+        assert result["a_wins"].tolist() == [True, False, False]
+        assert result["ties"].tolist() == [False, False, True]
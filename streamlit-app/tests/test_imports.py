@@ -0,0 +1,49 @@
+"""
+Tests for the Streamlit-free, lazily importing evaluation core.
+
+Tests cover:
+  - Importing the core modules loads no UI package and no heavy dependency
+  - Package-level exports resolve lazily
+  - config reads .env only when an environment setting is accessed
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+APP_DIR = os.path.join(os.path.dirname(__file__), '..')
+
+CORE_MODULES = [
+    "utils.llm_client", "utils.rubric_parser", "utils.evaluator",
+    "utils.auto_evaluator", "utils.report_generator", "utils.batch_runner",
+]
+DEFERRED = ["streamlit", "streamlit_shadcn_ui", "openai", "requests", "numpy", "pandas", "yaml", "dotenv"]
+
+
+def loaded_after(code):
+    """Run ``code`` in a fresh interpreter; returns which deferred packages it loaded."""
+    probe = f"import json, sys\n{code}\nprint(json.dumps([m for m in {DEFERRED!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=APP_DIR, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestLazyImports:
+    def test_core_imports_nothing_heavy(self):
+        assert loaded_after("\n".join(f"import {module}" for module in CORE_MODULES)) == []
+
+    def test_package_exports_are_lazy(self):
+        assert loaded_after("import utils") == []
+        assert loaded_after("from utils import AutoEvaluator, Evaluator") == []
+
+    def test_batch_scoring_loads_numpy_on_use(self):
+        code = (
+            "from utils.evaluator import Evaluator\n"
+            "rubric = {'dimensions': [{'name': 'x', 'weight': 1.0}]}\n"
+            "Evaluator().batch_score(rubric, [{'x': 3}])"
+        )
+        assert loaded_after(code) == ["numpy"]
+
+    def test_config_loads_env_on_access(self):
+        assert loaded_after("import config") == []
+        assert loaded_after("import config; config.OPENROUTER_API_KEY") == ["dotenv"]
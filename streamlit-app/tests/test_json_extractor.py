@@ -0,0 +1,87 @@
+"""
+Tests for the single-pass streaming JSON object extractor.
+
+Tests cover:
+  - First balanced top-level object, ignoring surrounding prose
+  - Braces in prose and in non-JSON code fences are skipped
+  - Code fences inside JSON strings do not confuse extraction
+  - Trailing commas dropped outside strings only; control characters dropped
+  - Feeding in chunks of any size gives the same result as one shot
+  - Streams are closed as soon as the object is complete
+"""
+
+import sys
+import os
+import json
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.json_extractor import JsonObjectExtractor, extract_json, extract_json_from_chunks
+
+
+JUDGEMENT = {
+    "scores_a": {"Correctness": {"score": 2, "comment": "Uses ```python\nd = {}\n``` which fails on {edge} cases"}},
+    "preferred_response": "B",
+    "justification": "B handles {} and [] inputs, trailing text like ,} stays intact"
+}
+
+
+class TestExtractJson:
+    def test_object_between_prose(self):
+        text = f"Here is my evaluation:\n{json.dumps(JUDGEMENT)}\nHope this helps {{really}}."
+        assert json.loads(extract_json(text)) == JUDGEMENT
+
+    def test_fenced_code_inside_strings(self):
+        text = f"```json\n{json.dumps(JUDGEMENT, indent=2)}\n```"
+        assert json.loads(extract_json(text)) == JUDGEMENT
+
+    def test_non_json_fence_before_object_skipped(self):
+        text = 'Example:\n```python\nconfig = {"debug": True}\n```\nResult:\n{"ok": true}'
+        assert json.loads(extract_json(text)) == {"ok": True}
+
+    def test_prose_braces_skipped(self):
+        assert extract_json('Use {name} placeholders. {"a": 1}') == '{"a": 1}'
+
+    def test_cleaning(self):
+        assert extract_json('\ufeff{"a": [1, 2,], "b": "x\x01y",\n}') == '{"a": [1, 2], "b": "xy"\n}'
+        assert extract_json('{"a": "keep ,} and ,]"}') == '{"a": "keep ,} and ,]"}'
+
+    def test_clean_json_unchanged(self):
+        text = json.dumps(JUDGEMENT, indent=4)
+        assert extract_json(text) == text
+
+    def test_no_object(self):
+        assert extract_json("  nothing to see  ") == "nothing to see"
+
+    def test_unterminated_object_returned(self):
+        assert extract_json('Result: {"a": [1, 2') == '{"a": [1, 2'
+
+
+class TestStreaming:
+    def test_any_chunking_matches_one_shot(self):
+        text = f"Sure!\n```json\n{json.dumps(JUDGEMENT, indent=2)}\n```\nDone."
+        expected = extract_json(text)
+        for size in (1, 2, 3, 5, 16, 64):
+            extractor = JsonObjectExtractor()
+            for i in range(0, len(text), size):
+                extractor.feed(text[i:i + size])
+            assert extractor.finish() == expected, size
+
+    def test_result_available_at_closing_brace(self):
+        extractor = JsonObjectExtractor()
+        assert extractor.feed('{"a": {"b": 1}') is None
+        assert extractor.feed('}') == '{"a": {"b": 1}}'
+        assert extractor.done
+        assert extractor.feed(" and more") == '{"a": {"b": 1}}'
+
+    def test_stream_closed_early(self):
+        consumed = []
+
+        def chunks():
+            for chunk in ['{"a"', ': 1}', " trailing", " commentary"]:
+                consumed.append(chunk)
+                yield chunk
+
+        assert extract_json_from_chunks(chunks()) == '{"a": 1}'
+        assert consumed == ['{"a"', ': 1}']
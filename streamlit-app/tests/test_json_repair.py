@@ -0,0 +1,87 @@
+"""
+Tests for the tolerant JSON repair used on judge output.
+
+Tests cover:
+  - Valid JSON passes through unchanged
+  - Single quotes, unquoted keys and Python literals
+  - Unescaped quotes and raw newlines inside strings
+  - Trailing, doubled and missing commas
+  - Truncated output (open strings, dangling keys, unclosed containers)
+  - Surrounding prose and code fences are ignored
+  - Text without any JSON raises ValueError
+"""
+
+import sys
+import os
+import json
+import pytest
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.json_repair import loads_tolerant, repair_json
+
+
+def repaired(text):
+    return json.loads(repair_json(text))
+
+
+class TestRepairJson:
+    def test_valid_json_unchanged(self):
+        text = '{"a": [1, 2.5, -3], "b": {"c": "x, y: z"}, "d": null}'
+        assert repaired(text) == json.loads(text)
+
+    def test_single_quotes_and_python_literals(self):
+        assert repaired("{'a': 'it is', 'b': True, 'c': None, 'd': False}") == {
+            "a": "it is", "b": True, "c": None, "d": False
+        }
+
+    def test_apostrophe_inside_single_quoted_string(self):
+        assert repaired("{'comment': 'the model's answer'}") == {"comment": "the model's answer"}
+
+    def test_unquoted_keys(self):
+        assert repaired('{score: 3, comment: "ok"}') == {"score": 3, "comment": "ok"}
+
+    def test_unescaped_inner_quotes(self):
+        assert repaired('{"comment": "uses "print" instead of logging", "score": 2}') == {
+            "comment": 'uses "print" instead of logging', "score": 2
+        }
+
+    def test_unescaped_quote_before_comma(self):
+        assert repaired('{"comment": "calls it "fast", which is wrong", "score": 1}') == {
+            "comment": 'calls it "fast", which is wrong', "score": 1
+        }
+
+    def test_raw_newlines_and_invalid_escapes(self):
+        assert repaired('{"a": "line1\nline2", "path": "C:\\dir"}') == {"a": "line1\nline2", "path": "C:\\dir"}
+
+    def test_comma_problems(self):
+        assert repaired('{"a": [1, 2,, 3,], "b": 1 "c": 2,}') == {"a": [1, 2, 3], "b": 1, "c": 2}
+
+    def test_truncated_inside_string(self):
+        text = '{"scores_a": {"X": {"score": 3, "comment": "good"}}, "justification": "A is bet'
+        assert repaired(text) == {"scores_a": {"X": {"score": 3, "comment": "good"}}, "justification": "A is bet"}
+
+    def test_truncated_dangling_key(self):
+        assert repaired('{"a": 1, "b": {"score": 2, "comm') == {"a": 1, "b": {"score": 2}}
+        assert repaired('{"a": 1, "b":') == {"a": 1}
+
+    def test_surrounding_text_ignored(self):
+        text = 'Here you go:\n```json\n{"a": 1}\n```\nLet me know {if} you need more.'
+        assert repaired(text) == {"a": 1}
+
+    def test_no_json_raises(self):
+        with pytest.raises(ValueError, match="No JSON"):
+            repair_json("I cannot evaluate these responses.")
+
+
+class TestLoadsTolerant:
+    def test_strict_json_fast_path(self):
+        assert loads_tolerant('{"a": 1}') == {"a": 1}
+
+    def test_repairs_when_needed(self):
+        assert loads_tolerant("{'a': True,}") == {"a": True}
+
+    def test_unrepairable_raises(self):
+        with pytest.raises(ValueError):
+            loads_tolerant("no json here")
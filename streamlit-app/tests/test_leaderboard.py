@@ -0,0 +1,180 @@
+"""
+Tests for the leaderboard aggregation engine.
+
+Tests cover:
+  - Elo updates, single and batched across replicates
+  - Bradley-Terry recovers the strength ordering and handles undefeated models
+  - Incremental updates match a fit over the full history
+  - Bootstrap intervals bracket the point estimates
+  - Snapshots round-trip and only new judgements are folded in from the store
+  - Bootstrap intervals are cached until the judgement count grows or a model is added
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.evaluation_store import EvaluationStore
+from utils.leaderboard import (
+    INITIAL_RATING, Leaderboard, elo_update, fit_bradley_terry, refresh_leaderboard
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def comparisons(model_a, model_b, outcome, n):
+    return [{"model_a": model_a, "model_b": model_b, "outcome": outcome}] * n
+
+
+HISTORY = (
+    comparisons("strong", "medium", 1.0, 8) + comparisons("medium", "strong", 1.0, 2)
+    + comparisons("medium", "weak", 1.0, 7) + comparisons("weak", "medium", 1.0, 3)
+    + comparisons("strong", "weak", 1.0, 9) + comparisons("strong", "weak", 0.5, 2)
+)
+
+
+# ---------------------------------------------------------------------------
+# Rating function tests
+# ---------------------------------------------------------------------------
+
+class TestElo:
+    def test_single_update(self):
+        ratings = np.full(2, INITIAL_RATING)
+        elo_update(ratings, [0], [1], [1.0], k_factor=16)
+        assert ratings.tolist() == [INITIAL_RATING + 8, INITIAL_RATING - 8]
+
+    def test_tie_between_equals_changes_nothing(self):
+        ratings = np.full(2, INITIAL_RATING)
+        elo_update(ratings, [0, 1], [1, 0], [0.5, 0.5])
+        assert np.allclose(ratings, INITIAL_RATING)
+
+    def test_batched_replicates_match_single_runs(self):
+        model_a = np.array([[0, 1, 2], [2, 2, 0]])
+        model_b = np.array([[1, 2, 0], [1, 0, 1]])
+        outcomes = np.array([[1.0, 0.0, 0.5], [1.0, 1.0, 0.0]])
+        batched = elo_update(np.full((2, 3), INITIAL_RATING), model_a, model_b, outcomes)
+        for row in range(2):
+            single = elo_update(np.full(3, INITIAL_RATING), model_a[row], model_b[row], outcomes[row])
+            assert np.allclose(batched[row], single)
+
+
+class TestBradleyTerry:
+    def test_recovers_ordering(self):
+        wins = np.array([[0, 8, 9], [2, 0, 7], [1, 3, 0]], dtype=float)
+        strengths = fit_bradley_terry(wins, prior=0.0)
+        assert strengths[0] > strengths[1] > strengths[2]
+        assert np.isclose(np.exp(np.log(strengths).mean()), 1.0)
+
+    def test_undefeated_model_stays_finite(self):
+        wins = np.array([[0, 5], [0, 0]], dtype=float)
+        strengths = fit_bradley_terry(wins)
+        assert np.all(np.isfinite(strengths))
+        assert strengths[0] > strengths[1]
+
+    def test_batched_fit_matches_single(self):
+        wins = np.array([[[0, 3], [1, 0]], [[0, 1], [4, 0]]], dtype=float)
+        batched = fit_bradley_terry(wins)
+        for row in range(2):
+            assert np.allclose(batched[row], fit_bradley_terry(wins[row]), atol=1e-6)
+
+
+# ---------------------------------------------------------------------------
+# Leaderboard tests
+# ---------------------------------------------------------------------------
+
+class TestLeaderboard:
+    def test_table_ranks_models(self):
+        leaderboard = Leaderboard()
+        assert leaderboard.add_comparisons(HISTORY) == len(HISTORY)
+        table = leaderboard.table()
+        assert [row["model"] for row in table] == ["strong", "medium", "weak"]
+        strong = table[0]
+        assert (strong["wins"], strong["losses"], strong["ties"]) == (17, 2, 2)
+        assert strong["elo"] > INITIAL_RATING
+        assert strong["bradley_terry_low"] is None
+
+    def test_skips_self_comparisons(self):
+        leaderboard = Leaderboard()
+        assert leaderboard.add_comparisons(comparisons("m", "m", 1.0, 3)) == 0
+        assert leaderboard.models == []
+
+    def test_incremental_matches_full_fit(self):
+        incremental = Leaderboard()
+        for start in range(0, len(HISTORY), 7):
+            incremental.add_comparisons(HISTORY[start:start + 7])
+        full = Leaderboard()
+        full.add_comparisons(HISTORY)
+        assert np.allclose(incremental.elo, full.elo)
+        assert np.allclose(incremental.strengths, full.strengths, rtol=1e-5)
+
+    def test_bootstrap_intervals(self):
+        leaderboard = Leaderboard()
+        leaderboard.add_comparisons(HISTORY)
+        leaderboard.bootstrap(samples=100, seed=0)
+        for row in leaderboard.table():
+            assert row["bradley_terry_low"] <= row["bradley_terry"] <= row["bradley_terry_high"]
+            assert row["elo_low"] < row["elo_high"]
+
+    def test_snapshot_round_trip(self, tmp_path):
+        leaderboard = Leaderboard()
+        leaderboard.add_comparisons(HISTORY)
+        leaderboard.bootstrap(samples=20, seed=0)
+        restored = Leaderboard.load(leaderboard.save(tmp_path / "all.json"))
+        assert restored.table() == leaderboard.table()
+        assert Leaderboard.load(tmp_path / "missing.json") is None
+
+
+class TestRefreshLeaderboard:
+    def test_folds_in_only_new_judgements(self, tmp_path):
+        store = EvaluationStore(tmp_path / "store.sqlite3")
+        rubric = {"name": "R", "dimensions": [{"name": "D", "weight": 1.0}]}
+        base = {"mode": "auto", "prompt": "p", "rubric": rubric, "scores_a": {}, "scores_b": {}}
+        store.add({**base, "model_a": "x", "model_b": "y", "preferred_response": "A"})
+        store.add({**base, "model_a": "x", "model_b": "x", "preferred_response": "A"})
+        store.add({**base, "model_a": "y", "model_b": "x", "final_score_a": 9.0, "final_score_b": 9.0})
+
+        path = tmp_path / "all.json"
+        leaderboard = refresh_leaderboard(store, path, samples=10)
+        assert leaderboard.judgements == 2
+        assert leaderboard.intervals
+
+        store.add({**base, "model_a": "y", "model_b": "x", "preferred_response": "B"})
+        leaderboard = refresh_leaderboard(store, path, samples=10)
+        assert leaderboard.judgements == 3
+        assert Leaderboard.load(path).last_id == 4
+        store.close()
+
+    def test_intervals_cached_until_stale(self, tmp_path, monkeypatch):
+        store = EvaluationStore(tmp_path / "store.sqlite3")
+        rubric = {"name": "R", "dimensions": [{"name": "D", "weight": 1.0}]}
+        base = {"mode": "auto", "prompt": "p", "rubric": rubric, "scores_a": {}, "scores_b": {}}
+        for preferred in "AB" * 10:
+            store.add({**base, "model_a": "x", "model_b": "y", "preferred_response": preferred})
+
+        path = tmp_path / "all.json"
+        runs = []
+        original = Leaderboard.bootstrap
+        monkeypatch.setattr(
+            Leaderboard, "bootstrap", lambda self, samples: runs.append(samples) or original(self, samples)
+        )
+        assert refresh_leaderboard(store, path, samples=10).interval_judgements == 20
+        assert runs == [10]
+
+        # One more judgement is within the 10% growth allowance: the cached intervals stay
+        store.add({**base, "model_a": "x", "model_b": "y", "preferred_response": "A"})
+        leaderboard = refresh_leaderboard(store, path, samples=10)
+        assert leaderboard.judgements == 21 and leaderboard.intervals
+        assert runs == [10]
+
+        # A new model has no interval yet, so they are recomputed
+        store.add({**base, "model_a": "x", "model_b": "z", "preferred_response": "A"})
+        assert refresh_leaderboard(store, path, samples=10).interval_judgements == 22
+        assert runs == [10, 10]
+        store.close()
@@ -0,0 +1,631 @@
+"""
+Tests for LLMClient — request building and concurrent generation.
+
+Tests cover:
+  - Dual responses run concurrently (latency ~ slower side, not the sum)
+  - Per-side errors are returned as error strings without affecting the other side
+  - N-model generation runs every model concurrently, failures reported per model
+  - Per-side timeouts, measured from when each call starts running
+  - Streaming deltas, timing statistics and stream error contract
+  - Interleaving two streams concurrently
+  - Pooled transport shared per (API key, base URL)
+  - API key picked up from .env when no key is passed
+  - Model list and refresh failures reported through the on_error callback
+  - Response cache: automatic for deterministic calls, opt-in otherwise,
+    errors never cached, LRU eviction and TTL expiry
+  - Structured output: mode chosen from supported_parameters, request
+    parameters per mode, tool-call arguments as content, fallback on rejection
+  - Metrics: tokens, cost from catalog pricing, status and timings recorded
+    for completions, failures, cache hits and streams; sink formats
+  - Retries: transient failures retried and counted, typed errors raised,
+    error string kept by generate_response
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from openai import BadRequestError, InternalServerError
+
+from utils import concurrency
+from utils.concurrency import run_concurrently
+from utils.http_transport import close_transports
+from utils.llm_client import LLMClient, interleave_streams
+from utils.metrics import CallRecord, JsonlSink, PrometheusSink, RingBufferSink, summarize
+from utils.model_catalog import ModelCatalog
+from utils.resilience import LLMServerError, RetryPolicy, reset_model_guards
+from utils.response_cache import ResponseCache
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class FakeCompletions:
+    """Stands in for ``client.chat.completions`` with scripted per-model behaviour."""
+
+    def __init__(self, delays=None, failures=None):
+        self.delays = delays or {}
+        self.failures = failures or {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def create(self, **params):
+        with self.lock:
+            self.calls.append(params)
+        model = params["model"]
+        time.sleep(self.delays.get(model, 0))
+        if model in self.failures:
+            raise self.failures[model]
+        if params.get("stream"):
+            return self._stream(model)
+        message = SimpleNamespace(content=f"answer from {model}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def _stream(self, model):
+        yield SimpleNamespace(choices=[])
+        for token in ["answer ", "from ", None, model]:
+            delta = SimpleNamespace(content=token)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def make_client(completions, cache=None, metrics=None):
+    """Create an LLMClient whose OpenAI client is replaced by a fake."""
+    reset_model_guards()
+    client = LLMClient.__new__(LLMClient)
+    client.api_key = "test-key"
+    client.base_url = "https://example.invalid/api/v1"
+    client.models_url = f"{client.base_url}/models"
+    client.cache = cache
+    client.metrics = metrics
+    client.session = None
+    client.retry_policy = RetryPolicy(base_delay=0.0)
+    client.on_error = None
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return client
+
+
+# ---------------------------------------------------------------------------
+# generate_dual_responses tests
+# ---------------------------------------------------------------------------
+
+class TestGenerateDualResponses:
+    def test_returns_both_responses_in_order(self):
+        client = make_client(FakeCompletions())
+        response_a, response_b = client.generate_dual_responses("Hi", "model-a", "model-b")
+        assert response_a == "answer from model-a"
+        assert response_b == "answer from model-b"
+
+    def test_runs_concurrently(self):
+        client = make_client(FakeCompletions(delays={"model-a": 0.3, "model-b": 0.3}))
+        started = time.monotonic()
+        client.generate_dual_responses("Hi", "model-a", "model-b")
+        assert time.monotonic() - started < 0.55
+
+    def test_error_reported_per_side(self):
+        completions = FakeCompletions(failures={"model-b": RuntimeError("boom")})
+        client = make_client(completions)
+        response_a, response_b = client.generate_dual_responses("Hi", "model-a", "model-b")
+        assert response_a == "answer from model-a"
+        assert response_b == "Error generating response: boom"
+
+    def test_per_side_timeout(self):
+        client = make_client(FakeCompletions(delays={"model-b": 1.0}))
+        response_a, response_b = client.generate_dual_responses(
+            "Hi", "model-a", "model-b", params_b={"timeout": 0.1}
+        )
+        assert response_a == "answer from model-a"
+        assert response_b.startswith("Error generating response: timed out")
+
+    def test_params_forwarded_per_side(self):
+        completions = FakeCompletions()
+        client = make_client(completions)
+        client.generate_dual_responses(
+            "Hi", "model-a", "model-b",
+            params_a={"temperature": 0.2, "seed": 7},
+            params_b={"top_k": 40}
+        )
+        by_model = {call["model"]: call for call in completions.calls}
+        assert by_model["model-a"]["temperature"] == 0.2
+        assert by_model["model-a"]["seed"] == 7
+        assert by_model["model-b"]["temperature"] == 1.0
+        assert by_model["model-b"]["top_k"] == 40
+
+
+class TestApiKey:
+    def test_key_read_from_dotenv_without_app(self, tmp_path, monkeypatch):
+        import config
+        import dotenv
+        import utils.llm_client as llm_client
+
+        env_file = tmp_path / ".env"
+        env_file.write_text("OPENROUTER_API_KEY=from-dotenv\n", encoding="utf-8")
+        real_load_dotenv = dotenv.load_dotenv
+        monkeypatch.setattr(dotenv, "load_dotenv", lambda: real_load_dotenv(env_file))
+        monkeypatch.setattr(config, "_env_loaded", False)
+        monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+        monkeypatch.setattr(llm_client, "get_transport", lambda api_key, base_url: ("client", "session"))
+        try:
+            client = LLMClient()
+        finally:
+            # load_dotenv writes os.environ directly, outside monkeypatch's bookkeeping
+            os.environ.pop("OPENROUTER_API_KEY", None)
+        assert client.api_key == "from-dotenv"
+        assert client.client == "client"
+
+
+class TestRunConcurrently:
+    def test_timeout_starts_when_call_runs(self, monkeypatch):
+        # A single worker queues the second call behind the first
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(concurrency, "_executor", executor)
+        calls = [lambda: time.sleep(0.15) or "first", lambda: time.sleep(0.15) or "second"]
+        try:
+            results = run_concurrently(calls, timeouts=[0.25, 0.25], on_timeout=lambda index, timeout: "timed out")
+        finally:
+            executor.shutdown()
+        assert results == ["first", "second"]
+
+
+class TestGenerateMultiResponses:
+    def test_one_response_per_model_concurrently(self):
+        models = ["model-a", "model-b", "model-c", "model-d"]
+        client = make_client(FakeCompletions(delays={model: 0.3 for model in models}))
+        started = time.monotonic()
+        responses = client.generate_multi_responses("Hi", models, params={"temperature": 0.2})
+        assert time.monotonic() - started < 0.55
+        assert responses == [f"answer from {model}" for model in models]
+
+    def test_failure_reported_per_model(self):
+        client = make_client(FakeCompletions(failures={"model-b": RuntimeError("boom")}))
+        responses = client.generate_multi_responses("Hi", ["model-a", "model-b", "model-c"])
+        assert responses == ["answer from model-a", "Error generating response: boom", "answer from model-c"]
+
+
+class TestSharedTransport:
+    def teardown_method(self):
+        close_transports()
+
+    def test_clients_share_pool_per_key_and_url(self):
+        first = LLMClient(api_key="key-1")
+        second = LLMClient(api_key="key-1")
+        other_key = LLMClient(api_key="key-2")
+        other_url = LLMClient(api_key="key-1", base_url="https://example.invalid/v1")
+        assert first.client is second.client
+        assert first.session is second.session
+        assert first.client is not other_key.client
+        assert first.client is not other_url.client
+
+    def test_session_authenticated(self):
+        client = LLMClient(api_key="key-1")
+        assert client.session.headers["Authorization"] == "Bearer key-1"
+
+
+# ---------------------------------------------------------------------------
+# Streaming tests
+# ---------------------------------------------------------------------------
+
+class TestErrorReporting:
+    def test_catalog_failure_reported_through_callback(self, monkeypatch):
+        import utils.llm_client as llm_client
+
+        class OfflineCatalog:
+            def get(self):
+                raise RuntimeError("offline")
+
+        monkeypatch.setattr(llm_client, "get_catalog_cache", lambda key, fetch: OfflineCatalog())
+        messages = []
+        client = make_client(FakeCompletions())
+        client.session = object()
+        client.on_error = messages.append
+        assert client.fetch_models() == []
+        assert messages == ["Error fetching models: offline"]
+
+    def test_failed_refresh_reported_with_stale_catalog(self, monkeypatch):
+        import utils.llm_client as llm_client
+
+        class StaleCatalog:
+            def unreported_error(self):
+                return "offline"
+
+            def get(self):
+                return ModelCatalog([{"id": "m1", "name": "M1", "pricing": {"prompt": "0", "completion": "0"}}])
+
+        monkeypatch.setattr(llm_client, "get_catalog_cache", lambda key, fetch: StaleCatalog())
+        messages = []
+        client = make_client(FakeCompletions())
+        client.session = object()
+        client.on_error = messages.append
+        assert [model["id"] for model in client.fetch_models()] == ["m1"]
+        assert messages == ["Error refreshing models, showing the cached list: offline"]
+
+
+class TestStreamResponse:
+    def test_yields_deltas_and_records_text(self):
+        client = make_client(FakeCompletions())
+        stream = client.stream_response("Hi", "model-a")
+        assert list(stream) == ["answer ", "from ", "model-a"]
+        assert stream.text == "answer from model-a"
+        assert stream.error is None
+
+    def test_records_timings(self):
+        client = make_client(FakeCompletions(delays={"model-a": 0.05}))
+        stream = client.stream_response("Hi", "model-a")
+        list(stream)
+        stats = stream.stats()
+        assert stats["time_to_first_token"] >= 0.05
+        assert stats["total_time"] >= stats["time_to_first_token"]
+
+    def test_request_sent_with_stream_flag(self):
+        completions = FakeCompletions()
+        client = make_client(completions)
+        list(client.stream_response("Hi", "model-a", temperature=0.0))
+        assert completions.calls[0]["stream"] is True
+        assert completions.calls[0]["temperature"] == 0.0
+
+    def test_error_follows_string_contract(self):
+        client = make_client(FakeCompletions(failures={"model-a": RuntimeError("boom")}))
+        stream = client.stream_response("Hi", "model-a")
+        assert list(stream) == ["Error generating response: boom"]
+        assert stream.text == "Error generating response: boom"
+        assert stream.error == "boom"
+
+    def test_interleave_dual_streams(self):
+        completions = FakeCompletions(failures={"model-b": RuntimeError("boom")})
+        client = make_client(completions)
+        streams = client.stream_dual_responses("Hi", "model-a", "model-b")
+        texts = ["", ""]
+        for side, delta in interleave_streams(streams):
+            texts[side] += delta
+        assert texts[0] == "answer from model-a"
+        assert texts[1] == "Error generating response: boom"
+        assert [s.text for s in streams] == texts
+
+
+# ---------------------------------------------------------------------------
+# Response cache tests
+# ---------------------------------------------------------------------------
+
+class TestResponseCaching:
+    def test_deterministic_calls_cached_automatically(self, tmp_path):
+        completions = FakeCompletions()
+        client = make_client(completions, ResponseCache(tmp_path / "cache.sqlite3"))
+        first = client.generate_response("Hi", "model-a", temperature=0)
+        second = client.generate_response("Hi", "model-a", temperature=0)
+        assert first == second == "answer from model-a"
+        assert len(completions.calls) == 1
+
+    def test_seeded_calls_cached_automatically(self, tmp_path):
+        completions = FakeCompletions()
+        client = make_client(completions, ResponseCache(tmp_path / "cache.sqlite3"))
+        client.generate_response("Hi", "model-a", temperature=0.9, seed=42)
+        client.generate_response("Hi", "model-a", temperature=0.9, seed=42)
+        client.generate_response("Hi", "model-a", temperature=0.9, seed=43)
+        assert len(completions.calls) == 2
+
+    def test_sampled_calls_not_cached_unless_forced(self, tmp_path):
+        completions = FakeCompletions()
+        client = make_client(completions, ResponseCache(tmp_path / "cache.sqlite3"))
+        client.generate_response("Hi", "model-a", temperature=0.7)
+        client.generate_response("Hi", "model-a", temperature=0.7)
+        assert len(completions.calls) == 2
+        client.generate_response("Hi", "model-a", temperature=0.7, use_cache=True)
+        client.generate_response("Hi", "model-a", temperature=0.7, use_cache=True)
+        assert len(completions.calls) == 3
+
+    def test_opt_out_and_timeout_not_in_key(self, tmp_path):
+        completions = FakeCompletions()
+        client = make_client(completions, ResponseCache(tmp_path / "cache.sqlite3"))
+        client.generate_response("Hi", "model-a", temperature=0, timeout=10)
+        client.generate_response("Hi", "model-a", temperature=0, timeout=20)
+        assert len(completions.calls) == 1
+        client.generate_response("Hi", "model-a", temperature=0, use_cache=False)
+        assert len(completions.calls) == 2
+
+    def test_errors_not_cached(self, tmp_path):
+        completions = FakeCompletions(failures={"model-a": RuntimeError("boom")})
+        client = make_client(completions, ResponseCache(tmp_path / "cache.sqlite3"))
+        client.generate_response("Hi", "model-a", temperature=0)
+        client.generate_response("Hi", "model-a", temperature=0)
+        assert len(completions.calls) == 2
+
+
+class TestResponseCache:
+    def test_lru_eviction_by_entries(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite3", max_entries=2)
+        cache.set("a", "1")
+        time.sleep(0.01)
+        cache.set("b", "2")
+        time.sleep(0.01)
+        cache.get("a")  # "b" is now least recently used
+        time.sleep(0.01)
+        cache.set("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_eviction_by_size(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=10)
+        cache.set("a", "x" * 6)
+        time.sleep(0.01)
+        cache.set("b", "y" * 6)
+        assert cache.get("a") is None
+        assert cache.stats() == {"entries": 1, "bytes": 6}
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite3", ttl=0.05)
+        cache.set("a", "1")
+        assert cache.get("a") == "1"
+        time.sleep(0.1)
+        assert cache.get("a") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        ResponseCache(tmp_path / "cache.sqlite3").set("a", "1")
+        assert ResponseCache(tmp_path / "cache.sqlite3").get("a") == "1"
+
+
+# ---------------------------------------------------------------------------
+# Structured output
+# ---------------------------------------------------------------------------
+
+SCHEMA = {
+    "type": "object",
+    "properties": {"verdict": {"type": "string"}},
+    "required": ["verdict"],
+    "additionalProperties": False
+}
+
+
+class StructuredCompletions(FakeCompletions):
+    """Answers tool calls with arguments; optionally rejects structured requests."""
+
+    def __init__(self, reject_structured=False):
+        super().__init__()
+        self.reject_structured = reject_structured
+
+    def create(self, **params):
+        with self.lock:
+            self.calls.append(params)
+        structured = "response_format" in params or "tools" in params
+        if self.reject_structured and structured:
+            response = SimpleNamespace(request=None, status_code=400, headers={})
+            raise BadRequestError("response_format not supported", response=response, body=None)
+        if "tools" in params:
+            call = SimpleNamespace(function=SimpleNamespace(name="verdict", arguments='{"verdict": "A"}'))
+            message = SimpleNamespace(content=None, tool_calls=[call])
+        else:
+            message = SimpleNamespace(content='{"verdict": "B"}')
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def with_catalog(client, supported_parameters):
+    """Give the client a fixed model catalog advertising the given parameters."""
+    catalog = ModelCatalog([{"id": "judge", "name": "Judge", "supported_parameters": supported_parameters}])
+    client.get_model_catalog = lambda: catalog
+    client._cached_catalog = lambda: catalog
+    return client
+
+
+class TestStructuredOutput:
+    def test_mode_from_supported_parameters(self):
+        client = make_client(StructuredCompletions())
+        assert with_catalog(client, ["structured_outputs", "response_format", "tools"]).structured_output_mode("judge") == "json_schema"
+        assert with_catalog(client, ["tools", "tool_choice"]).structured_output_mode("judge") == "tool"
+        assert with_catalog(client, ["response_format"]).structured_output_mode("judge") == "json_object"
+        assert with_catalog(client, []).structured_output_mode("judge") == "prompt"
+        assert client.structured_output_mode("unknown/model") == "prompt"
+
+    def test_missing_catalog_falls_back_quietly(self, monkeypatch):
+        import utils.llm_client as llm_client
+
+        class OfflineCatalog:
+            def get(self):
+                raise RuntimeError("offline")
+
+        monkeypatch.setattr(llm_client, "get_catalog_cache", lambda key, fetch: OfflineCatalog())
+        messages = []
+        client = make_client(StructuredCompletions())
+        client.session = object()
+        client.on_error = messages.append
+        assert client.structured_output_mode("judge") == "prompt"
+        assert messages == []
+
+    def test_json_schema_request(self):
+        completions = StructuredCompletions()
+        client = with_catalog(make_client(completions), ["structured_outputs"])
+        result = client.generate_completion("Judge", "judge", json_schema=SCHEMA, schema_name="verdict")
+        response_format = completions.calls[0]["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"] == {"name": "verdict", "strict": True, "schema": SCHEMA}
+        assert result["structured_mode"] == "json_schema"
+        assert json.loads(result["content"]) == {"verdict": "B"}
+
+    def test_tool_call_arguments_returned_as_content(self):
+        completions = StructuredCompletions()
+        client = with_catalog(make_client(completions), ["tools", "tool_choice"])
+        result = client.generate_completion("Judge", "judge", json_schema=SCHEMA, schema_name="verdict")
+        call = completions.calls[0]
+        assert call["tools"][0]["function"]["parameters"] == SCHEMA
+        assert call["tool_choice"] == {"type": "function", "function": {"name": "verdict"}}
+        assert result["content"] == '{"verdict": "A"}'
+
+    def test_no_schema_sends_plain_request(self):
+        completions = StructuredCompletions()
+        result = make_client(completions).generate_completion("Hi", "judge")
+        assert "response_format" not in completions.calls[0] and "tools" not in completions.calls[0]
+        assert result["structured_mode"] == "prompt"
+
+    def test_rejected_structured_request_falls_back(self):
+        completions = StructuredCompletions(reject_structured=True)
+        result = make_client(completions).generate_completion(
+            "Judge", "judge", json_schema=SCHEMA, structured_mode="json_schema"
+        )
+        assert len(completions.calls) == 2
+        assert "response_format" not in completions.calls[1]
+        assert result["structured_mode"] == "prompt"
+
+
+# ---------------------------------------------------------------------------
+# Metrics tests
+# ---------------------------------------------------------------------------
+
+class UsageCompletions(FakeCompletions):
+    """Reports token usage (and a final usage chunk when streaming)."""
+
+    USAGE = SimpleNamespace(
+        prompt_tokens=1000, completion_tokens=200,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=400)
+    )
+
+    def create(self, **params):
+        response = super().create(**params)
+        if params.get("stream"):
+            return self._with_usage(response)
+        response.usage = self.USAGE
+        response.model = "provider/served"
+        return response
+
+    def _with_usage(self, chunks):
+        yield from chunks
+        yield SimpleNamespace(choices=[], usage=self.USAGE, model="provider/served")
+
+
+def with_pricing(client):
+    """Price calls to provider/served from a fixed catalog."""
+    catalog = ModelCatalog([{
+        "id": "provider/served",
+        "pricing": {"prompt": "0.000001", "completion": "0.000002", "input_cache_read": "0.0000001"}
+    }])
+    client.session = object()
+    client._call_cost = lambda model, usage: catalog.get(model).cost(usage) if catalog.get(model) else None
+    return client
+
+
+class TestMetrics:
+    EXPECTED_COST = 600 * 0.000001 + 400 * 0.0000001 + 200 * 0.000002
+
+    def test_completion_recorded_with_cost(self):
+        sink = RingBufferSink()
+        client = with_pricing(make_client(UsageCompletions(), metrics=sink))
+        result = client.generate_completion("Hi", "model-a")
+        [call] = sink.records()
+        assert (call.prompt_tokens, call.completion_tokens, call.cached_tokens) == (1000, 200, 400)
+        assert call.served_model == "provider/served"
+        assert call.status == 200 and call.ok
+        assert abs(call.cost - self.EXPECTED_COST) < 1e-12
+        assert result["cost"] == call.cost
+        assert result["wall_time"] >= 0
+
+    def test_failure_recorded_with_status(self):
+        sink = RingBufferSink()
+        response = SimpleNamespace(request=None, status_code=400, headers={})
+        error = BadRequestError("bad", response=response, body=None)
+        client = make_client(FakeCompletions(failures={"model-a": error}), metrics=sink)
+        assert client.generate_response("Hi", "model-a").startswith("Error generating response")
+        [call] = sink.records()
+        assert call.status == 400 and not call.ok
+
+    def test_cache_hit_recorded_as_free(self, tmp_path):
+        sink = RingBufferSink()
+        client = make_client(UsageCompletions(), cache=ResponseCache(tmp_path / "c.sqlite3"), metrics=sink)
+        client.generate_response("Hi", "model-a", temperature=0)
+        client.generate_response("Hi", "model-a", temperature=0)
+        summary = sink.summary()
+        assert summary["calls"] == 2 and summary["cache_hits"] == 1
+        assert summary["prompt_tokens"] == 1000
+
+    def test_stream_recorded_with_usage(self):
+        sink = RingBufferSink()
+        completions = UsageCompletions()
+        client = with_pricing(make_client(completions, metrics=sink))
+        stream = client.stream_response("Hi", "model-a")
+        assert "".join(stream) == "answer from model-a"
+        assert completions.calls[0]["stream_options"] == {"include_usage": True}
+        [call] = sink.records()
+        assert call.streamed and call.time_to_first_token is not None
+        assert call.completion_tokens == 200
+        assert abs(call.cost - self.EXPECTED_COST) < 1e-12
+
+    def test_summary_and_sinks(self, tmp_path):
+        calls = [
+            CallRecord(model="m", prompt_tokens=10, completion_tokens=5, wall_time=1.0, status=200, cost=0.5),
+            CallRecord(model="m", wall_time=3.0, status=429, error="rate limited"),
+        ]
+        summary = summarize(calls)
+        assert summary["calls"] == 2 and summary["errors"] == 1
+        assert summary["cost"] == 0.5 and summary["unpriced_calls"] == 1
+        assert summary["avg_wall_time"] == 2.0
+        assert summary["by_model"]["m"]["calls"] == 2
+
+        jsonl = JsonlSink(tmp_path / "calls.jsonl")
+        prometheus = PrometheusSink()
+        for call in calls:
+            jsonl.record(call)
+            prometheus.record(call)
+        lines = (tmp_path / "calls.jsonl").read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[1])["status"] == 429
+        text = prometheus.render()
+        assert 'llm_requests_total{model="m",status="429"} 1' in text
+        assert "# TYPE llm_request_duration_seconds summary" in text
+        assert 'llm_cost_usd_total{model="m"} 0.5' in text
+
+
+# ---------------------------------------------------------------------------
+# Retry tests
+# ---------------------------------------------------------------------------
+
+class FlakyCompletions(FakeCompletions):
+    """Fails the first ``failures`` requests with a 503."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.remaining = failures
+
+    def create(self, **params):
+        with self.lock:
+            fail, self.remaining = self.remaining > 0, self.remaining - 1
+        if fail:
+            self.calls.append(params)
+            response = SimpleNamespace(request=None, status_code=503, headers={})
+            raise InternalServerError("unavailable", response=response, body=None)
+        return super().create(**params)
+
+
+class TestRetries:
+    def test_transient_failures_retried(self):
+        sink = RingBufferSink()
+        completions = FlakyCompletions(2)
+        result = make_client(completions, metrics=sink).generate_completion("Hi", "model-a")
+        assert result["content"] == "answer from model-a"
+        assert len(completions.calls) == 3
+        [call] = sink.records()
+        assert call.ok and call.retries == 2
+        assert sink.summary()["retries"] == 2
+
+    def test_typed_error_after_max_attempts(self):
+        client = make_client(FlakyCompletions(10))
+        client.retry_policy = RetryPolicy(max_attempts=2, base_delay=0.0)
+        try:
+            client.generate_completion("Hi", "model-a")
+        except LLMServerError as e:
+            assert e.status_code == 503 and e.attempts == 2
+        else:
+            raise AssertionError("expected LLMServerError")
+        assert len(client.client.chat.completions.calls) == 2
+
+    def test_generate_response_keeps_error_string(self):
+        client = make_client(FlakyCompletions(10))
+        client.retry_policy = RetryPolicy(max_attempts=2, base_delay=0.0)
+        assert client.generate_response("Hi", "model-a").startswith("Error generating response")
+
+    def test_stream_open_retried(self):
+        completions = FlakyCompletions(1)
+        assert "".join(make_client(completions).stream_response("Hi", "model-a")) == "answer from model-a"
+        assert len(completions.calls) == 2
@@ -0,0 +1,162 @@
+"""
+Tests for ModelCatalog — typed parsing, indexes and background refresh.
+
+Tests cover:
+  - Pricing, context length, modality and parameter parsing
+  - Malformed pricing is treated as non-free
+  - Request cost from token usage, with cache-read pricing
+  - Free-model index and ready-made selectbox options
+  - Stale catalog served while a background refresh runs
+  - Failed refresh keeps the stale catalog and records the error, reported once
+  - A failed first fetch is not retried on every access
+"""
+
+import sys
+import os
+import threading
+import time
+
+import pytest
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.model_catalog import CatalogCache, ModelCatalog, ModelInfo
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+RAW_MODELS = [
+    {
+        "id": "vendor/free-model:free",
+        "name": "Free Model",
+        "pricing": {"prompt": "0", "completion": "0"},
+        "context_length": 32768,
+        "architecture": {"input_modalities": ["text", "image"], "output_modalities": ["text"]},
+        "supported_parameters": ["temperature", "response_format", "tools"],
+    },
+    {
+        "id": "vendor/paid-model",
+        "name": "Paid Model",
+        "pricing": {"prompt": "0.000001", "completion": "0.000002"},
+    },
+    {
+        "id": "vendor/odd-pricing",
+        "name": "Odd Pricing",
+        "pricing": {"prompt": "n/a", "completion": "0"},
+    },
+]
+
+
+# ---------------------------------------------------------------------------
+# ModelInfo / ModelCatalog tests
+# ---------------------------------------------------------------------------
+
+class TestModelCatalog:
+    def test_typed_fields(self):
+        model = ModelInfo.from_api(RAW_MODELS[0])
+        assert model.prompt_price == 0.0
+        assert model.context_length == 32768
+        assert model.input_modalities == ("text", "image")
+        assert "response_format" in model.supported_parameters
+        assert model.is_free
+        assert model.label == "Free Model (vendor/free-model:free)"
+
+    def test_malformed_pricing_is_not_free(self):
+        model = ModelInfo.from_api(RAW_MODELS[2])
+        assert model.prompt_price is None
+        assert not model.is_free
+
+    def test_cost(self):
+        usage = {"prompt_tokens": 1000, "completion_tokens": 100, "cached_tokens": 500}
+        paid = ModelInfo.from_api(RAW_MODELS[1])
+        assert abs(paid.cost(usage) - (1000 * 0.000001 + 100 * 0.000002)) < 1e-12
+        cached = ModelInfo.from_api({
+            "id": "m", "pricing": {"prompt": "0.000001", "completion": "0", "input_cache_read": "0"}
+        })
+        assert abs(cached.cost(usage) - 500 * 0.000001) < 1e-12
+        assert ModelInfo.from_api(RAW_MODELS[0]).cost(usage) == 0.0
+        assert ModelInfo.from_api(RAW_MODELS[2]).cost(usage) is None
+
+    def test_indexes_and_options(self):
+        catalog = ModelCatalog(RAW_MODELS)
+        assert len(catalog) == 3
+        assert catalog.get("vendor/paid-model").completion_price == 0.000002
+        assert [m.id for m in catalog.free_models] == ["vendor/free-model:free"]
+        assert catalog.free_options == ["Free Model (vendor/free-model:free)"]
+        assert catalog.free_label_to_id[catalog.free_options[0]] == "vendor/free-model:free"
+        assert catalog.free_option_index("vendor/free-model:free") == 0
+        assert catalog.free_option_index("vendor/paid-model") == 0
+        assert catalog.free_option_index(None, default=-1) == -1
+
+
+# ---------------------------------------------------------------------------
+# CatalogCache tests
+# ---------------------------------------------------------------------------
+
+class TestCatalogCache:
+    def test_first_get_fetches_once(self):
+        calls = []
+        cache = CatalogCache(lambda: calls.append(1) or RAW_MODELS, ttl=60)
+        assert cache.get() is cache.get()
+        assert len(calls) == 1
+
+    def test_stale_catalog_served_during_refresh(self):
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            if len(calls) > 1:
+                release.wait(2)
+                return RAW_MODELS[:1]
+            return RAW_MODELS
+
+        cache = CatalogCache(fetch, ttl=0.01)
+        stale = cache.get()
+        time.sleep(0.02)
+
+        # Expired: returns immediately with the stale catalog
+        assert cache.get() is stale
+        release.set()
+        for _ in range(100):
+            if cache.get() is not stale:
+                break
+            time.sleep(0.01)
+        assert len(cache.get()) == 1
+
+    def test_failed_refresh_keeps_stale_catalog(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            if len(calls) > 1:
+                raise RuntimeError("network down")
+            return RAW_MODELS
+
+        cache = CatalogCache(fetch, ttl=0.01)
+        stale = cache.get()
+        time.sleep(0.02)
+        cache.get()
+        time.sleep(0.05)
+        assert cache.get() is stale
+        assert len(calls) == 2
+        assert cache.last_error == "network down"
+        # Shown once, however often the catalog is read afterwards
+        assert cache.unreported_error() == "network down"
+        assert cache.unreported_error() is None
+
+    def test_failed_first_fetch_not_retried_immediately(self):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            raise RuntimeError("network down")
+
+        cache = CatalogCache(fetch)
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="network down"):
+                cache.get()
+        assert len(calls) == 1
@@ -0,0 +1,155 @@
+"""
+Tests for ReportGenerator — concurrent LLM sections and progressive rendering.
+
+Tests cover:
+  - LLM sections run concurrently (export time ~ slowest call, not the sum)
+  - Deterministic sections render first, with placeholders for LLM sections
+  - Each completed LLM section triggers an update
+  - Optional enhanced response and critique sections, both off by default
+  - API usage summary in the metadata when provided
+  - Streaming to disk matches the returned report; failed writes publish nothing
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from utils.report_generator import PENDING_SECTION, ReportGenerator
+from utils.metrics import CallRecord, summarize
+from utils.report_writer import ReportWriter
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+RUBRIC = {
+    "name": "Test Rubric",
+    "dimensions": [
+        {"name": "Accuracy", "weight": 5.0, "description": "Factual correctness"},
+        {"name": "Clarity", "weight": 5.0, "description": "Clear communication"},
+    ]
+}
+
+SESSION = {
+    "prompt": "Explain recursion",
+    "response_a": "Recursion is when a function calls itself.",
+    "response_b": "It is a loop.",
+    "model_a": "model/a",
+    "model_b": "model/b",
+    "params_a": {"temperature": 0.7, "top_p": 1.0, "max_tokens": 1024},
+    "params_b": {"temperature": 0.7, "top_p": 1.0, "max_tokens": 1024},
+    "rubric": RUBRIC,
+    "scores_a": {"Accuracy": {"score": 3, "comment": "Correct"}, "Clarity": {"score": 3, "comment": ""}},
+    "scores_b": {"Accuracy": {"score": 1, "comment": "Wrong"}, "Clarity": {"score": 2, "comment": "Vague"}},
+    "final_score_a": 10.0,
+    "final_score_b": 7.0,
+    "user_justification": "A is correct, B is not.",
+    "preferred_response": "A",
+    "timestamp": "20250101_120000",
+    "evaluator": "User",
+    "report_model": "model/report",
+}
+
+
+class SlowClient:
+    """Answers each report prompt after a delay, labelling the output by section."""
+
+    def __init__(self, delay=0.3):
+        self.delay = delay
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate_response(self, prompt, model, system_prompt="", **params):
+        with self.lock:
+            self.prompts.append(prompt)
+        time.sleep(self.delay)
+        if "Rewrite or improve" in prompt:
+            return "ENHANCED TEXT"
+        if "judged the weaker" in prompt:
+            return "CRITIQUE TEXT"
+        return "REASONING TEXT"
+
+
+# ---------------------------------------------------------------------------
+# generate_report tests
+# ---------------------------------------------------------------------------
+
+class TestGenerateReport:
+    def test_sections_generated_concurrently(self):
+        client = SlowClient(delay=0.3)
+        started = time.monotonic()
+        report = ReportGenerator(client).generate_report(
+            SESSION, "model/report", include_enhanced=True, include_critique=True
+        )
+        assert time.monotonic() - started < 0.6
+        assert len(client.prompts) == 3
+        for text in ("REASONING TEXT", "ENHANCED TEXT", "CRITIQUE TEXT"):
+            assert text in report
+
+    def test_progressive_updates(self):
+        updates = []
+        ReportGenerator(SlowClient(delay=0.05)).generate_report(
+            SESSION, "model/report", include_enhanced=True, on_update=updates.append
+        )
+        assert len(updates) == 3
+        first = updates[0]
+        assert "## Response A" in first and "Correct" in first
+        assert first.count(PENDING_SECTION) == 2
+        assert updates[1].count(PENDING_SECTION) == 1
+        assert PENDING_SECTION not in updates[-1]
+
+    def test_optional_sections(self):
+        client = SlowClient(delay=0)
+        # Only the reasoning section costs an LLM call by default
+        report = ReportGenerator(client).generate_report(SESSION, "model/report")
+        assert len(client.prompts) == 1
+        assert "Enhanced Response" not in report
+        assert "Critique of Response" not in report
+        assert "## LLM Reasoning & Additional Insights\n\nREASONING TEXT" in report
+
+    def test_usage_summary(self):
+        usage = summarize([CallRecord(model="m", prompt_tokens=1200, completion_tokens=300, status=200, cost=0.01)])
+        report = ReportGenerator(SlowClient(delay=0)).generate_report({**SESSION, "usage": usage}, "model/report")
+        section = report.split("### API Usage (this session)")[1]
+        assert "1,200 prompt" in section and "$0.0100" in section
+        assert "API Usage" not in ReportGenerator(SlowClient(delay=0)).generate_report(SESSION, "model/report")
+
+    def test_section_titles_follow_preference(self):
+        session = {**SESSION, "preferred_response": "B"}
+        report = ReportGenerator(SlowClient(delay=0)).generate_report(
+            session, "model/report", include_enhanced=True, include_critique=True
+        )
+        assert "## Enhanced Response (improved Response B)" in report
+        assert "## Critique of Response A" in report
+
+
+# ---------------------------------------------------------------------------
+# Streaming writer tests
+# ---------------------------------------------------------------------------
+
+class TestStreamingReport:
+    def test_output_file_matches_report(self, tmp_path):
+        path = tmp_path / "evaluations" / "report.md"
+        report = ReportGenerator(SlowClient(delay=0.01)).generate_report(
+            SESSION, "model/report", include_critique=True, output_path=path
+        )
+        assert path.read_text(encoding="utf-8") == report
+        assert PENDING_SECTION not in report
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_failed_write_leaves_previous_report(self, tmp_path):
+        path = tmp_path / "report.md"
+        path.write_text("old", encoding="utf-8")
+        with pytest.raises(RuntimeError):
+            with ReportWriter(path) as writer:
+                writer.write("# New\n")
+                raise RuntimeError("boom")
+        assert path.read_text(encoding="utf-8") == "old"
+        assert list(tmp_path.iterdir()) == [path]
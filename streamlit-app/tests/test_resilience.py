@@ -0,0 +1,175 @@
+"""
+Tests for the retry, rate-limit and circuit-breaker layer.
+
+Tests cover:
+  - Provider errors mapped to typed LLMErrors (429, 5xx, 4xx, connection, timeout)
+  - Retry-After parsing (milliseconds, seconds, HTTP date, reset timestamp)
+  - Retries on 429/5xx with backoff, honoring Retry-After
+  - No retry on 4xx; typed error after max_attempts
+  - Rate limits pause the model's guard without tripping the breaker
+  - Circuit breaker opens, fails fast, and recovers through half-open
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+from utils.resilience import (
+    CircuitBreaker, CircuitOpenError, LLMConnectionError, LLMRateLimitError, LLMRequestError,
+    LLMServerError, LLMTimeoutError, ModelGuard, RetryPolicy, call_with_retry, classify_error,
+    parse_retry_after
+)
+
+def status_error(status, headers=None):
+    """Build the OpenAI SDK error for an HTTP status."""
+    response = SimpleNamespace(request=None, status_code=status, headers=headers or {})
+    cls = RateLimitError if status == 429 else APIStatusError
+    return cls(f"status {status}", response=response, body=None)
+
+
+class Script:
+    """Callable that raises the scripted errors, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def run(call, policy=RetryPolicy(base_delay=0.0), guard=None):
+    """Run ``call`` with a recording fake sleep; returns (result or error, sleeps)."""
+    sleeps = []
+    try:
+        result = call_with_retry(call, "model", policy, guard or ModelGuard(), sleep=sleeps.append)
+    except Exception as e:
+        result = e
+    return result, sleeps
+
+
+class TestClassifyError:
+    def test_status_codes(self):
+        assert isinstance(classify_error(status_error(429)), LLMRateLimitError)
+        assert isinstance(classify_error(status_error(503)), LLMServerError)
+        assert isinstance(classify_error(status_error(408)), LLMServerError)
+        typed = classify_error(status_error(400), "m")
+        assert isinstance(typed, LLMRequestError)
+        assert typed.status_code == 400 and typed.model == "m"
+        assert not typed.retryable
+
+    def test_transport_errors(self):
+        assert isinstance(classify_error(APITimeoutError(request=None)), LLMTimeoutError)
+        assert isinstance(classify_error(APIConnectionError(request=None)), LLMConnectionError)
+
+    def test_unknown_errors_unchanged(self):
+        error = ValueError("not an API error")
+        assert classify_error(error) is error
+
+    def test_rate_limit_carries_retry_after(self):
+        assert classify_error(status_error(429, {"retry-after": "7"})).retry_after == 7.0
+
+
+class TestParseRetryAfter:
+    def test_formats(self):
+        assert parse_retry_after({"retry-after-ms": "1500"}) == 1.5
+        assert parse_retry_after({"Retry-After": "3"}) == 3.0
+        assert parse_retry_after({"retry-after": "Thu, 01 Jan 1970 00:01:40 GMT"}, now=90.0) == 10.0
+        assert parse_retry_after({"x-ratelimit-reset": "105000"}, now=100.0) == 5.0
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after({}) is None
+        assert parse_retry_after({"retry-after": "soon"}) is None
+
+
+class TestCallWithRetry:
+    def test_retries_transient_errors(self):
+        call = Script(status_error(429), status_error(502), APIConnectionError(request=None))
+        result, sleeps = run(call)
+        assert result == "ok"
+        assert call.calls == 4 and len(sleeps) == 3
+
+    def test_honors_retry_after(self):
+        guard = ModelGuard()
+        result, sleeps = run(Script(status_error(429, {"retry-after": "2"})), guard=guard)
+        assert result == "ok"
+        # The shared pause and the per-caller delay both respect Retry-After
+        assert all(s >= 1.9 for s in sleeps) and sleeps[-1] <= 3.0
+        assert guard.breaker.state == "closed"
+
+    def test_retry_after_beyond_limit_gives_up(self):
+        call = Script(status_error(429, {"retry-after": "600"}))
+        result, _ = run(call, RetryPolicy(base_delay=0.0, max_retry_after=60))
+        assert isinstance(result, LLMRateLimitError) and call.calls == 1
+
+    def test_gives_up_with_typed_error(self):
+        call = Script(*[status_error(500)] * 5)
+        result, sleeps = run(call, RetryPolicy(max_attempts=3, base_delay=0.0))
+        assert isinstance(result, LLMServerError)
+        assert result.attempts == 3 and call.calls == 3 and len(sleeps) == 2
+        assert isinstance(result.__cause__, APIStatusError)
+
+    def test_client_errors_not_retried(self):
+        call = Script(status_error(400))
+        result, sleeps = run(call)
+        assert isinstance(result, LLMRequestError)
+        assert call.calls == 1 and not sleeps
+
+    def test_timeouts_retried_only_when_enabled(self):
+        result, _ = run(Script(APITimeoutError(request=None)))
+        assert isinstance(result, LLMTimeoutError)
+        result, _ = run(Script(APITimeoutError(request=None)), RetryPolicy(base_delay=0.0, retry_timeouts=True))
+        assert result == "ok"
+
+    def test_backoff_grows_and_is_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        rng = SimpleNamespace(uniform=lambda low, high: high)
+        error = LLMServerError("boom")
+        assert [policy.delay(error, attempt, rng) for attempt in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        guard = ModelGuard(breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60))
+        policy = RetryPolicy(max_attempts=1)
+        run(Script(status_error(500)), policy, guard)
+        assert guard.breaker.state == "closed"
+        run(Script(status_error(500)), policy, guard)
+        assert guard.breaker.state == "open"
+
+        call = Script()
+        result, _ = run(call, policy, guard)
+        assert isinstance(result, CircuitOpenError) and call.calls == 0
+
+    def test_rate_limits_and_client_errors_do_not_trip(self):
+        guard = ModelGuard(breaker=CircuitBreaker(failure_threshold=1))
+        run(Script(status_error(429)), RetryPolicy(max_attempts=1), guard)
+        run(Script(status_error(400)), RetryPolicy(max_attempts=1), guard)
+        assert guard.breaker.state == "closed"
+
+    def test_half_open_trial(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+        assert not breaker.allow()
+
+        now[0] = 10.0
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+        assert not breaker.allow()  # only one trial in flight
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        now[0] = 20.0
+        assert breaker.allow()
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
@@ -0,0 +1,184 @@
+"""
+Tests for RubricParser — parsing, the mtime-aware parse cache and the watcher.
+
+Tests cover:
+  - Bundled rubrics parse into dimensions with weights summing to ~10
+  - Repeated loads reuse the cached parse
+  - Editing a rubric file invalidates the cache
+  - Callers receive independent copies
+  - Parsed rubrics carry their precomputed fingerprint
+  - RubricWatcher reparses changed files and reports reparse errors
+  - Compiled artifacts round-trip, go stale on edit and reject malformed sources
+  - The builder reuses the in-memory parse before reading an artifact
+"""
+
+import sys
+import os
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.rubric_builder import RubricBuilder
+from utils.rubric_compiler import (
+    ARTIFACT_VERSION, RubricValidationError, artifact_path, compile_directory, compile_rubric,
+    load_compiled_rubric
+)
+from utils.rubric_parser import RubricParser, RubricWatcher, clear_parse_cache, rubric_fingerprint
+
+
+RUBRICS_DIR = Path(__file__).parent.parent / "rubrics"
+
+
+@pytest.fixture
+def rubrics_copy(tmp_path):
+    """A private copy of the coding rubric that tests may edit."""
+    clear_parse_cache()
+    shutil.copy(RUBRICS_DIR / "coding-rubric.md", tmp_path / "coding-rubric.md")
+    yield tmp_path
+    clear_parse_cache()
+
+
+def count_parses(parser, monkeypatch):
+    """Record every full parse performed by the parser."""
+    calls = []
+    original = parser._parse_content
+
+    def spy(content, file_path):
+        calls.append(file_path.name)
+        return original(content, file_path)
+
+    monkeypatch.setattr(parser, "_parse_content", spy)
+    return calls
+
+
+class TestRubricParser:
+    def test_bundled_rubrics_parse(self):
+        parser = RubricParser(RUBRICS_DIR)
+        for name in parser.list_available_rubrics():
+            rubric = parser.parse_rubric_file(name)
+            assert rubric["dimensions"], name
+            assert abs(sum(d["weight"] for d in rubric["dimensions"]) - 10) < 0.05
+
+    def test_repeated_loads_use_cache(self, rubrics_copy, monkeypatch):
+        parser = RubricParser(rubrics_copy)
+        calls = count_parses(parser, monkeypatch)
+        first = parser.parse_rubric_file("coding")
+        second = RubricParser(rubrics_copy).parse_rubric_file("coding-rubric.md")
+        assert first == second
+        assert calls == ["coding-rubric.md"]
+
+    def test_edit_invalidates_cache(self, rubrics_copy):
+        parser = RubricParser(rubrics_copy)
+        original = parser.parse_rubric_file("coding")
+        path = rubrics_copy / "coding-rubric.md"
+        path.write_text(path.read_text(encoding="utf-8").replace(original["name"], "Edited Rubric", 1), encoding="utf-8")
+        assert parser.parse_rubric_file("coding")["name"] == "Edited Rubric"
+
+    def test_callers_get_independent_copies(self, rubrics_copy):
+        parser = RubricParser(rubrics_copy)
+        first = parser.parse_rubric_file("coding")
+        first["dimensions"][0]["weight"] = 99
+        assert parser.parse_rubric_file("coding")["dimensions"][0]["weight"] != 99
+
+    def test_fingerprint_computed_once_per_parse(self, rubrics_copy):
+        rubric = RubricParser(rubrics_copy).parse_rubric_file("coding")
+        content = {key: value for key, value in rubric.items() if key != "fingerprint"}
+        assert rubric["fingerprint"] == rubric_fingerprint(content)
+        assert rubric_fingerprint(rubric) is rubric["fingerprint"]
+
+    def test_missing_rubric_raises(self, rubrics_copy):
+        with pytest.raises(FileNotFoundError):
+            RubricParser(rubrics_copy).parse_rubric_file("nonexistent")
+
+
+class TestRubricWatcher:
+    def test_poll_reparses_changed_files(self, rubrics_copy):
+        changed = []
+        watcher = RubricWatcher(RubricParser(rubrics_copy), on_change=changed.append)
+        assert watcher.poll() == ["coding-rubric"]
+        assert watcher.poll() == []
+
+        path = rubrics_copy / "coding-rubric.md"
+        path.write_text(path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        assert watcher.poll() == ["coding-rubric"]
+        assert changed == ["coding-rubric", "coding-rubric"]
+
+    def test_reparse_errors_go_to_callback(self, rubrics_copy, monkeypatch):
+        errors = []
+        parser = RubricParser(rubrics_copy)
+        monkeypatch.setattr(parser, "parse_rubric_file", lambda name: 1 / 0)
+        watcher = RubricWatcher(parser, on_error=errors.append)
+        assert watcher.poll() == []
+        assert errors == ["Error reparsing rubric coding-rubric.md: division by zero"]
+
+
+class TestRubricCompiler:
+    def test_round_trip_matches_parse(self, rubrics_copy):
+        source = rubrics_copy / "coding-rubric.md"
+        target = compile_rubric(source)
+        assert target == artifact_path(source)
+        assert load_compiled_rubric(source) == RubricParser(rubrics_copy).parse_rubric_file("coding")
+
+    def test_artifact_is_versioned_and_fingerprinted(self, rubrics_copy):
+        artifact = json.loads(compile_rubric(rubrics_copy / "coding-rubric.md").read_text(encoding="utf-8"))
+        assert artifact["format_version"] == ARTIFACT_VERSION
+        assert len(artifact["fingerprint"]) == 64
+        assert artifact["rubric"]["fingerprint"] == artifact["fingerprint"]
+        assert artifact["source"]["file"] == "coding-rubric.md"
+
+    def test_edited_source_makes_artifact_stale(self, rubrics_copy):
+        source = rubrics_copy / "coding-rubric.md"
+        compile_rubric(source)
+        source.write_text(source.read_text(encoding="utf-8") + "\nextra", encoding="utf-8")
+        assert load_compiled_rubric(source) is None
+
+    def test_touched_but_unchanged_source_stays_fresh(self, rubrics_copy):
+        source = rubrics_copy / "coding-rubric.md"
+        compile_rubric(source)
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert load_compiled_rubric(source) is not None
+        # The new mtime is recorded, so the next load skips hashing the source
+        recorded = json.loads(artifact_path(source).read_text(encoding="utf-8"))["source"]
+        assert recorded["mtime_ns"] == source.stat().st_mtime_ns
+
+    def test_builder_prefers_fresh_artifact(self, rubrics_copy):
+        source = rubrics_copy / "coding-rubric.md"
+        compile_rubric(source)
+        target = artifact_path(source)
+        artifact = json.loads(target.read_text(encoding="utf-8"))
+        artifact["rubric"]["name"] = "From Artifact"
+        target.write_text(json.dumps(artifact), encoding="utf-8")
+        # As in a fresh process: nothing has been parsed in memory yet
+        clear_parse_cache()
+        assert RubricBuilder(rubrics_copy).load_rubric("coding-rubric.md")["name"] == "From Artifact"
+
+    def test_builder_checks_memory_cache_before_artifact(self, rubrics_copy, monkeypatch):
+        import utils.rubric_builder as rubric_builder
+
+        compile_rubric(rubrics_copy / "coding-rubric.md")
+        clear_parse_cache()
+        loads = []
+        monkeypatch.setattr(
+            rubric_builder, "load_compiled_rubric", lambda source: loads.append(1) or load_compiled_rubric(source)
+        )
+        builder = RubricBuilder(rubrics_copy)
+        first = builder.load_rubric("coding-rubric.md")
+        assert builder.load_rubric("coding-rubric.md") == first
+        assert len(loads) == 1
+
+    def test_malformed_source_fails_fast(self, rubrics_copy):
+        (rubrics_copy / "broken-rubric.md").write_text("# Broken\n\nNo dimensions here.\n", encoding="utf-8")
+        with pytest.raises(RubricValidationError, match="no dimensions"):
+            compile_rubric(rubrics_copy / "broken-rubric.md")
+
+    def test_compile_directory_reports_per_file(self, rubrics_copy):
+        (rubrics_copy / "broken-rubric.md").write_text("# Broken\n", encoding="utf-8")
+        results = compile_directory(rubrics_copy, jobs=2)
+        assert results["coding-rubric.md"] is None
+        assert "no dimensions" in results["broken-rubric.md"]
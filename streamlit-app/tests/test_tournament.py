@@ -0,0 +1,213 @@
+"""
+Tests for the N-way model tournament.
+
+Tests cover:
+  - Swiss pairing: no rematches, byes for odd fields, fallback when every pair has met
+  - Active pairing picks the most uncertain unplayed pairs
+  - A Swiss tournament judges fewer pairs than a round robin and ranks the field correctly
+  - Pointwise tournaments score every response once; pairwise ones judge every match
+  - Rounds stop early once every pair has met
+  - Responses that cannot be scored are excluded; failed matches are recorded
+  - Judged matches are appended to the evaluation store
+"""
+
+import sys
+import os
+import json
+import re
+import threading
+
+import numpy as np
+import pytest
+
+# Add parent directory to path so we can import utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.auto_evaluator import JUDGE_SYSTEM_PROMPT, AutoEvaluator
+from utils.evaluation_store import EvaluationStore
+from utils.tournament import Tournament, active_pairs, default_rounds, swiss_pairs
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+RUBRIC = {
+    "name": "Test Rubric",
+    "dimensions": [
+        {"name": "Accuracy", "weight": 0.5, "description": "Factual correctness"},
+        {"name": "Clarity", "weight": 0.5, "description": "Clear communication"},
+    ]
+}
+
+# Response "q<N>" has quality N; scores only separate some levels, the tie-break decides the rest
+LEVELS = [(1, 1), (1, 2), (2, 2), (2, 3), (3, 3), (3, 3), (3, 3), (3, 3)]
+
+
+def quality(response):
+    return int(response[1:])
+
+
+def scores_for(response):
+    accuracy, clarity = LEVELS[quality(response)]
+    return {
+        "Accuracy": {"score": accuracy, "comment": "acc"},
+        "Clarity": {"score": clarity, "comment": "clr"},
+    }
+
+
+class QualityJudge:
+    """Judge stand-in that always prefers the higher-quality response."""
+
+    def __init__(self, unscoreable=()):
+        self.unscoreable = set(unscoreable)
+        self.kinds = []
+        self.lock = threading.Lock()
+
+    def generate_completion(self, prompt, model, system_prompt="", **params):
+        if "## Response A" in prompt:
+            a, b = re.search(r"## Response A\n\n(.*)\n\n## Response B\n\n(.*)$", prompt, re.S).groups()
+            preferred = "A" if quality(a) > quality(b) else "B"
+            if "nearly identical rubric scores" in prompt:
+                kind, data = "tie_break", {"preferred_response": preferred, "justification": "Tie-break."}
+            else:
+                kind, data = "pairwise", {
+                    "scores_a": scores_for(a), "scores_b": scores_for(b),
+                    "preferred_response": preferred, "justification": "Pairwise.",
+                }
+        else:
+            response = prompt.rsplit("## Response\n\n", 1)[1]
+            if response in self.unscoreable:
+                raise RuntimeError("judge unavailable")
+            kind, data = "pointwise", {"scores": scores_for(response), "summary": "ok"}
+        with self.lock:
+            self.kinds.append(kind)
+        return {"content": json.dumps(data), "model": model, "usage": {}, "from_cache": False}
+
+
+def responses(count):
+    # Entered weakest first, so the ranking has to come from the judging
+    return {f"model-{i}": f"q{i}" for i in range(count)}
+
+
+def played_pairs(result):
+    return [frozenset((match["a"], match["b"])) for match in result["matches"]]
+
+
+# ---------------------------------------------------------------------------
+# Pairing schedules
+# ---------------------------------------------------------------------------
+
+class TestPairing:
+    def test_swiss_pairs_neighbours_without_rematches(self):
+        assert swiss_pairs([0, 1, 2, 3], set()) == [(0, 1), (2, 3)]
+        assert swiss_pairs([0, 1, 2, 3], {(0, 1), (2, 3)}) == [(0, 2), (1, 3)]
+
+    def test_swiss_bye_goes_to_lowest_ranked(self):
+        pairs = swiss_pairs([4, 3, 2, 1, 0], set())
+        assert pairs == [(4, 3), (2, 1)]
+
+    def test_swiss_falls_back_when_every_pair_has_met(self):
+        played = {(0, 1), (0, 2), (1, 2), (0, 3), (1, 3), (2, 3)}
+        assert swiss_pairs([0, 1, 2, 3], played) == [(0, 1), (2, 3)]
+
+    def test_active_prefers_evenly_matched_unplayed_pairs(self):
+        strengths = np.array([8.0, 4.0, 1.0, 1.0])
+        pairs = active_pairs(strengths, {(2, 3)})
+        # 0-1 is the closest unplayed pair; 2 and 3 then meet neither 0 nor 1 twice
+        assert pairs[0] == (0, 1)
+        assert all(pair != (2, 3) for pair in pairs)
+        assert len({i for pair in pairs for i in pair}) == 2 * len(pairs)
+
+    def test_default_rounds(self):
+        assert [default_rounds(k) for k in (2, 3, 4, 8, 9)] == [1, 2, 2, 3, 4]
+
+
+# ---------------------------------------------------------------------------
+# Tournament
+# ---------------------------------------------------------------------------
+
+class TestTournament:
+    def test_swiss_ranks_field_with_fewer_than_all_pairs(self):
+        judge = QualityJudge()
+        result = Tournament(AutoEvaluator(judge), RUBRIC, "judge").run("p", responses(8))
+
+        assert result["rounds"] == 3
+        assert len(result["matches"]) == 12 < result["pairs_possible"] == 28
+        assert len(set(played_pairs(result))) == len(result["matches"])
+        # Each response is scored exactly once; only close matches cost another call
+        assert judge.kinds.count("pointwise") == 8
+        assert result["judge_calls"] == len(judge.kinds)
+
+        standings = result["standings"]
+        assert [row["rank"] for row in standings] == list(range(1, 9))
+        assert standings[0]["entrant"] == "model-7" and standings[0]["wins"] == 3
+        assert standings[-1]["entrant"] == "model-0" and standings[-1]["losses"] == 3
+        ratings = [row["rating"] for row in standings]
+        assert ratings == sorted(ratings, reverse=True)
+
+    def test_active_schedule_finds_the_best_entrant(self):
+        result = Tournament(AutoEvaluator(QualityJudge()), RUBRIC, "judge", schedule="active").run("p", responses(6))
+        assert len(result["matches"]) < result["pairs_possible"]
+        assert len(set(played_pairs(result))) == len(result["matches"])
+        assert result["standings"][0]["entrant"] == "model-5"
+
+    def test_pairwise_mode_judges_every_match(self):
+        judge = QualityJudge()
+        result = Tournament(AutoEvaluator(judge), RUBRIC, "judge", pointwise=False).run("p", responses(4))
+        assert set(judge.kinds) == {"pairwise"}
+        assert result["judge_calls"] == len(result["matches"]) == 4
+        assert result["standings"][0]["entrant"] == "model-3"
+
+    def test_pairwise_mode_counts_judge_retries(self):
+        judge = QualityJudge()
+        answer = judge.generate_completion
+
+        def first_answer_without_json(prompt, model, system_prompt="", **params):
+            if system_prompt == JUDGE_SYSTEM_PROMPT:
+                return {"content": "A is better.", "model": model, "usage": {}, "from_cache": False}
+            return answer(prompt, model, system_prompt, **params)
+
+        judge.generate_completion = first_answer_without_json
+        result = Tournament(AutoEvaluator(judge), RUBRIC, "judge", pointwise=False, rounds=1).run("p", responses(4))
+        assert [match["judge_calls"] for match in result["matches"]] == [2, 2]
+        assert result["judge_calls"] == 4
+
+    def test_stops_once_every_pair_has_met(self):
+        result = Tournament(AutoEvaluator(QualityJudge()), RUBRIC, "judge", rounds=10).run("p", responses(4))
+        assert len(result["matches"]) == result["pairs_possible"] == 6
+        assert result["rounds"] == 3
+
+    def test_unscoreable_response_is_excluded(self):
+        judge = QualityJudge(unscoreable={"q2"})
+        result = Tournament(AutoEvaluator(judge), RUBRIC, "judge").run("p", responses(4))
+        assert list(result["excluded"]) == ["model-2"]
+        assert "judge unavailable" in result["excluded"]["model-2"]
+        assert {row["entrant"] for row in result["standings"]} == {"model-0", "model-1", "model-3"}
+        assert all("model-2" not in pair for pair in played_pairs(result))
+
+    def test_failed_match_is_recorded_and_not_counted(self, monkeypatch):
+        evaluator = AutoEvaluator(QualityJudge())
+
+        def broken(*args, **kwargs):
+            raise RuntimeError("judge down")
+
+        monkeypatch.setattr(evaluator, "auto_evaluate", broken)
+        result = Tournament(evaluator, RUBRIC, "judge", pointwise=False, rounds=1).run("p", responses(4))
+        assert [match["error"] for match in result["matches"]] == ["judge down", "judge down"]
+        assert all(row["matches"] == 0 for row in result["standings"])
+        assert result["judge_calls"] == 0
+
+    def test_matches_are_stored(self, tmp_path):
+        store = EvaluationStore(tmp_path / "evaluations.sqlite3")
+        result = Tournament(AutoEvaluator(QualityJudge()), RUBRIC, "judge", store=store).run("p", responses(4))
+        store.flush()
+        stored = store.query(mode="tournament")
+        assert len(stored) == len(result["matches"])
+        winners = {match["winner"] for match in result["matches"]}
+        assert {row["model_a"] if row["preferred_response"] == "A" else row["model_b"] for row in stored} == winners
+        store.close()
+
+    def test_unknown_schedule_rejected(self):
+        with pytest.raises(ValueError):
+            Tournament(AutoEvaluator(QualityJudge()), RUBRIC, "judge", schedule="knockout")
@@ -0,0 +1,35 @@
+"""
+Evaluation core: LLM client, rubric parsing, scoring, LLM-as-judge and reports.
+
+Nothing in this package imports Streamlit; the app passes its UI hooks in
+(e.g. ``LLMClient(on_error=st.error)``). Heavy dependencies are imported on
+first use: ``openai``/``requests`` when the first API client is created and
+``numpy`` by the batch scoring methods and the leaderboard. The main classes
+are re-exported here lazily, so ``from utils import AutoEvaluator`` only
+loads the modules it needs.
+"""
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "LLMClient": "utils.llm_client",
+    "RubricParser": "utils.rubric_parser",
+    "Evaluator": "utils.evaluator",
+    "AutoEvaluator": "utils.auto_evaluator",
+    "ReportGenerator": "utils.report_generator",
+    "BatchRunner": "utils.batch_runner",
+    "EvaluationStore": "utils.evaluation_store",
+    "LLMError": "utils.resilience",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,117 @@
+"""
+Atomic File Writes
+
+Text is written to a temporary file next to the target, which is moved into
+place with ``os.replace`` once complete: readers never see a half-written
+file, and a failed write leaves any previous file at the same path untouched.
+Reports, compiled rubric artifacts, leaderboard snapshots and metrics
+exposition files are all published this way.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, TextIO
+
+
+class AtomicWriter:
+    """
+    Append-only text writer for one file, published atomically.
+
+    Usage:
+        with AtomicWriter(path) as writer:
+            writer.write(chunk)
+        # The file appears at ``path`` only if the block completed without error
+    """
+
+    def __init__(self, path: Path, encoding: str = "utf-8"):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Final file path (its parent directory is created if needed)
+            encoding: Text encoding of the file
+        """
+        self.path = Path(path)
+        self.encoding = encoding
+        self._file: Optional[TextIO] = None
+        self._tmp_path: Optional[Path] = None
+
+    def __enter__(self) -> "AtomicWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+    def open(self) -> None:
+        """Create the temporary file text is written to."""
+        if self._file is not None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Same directory as the target so the final rename stays on one filesystem
+        fd, tmp_name = tempfile.mkstemp(
+            dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+        )
+        self._tmp_path = Path(tmp_name)
+        self._file = os.fdopen(fd, "w", encoding=self.encoding, newline="")
+
+    def write(self, text: str) -> None:
+        """
+        Append text to the file.
+
+        Args:
+            text: Text to append
+        """
+        if self._file is None:
+            self.open()
+        self._file.write(text)
+
+    def commit(self) -> Path:
+        """
+        Flush the file to disk and move it into place.
+
+        Returns:
+            Path to the published file
+        """
+        if self._file is None:
+            self.open()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        os.replace(self._tmp_path, self.path)
+        self._tmp_path = None
+        return self.path
+
+    def abort(self) -> None:
+        """Discard the partially written file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp_path is not None:
+            try:
+                self._tmp_path.unlink()
+            except FileNotFoundError:
+                pass
+            self._tmp_path = None
+
+
+def write_atomic(path: Path, text: str, encoding: str = "utf-8") -> Path:
+    """
+    Write a whole text file, replacing any previous one atomically.
+
+    Args:
+        path: Final file path
+        text: File contents
+        encoding: Text encoding of the file
+
+    Returns:
+        Path to the written file
+    """
+    with AtomicWriter(path, encoding) as writer:
+        writer.write(text)
+    return writer.path
@@ -6,23 +6,281 @@ producing structured scores and justifications compatible with the manual evalua
 """
 
 import json
-import re
-from typing import Dict, Any, Optional
-
+import statistics
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+
+from utils.concurrency import iter_completed, run_concurrently
+from utils.evaluator import Evaluator
+from utils.json_extractor import extract_json
+from utils.json_repair import repair_json
 from utils.llm_client import LLMClient
+from utils.rubric_parser import rubric_fingerprint
+from utils.score_cache import ScoreCache, score_key
+
+JUDGE_SYSTEM_PROMPT = (
+    "You are an expert AI response evaluator. You evaluate AI-generated responses "
+    "using structured rubrics. You MUST respond ONLY with valid JSON, no other text. "
+    "Do NOT include any markdown formatting, code blocks, or commentary. "
+    "Be fair, objective, and thorough in your evaluations."
+)
+
+STRICT_JUDGE_SYSTEM_PROMPT = (
+    "You are an expert AI evaluator. You MUST output ONLY a single, valid JSON object. "
+    "No markdown, no code blocks, no commentary before or after the JSON. "
+    "Ensure all strings are properly escaped. Do not use trailing commas. "
+    "Output MUST start with { and end with }."
+)
+
+REPAIR_SYSTEM_PROMPT = (
+    "You repair malformed JSON. Output ONLY the corrected JSON object, conforming to the given schema. "
+    "Keep every score, comment and justification exactly as written; only fix the syntax "
+    "and fill in anything structurally required that is missing."
+)
+
+# Parse stages, from cheapest to most expensive:
+#   direct       - judge output parsed as-is (after extraction/cleaning)
+#   local_repair - fixed by the tolerant local parser, no extra call
+#   llm_repair   - fixed by a cheap call sending only the broken JSON and the schema
+#   full_retry   - the full judge prompt was re-sent with the strict system prompt
+#   failed       - no stage produced a valid judgement
+PARSE_STAGES = ("direct", "local_repair", "llm_repair", "full_retry", "failed")
+_parse_stage_counts: Dict[str, int] = {stage: 0 for stage in PARSE_STAGES}
+_parse_stage_lock = threading.Lock()
+
+# Agreement between the A/B and B/A orderings of position-swapped judgements
+_position_stats: Dict[str, int] = {"judgements": 0, "consistent": 0, "matching_scores": 0, "scores": 0}
+_position_stats_lock = threading.Lock()
+
+# Output token budget per dimension in sharded mode
+SHARD_MAX_TOKENS_PER_DIMENSION = 1024
+
+# Pointwise comparisons whose weighted final scores (0-10) are closer than
+# this are settled by a pairwise tie-break call
+POINTWISE_TIE_MARGIN = 0.5
+
+# How an ensemble combines its judges' per-dimension scores
+ENSEMBLE_AGGREGATES = ("median", "majority")
+
+# Memoized judge prompt prefixes keyed by rubric fingerprint
+_MAX_CACHED_PREFIXES = 64
+_prefix_cache: Dict[str, str] = {}
+_prefix_cache_lock = threading.Lock()
+
+
+def _memoized_prefix(key: str, render: Callable[[], str]) -> str:
+    """Return the cached prompt prefix for ``key``, rendering it on first use."""
+    prefix = _prefix_cache.get(key)
+    if prefix is None:
+        prefix = render()
+        with _prefix_cache_lock:
+            if len(_prefix_cache) >= _MAX_CACHED_PREFIXES:
+                _prefix_cache.clear()
+            _prefix_cache[key] = prefix
+    return prefix
+
+
+def _record_parse_stage(stage: str) -> None:
+    """Count a judgement resolved at ``stage``."""
+    with _parse_stage_lock:
+        _parse_stage_counts[stage] += 1
+
+
+def parse_stage_counts() -> Dict[str, int]:
+    """
+    How many judgements were resolved at each parse stage in this process.
+
+    Returns:
+        Mapping of stage name (see PARSE_STAGES) to count
+    """
+    with _parse_stage_lock:
+        return dict(_parse_stage_counts)
+
+
+def reset_parse_stage_counts() -> None:
+    """Zero all parse stage counters."""
+    with _parse_stage_lock:
+        for stage in PARSE_STAGES:
+            _parse_stage_counts[stage] = 0
+
+
+def _record_position_agreement(consistent: bool, matching_scores: int, scores: int) -> None:
+    """Count one position-swapped judgement."""
+    with _position_stats_lock:
+        _position_stats["judgements"] += 1
+        _position_stats["consistent"] += 1 if consistent else 0
+        _position_stats["matching_scores"] += matching_scores
+        _position_stats["scores"] += scores
+
+
+def position_agreement_stats() -> Dict[str, Any]:
+    """
+    How often position-swapped judgements agreed with themselves in this process.
+
+    Returns:
+        Dictionary containing:
+            - judgements: Position-swapped judgements made
+            - consistent: Judgements whose preference survived the swap
+            - consistency_rate: consistent / judgements (None without data)
+            - score_agreement: Share of dimension scores identical in both
+              orderings (None without data)
+    """
+    with _position_stats_lock:
+        stats = dict(_position_stats)
+    judgements, scores = stats["judgements"], stats.pop("scores")
+    matching = stats.pop("matching_scores")
+    stats["consistency_rate"] = stats["consistent"] / judgements if judgements else None
+    stats["score_agreement"] = matching / scores if scores else None
+    return stats
+
+
+def reset_position_agreement_stats() -> None:
+    """Zero the position agreement counters."""
+    with _position_stats_lock:
+        for key in _position_stats:
+            _position_stats[key] = 0
+
+
+class JudgeCancelled(Exception):
+    """Raised when a judgement is abandoned because its result is no longer needed."""
+
+
+def _raise_if_cancelled(cancel: Optional[threading.Event]) -> None:
+    """Stop before the next judge request once ``cancel`` is set."""
+    if cancel is not None and cancel.is_set():
+        raise JudgeCancelled("Judgement cancelled")
+
+
+def _scores_schema(dim_names: List[str]) -> Dict[str, Any]:
+    """JSON Schema of a {dimension: {score, comment}} object."""
+    dimension_schema = {
+        "type": "object",
+        "properties": {
+            "score": {"type": "integer", "enum": [1, 2, 3]},
+            "comment": {"type": "string"}
+        },
+        "required": ["score", "comment"],
+        "additionalProperties": False
+    }
+    return {
+        "type": "object",
+        "properties": {name: dimension_schema for name in dim_names},
+        "required": dim_names,
+        "additionalProperties": False
+    }
+
+
+def build_judge_schema(rubric: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON Schema of the judge output for a rubric.
+
+    Args:
+        rubric: Parsed rubric dictionary with dimensions
+
+    Returns:
+        JSON Schema dictionary
+    """
+    scores_schema = _scores_schema([dim["name"] for dim in rubric.get("dimensions", [])])
+    return {
+        "type": "object",
+        "properties": {
+            "scores_a": scores_schema,
+            "scores_b": scores_schema,
+            "preferred_response": {"type": "string", "enum": ["A", "B"]},
+            "justification": {"type": "string"}
+        },
+        "required": ["scores_a", "scores_b", "preferred_response", "justification"],
+        "additionalProperties": False
+    }
+
+
+def build_shard_schema(dimensions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    JSON Schema of the judge output for one shard of dimensions.
+
+    Args:
+        dimensions: Dimensions judged in the shard
+
+    Returns:
+        JSON Schema dictionary
+    """
+    scores_schema = _scores_schema([dim["name"] for dim in dimensions])
+    return {
+        "type": "object",
+        "properties": {
+            "scores_a": scores_schema,
+            "scores_b": scores_schema,
+            "preferred_response": {"type": "string", "enum": ["A", "B"]},
+            "notes": {"type": "string"}
+        },
+        "required": ["scores_a", "scores_b", "preferred_response", "notes"],
+        "additionalProperties": False
+    }
+
+
+def build_pointwise_schema(rubric: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON Schema of the judge output when scoring a single response.
+
+    Args:
+        rubric: Parsed rubric dictionary with dimensions
+
+    Returns:
+        JSON Schema dictionary
+    """
+    return {
+        "type": "object",
+        "properties": {
+            "scores": _scores_schema([dim["name"] for dim in rubric.get("dimensions", [])]),
+            "summary": {"type": "string"}
+        },
+        "required": ["scores", "summary"],
+        "additionalProperties": False
+    }
+
+
+TIE_BREAK_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "preferred_response": {"type": "string", "enum": ["A", "B"]},
+        "justification": {"type": "string"}
+    },
+    "required": ["preferred_response", "justification"],
+    "additionalProperties": False
+}
 
 
 class AutoEvaluator:
     """Automated evaluation using LLM-as-Judge approach."""
 
-    def __init__(self, llm_client: LLMClient):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        use_cache: Optional[bool] = None,
+        structured_output: bool = True,
+        score_cache: Optional[ScoreCache] = None,
+        throttle: Optional[Callable[[int], None]] = None
+    ):
         """
         Initialize the auto-evaluator.
 
         Args:
             llm_client: LLMClient instance for calling the judge model
+            use_cache: Force the client's response cache on/off for judge calls
+                (None = client default, i.e. only deterministic calls)
+            structured_output: Constrain judge output to the rubric's JSON schema
+                (structured outputs or tool calling, whichever the judge supports)
+            score_cache: Optional cache of pointwise scores, reused across comparisons
+            throttle: Called with the number of requests (1) before every judge
+                request, e.g. to block on a rate limiter
         """
         self.llm_client = llm_client
+        self.use_cache = use_cache
+        self.structured_output = structured_output
+        self.score_cache = score_cache
+        self.throttle = throttle
 
     def auto_evaluate(
         self,
@@ -30,7 +288,11 @@ class AutoEvaluator:
         response_a: str,
         response_b: str,
         rubric: Dict[str, Any],
-        judge_model: str
+        judge_model: str,
+        sharded: bool = False,
+        dimensions_per_shard: int = 1,
+        swap_positions: bool = False,
+        cancel: Optional[threading.Event] = None
     ) -> Dict[str, Any]:
         """
         Run automated evaluation of two responses using an LLM judge.
@@ -41,6 +303,15 @@ class AutoEvaluator:
             response_b: Second AI response
             rubric: Parsed rubric dictionary with dimensions
             judge_model: Model ID for the judge LLM
+            sharded: Judge each group of dimensions in its own concurrent call
+                instead of one call covering the whole rubric
+            dimensions_per_shard: Dimensions per judge call in sharded mode
+            swap_positions: Also judge with B shown first, concurrently, and
+                reconcile both orderings to cancel the judge's position bias
+                (see ``_auto_evaluate_swapped``); cannot be combined with sharding
+            cancel: Once set, no further judge request (first call, JSON
+                repair, retry, shard or second ordering) is sent; used to stop
+                ensemble stragglers
 
         Returns:
             Dictionary containing:
@@ -48,47 +319,719 @@ class AutoEvaluator:
                 - scores_b: {dim_name: {'score': 1-3, 'comment': str}}
                 - preferred_response: 'A' or 'B'
                 - justification: Comparative justification text
+                - judge_usage: Token counts summed over all judge calls, including
+                  provider prompt-cache hits (cached_tokens) and misses (uncached_tokens)
+                - judge_calls: Judge requests made, including JSON repairs,
+                  retries, shards and both orderings
+                - parse_stage: Cheapest stage that produced valid JSON (see PARSE_STAGES)
+                - position_consistent, position_agreement, orderings: Only with
+                  swap_positions, see ``_auto_evaluate_swapped``
+
+        Raises:
+            ValueError: If the judge output cannot be parsed, even after a retry,
+                or if swap_positions is combined with sharded
+            LLMError: If the judge call itself fails (rate limit, server error, ...)
+            JudgeCancelled: If ``cancel`` was set before the judgement finished
         """
+        if swap_positions:
+            if sharded:
+                raise ValueError("Position-swapped judging cannot be combined with sharded judging")
+            return self._auto_evaluate_swapped(prompt, response_a, response_b, rubric, judge_model, cancel)
+
+        if sharded:
+            return self._auto_evaluate_sharded(
+                prompt, response_a, response_b, rubric, judge_model, dimensions_per_shard, cancel
+            )
+
         judge_prompt = self._build_judge_prompt(prompt, response_a, response_b, rubric)
+        schema = build_judge_schema(rubric)
+        usage: Dict[str, int] = {}
+        result = None
+        calls = 1
 
-        system_prompt = (
-            "You are an expert AI response evaluator. You evaluate AI-generated responses "
-            "using structured rubrics. You MUST respond ONLY with valid JSON, no other text. "
-            "Do NOT include any markdown formatting, code blocks, or commentary. "
-            "Be fair, objective, and thorough in your evaluations."
-        )
+        _raise_if_cancelled(cancel)
+        raw_response = self._call_judge(judge_prompt, judge_model, JUDGE_SYSTEM_PROMPT, 0.3, usage, schema=schema)
 
-        raw_response = self.llm_client.generate_response(
-            prompt=judge_prompt,
-            model=judge_model,
-            system_prompt=system_prompt,
-            temperature=0.3,
-            max_tokens=8192
+        # Parse as-is, then with the tolerant local parser
+        try:
+            data, stage = self._decode_judge_json(raw_response)
+            result = self._validate_judge_data(data, rubric)
+        except ValueError:
+            pass
+
+        # Malformed JSON: ask for a repair of just the JSON, not a new judgement
+        if result is None and "{" in raw_response:
+            _raise_if_cancelled(cancel)
+            repair_prompt = self._build_repair_prompt(raw_response, rubric)
+            calls += 1
+            repaired = self._call_judge(repair_prompt, judge_model, REPAIR_SYSTEM_PROMPT, 0.0, usage, schema=schema)
+            try:
+                data, _ = self._decode_judge_json(repaired)
+                result = self._validate_judge_data(data, rubric)
+                stage = "llm_repair"
+            except ValueError:
+                pass
+
+        # No usable JSON at all: re-run the judgement with a stricter prompt
+        if result is None:
+            _raise_if_cancelled(cancel)
+            calls += 1
+            raw_response = self._call_judge(
+                judge_prompt, judge_model, STRICT_JUDGE_SYSTEM_PROMPT, 0.1, usage, schema=schema
+            )
+            try:
+                result = self._parse_judge_response(raw_response, rubric)
+                stage = "full_retry"
+            except ValueError:
+                _record_parse_stage("failed")
+                raise
+
+        _record_parse_stage(stage)
+        result["parse_stage"] = stage
+        result["judge_usage"] = self._summarize_usage(usage)
+        result["judge_calls"] = calls
+        return result
+
+    def _auto_evaluate_swapped(
+        self,
+        prompt: str,
+        response_a: str,
+        response_b: str,
+        rubric: Dict[str, Any],
+        judge_model: str,
+        cancel: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Judge both orderings concurrently and reconcile them.
+
+        The B/A judgement is mapped back onto the original labels. A dimension
+        keeps its score when both orderings agree and otherwise gets the lower
+        of the two. When both orderings prefer the same response, that
+        preference stands. When they disagree, the judge's choice followed
+        the position, so the reconciled weighted scores decide, and a tie
+        goes to A.
+
+        Returns:
+            The ``auto_evaluate`` result keys, plus:
+                - position_consistent: Whether both orderings preferred the same response
+                - position_agreement: Share of dimension scores identical in both orderings
+                - orderings: Preferred response of the A-first and B-first runs,
+                  in the original labels
+        """
+        first, swapped = run_concurrently([
+            lambda: self.auto_evaluate(prompt, response_a, response_b, rubric, judge_model, cancel=cancel),
+            lambda: self.auto_evaluate(prompt, response_b, response_a, rubric, judge_model, cancel=cancel)
+        ])
+        swapped_preferred = "B" if swapped["preferred_response"] == "A" else "A"
+        consistent = first["preferred_response"] == swapped_preferred
+
+        matching = 0
+        reconciled: Dict[str, Dict[str, Any]] = {"A": {}, "B": {}}
+        for label, ours, theirs in (("A", first["scores_a"], swapped["scores_b"]),
+                                    ("B", first["scores_b"], swapped["scores_a"])):
+            for dim in rubric.get("dimensions", []):
+                name = dim["name"]
+                entry, other = ours[name], theirs[name]
+                matching += 1 if entry["score"] == other["score"] else 0
+                reconciled[label][name] = entry if entry["score"] <= other["score"] else other
+        compared = 2 * len(rubric.get("dimensions", []))
+        _record_position_agreement(consistent, matching, compared)
+
+        if consistent:
+            preferred = first["preferred_response"]
+            justification = first["justification"]
+        else:
+            evaluator = Evaluator()
+            final_a = evaluator.calculate_score(rubric, reconciled["A"])
+            final_b = evaluator.calculate_score(rubric, reconciled["B"])
+            preferred = "B" if final_b > final_a else "A"
+            justification = (
+                f"⚠️ Position bias: the judge preferred Response {first['preferred_response']} with A shown first "
+                f"and Response {swapped_preferred} with B shown first. Response {preferred} is preferred on the "
+                f"reconciled scores (A: {final_a:.2f}/10, B: {final_b:.2f}/10).\n\n"
+                f"**Judgement with A shown first:** {first['justification']}"
+            )
+
+        usage: Dict[str, int] = {}
+        for result in (first, swapped):
+            for key, value in result["judge_usage"].items():
+                if key != "uncached_tokens":
+                    usage[key] = usage.get(key, 0) + value
+
+        return {
+            "scores_a": reconciled["A"],
+            "scores_b": reconciled["B"],
+            "preferred_response": preferred,
+            "justification": justification,
+            "judge_usage": self._summarize_usage(usage),
+            "judge_calls": first["judge_calls"] + swapped["judge_calls"],
+            "parse_stage": max(first["parse_stage"], swapped["parse_stage"], key=PARSE_STAGES.index),
+            "position_consistent": consistent,
+            "position_agreement": matching / compared if compared else 1.0,
+            "orderings": {"a_first": first["preferred_response"], "b_first": swapped_preferred}
+        }
+
+    def evaluate_ensemble(
+        self,
+        prompt: str,
+        response_a: str,
+        response_b: str,
+        rubric: Dict[str, Any],
+        judge_models: Sequence[str],
+        aggregate: str = "median",
+        quorum: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Judge two responses with several judge models at once.
+
+        Every judge runs ``auto_evaluate`` concurrently. As soon as ``quorum``
+        judges agree on the preferred response, the rest are abandoned:
+        judges still queued are cancelled, and running ones send no further
+        request (JSON repair or retry) and are no longer waited for. The
+        ensemble is then as fast as its fastest quorum. Scores are aggregated
+        per dimension over the judges that answered. Ties and even-sized
+        medians go to the lower score.
+
+        Args:
+            prompt: The original user prompt
+            response_a: First AI response
+            response_b: Second AI response
+            rubric: Parsed rubric dictionary with dimensions
+            judge_models: Model IDs of the judges
+            aggregate: Per-dimension aggregation, one of ENSEMBLE_AGGREGATES
+            quorum: Agreeing judges needed to stop early (None = a majority of
+                ``judge_models``)
+
+        Returns:
+            The ``auto_evaluate`` result keys, plus:
+                - judges: Per judge, in ``judge_models`` order: model, status
+                  ("ok", "error" or "cancelled"), latency (seconds),
+                  preferred_response and error
+                - agreement: Share of answering judges that preferred the
+                  ensemble's response
+                - score_agreement: Share of the answering judges' dimension
+                  scores equal to the aggregated score
+                - early_stop: Whether a quorum ended the ensemble early
+
+        Raises:
+            ValueError: If no judge models are given, the aggregate is unknown,
+                or every judge's output was unparseable
+            LLMError: If every judge failed and the first failure was an API error
+        """
+        judge_models = list(judge_models)
+        if not judge_models:
+            raise ValueError("An ensemble needs at least one judge model")
+        if aggregate not in ENSEMBLE_AGGREGATES:
+            raise ValueError(f"Unknown aggregate '{aggregate}', expected one of {ENSEMBLE_AGGREGATES}")
+        quorum = quorum or len(judge_models) // 2 + 1
+
+        cancel = threading.Event()
+
+        def judge(model: str) -> Tuple[Dict[str, Any], float]:
+            started = time.monotonic()
+            result = self.auto_evaluate(prompt, response_a, response_b, rubric, model, cancel=cancel)
+            return result, time.monotonic() - started
+
+        judges = [
+            {"model": model, "status": "cancelled", "latency": None, "preferred_response": None, "error": None}
+            for model in judge_models
+        ]
+        results: List[Dict[str, Any]] = []
+        errors: List[BaseException] = []
+        votes: Counter = Counter()
+        early_stop = False
+
+        completed = iter_completed([lambda model=model: judge(model) for model in judge_models])
+        try:
+            for index, future in completed:
+                try:
+                    result, latency = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    judges[index].update(status="error", error=str(e))
+                    continue
+                results.append(result)
+                votes[result["preferred_response"]] += 1
+                judges[index].update(status="ok", latency=latency, preferred_response=result["preferred_response"])
+                pending = any(entry["status"] == "cancelled" for entry in judges)
+                if pending and max(votes.values()) >= quorum:
+                    early_stop = True
+                    break
+        finally:
+            cancel.set()
+            completed.close()
+
+        if not results:
+            raise errors[0]
+
+        scores = {}
+        matching = 0
+        for key in ("scores_a", "scores_b"):
+            scores[key] = {}
+            for dim in rubric.get("dimensions", []):
+                name = dim["name"]
+                entries = [result[key][name] for result in results]
+                values = sorted(entry["score"] for entry in entries)
+                if aggregate == "median":
+                    score = statistics.median_low(values)
+                else:
+                    counts = Counter(values)
+                    score = min(values, key=lambda value: (-counts[value], value))
+                matching += values.count(score)
+                scores[key][name] = next(entry for entry in entries if entry["score"] == score)
+
+        evaluator = Evaluator()
+        final_a = evaluator.calculate_score(rubric, scores["scores_a"])
+        final_b = evaluator.calculate_score(rubric, scores["scores_b"])
+        if votes["A"] != votes["B"]:
+            preferred = "A" if votes["A"] > votes["B"] else "B"
+        else:
+            preferred = "B" if final_b > final_a else "A"
+
+        lines = [
+            f"Response {preferred} is preferred by {votes[preferred]} of {len(results)} judges "
+            f"(aggregated score A: {final_a:.2f}/10, B: {final_b:.2f}/10)."
+        ]
+        if votes["A"] == votes["B"]:
+            lines[0] += " The judges were split, so the aggregated scores decide."
+        # Every preference in the vote has at least one judge behind it
+        agreeing = next(result for result in results if result["preferred_response"] == preferred)
+        lines.append(agreeing["justification"])
+
+        usage: Dict[str, int] = {}
+        for result in results:
+            for key, value in result["judge_usage"].items():
+                if key != "uncached_tokens":
+                    usage[key] = usage.get(key, 0) + value
+        compared = 2 * len(rubric.get("dimensions", [])) * len(results)
+
+        return {
+            "scores_a": scores["scores_a"],
+            "scores_b": scores["scores_b"],
+            "preferred_response": preferred,
+            "justification": "\n\n".join(lines),
+            "judge_usage": self._summarize_usage(usage),
+            "judge_calls": sum(result["judge_calls"] for result in results),
+            "parse_stage": max((result["parse_stage"] for result in results), key=PARSE_STAGES.index),
+            "judges": judges,
+            "agreement": votes[preferred] / len(results),
+            "score_agreement": matching / compared if compared else 1.0,
+            "early_stop": early_stop
+        }
+
+    def score_response(
+        self,
+        prompt: str,
+        response: str,
+        rubric: Dict[str, Any],
+        judge_model: str
+    ) -> Dict[str, Any]:
+        """
+        Judge a single response against the rubric (pointwise).
+
+        With a score cache, results are reused for the same rubric, prompt,
+        response and judge model, so a response compared against many others
+        is judged only once.
+
+        Args:
+            prompt: The original user prompt
+            response: Response to score
+            rubric: Parsed rubric dictionary with dimensions
+            judge_model: Model ID for the judge LLM
+
+        Returns:
+            Dictionary containing:
+                - scores: {dim_name: {'score': 1-3, 'comment': str}}
+                - summary: Short assessment of the response
+                - from_cache: Whether the scores came from the score cache
+                - judge_calls: Judge requests made (0 on a cache hit)
+                - judge_usage: Token counts summed over those requests
+                - parse_stage: Cheapest stage that produced valid JSON (see PARSE_STAGES)
+
+        Raises:
+            ValueError: If the judge output cannot be parsed, even after a retry
+            LLMError: If the judge call itself fails
+        """
+        key = score_key(rubric, prompt, response, judge_model) if self.score_cache is not None else None
+        if key is not None:
+            cached = self.score_cache.get(key)
+            if cached is not None:
+                return {**cached, "from_cache": True, "judge_calls": 0, "judge_usage": {}, "parse_stage": "direct"}
+
+        judge_prompt = self._build_pointwise_prompt(prompt, response, rubric)
+        schema = build_pointwise_schema(rubric)
+        usage: Dict[str, int] = {}
+        attempts = ((JUDGE_SYSTEM_PROMPT, 0.3), (STRICT_JUDGE_SYSTEM_PROMPT, 0.1))
+        for calls, (system_prompt, temperature) in enumerate(attempts, start=1):
+            raw_response = self._call_judge(judge_prompt, judge_model, system_prompt, temperature, usage, schema=schema)
+            try:
+                result = self._parse_pointwise_response(raw_response, rubric)
+                break
+            except ValueError:
+                if calls == len(attempts):
+                    _record_parse_stage("failed")
+                    raise
+
+        stage = result.pop("parse_stage")
+        if calls > 1:
+            stage = "full_retry"
+        _record_parse_stage(stage)
+        if key is not None:
+            self.score_cache.set(key, result)
+        return {
+            **result,
+            "from_cache": False,
+            "judge_calls": calls,
+            "judge_usage": self._summarize_usage(usage),
+            "parse_stage": stage
+        }
+
+    def compare_pointwise(
+        self,
+        prompt: str,
+        response_a: str,
+        response_b: str,
+        rubric: Dict[str, Any],
+        judge_model: str,
+        tie_margin: float = POINTWISE_TIE_MARGIN
+    ) -> Dict[str, Any]:
+        """
+        Compare two responses through their pointwise scores.
+
+        Both responses are scored on their own (concurrently, and from the
+        score cache when already judged) and the weighted final scores decide
+        the preference. Only when they are within ``tie_margin`` of each other
+        is a pairwise tie-break call made.
+
+        Args:
+            prompt: The original user prompt
+            response_a: First AI response
+            response_b: Second AI response
+            rubric: Parsed rubric dictionary with dimensions
+            judge_model: Model ID for the judge LLM
+            tie_margin: Final-score gap (0-10 scale) below which the tie-break call decides
+
+        Returns:
+            The ``auto_evaluate`` result keys, plus:
+                - judge_calls: Judge requests made for this comparison
+                - cached_scores: How many of the two responses were scored from the cache
+                - tie_break: Whether the pairwise tie-break call decided the preference
+
+        Raises:
+            ValueError: If a response's scores cannot be parsed, even after a retry
+            LLMError: If a judge call itself fails
+        """
+        point_a, point_b = run_concurrently([
+            lambda: self.score_response(prompt, response_a, rubric, judge_model),
+            lambda: self.score_response(prompt, response_b, rubric, judge_model)
+        ])
+        result = self.compare_scored(prompt, response_a, response_b, point_a, point_b, rubric, judge_model, tie_margin)
+
+        usage = dict(result["judge_usage"])
+        for point in (point_a, point_b):
+            for key, value in point["judge_usage"].items():
+                if key != "uncached_tokens":
+                    usage[key] = usage.get(key, 0) + value
+        result["judge_usage"] = self._summarize_usage(usage)
+        result["judge_calls"] += point_a["judge_calls"] + point_b["judge_calls"]
+        return result
+
+    def compare_scored(
+        self,
+        prompt: str,
+        response_a: str,
+        response_b: str,
+        point_a: Dict[str, Any],
+        point_b: Dict[str, Any],
+        rubric: Dict[str, Any],
+        judge_model: str,
+        tie_margin: float = POINTWISE_TIE_MARGIN
+    ) -> Dict[str, Any]:
+        """
+        Compare two responses that were already scored with ``score_response``.
+
+        Lets callers comparing many pairs (e.g. a tournament) score every
+        response once up front. Only the tie-break call, if needed, is made here.
+
+        Args:
+            prompt: The original user prompt
+            response_a: First AI response
+            response_b: Second AI response
+            point_a: ``score_response`` result for response A
+            point_b: ``score_response`` result for response B
+            rubric: Parsed rubric dictionary with dimensions
+            judge_model: Model ID for the judge LLM
+            tie_margin: Final-score gap (0-10 scale) below which the tie-break call decides
+
+        Returns:
+            Same keys as ``compare_pointwise``; judge_calls and judge_usage
+            only cover the tie-break call
+        """
+        evaluator = Evaluator()
+        final_a = evaluator.calculate_score(rubric, point_a["scores"])
+        final_b = evaluator.calculate_score(rubric, point_b["scores"])
+
+        usage: Dict[str, int] = {}
+        tie_break = abs(final_a - final_b) < tie_margin
+        decision = None
+        if tie_break:
+            decision = self._tie_break(prompt, response_a, response_b, rubric, judge_model, usage)
+        if decision is not None:
+            preferred, reason = decision
+        else:
+            preferred, reason = ("B" if final_b > final_a else "A"), ""
+
+        lines = [
+            f"Response {preferred} is preferred "
+            f"(weighted score A: {final_a:.2f}/10, B: {final_b:.2f}/10)."
+        ]
+        if tie_break:
+            lines.append(
+                f"The scores are within {tie_margin:g} points, so the responses were compared head to head: {reason}"
+                if decision is not None else
+                "The scores are within the tie margin and the head-to-head comparison was unreadable; "
+                "the higher score decides."
+            )
+        for label, point in (("A", point_a), ("B", point_b)):
+            if point["summary"]:
+                lines.append(f"- **Response {label}**: {point['summary']}")
+
+        stages = [point["parse_stage"] for point in (point_a, point_b)]
+        return {
+            "scores_a": point_a["scores"],
+            "scores_b": point_b["scores"],
+            "preferred_response": preferred,
+            "justification": "\n".join(lines),
+            "judge_usage": self._summarize_usage(usage),
+            "parse_stage": max(stages, key=PARSE_STAGES.index),
+            "judge_calls": 1 if tie_break else 0,
+            "cached_scores": sum(1 for point in (point_a, point_b) if point["from_cache"]),
+            "tie_break": tie_break
+        }
+
+    def _tie_break(
+        self,
+        prompt: str,
+        response_a: str,
+        response_b: str,
+        rubric: Dict[str, Any],
+        judge_model: str,
+        usage: Dict[str, int]
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Ask the judge which of two closely scored responses is better.
+
+        Returns:
+            Tuple of (preferred response, justification), or None if the
+            output could not be read
+        """
+        prefix = _memoized_prefix(
+            rubric_fingerprint(rubric) + ":tie_break", lambda: self._render_tie_break_prefix(rubric)
         )
+        judge_prompt = prefix + f"""
+
+## Original Prompt
+
+{prompt}
+
+## Response A
+
+{response_a}
+
+## Response B
 
-        # First attempt to parse
+{response_b}"""
+        raw_response = self._call_judge(
+            judge_prompt, judge_model, JUDGE_SYSTEM_PROMPT, 0.0, usage, max_tokens=1024, schema=TIE_BREAK_SCHEMA
+        )
         try:
-            return self._parse_judge_response(raw_response, rubric)
+            data, _ = self._decode_judge_json(raw_response)
         except ValueError:
-            pass  # Fall through to retry
-
-        # Retry with a stricter prompt
-        strict_system_prompt = (
-            "You are an expert AI evaluator. You MUST output ONLY a single, valid JSON object. "
-            "No markdown, no code blocks, no commentary before or after the JSON. "
-            "Ensure all strings are properly escaped. Do not use trailing commas. "
-            "Output MUST start with { and end with }."
-        )
+            return None
+        if not isinstance(data, dict) or data.get("preferred_response") not in ("A", "B"):
+            return None
+        return data["preferred_response"], str(data.get("justification") or "")
 
-        raw_response = self.llm_client.generate_response(
+    def _call_judge(
+        self,
+        judge_prompt: str,
+        judge_model: str,
+        system_prompt: str,
+        temperature: float,
+        usage: Dict[str, int],
+        max_tokens: int = 8192,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Call the judge model, accumulating token usage into ``usage``.
+
+        Returns the raw response text. API failures are raised as typed
+        ``LLMError``s (already retried by the client) rather than fed to the
+        JSON parse-and-repair logic, which can only fix malformed output.
+        """
+        if self.throttle is not None:
+            self.throttle(1)
+        completion = self.llm_client.generate_completion(
             prompt=judge_prompt,
             model=judge_model,
-            system_prompt=strict_system_prompt,
-            temperature=0.1,
-            max_tokens=8192
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            use_cache=self.use_cache,
+            json_schema=schema if self.structured_output else None,
+            schema_name="evaluation"
         )
 
-        return self._parse_judge_response(raw_response, rubric)
+        for key, value in completion.get("usage", {}).items():
+            usage[key] = usage.get(key, 0) + value
+        return completion["content"] or ""
+
+    def _auto_evaluate_sharded(
+        self,
+        prompt: str,
+        response_a: str,
+        response_b: str,
+        rubric: Dict[str, Any],
+        judge_model: str,
+        dimensions_per_shard: int,
+        cancel: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """
+        Judge groups of dimensions concurrently and merge the shards.
+
+        Each shard is validated on its own; only failed shards are retried
+        (with the strict system prompt). The preferred response follows the
+        weighted final scores, with the judge's per-shard preferences
+        breaking ties.
+        """
+        dimensions = rubric.get("dimensions", [])
+        if not dimensions:
+            raise ValueError("Rubric has no dimensions to judge")
+
+        size = max(1, dimensions_per_shard)
+        shards = [dimensions[i:i + size] for i in range(0, len(dimensions), size)]
+        prompts = [self._build_shard_prompt(prompt, response_a, response_b, rubric, shard) for shard in shards]
+        usages: List[Dict[str, int]] = [{} for _ in shards]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(shards)
+        errors: List[str] = [""] * len(shards)
+        calls = 0
+
+        def judge_shard(i: int, system_prompt: str, temperature: float) -> str:
+            _raise_if_cancelled(cancel)
+            return self._call_judge(
+                prompts[i], judge_model, system_prompt, temperature, usages[i],
+                max_tokens=SHARD_MAX_TOKENS_PER_DIMENSION * len(shards[i]),
+                schema=build_shard_schema(shards[i])
+            )
+
+        retried = False
+        for system_prompt, temperature in ((JUDGE_SYSTEM_PROMPT, 0.3), (STRICT_JUDGE_SYSTEM_PROMPT, 0.1)):
+            pending = [i for i, result in enumerate(results) if result is None]
+            if not pending:
+                break
+            retried = system_prompt is STRICT_JUDGE_SYSTEM_PROMPT
+            calls += len(pending)
+
+            raw_responses = run_concurrently([
+                lambda i=i, system_prompt=system_prompt, temperature=temperature: judge_shard(
+                    i, system_prompt, temperature
+                )
+                for i in pending
+            ])
+            for i, raw_response in zip(pending, raw_responses):
+                try:
+                    results[i] = self._parse_shard_response(raw_response, shards[i])
+                except ValueError as e:
+                    errors[i] = str(e)
+
+        failed = [i for i, result in enumerate(results) if result is None]
+        if failed:
+            _record_parse_stage("failed")
+            names = ", ".join(dim["name"] for i in failed for dim in shards[i])
+            raise ValueError(f"Judge failed on dimensions: {names}\n\n{errors[failed[0]]}")
+
+        usage: Dict[str, int] = {}
+        for shard_usage in usages:
+            for key, value in shard_usage.items():
+                usage[key] = usage.get(key, 0) + value
+
+        if retried:
+            stage = "full_retry"
+        elif any(result["parse_stage"] == "local_repair" for result in results):
+            stage = "local_repair"
+        else:
+            stage = "direct"
+        _record_parse_stage(stage)
+
+        merged = self._merge_shards(rubric, shards, results)
+        merged["parse_stage"] = stage
+        merged["judge_usage"] = self._summarize_usage(usage)
+        merged["judge_calls"] = calls
+        return merged
+
+    def _merge_shards(
+        self,
+        rubric: Dict[str, Any],
+        shards: List[List[Dict[str, Any]]],
+        results: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Combine validated shard results into the single-call result structure."""
+        scores_a: Dict[str, Any] = {}
+        scores_b: Dict[str, Any] = {}
+        for result in results:
+            scores_a.update(result["scores_a"])
+            scores_b.update(result["scores_b"])
+
+        evaluator = Evaluator()
+        final_a = evaluator.calculate_score(rubric, scores_a)
+        final_b = evaluator.calculate_score(rubric, scores_b)
+
+        if final_a != final_b:
+            preferred = "A" if final_a > final_b else "B"
+        else:
+            # Tie: weigh each shard's stated preference by its dimensions' weight
+            lean = 0.0
+            for shard, result in zip(shards, results):
+                weight = sum(dim.get("weight", 0) for dim in shard)
+                lean += weight if result["preferred_response"] == "A" else -weight
+            preferred = "B" if lean < 0 else "A"
+
+        lines = [
+            f"Response {preferred} is preferred "
+            f"(weighted score A: {final_a:.2f}/10, B: {final_b:.2f}/10)."
+        ]
+        for shard, result in zip(shards, results):
+            if result["notes"]:
+                names = ", ".join(dim["name"] for dim in shard)
+                lines.append(f"- **{names}**: {result['notes']}")
+
+        return {
+            "scores_a": scores_a,
+            "scores_b": scores_b,
+            "preferred_response": preferred,
+            "justification": "\n".join(lines)
+        }
+
+    def _summarize_usage(self, usage: Dict[str, int]) -> Dict[str, int]:
+        """Add the prompt-cache miss count to accumulated judge usage."""
+        summary = dict(usage)
+        if "prompt_tokens" in summary:
+            summary["uncached_tokens"] = summary["prompt_tokens"] - summary.get("cached_tokens", 0)
+        return summary
+
+    def _build_repair_prompt(self, raw_response: str, rubric: Dict[str, Any]) -> str:
+        """Build the JSON-repair prompt: the broken JSON and the expected schema only."""
+        broken = raw_response[raw_response.find("{"):]
+        schema = json.dumps(build_judge_schema(rubric), separators=(",", ":"))
+        return f"""Fix the following malformed JSON so that it is valid and conforms to this JSON Schema.
+
+## Schema
+
+{schema}
+
+## Malformed JSON
+
+{broken}"""
 
     def _build_judge_prompt(
         self,
@@ -97,11 +1040,167 @@ class AutoEvaluator:
         response_b: str,
         rubric: Dict[str, Any]
     ) -> str:
-        """Build the structured prompt for the LLM judge."""
+        """
+        Build the structured prompt for the LLM judge.
+
+        The rubric, instructions and output schema come first as a byte-identical
+        prefix shared by every judgement with the same rubric (so providers can
+        serve it from their prompt cache); the per-pair content is appended last.
+        """
+        return self._build_judge_prefix(rubric) + f"""
+
+## Original Prompt
+
+{prompt}
+
+## Response A
+
+{response_a}
+
+## Response B
+
+{response_b}"""
+
+    def _build_judge_prefix(self, rubric: Dict[str, Any]) -> str:
+        """Return the static, rubric-dependent part of the judge prompt (memoized)."""
+        return _memoized_prefix(rubric_fingerprint(rubric), lambda: self._render_judge_prefix(rubric))
+
+    def _build_shard_prompt(
+        self,
+        prompt: str,
+        response_a: str,
+        response_b: str,
+        rubric: Dict[str, Any],
+        dimensions: List[Dict[str, Any]]
+    ) -> str:
+        """Build the judge prompt for one shard of dimensions (static prefix first)."""
+        key = rubric_fingerprint(rubric) + ":" + json.dumps([dim["name"] for dim in dimensions])
+        prefix = _memoized_prefix(key, lambda: self._render_shard_prefix(rubric, dimensions))
+
+        return prefix + f"""
+
+## Original Prompt
+
+{prompt}
+
+## Response A
+
+{response_a}
+
+## Response B
+
+{response_b}"""
+
+    def _render_shard_prefix(self, rubric: Dict[str, Any], dimensions: List[Dict[str, Any]]) -> str:
+        """Render the instructions and output schema for a shard of dimensions."""
+        dim_schema = ",\n".join(
+            f'        "{dim["name"]}": {{"score": <1|2|3>, "comment": "<specific comment>"}}'
+            for dim in dimensions
+        )
+
+        return f"""Evaluate two AI-generated responses to a given prompt on the rubric dimensions below only. The prompt and both responses appear at the end of this message.
+Score EACH response independently on a 3-point scale:
+- **3 = No Issues**: Meets all criteria with no identifiable problems
+- **2 = Minor Issues**: Small problems that don't significantly impact usefulness
+- **1 = Major Issues**: Significant problems that severely impact usefulness
+
+## Evaluation Rubric: {rubric.get('name', 'Evaluation Rubric')}
+
+### Dimensions
+{self._format_dimensions(dimensions)}
+
+## Required Output Format
+
+You MUST respond with ONLY this JSON structure (no markdown, no extra text):
+
+{{
+    "scores_a": {{
+{dim_schema}
+    }},
+    "scores_b": {{
+{dim_schema}
+    }},
+    "preferred_response": "A" or "B",
+    "notes": "<one or two sentences comparing the responses on these dimensions>"
+}}
 
-        # Build dimensions description
+# Items to Evaluate"""
+
+    def _build_pointwise_prompt(self, prompt: str, response: str, rubric: Dict[str, Any]) -> str:
+        """Build the single-response judge prompt (static prefix first)."""
+        prefix = _memoized_prefix(
+            rubric_fingerprint(rubric) + ":pointwise", lambda: self._render_pointwise_prefix(rubric)
+        )
+
+        return prefix + f"""
+
+## Original Prompt
+
+{prompt}
+
+## Response
+
+{response}"""
+
+    def _render_pointwise_prefix(self, rubric: Dict[str, Any]) -> str:
+        """Render the instructions and output schema for scoring one response."""
+        dim_schema = ",\n".join(
+            f'        "{dim["name"]}": {{"score": <1|2|3>, "comment": "<specific comment>"}}'
+            for dim in rubric.get("dimensions", [])
+        )
+
+        return f"""Evaluate an AI-generated response to a given prompt. The prompt and the response appear at the end of this message, after the rubric and instructions.
+Score the response on EVERY rubric dimension below, on a 3-point scale:
+- **3 = No Issues**: Meets all criteria with no identifiable problems
+- **2 = Minor Issues**: Small problems that don't significantly impact usefulness
+- **1 = Major Issues**: Significant problems that severely impact usefulness
+
+Judge the response on its own merits; it is not being compared with another response here.
+
+## Evaluation Rubric: {rubric.get('name', 'Evaluation Rubric')}
+
+{rubric.get('description', '')}
+
+### Dimensions
+{self._format_dimensions(rubric.get("dimensions", []))}
+
+## Required Output Format
+
+You MUST respond with ONLY this JSON structure (no markdown, no extra text):
+
+{{
+    "scores": {{
+{dim_schema}
+    }},
+    "summary": "<one or two sentences on the response's main strengths and weaknesses>"
+}}
+
+# Item to Evaluate"""
+
+    def _render_tie_break_prefix(self, rubric: Dict[str, Any]) -> str:
+        """Render the instructions for choosing between two closely scored responses."""
+        return f"""Two AI-generated responses to the same prompt received nearly identical rubric scores. Decide which one is better overall. The prompt and both responses appear at the end of this message.
+
+## Evaluation Rubric: {rubric.get('name', 'Evaluation Rubric')}
+
+### Dimensions
+{self._format_dimensions(rubric.get("dimensions", []))}
+
+## Required Output Format
+
+You MUST respond with ONLY this JSON structure (no markdown, no extra text):
+
+{{
+    "preferred_response": "A" or "B",
+    "justification": "<the concrete differences that decide it>"
+}}
+
+# Items to Evaluate"""
+
+    def _format_dimensions(self, dimensions: List[Dict[str, Any]]) -> str:
+        """Render dimension definitions, criteria and rating guides for a judge prompt."""
         dimensions_text = ""
-        for dim in rubric.get("dimensions", []):
+        for dim in dimensions:
             dim_name = dim["name"]
             dim_desc = dim.get("description", "")
             dim_weight = dim.get("weight", 0)
@@ -126,6 +1225,11 @@ class AutoEvaluator:
 - **{dim_name}** (Weight: {dim_weight:.3f})
   Definition: {dim_desc}{criteria_text}{guide_text}
 """
+        return dimensions_text
+
+    def _render_judge_prefix(self, rubric: Dict[str, Any]) -> str:
+        """Render the rubric block, task instructions and output schema."""
+        dimensions_text = self._format_dimensions(rubric.get("dimensions", []))
 
         # Build list of dimension names for JSON schema
         dim_names = [dim["name"] for dim in rubric.get("dimensions", [])]
@@ -134,24 +1238,12 @@ class AutoEvaluator:
             for name in dim_names
         )
 
-        prompt_text = f"""Evaluate the following two AI-generated responses to the given prompt.
+        prefix_text = f"""Evaluate two AI-generated responses to a given prompt. The prompt and both responses appear at the end of this message, after the rubric and instructions.
 Use the rubric dimensions below to score EACH response independently on a 3-point scale:
 - **3 = No Issues**: Meets all criteria with no identifiable problems
 - **2 = Minor Issues**: Small problems that don't significantly impact usefulness
 - **1 = Major Issues**: Significant problems that severely impact usefulness
 
-## Original Prompt
-
-{prompt}
-
-## Response A
-
-{response_a}
-
-## Response B
-
-{response_b}
-
 ## Evaluation Rubric: {rubric.get('name', 'Evaluation Rubric')}
 
 {rubric.get('description', '')}
@@ -179,9 +1271,11 @@ You MUST respond with ONLY this JSON structure (no markdown, no extra text):
     }},
     "preferred_response": "A" or "B",
     "justification": "<detailed comparative justification explaining your preference, citing specific differences>"
-}}"""
+}}
+
+# Items to Evaluate"""
 
-        return prompt_text
+        return prefix_text
 
     def _parse_judge_response(
         self,
@@ -201,17 +1295,55 @@ You MUST respond with ONLY this JSON structure (no markdown, no extra text):
         Raises:
             ValueError: If response cannot be parsed or validated
         """
+        data, _ = self._decode_judge_json(raw_response)
+        return self._validate_judge_data(data, rubric)
+
+    def _decode_judge_json(self, raw_response: str) -> Tuple[Any, str]:
+        """
+        Decode judge output, falling back to the tolerant local parser.
+
+        Args:
+            raw_response: Raw text response from the judge
+
+        Returns:
+            Tuple of (decoded JSON value, stage), stage being "direct" or "local_repair"
+
+        Raises:
+            ValueError: If no JSON can be recovered
+        """
         # Try to extract JSON from various wrapping formats
         json_str = self._extract_json(raw_response)
 
         try:
-            data = json.loads(json_str)
+            return json.loads(json_str), "direct"
         except json.JSONDecodeError as e:
+            error = e
+
+        try:
+            return json.loads(repair_json(raw_response)), "local_repair"
+        except ValueError:
             raise ValueError(
-                f"Failed to parse judge response as JSON: {e}\n\n"
+                f"Failed to parse judge response as JSON: {error}\n\n"
                 f"Raw response:\n{raw_response[:500]}"
             )
 
+    def _validate_judge_data(self, data: Any, rubric: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and normalize a decoded judgement.
+
+        Args:
+            data: Decoded judge JSON
+            rubric: Rubric for validation
+
+        Returns:
+            Validated evaluation data dictionary
+
+        Raises:
+            ValueError: If required keys are missing or malformed
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Judge response must be a JSON object")
+
         # Validate structure
         required_keys = {"scores_a", "scores_b", "preferred_response", "justification"}
         missing = required_keys - set(data.keys())
@@ -257,60 +1389,108 @@ You MUST respond with ONLY this JSON structure (no markdown, no extra text):
 
         return data
 
+    def _parse_shard_response(
+        self,
+        raw_response: str,
+        dimensions: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Parse and strictly validate one shard of a sharded judgement.
+
+        Unlike the single-call parser, missing dimensions are an error, since
+        a failed shard is cheap to retry.
+
+        Args:
+            raw_response: Raw text response from the judge
+            dimensions: The dimensions this shard was asked to score
+
+        Returns:
+            Dictionary with scores_a, scores_b, preferred_response, notes and parse_stage
+
+        Raises:
+            ValueError: If the shard cannot be parsed or is incomplete
+        """
+        data, stage = self._decode_judge_json(raw_response)
+        if not isinstance(data, dict):
+            raise ValueError("Judge response must be a JSON object")
+
+        preferred = data.get("preferred_response")
+        shard = {
+            "preferred_response": preferred if preferred in ("A", "B") else "A",
+            "notes": str(data.get("notes") or ""),
+            "parse_stage": stage
+        }
+        for key in ("scores_a", "scores_b"):
+            shard[key] = self._validate_scores(data.get(key), dimensions, key)
+
+        return shard
+
+    def _parse_pointwise_response(self, raw_response: str, rubric: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse and strictly validate a single-response judgement.
+
+        Every rubric dimension must be scored, since the result is cached
+        and reused across comparisons.
+
+        Args:
+            raw_response: Raw text response from the judge
+            rubric: Rubric the response was scored on
+
+        Returns:
+            Dictionary with scores, summary and parse_stage
+
+        Raises:
+            ValueError: If the judgement cannot be parsed or is incomplete
+        """
+        data, stage = self._decode_judge_json(raw_response)
+        if not isinstance(data, dict):
+            raise ValueError("Judge response must be a JSON object")
+        return {
+            "scores": self._validate_scores(data.get("scores"), rubric.get("dimensions", []), "scores"),
+            "summary": str(data.get("summary") or ""),
+            "parse_stage": stage
+        }
+
+    def _validate_scores(self, scores: Any, dimensions: List[Dict[str, Any]], key: str) -> Dict[str, Any]:
+        """
+        Require a valid score for every dimension, clamped to 1-3.
+
+        Raises:
+            ValueError: If ``scores`` is not an object or a dimension has no valid score
+        """
+        if not isinstance(scores, dict):
+            raise ValueError(f"'{key}' must be a dictionary")
+
+        validated = {}
+        for dim in dimensions:
+            dim_data = scores.get(dim["name"])
+            if isinstance(dim_data, dict):
+                score, comment = dim_data.get("score"), dim_data.get("comment", "")
+            else:
+                score, comment = dim_data, ""
+            try:
+                score = int(score)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{key}' has no valid score for '{dim['name']}'")
+            validated[dim["name"]] = {"score": max(1, min(3, score)), "comment": str(comment or "")}
+        return validated
+
     def _extract_json(self, text: str) -> str:
         """
         Extract JSON from text that may be wrapped in markdown code blocks
         or contain extra text before/after the JSON.
 
+        Uses a single-pass scanner that returns the first balanced top-level
+        object, skipping braces in prose and in non-JSON code fences, and
+        cleaning it on the way (see ``utils.json_extractor``).
+
         Args:
             text: Raw text that may contain JSON
 
         Returns:
-            Extracted JSON string
-        """
-        # Try extracting from ```json ... ``` block
-        json_block_match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', text, re.DOTALL)
-        if json_block_match:
-            extracted = json_block_match.group(1).strip()
-            return self._clean_json_string(extracted)
-
-        # Try finding JSON object directly using brace matching
-        first_brace = text.find('{')
-        if first_brace != -1:
-            # Use brace-depth matching to find the correct closing brace
-            depth = 0
-            in_string = False
-            escape_next = False
-            for i in range(first_brace, len(text)):
-                ch = text[i]
-                if escape_next:
-                    escape_next = False
-                    continue
-                if ch == '\\':
-                    if in_string:
-                        escape_next = True
-                    continue
-                if ch == '"' and not escape_next:
-                    in_string = not in_string
-                    continue
-                if in_string:
-                    continue
-                if ch == '{':
-                    depth += 1
-                elif ch == '}':
-                    depth -= 1
-                    if depth == 0:
-                        extracted = text[first_brace:i + 1]
-                        return self._clean_json_string(extracted)
-
-            # Fallback: first { to last }
-            last_brace = text.rfind('}')
-            if last_brace > first_brace:
-                extracted = text[first_brace:last_brace + 1]
-                return self._clean_json_string(extracted)
-
-        # Return as-is and let JSON parser handle the error
-        return text.strip()
+            Extracted JSON string (the stripped text if it holds no object)
+        """
+        return extract_json(text)
 
     def _clean_json_string(self, json_str: str) -> str:
         """
@@ -327,13 +1507,4 @@ You MUST respond with ONLY this JSON structure (no markdown, no extra text):
         Returns:
             Cleaned JSON string
         """
-        # Remove BOM
-        json_str = json_str.strip().lstrip('\ufeff')
-
-        # Remove trailing commas before } or ] (common LLM mistake)
-        json_str = re.sub(r',\s*([}\]])', r'\1', json_str)
-
-        # Remove control characters (except \n \r \t which are valid in strings)
-        json_str = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', json_str)
-
-        return json_str
+        return extract_json(json_str)
@@ -0,0 +1,556 @@
+"""
+Batch Evaluation Runner
+
+Runs generation and LLM-as-Judge evaluation headlessly over a JSONL dataset,
+writing one JSONL result per row as soon as it completes. Runs are resumable:
+rows that already have a successful result in the output file are skipped.
+
+Usage (from the streamlit-app directory):
+    python -m utils.batch_runner dataset.jsonl results.jsonl \\
+        --rubric coding --judge-model <model-id> --concurrency 8 --rpm 60 \\
+        --report batch_report.md
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Set
+
+from utils.auto_evaluator import ENSEMBLE_AGGREGATES, AutoEvaluator, position_agreement_stats
+from utils.evaluation_store import EvaluationStore
+from utils.evaluator import Evaluator
+from utils.llm_client import LLMClient
+from utils.metrics import FanoutSink, JsonlSink, RingBufferSink, format_summary
+from utils.report_generator import batch_report_sections
+from utils.report_writer import write_report
+from utils.score_cache import ScoreCache
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the rate of API calls."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to one second of tokens, at least 1)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """
+        Block until the requested number of tokens is available, then consume them.
+
+        Requests larger than the capacity are taken in capacity-sized chunks,
+        so they are always charged in full.
+
+        Args:
+            tokens: Number of tokens to consume
+        """
+        while tokens > self.capacity:
+            self._take(self.capacity)
+            tokens -= self.capacity
+        self._take(tokens)
+
+    def _take(self, tokens: float) -> None:
+        """Block until ``tokens`` (at most the capacity) are available, then consume them."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class BatchRunner:
+    """Generates and judges response pairs for a whole dataset."""
+
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        rubric: Dict[str, Any],
+        judge_model: str,
+        concurrency: int = 4,
+        requests_per_minute: Optional[float] = None,
+        system_prompt: str = "You are a helpful AI assistant.",
+        params_a: Optional[Dict] = None,
+        params_b: Optional[Dict] = None,
+        use_cache: Optional[bool] = None,
+        sharded: bool = False,
+        store: Optional[EvaluationStore] = None,
+        pointwise: bool = False,
+        score_cache: Optional[ScoreCache] = None,
+        swap_positions: bool = False,
+        ensemble: Optional[List[str]] = None,
+        aggregate: str = "median"
+    ):
+        """
+        Initialize the batch runner.
+
+        Args:
+            llm_client: LLMClient used for generation and judging
+            rubric: Parsed rubric dictionary
+            judge_model: Model ID for the judge LLM
+            concurrency: Maximum number of rows processed at once
+            requests_per_minute: API call rate limit (None = unlimited)
+            system_prompt: Default system prompt for generated rows
+            params_a: Default generation parameters for model A
+            params_b: Default generation parameters for model B
+            use_cache: Force the client's response cache on/off for every call
+                (None = client default, i.e. only deterministic calls)
+            sharded: Judge each rubric dimension in its own concurrent call
+            store: Evaluation store every successful result is also appended to
+            pointwise: Score each response on its own and derive the preference
+                from the final scores (tie-break call only when they are close)
+            score_cache: Pointwise score cache shared across rows and runs
+            swap_positions: Judge every pair in both orders concurrently and
+                reconcile them, cancelling the judge's position bias
+            ensemble: Judge models of a judge ensemble used instead of
+                ``judge_model`` (see ``AutoEvaluator.evaluate_ensemble``)
+            aggregate: Per-dimension aggregation of the ensemble's scores
+        """
+        self.llm_client = llm_client
+        self.rubric = rubric
+        self.judge_model = judge_model
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = TokenBucket(requests_per_minute / 60.0) if requests_per_minute else None
+        self.system_prompt = system_prompt
+        self.params_a = params_a
+        self.params_b = params_b
+        self.use_cache = use_cache
+        self.sharded = sharded
+        self.store = store
+        self.pointwise = pointwise
+        self.swap_positions = swap_positions
+        self.ensemble = ensemble
+        self.aggregate = aggregate
+        # Every judge request (including repairs, retries and tie-breaks) takes one token
+        self.auto_evaluator = AutoEvaluator(
+            llm_client, use_cache=use_cache, score_cache=score_cache,
+            throttle=self._throttle if self.rate_limiter else None
+        )
+        self.evaluator = Evaluator()
+        self._write_lock = threading.Lock()
+
+    def run(self, input_path: Path, output_path: Path) -> Dict[str, int]:
+        """
+        Process every row of the dataset not already judged in the output file.
+
+        Args:
+            input_path: JSONL file of {prompt, response_a, response_b} or
+                {prompt, model_a, model_b} rows
+            output_path: JSONL file results are appended to
+
+        Returns:
+            Summary counts: total, skipped, succeeded, failed
+        """
+        output_path = Path(output_path)
+        rows = list(load_rows(Path(input_path)))
+        done = completed_row_ids(output_path)
+        pending = [row for row in rows if row["row_id"] not in done]
+
+        summary = {"total": len(rows), "skipped": len(rows) - len(pending), "succeeded": 0, "failed": 0}
+        if not pending:
+            return summary
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "a", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="batch") as pool:
+            futures = [pool.submit(self.process_row, row) for row in pending]
+            row_by_id = {row["row_id"]: row for row in pending}
+            for future in as_completed(futures):
+                result = future.result()
+                summary["succeeded" if result["status"] == "ok" else "failed"] += 1
+                with self._write_lock:
+                    out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    out.flush()
+                if self.store is not None and result["status"] == "ok":
+                    self.store.submit(self._store_record(row_by_id[result["row_id"]], result))
+
+        if self.store is not None:
+            self.store.flush()
+        return summary
+
+    def process_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate (if needed) and judge a single row.
+
+        Errors never propagate: they are recorded in the result with status "error"
+        so the row is retried on the next run.
+
+        Args:
+            row: Dataset row with an assigned row_id
+
+        Returns:
+            Result record for the output file
+        """
+        started = time.monotonic()
+        result = {
+            "row_id": row["row_id"],
+            "status": "error",
+            "prompt": row.get("prompt", ""),
+            "model_a": row.get("model_a"),
+            "model_b": row.get("model_b"),
+            "rubric": self.rubric.get("name"),
+            "judge_model": ", ".join(self.ensemble) if self.ensemble else self.judge_model,
+        }
+
+        try:
+            response_a, response_b = self._get_responses(row)
+            result["response_a"] = response_a
+            result["response_b"] = response_b
+
+            for label, response in (("A", response_a), ("B", response_b)):
+                if response.startswith("Error"):
+                    raise RuntimeError(f"Generation failed for response {label}: {response}")
+
+            if self.ensemble:
+                # Each judge's requests are charged as sent; cancelled judges send nothing more
+                judge_started = time.monotonic()
+                judgement = self.auto_evaluator.evaluate_ensemble(
+                    row["prompt"], response_a, response_b, self.rubric, self.ensemble, self.aggregate
+                )
+            elif self.pointwise:
+                # Scoring and tie-break calls are charged as they are made; cached scores cost nothing
+                judge_started = time.monotonic()
+                judgement = self.auto_evaluator.compare_pointwise(
+                    row["prompt"], response_a, response_b, self.rubric, self.judge_model
+                )
+            else:
+                judge_started = time.monotonic()
+                judgement = self.auto_evaluator.auto_evaluate(
+                    prompt=row["prompt"],
+                    response_a=response_a,
+                    response_b=response_b,
+                    rubric=self.rubric,
+                    judge_model=self.judge_model,
+                    sharded=self.sharded,
+                    swap_positions=self.swap_positions
+                )
+
+            result.update(judgement)
+            result["judge_time"] = round(time.monotonic() - judge_started, 3)
+            result["final_score_a"] = self.evaluator.calculate_score(self.rubric, judgement["scores_a"])
+            result["final_score_b"] = self.evaluator.calculate_score(self.rubric, judgement["scores_b"])
+            result["status"] = "ok"
+        except Exception as e:
+            result["error"] = str(e)
+
+        result["elapsed"] = round(time.monotonic() - started, 3)
+        result["timestamp"] = datetime.now().isoformat(timespec="seconds")
+        return result
+
+    def _store_record(self, row: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the evaluation store record for a successful result."""
+        return {
+            "mode": "batch",
+            "prompt": result["prompt"],
+            "model_a": result.get("model_a"),
+            "model_b": result.get("model_b"),
+            "params_a": row.get("params_a", self.params_a),
+            "params_b": row.get("params_b", self.params_b),
+            "rubric": self.rubric,
+            "judge_model": result["judge_model"],
+            "scores_a": result["scores_a"],
+            "scores_b": result["scores_b"],
+            "final_score_a": result["final_score_a"],
+            "final_score_b": result["final_score_b"],
+            "preferred_response": result.get("preferred_response"),
+            "justification": result.get("justification"),
+            "timings": {"judge": result.get("judge_time"), "total": result["elapsed"]},
+        }
+
+    def _get_responses(self, row: Dict[str, Any]) -> tuple:
+        """Return the row's responses, generating them when only models are given."""
+        if "response_a" in row and "response_b" in row:
+            return row["response_a"], row["response_b"]
+
+        if not row.get("model_a") or not row.get("model_b"):
+            raise ValueError("Row needs either response_a/response_b or model_a/model_b")
+
+        params_a = dict(row.get("params_a", self.params_a) or {})
+        params_b = dict(row.get("params_b", self.params_b) or {})
+        if self.use_cache is not None:
+            params_a.setdefault("use_cache", self.use_cache)
+            params_b.setdefault("use_cache", self.use_cache)
+
+        self._throttle(2)
+        return self.llm_client.generate_dual_responses(
+            row["prompt"],
+            row["model_a"],
+            row["model_b"],
+            system_prompt=row.get("system_prompt", self.system_prompt),
+            params_a=params_a,
+            params_b=params_b
+        )
+
+    def _throttle(self, calls: int = 1) -> None:
+        """Wait for rate-limit capacity for the given number of API calls."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(calls)
+
+
+def row_id_for(row: Dict[str, Any]) -> str:
+    """
+    Stable identifier for a dataset row.
+
+    Uses the row's own "id" field when present, otherwise a hash of its content.
+
+    Args:
+        row: Dataset row
+
+    Returns:
+        Row identifier string
+    """
+    if row.get("id") is not None:
+        return str(row["id"])
+    canonical = json.dumps(row, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def load_rows(input_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Read dataset rows from a JSONL file, assigning each a row_id.
+
+    Args:
+        input_path: Path to the JSONL dataset
+
+    Returns:
+        Iterator of row dictionaries
+
+    Raises:
+        ValueError: If a line is not valid JSON or lacks a prompt
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{input_path}:{line_number}: invalid JSON: {e}")
+            if not isinstance(row, dict) or "prompt" not in row:
+                raise ValueError(f"{input_path}:{line_number}: row must be an object with a 'prompt'")
+            row["row_id"] = row_id_for(row)
+            yield row
+
+
+def completed_row_ids(output_path: Path) -> Set[str]:
+    """
+    Collect the ids of rows that already have a successful result.
+
+    A truncated final line (e.g. after a crash) is ignored.
+
+    Args:
+        output_path: Path to the results JSONL file
+
+    Returns:
+        Set of completed row ids
+    """
+    return {
+        str(record.get("row_id"))
+        for record in load_results(output_path)
+        if record.get("status") == "ok"
+    }
+
+
+def load_results(output_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream result records from a results JSONL file.
+
+    A truncated final line (e.g. after a crash) is ignored.
+
+    Args:
+        output_path: Path to the results JSONL file
+
+    Yields:
+        Result records in file order
+    """
+    output_path = Path(output_path)
+    if not output_path.exists():
+        return
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def latest_results(output_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Stream one record per row: its first successful result, or its first
+    failure if it never succeeded.
+
+    Results are read in two passes over the file, so only row ids are held
+    in memory.
+
+    Args:
+        output_path: Path to the results JSONL file
+
+    Yields:
+        Result records in file order
+    """
+    done = completed_row_ids(Path(output_path))
+    seen: Set[str] = set()
+    for record in load_results(output_path):
+        row_id = str(record.get("row_id"))
+        if row_id in seen or (row_id in done and record.get("status") != "ok"):
+            continue
+        seen.add(row_id)
+        yield record
+
+
+def write_batch_report(
+    output_path: Path,
+    report_path: Path,
+    rubric: Dict[str, Any],
+    judge_model: Optional[str] = None,
+    usage: Optional[Dict[str, Any]] = None
+) -> Path:
+    """
+    Write a consolidated markdown report over a results file.
+
+    Per-pair sections are streamed from the results file straight to disk
+    and the report is published with an atomic rename.
+
+    Args:
+        output_path: Path to the results JSONL file
+        report_path: Markdown report to write
+        rubric: Rubric the batch was judged with
+        judge_model: Judge model ID shown in the report header
+        usage: Optional metrics summary of the run
+
+    Returns:
+        Path to the written report
+    """
+    return write_report(
+        Path(report_path),
+        batch_report_sections(latest_results(output_path), rubric, judge_model, usage)
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Batch-evaluate response pairs with an LLM judge.")
+    parser.add_argument("input", type=Path, help="JSONL dataset of prompts and responses/models")
+    parser.add_argument("output", type=Path, help="JSONL file to append results to")
+    parser.add_argument("--rubric", required=True, help="Rubric name, e.g. 'coding' or 'coding-rubric.md'")
+    parser.add_argument("--judge-model", required=True, help="Model ID of the judge LLM")
+    parser.add_argument("--concurrency", type=int, default=4, help="Rows processed concurrently")
+    parser.add_argument("--rpm", type=float, default=None, help="Maximum API requests per minute")
+    parser.add_argument(
+        "--cache", action=argparse.BooleanOptionalAction, default=None,
+        help="Serve every call from the response cache (default: only deterministic calls)"
+    )
+    parser.add_argument(
+        "--sharded", action="store_true",
+        help="Judge each rubric dimension in its own concurrent call"
+    )
+    parser.add_argument(
+        "--pointwise", action="store_true",
+        help="Score each response once (cached across rows and runs) and compare the scores"
+    )
+    parser.add_argument(
+        "--swap-positions", action="store_true",
+        help="Judge each pair in both orders concurrently and reconcile them (cancels position bias)"
+    )
+    parser.add_argument(
+        "--ensemble", nargs="+", metavar="MODEL", default=None,
+        help="Extra judge models; together with --judge-model they judge every pair as an ensemble"
+    )
+    parser.add_argument(
+        "--aggregate", choices=ENSEMBLE_AGGREGATES, default="median",
+        help="How the ensemble's per-dimension scores are combined"
+    )
+    parser.add_argument(
+        "--no-store", action="store_true",
+        help="Do not append results to the local evaluation store"
+    )
+    parser.add_argument(
+        "--report", type=Path, default=None,
+        help="Also write a consolidated markdown report of all results to this path"
+    )
+    args = parser.parse_args(argv)
+
+    import config
+    from utils.response_cache import ResponseCache
+    from utils.rubric_builder import RubricBuilder
+
+    if args.pointwise and args.sharded:
+        parser.error("--pointwise and --sharded cannot be combined")
+    if args.swap_positions and (args.pointwise or args.sharded):
+        parser.error("--swap-positions cannot be combined with --pointwise or --sharded")
+    if args.ensemble and (args.pointwise or args.sharded or args.swap_positions):
+        parser.error("--ensemble cannot be combined with --pointwise, --sharded or --swap-positions")
+    ensemble = [args.judge_model] + args.ensemble if args.ensemble else None
+
+    rubric = RubricBuilder(config.RUBRICS_DIR).load_rubric(args.rubric)
+    if not rubric.get("dimensions"):
+        parser.error(f"Rubric '{args.rubric}' not found or has no dimensions")
+
+    metrics = RingBufferSink(capacity=None)
+    llm_client = LLMClient(
+        cache=ResponseCache(config.RESPONSE_CACHE_PATH),
+        metrics=FanoutSink([metrics, JsonlSink(config.METRICS_PATH)])
+    )
+    if not llm_client.client:
+        parser.error("OPENROUTER_API_KEY is not set")
+
+    runner = BatchRunner(
+        llm_client,
+        rubric,
+        args.judge_model,
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        use_cache=args.cache,
+        sharded=args.sharded,
+        store=None if args.no_store else EvaluationStore(config.EVALUATION_STORE_PATH),
+        pointwise=args.pointwise,
+        score_cache=ScoreCache(config.SCORE_CACHE_PATH) if args.pointwise else None,
+        swap_positions=args.swap_positions,
+        ensemble=ensemble,
+        aggregate=args.aggregate
+    )
+    summary = runner.run(args.input, args.output)
+    print(
+        f"{summary['total']} rows: {summary['succeeded']} judged, "
+        f"{summary['failed']} failed, {summary['skipped']} already done"
+    )
+    usage = metrics.summary()
+    for line in format_summary(usage):
+        print(line)
+    position = position_agreement_stats()
+    if position["judgements"]:
+        print(
+            f"Position check: {position['consistent']}/{position['judgements']} preferences survived the swap, "
+            f"{position['score_agreement']:.0%} of dimension scores identical"
+        )
+    if args.report:
+        judges = ", ".join(ensemble) if ensemble else args.judge_model
+        report_path = write_batch_report(args.output, args.report, rubric, judges, usage)
+        print(f"Report written to {report_path}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
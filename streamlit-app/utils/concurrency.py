@@ -0,0 +1,111 @@
+"""
+Concurrency helpers shared by the LLM-facing utilities.
+
+Provides a single, bounded, process-wide thread pool so that concurrent
+API calls (dual generation, parallel judging, report sections) never spawn
+unbounded numbers of threads across Streamlit reruns.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Upper bound on concurrently running LLM calls across the whole process
+MAX_WORKERS = 16
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared worker pool, creating it on first use.
+
+    Returns:
+        Process-wide ThreadPoolExecutor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="llm-worker")
+    return _executor
+
+
+def run_concurrently(
+    calls: Sequence[Callable[[], T]],
+    timeouts: Optional[Sequence[Optional[float]]] = None,
+    on_timeout: Optional[Callable[[int, float], T]] = None
+) -> List[T]:
+    """
+    Run zero-argument callables concurrently on the shared pool.
+
+    Each call's timeout starts when a worker picks it up, so neither a slow
+    sibling nor time spent queued behind a busy pool eats into its budget.
+    A running call cannot be interrupted: on timeout it is abandoned and
+    finishes in the background, bounded by the API client's own request
+    timeout.
+
+    Args:
+        calls: Callables to run
+        timeouts: Optional per-call timeouts in seconds (None = wait forever)
+        on_timeout: Factory for the result of a timed-out call, given its index
+            and timeout. If omitted, the TimeoutError is raised.
+
+    Returns:
+        Results in the same order as ``calls``
+    """
+    timeouts = list(timeouts) if timeouts is not None else [None] * len(calls)
+    executor = get_executor()
+    starts: List[Optional[float]] = [None] * len(calls)
+    started = [threading.Event() for _ in calls]
+
+    def timed(index: int, call: Callable[[], T]) -> T:
+        starts[index] = time.monotonic()
+        started[index].set()
+        return call()
+
+    futures: List[Future] = [executor.submit(timed, index, call) for index, call in enumerate(calls)]
+
+    results: List[T] = []
+    for index, future in enumerate(futures):
+        timeout = timeouts[index]
+        remaining = None
+        if timeout is not None:
+            started[index].wait()
+            remaining = max(0.0, starts[index] + timeout - time.monotonic())
+        try:
+            results.append(future.result(timeout=remaining))
+        except FutureTimeoutError:
+            if on_timeout is None:
+                raise
+            results.append(on_timeout(index, timeout))
+    return results
+
+
+def iter_completed(calls: Sequence[Callable[[], T]]) -> Iterator[Tuple[int, "Future[T]"]]:
+    """
+    Run zero-argument callables on the shared pool, yielding them as they finish.
+
+    Lets a caller stop as soon as it has enough results (e.g. a quorum of
+    judges). Closing the generator early cancels the calls that have not
+    started yet; calls already running finish in the background and their
+    results are dropped.
+
+    Args:
+        calls: Callables to run
+
+    Yields:
+        (index into ``calls``, finished future), in completion order
+    """
+    executor = get_executor()
+    futures = {executor.submit(call): index for index, call in enumerate(calls)}
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future
+    finally:
+        for future in futures:
+            future.cancel()
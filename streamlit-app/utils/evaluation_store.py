@@ -0,0 +1,485 @@
+"""
+Evaluation Store
+
+Append-only local record of every manual, auto and batch evaluation, backed by
+SQLite in WAL mode. Each evaluation keeps its models, generation parameters,
+rubric fingerprint, per-dimension scores and timings; models, rubrics and timestamps
+are indexed so questions like "how did model X do on the coding rubric this
+month" are answered with one query instead of grepping exported reports.
+
+Writes can be queued with ``submit`` and are then committed by a background
+thread, so the UI never waits on the disk.
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from utils.rubric_parser import rubric_fingerprint
+
+# Evaluation sources recorded in the ``mode`` column
+MODES = ("manual", "auto", "batch", "tournament")
+# Fields of a stored evaluation that ``update`` may change
+UPDATABLE_FIELDS = (
+    "scores_a", "scores_b", "final_score_a", "final_score_b", "preferred_response", "justification"
+)
+
+Timestamp = Union[datetime, float, None]
+
+
+def _epoch(value: Timestamp) -> Optional[float]:
+    """Convert a datetime (or epoch seconds) to epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _dumps(value: Any) -> Optional[str]:
+    return None if value is None else json.dumps(value, ensure_ascii=False)
+
+
+class EvaluationStore:
+    """SQLite-backed, append-only store of evaluations."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) an evaluation store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._errors: List[str] = []
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS evaluations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    mode TEXT NOT NULL,
+                    prompt TEXT NOT NULL,
+                    model_a TEXT,
+                    model_b TEXT,
+                    params_a TEXT,
+                    params_b TEXT,
+                    rubric_name TEXT,
+                    rubric_hash TEXT NOT NULL,
+                    judge_model TEXT,
+                    scores_a TEXT NOT NULL,
+                    scores_b TEXT NOT NULL,
+                    final_score_a REAL,
+                    final_score_b REAL,
+                    preferred_response TEXT,
+                    justification TEXT,
+                    timings TEXT
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS dimension_scores (
+                    evaluation_id INTEGER NOT NULL REFERENCES evaluations (id),
+                    side TEXT NOT NULL,
+                    dimension TEXT NOT NULL,
+                    score INTEGER,
+                    comment TEXT
+                )"""
+            )
+            for statement in (
+                "CREATE INDEX IF NOT EXISTS idx_evaluations_model_a ON evaluations (model_a, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_evaluations_model_b ON evaluations (model_b, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_evaluations_rubric_name ON evaluations (rubric_name, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_evaluations_rubric_hash ON evaluations (rubric_hash, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_evaluations_created_at ON evaluations (created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_dimension_scores_evaluation ON dimension_scores (evaluation_id)",
+            ):
+                self._conn.execute(statement)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def add(self, record: Dict[str, Any]) -> int:
+        """
+        Append one evaluation.
+
+        Args:
+            record: Evaluation with keys:
+                - mode: "manual", "auto", "batch" or "tournament"
+                - prompt, model_a, model_b, params_a, params_b
+                - rubric: Rubric dictionary (its name and fingerprint are stored)
+                - scores_a, scores_b: {dim_name: {'score': 1-3, 'comment': str}}
+                - final_score_a, final_score_b: Weighted 0-10 scores
+                - preferred_response, judge_model, justification (optional)
+                - timings: Free-form timing dictionary, e.g. generation and judge seconds
+                - created_at: datetime or epoch seconds (defaults to now)
+
+        Returns:
+            Id of the stored evaluation
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        mode = record.get("mode", "manual")
+        if mode not in MODES:
+            raise ValueError(f"Unknown evaluation mode '{mode}', expected one of {MODES}")
+
+        rubric = record.get("rubric") or {}
+        created_at = _epoch(record.get("created_at")) or time.time()
+        scores = {"A": record.get("scores_a") or {}, "B": record.get("scores_b") or {}}
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO evaluations (created_at, mode, prompt, model_a, model_b, params_a, params_b, "
+                "rubric_name, rubric_hash, judge_model, scores_a, scores_b, final_score_a, final_score_b, "
+                "preferred_response, justification, timings) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    created_at,
+                    mode,
+                    record.get("prompt", ""),
+                    record.get("model_a"),
+                    record.get("model_b"),
+                    _dumps(record.get("params_a")),
+                    _dumps(record.get("params_b")),
+                    rubric.get("name"),
+                    rubric_fingerprint(rubric),
+                    record.get("judge_model"),
+                    _dumps(scores["A"]),
+                    _dumps(scores["B"]),
+                    record.get("final_score_a"),
+                    record.get("final_score_b"),
+                    record.get("preferred_response"),
+                    record.get("justification"),
+                    _dumps(record.get("timings")),
+                )
+            )
+            evaluation_id = cursor.lastrowid
+            for side, ratings in scores.items():
+                self._insert_dimension_scores(evaluation_id, side, ratings)
+        return evaluation_id
+
+    def update(self, evaluation_id: int, changes: Dict[str, Any]) -> None:
+        """
+        Change the scores, preference or justification of a stored evaluation.
+
+        For evaluations that are revised after they were first recorded, such
+        as a manual rating whose preferred response is picked afterwards.
+        Leaderboard snapshots that already folded the evaluation in keep its
+        previous outcome.
+
+        Args:
+            evaluation_id: Id returned by ``add``
+            changes: New values for any of UPDATABLE_FIELDS
+
+        Raises:
+            ValueError: If a field cannot be updated
+            KeyError: If there is no evaluation with this id
+        """
+        unknown = sorted(set(changes) - set(UPDATABLE_FIELDS))
+        if unknown:
+            raise ValueError(f"Cannot update {', '.join(unknown)}, expected any of {UPDATABLE_FIELDS}")
+        if not changes:
+            return
+
+        columns = list(changes)
+        values = [_dumps(changes[c]) if c in ("scores_a", "scores_b") else changes[c] for c in columns]
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"UPDATE evaluations SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?",
+                values + [int(evaluation_id)]
+            )
+            if cursor.rowcount == 0:
+                raise KeyError(f"No evaluation with id {evaluation_id}")
+            for side, key in (("A", "scores_a"), ("B", "scores_b")):
+                if key in changes:
+                    self._conn.execute(
+                        "DELETE FROM dimension_scores WHERE evaluation_id = ? AND side = ?",
+                        (int(evaluation_id), side)
+                    )
+                    self._insert_dimension_scores(evaluation_id, side, changes[key] or {})
+
+    def _insert_dimension_scores(self, evaluation_id: int, side: str, ratings: Dict[str, Any]) -> None:
+        """Write one side's per-dimension scores; the caller holds the lock and transaction."""
+        self._conn.executemany(
+            "INSERT INTO dimension_scores (evaluation_id, side, dimension, score, comment) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    evaluation_id,
+                    side,
+                    name,
+                    rating.get("score") if isinstance(rating, dict) else rating,
+                    rating.get("comment", "") if isinstance(rating, dict) else "",
+                )
+                for name, rating in ratings.items()
+            ]
+        )
+
+    def submit(self, record: Dict[str, Any]) -> None:
+        """
+        Queue an evaluation to be appended by the background writer.
+
+        Failures are kept in ``errors`` rather than raised, since the caller
+        has moved on by the time the record is written.
+
+        Args:
+            record: Evaluation record (see ``add``)
+        """
+        self._ensure_writer()
+        self._queue.put(dict(record))
+
+    def flush(self) -> None:
+        """Block until every queued evaluation has been written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    @property
+    def errors(self) -> List[str]:
+        """Messages from queued evaluations that could not be written."""
+        return list(self._errors)
+
+    def close(self) -> None:
+        """Write any queued evaluations and close the database."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._lock:
+            self._conn.close()
+
+    def _ensure_writer(self) -> None:
+        """Start the background writer thread on first use."""
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(
+                        target=self._drain, name="evaluation-store-writer", daemon=True
+                    )
+                    self._writer.start()
+
+    def _drain(self) -> None:
+        """Background writer loop: append queued records until a None sentinel."""
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                self.add(record)
+            except Exception as e:
+                self._errors.append(str(e))
+            finally:
+                self._queue.task_done()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        model: Optional[str] = None,
+        rubric: Optional[str] = None,
+        since: Timestamp = None,
+        until: Timestamp = None,
+        mode: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List stored evaluations, newest first.
+
+        Args:
+            model: Only evaluations where this model produced response A or B
+            rubric: Only evaluations with this rubric name or rubric hash
+            since: Only evaluations at or after this time
+            until: Only evaluations before this time
+            mode: Only evaluations from this source (one of MODES)
+            limit: Maximum number of evaluations returned
+
+        Returns:
+            Evaluation records with JSON fields decoded and ``created_at``
+            as epoch seconds
+        """
+        where, params = self._filters(model, rubric, since, until, mode)
+        sql = f"SELECT * FROM evaluations{where} ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+
+        records = []
+        for row in rows:
+            record = dict(zip(columns, row))
+            for key in ("params_a", "params_b", "scores_a", "scores_b", "timings"):
+                if record[key] is not None:
+                    record[key] = json.loads(record[key])
+            records.append(record)
+        return records
+
+    def model_summary(
+        self,
+        model: str,
+        rubric: Optional[str] = None,
+        since: Timestamp = None,
+        until: Timestamp = None
+    ) -> Dict[str, Any]:
+        """
+        Aggregate one model's results across every evaluation it appeared in.
+
+        A model compared against itself counts once per side.
+
+        Args:
+            model: Model ID
+            rubric: Only evaluations with this rubric name or rubric hash
+            since: Only evaluations at or after this time
+            until: Only evaluations before this time
+
+        Returns:
+            Dictionary containing:
+                - evaluations: Number of responses from the model that were scored
+                - wins: How many of those were the preferred response
+                - win_rate: wins / evaluations (None if never evaluated)
+                - average_score: Mean weighted 0-10 score (None if never evaluated)
+                - dimensions: {dim_name: mean raw 1-3 score}
+        """
+        branches = []
+        params: List[Any] = []
+        for side in ("A", "B"):
+            column = f"model_{side.lower()}"
+            where, branch_params = self._filters(None, rubric, since, until, None)
+            where += (" AND " if where else " WHERE ") + f"{column} = ?"
+            branches.append(
+                f"SELECT id, '{side}' AS side, final_score_{side.lower()} AS score, "
+                f"preferred_response = '{side}' AS won FROM evaluations{where}"
+            )
+            params.extend(branch_params + [model])
+        sides = " UNION ALL ".join(branches)
+
+        with self._lock:
+            count, wins, average = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(won), 0), AVG(score) FROM ({sides})", params
+            ).fetchone()
+            dimension_rows = self._conn.execute(
+                f"SELECT d.dimension, AVG(d.score) FROM ({sides}) AS s "
+                "JOIN dimension_scores AS d ON d.evaluation_id = s.id AND d.side = s.side "
+                "GROUP BY d.dimension ORDER BY d.dimension",
+                params
+            ).fetchall()
+
+        return {
+            "evaluations": count,
+            "wins": wins,
+            "win_rate": wins / count if count else None,
+            "average_score": average,
+            "dimensions": {name: score for name, score in dimension_rows},
+        }
+
+    def comparisons(self, rubric: Optional[str] = None, after_id: int = 0) -> List[Dict[str, Any]]:
+        """
+        List pairwise outcomes between two different models, oldest first.
+
+        Evaluations without a preferred response (e.g. manual ratings) are
+        decided by their final scores, and equal scores count as a tie.
+
+        Args:
+            rubric: Only evaluations with this rubric name or rubric hash
+            after_id: Only evaluations stored after this id, for incremental updates
+
+        Returns:
+            Dictionaries with id, model_a, model_b and outcome
+            (1.0 = A preferred, 0.0 = B preferred, 0.5 = tie)
+        """
+        where, params = self._filters(None, rubric, None, None, None)
+        where += (" AND " if where else " WHERE ") + (
+            "id > ? AND model_a IS NOT NULL AND model_b IS NOT NULL AND model_a != model_b"
+        )
+        params.append(int(after_id))
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, model_a, model_b, preferred_response, final_score_a, final_score_b "
+                f"FROM evaluations{where} ORDER BY id",
+                params
+            ).fetchall()
+
+        comparisons = []
+        for evaluation_id, model_a, model_b, preferred, score_a, score_b in rows:
+            if preferred in ("A", "B"):
+                outcome = 1.0 if preferred == "A" else 0.0
+            elif score_a is not None and score_b is not None:
+                outcome = 1.0 if score_a > score_b else 0.0 if score_a < score_b else 0.5
+            else:
+                continue
+            comparisons.append({"id": evaluation_id, "model_a": model_a, "model_b": model_b, "outcome": outcome})
+        return comparisons
+
+    def rubrics(self) -> List[Dict[str, Any]]:
+        """
+        List the rubrics evaluations were recorded with.
+
+        Returns:
+            Dictionaries with rubric name, hash and evaluation count, most used first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rubric_name, rubric_hash, COUNT(*) AS n FROM evaluations "
+                "GROUP BY rubric_hash, rubric_name ORDER BY n DESC, rubric_name"
+            ).fetchall()
+        return [{"name": name, "hash": digest, "evaluations": count} for name, digest, count in rows]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report store occupancy.
+
+        Returns:
+            Dictionary with evaluation count and number of distinct models
+        """
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+            models = self._conn.execute(
+                "SELECT COUNT(*) FROM (SELECT model_a FROM evaluations WHERE model_a IS NOT NULL "
+                "UNION SELECT model_b FROM evaluations WHERE model_b IS NOT NULL)"
+            ).fetchone()[0]
+        return {"evaluations": count, "models": models}
+
+    @staticmethod
+    def _filters(
+        model: Optional[str],
+        rubric: Optional[str],
+        since: Timestamp,
+        until: Timestamp,
+        mode: Optional[str]
+    ) -> tuple:
+        """Build a WHERE clause and its parameters from the common query filters."""
+        clauses = []
+        params: List[Any] = []
+        if model is not None:
+            clauses.append("(model_a = ? OR model_b = ?)")
+            params.extend([model, model])
+        if rubric is not None:
+            clauses.append("(rubric_name = ? OR rubric_hash = ?)")
+            params.extend([rubric, rubric])
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_epoch(since))
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(_epoch(until))
+        if mode is not None:
+            clauses.append("mode = ?")
+            params.append(mode)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
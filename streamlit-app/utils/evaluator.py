@@ -1,4 +1,27 @@
-from typing import Dict, Any, List, Union
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    # numpy is only needed by the batch methods and imported there on first use
+    import numpy as np
+
+# Default mapping of the 3-point rubric scale onto the 0-10 final score scale:
+# 3 (No Issues) -> 10, 2 (Minor Issues) -> 9 (small penalty), 1 (Major Issues) -> 5 (significant penalty)
+DEFAULT_SCORE_MAP = {3: 10.0, 2: 9.0, 1: 5.0}
+
+SCORE_LABELS = {3: "No Issues", 2: "Minor Issues", 1: "Major Issues"}
+
+
+def get_score_map(rubric: Dict[str, Any]) -> Dict[int, float]:
+    """
+    Score mapping for a rubric: its own ``score_map`` if present, else the default.
+
+    Keys may be strings (rubrics loaded from JSON/YAML) and are normalized to int.
+    """
+    score_map = rubric.get("score_map")
+    if not score_map:
+        return DEFAULT_SCORE_MAP
+    return {int(score): float(value) for score, value in score_map.items()}
+
 
 class Evaluator:
     def __init__(self):
@@ -9,6 +32,10 @@ class Evaluator:
         Calculates the weighted score based on rubric and user ratings.
         Ratings is a dict of dimension_name -> {'score': int (1-3), 'comment': str}
         """
+        score_map = get_score_map(rubric)
+        # Anything outside the scale counts as the lowest rating
+        fallback = score_map[min(score_map)]
+
         total_score = 0.0
         total_weight = 0.0
 
@@ -24,21 +51,7 @@ class Evaluator:
                 else:
                     raw_score = rating_data
                 
-                # Normalize 1-3 scale to 0-10 scale for final score calculation if desired
-                # 3 -> 10, 2 -> 5, 1 -> 0 ? Or just keep as 1-3 average?
-                # Let's normalize to 0-10 for consistency with previous mental model
-                # 3 (No Issues) -> 10
-                # 2 (Minor Issues) -> 5
-                # 1 (Major Issues) -> 0
-                
-                normalized_score = 0.0
-                normalized_score = 0.0
-                if raw_score == 3:
-                    normalized_score = 10.0
-                elif raw_score == 2:
-                    normalized_score = 9.0  # Minor issue = 9.0 (User's math preference: small penalty)
-                else:
-                    normalized_score = 5.0  # Major issue = 5.0 (Significant penalty)
+                normalized_score = score_map.get(raw_score, fallback)
                     
                 total_score += normalized_score * weight
                 total_weight += weight
@@ -46,8 +59,7 @@ class Evaluator:
         if total_weight == 0:
             return 0.0
             
-        # Normalize to 0-100 or keep as is? Let's assume input scores are 0-10
-        # and we return a 0-10 weighted average.
+        # Weighted average on the 0-10 scale
         return total_score / total_weight
 
     def format_results(self, rubric: Dict[str, Any], ratings: Dict[str, Any]) -> Dict[str, Any]:
@@ -56,6 +68,7 @@ class Evaluator:
         Ratings: {dim_name: {'score': 1-3, 'comment': '...'}}
         """
         final_score = self.calculate_score(rubric, ratings)
+        score_map = get_score_map(rubric)
         
         details = []
         for dim in rubric.get("dimensions", []):
@@ -68,22 +81,10 @@ class Evaluator:
             comment = rating_data.get('comment', '')
             
             # Text label for score
-            score_label = "Unknown"
-            if raw_score == 3:
-                score_label = "No Issues"
-            elif raw_score == 2:
-                score_label = "Minor Issues"
-            elif raw_score == 1:
-                score_label = "Major Issues"
+            score_label = SCORE_LABELS.get(raw_score, "Unknown")
 
             # Normalize for weighted score calculation
-            normalized_val = 0.0
-            if raw_score == 3:
-                normalized_val = 10.0
-            elif raw_score == 2:
-                normalized_val = 9.0
-            elif raw_score == 1:
-                normalized_val = 5.0
+            normalized_val = score_map.get(raw_score, 0.0)
             
             details.append({
                 "dimension": name,
@@ -98,3 +99,128 @@ class Evaluator:
             "final_score": final_score,
             "details": details
         }
+
+    def score_matrix(self, rubric: Dict[str, Any], ratings_list: Sequence[Dict[str, Any]]) -> "np.ndarray":
+        """
+        Convert many ratings dicts into an N x D matrix of raw rubric scores.
+
+        Columns follow the rubric's dimension order; dimensions missing from a
+        ratings dict are NaN.
+
+        Args:
+            rubric: Rubric dictionary
+            ratings_list: N ratings dicts ({dim_name: {'score': 1-3, ...}} or {dim_name: score})
+
+        Returns:
+            Float array of shape (N, D)
+        """
+        import numpy as np
+
+        names = [dim["name"] for dim in rubric.get("dimensions", [])]
+        matrix = np.full((len(ratings_list), len(names)), np.nan)
+        for row, ratings in enumerate(ratings_list):
+            for col, name in enumerate(names):
+                if name in ratings:
+                    rating_data = ratings[name]
+                    raw_score = rating_data.get('score', 0) if isinstance(rating_data, dict) else rating_data
+                    try:
+                        matrix[row, col] = float(raw_score)
+                    except (TypeError, ValueError):
+                        matrix[row, col] = 0.0
+        return matrix
+
+    def batch_score(
+        self,
+        rubric: Dict[str, Any],
+        scores: Union["np.ndarray", Sequence[Dict[str, Any]]],
+        weights: Optional[Sequence[float]] = None
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Score N evaluations at once; equivalent to ``calculate_score`` per row.
+
+        Args:
+            rubric: Rubric dictionary (dimension order, weights and optional score_map)
+            scores: N x D matrix of raw rubric scores (NaN = not rated), or a list of ratings dicts
+            weights: Optional length-D weight vector overriding the rubric weights,
+                e.g. to re-score a historical corpus after a weight change
+
+        Returns:
+            Dictionary containing:
+                - final_scores: (N,) weighted 0-10 scores
+                - contributions: (N, D) per-dimension share of each final score
+                  (rows sum to the final score)
+                - normalized: (N, D) scores mapped onto the 0-10 scale (0 where not rated)
+        """
+        import numpy as np
+
+        if not isinstance(scores, np.ndarray):
+            scores = self.score_matrix(rubric, scores)
+        raw = np.atleast_2d(np.asarray(scores, dtype=float))
+
+        if weights is None:
+            weights = [dim["weight"] for dim in rubric.get("dimensions", [])]
+        weights = np.asarray(weights, dtype=float)
+        if weights.shape != (raw.shape[1],):
+            raise ValueError(f"Expected {raw.shape[1]} weights, got {weights.shape[0]}")
+
+        score_map = get_score_map(rubric)
+        rated = ~np.isnan(raw)
+
+        # Table lookup: unmapped scores get the lowest rating, as in calculate_score
+        normalized = np.full(raw.shape, score_map[min(score_map)])
+        for score, value in score_map.items():
+            normalized[raw == score] = value
+        normalized[~rated] = 0.0
+
+        effective_weights = np.where(rated, weights, 0.0)
+        total_weight = effective_weights.sum(axis=1)
+        weighted = normalized * effective_weights
+
+        safe_total = np.where(total_weight > 0, total_weight, 1.0)[:, None]
+        contributions = np.where(total_weight[:, None] > 0, weighted / safe_total, 0.0)
+
+        return {
+            "final_scores": contributions.sum(axis=1),
+            "contributions": contributions,
+            "normalized": normalized
+        }
+
+    def compare_batch(
+        self,
+        rubric: Dict[str, Any],
+        scores_a: Union["np.ndarray", Sequence[Dict[str, Any]]],
+        scores_b: Union["np.ndarray", Sequence[Dict[str, Any]]],
+        weights: Optional[Sequence[float]] = None
+    ) -> Dict[str, "np.ndarray"]:
+        """
+        Score N response pairs at once and derive win/loss vectors.
+
+        Args:
+            rubric: Rubric dictionary
+            scores_a: N x D scores (or ratings dicts) for response A
+            scores_b: N x D scores (or ratings dicts) for response B
+            weights: Optional length-D weight vector overriding the rubric weights
+
+        Returns:
+            Dictionary containing:
+                - final_a, final_b: (N,) weighted 0-10 scores
+                - contributions_a, contributions_b: (N, D) per-dimension contributions
+                - outcome: (N,) +1 where A wins, -1 where B wins, 0 on ties
+                - a_wins, b_wins, ties: (N,) boolean masks
+        """
+        import numpy as np
+
+        result_a = self.batch_score(rubric, scores_a, weights)
+        result_b = self.batch_score(rubric, scores_b, weights)
+        outcome = np.sign(result_a["final_scores"] - result_b["final_scores"]).astype(int)
+
+        return {
+            "final_a": result_a["final_scores"],
+            "final_b": result_b["final_scores"],
+            "contributions_a": result_a["contributions"],
+            "contributions_b": result_b["contributions"],
+            "outcome": outcome,
+            "a_wins": outcome > 0,
+            "b_wins": outcome < 0,
+            "ties": outcome == 0
+        }
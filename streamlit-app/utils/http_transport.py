@@ -0,0 +1,90 @@
+"""
+Shared HTTP Transport
+
+Process-wide, pooled HTTP clients for the OpenRouter API. One OpenAI client
+and one requests session are kept per (API key, base URL) so TLS connections
+stay alive across Streamlit reruns and across LLMClient instances.
+
+``openai`` and ``requests`` are imported when the first transport is created,
+so importing the client modules stays cheap for processes that never call
+the API.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Dict, Tuple
+
+if TYPE_CHECKING:
+    import requests
+    from openai import OpenAI
+
+# Seconds allowed to establish a connection (including the TLS handshake)
+CONNECT_TIMEOUT = 10.0
+# Seconds allowed between bytes of a completion response
+READ_TIMEOUT = 180.0
+# (connect, read) timeouts for the models listing
+MODELS_TIMEOUT = (CONNECT_TIMEOUT, 30.0)
+
+# Keep-alive connections per host kept in the requests pool
+POOL_MAXSIZE = 16
+
+_transports: Dict[Tuple[str, str], Tuple["OpenAI", "requests.Session"]] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(api_key: str, base_url: str) -> Tuple["OpenAI", "requests.Session"]:
+    """
+    Return the shared OpenAI client and requests session for an API key and base URL.
+
+    Args:
+        api_key: OpenRouter API key
+        base_url: OpenRouter API base URL
+
+    Returns:
+        Tuple of (OpenAI client, requests session), created on first use
+    """
+    key = (api_key, base_url)
+    transport = _transports.get(key)
+    if transport is not None:
+        return transport
+
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = (_create_openai_client(api_key, base_url), _create_session(api_key))
+            _transports[key] = transport
+    return transport
+
+
+def close_transports() -> None:
+    """Close and forget every pooled client (e.g. on shutdown or in tests)."""
+    with _transports_lock:
+        for client, session in _transports.values():
+            client.close()
+            session.close()
+        _transports.clear()
+
+
+def _create_openai_client(api_key: str, base_url: str) -> "OpenAI":
+    """Create an OpenAI client with explicit connect/read timeouts."""
+    from openai import OpenAI, Timeout
+
+    return OpenAI(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        # Retries are handled by utils.resilience (backoff, Retry-After, circuit breaker)
+        max_retries=0
+    )
+
+
+def _create_session(api_key: str) -> "requests.Session":
+    """Create a keep-alive requests session authenticated for the API."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Authorization": f"Bearer {api_key}"})
+    return session
@@ -0,0 +1,271 @@
+"""
+Streaming JSON Object Extractor
+
+Finds the first balanced top-level JSON object in LLM output in a single
+left-to-right pass, cleaning it on the way:
+    - Prose, BOMs and code fences around the object are skipped
+    - Braces inside non-JSON code fences (```python ...) are ignored
+    - Trailing commas before } or ] are dropped (outside strings only)
+    - Control characters other than \\n, \\r and \\t are dropped
+
+Text can be fed in chunks as it streams from the model; the object is
+available as soon as its closing brace arrives, so parsing can start (and
+the stream can be closed) before the model finishes its trailing commentary.
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+# Next character of interest while scanning prose, JSON structure or a string
+_PROSE_SPECIAL = re.compile(r"\{|```")
+_STRUCTURE_SPECIAL = re.compile(r'[{}\[\]",\x00-\x08\x0b\x0c\x0e-\x1f\ufeff]')
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x08\x0b\x0c\x0e-\x1f]')
+# Rest of a well-formed string (no raw control characters) up to its closing quote
+_STRING_REST = re.compile(r'[^"\\\x00-\x1f]*(?:\\.[^"\\\x00-\x1f]*)*"', re.DOTALL)
+_NON_WHITESPACE = re.compile(r"\S")
+
+# Code fence languages whose content may hold the JSON object
+_JSON_FENCE_LANGUAGES = {"", "json", "json5", "jsonc"}
+
+
+class JsonObjectExtractor:
+    """
+    Incremental extractor for the first top-level JSON object in a text stream.
+
+    Usage:
+        extractor = JsonObjectExtractor()
+        for chunk in stream:
+            if extractor.feed(chunk) is not None:
+                break
+        json_str = extractor.finish()
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._result: Optional[str] = None
+        # Prose state
+        self._in_object = False
+        self._fence_allows_json = True
+        self._in_fence = False
+        # Object state
+        self._out: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        # Whitespace seen since an unresolved comma (None = no pending comma)
+        self._pending_comma: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """True once a complete object has been extracted."""
+        return self._result is not None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Consume the next chunk of text.
+
+        Args:
+            chunk: Next piece of the model output
+
+        Returns:
+            The cleaned JSON object text once it is complete, else None
+        """
+        if self._result is None and chunk:
+            self._buffer += chunk
+            self._scan(final=False)
+        return self._result
+
+    def finish(self) -> str:
+        """
+        Signal the end of the text and return the best extraction.
+
+        Returns:
+            The cleaned JSON object if one closed; otherwise the cleaned,
+            unterminated object text if one started; otherwise the whole
+            text stripped (left for the JSON parser to reject)
+        """
+        if self._result is None:
+            self._scan(final=True)
+        if self._result is not None:
+            return self._result
+        if self._in_object:
+            return "".join(self._out).strip()
+        return self._buffer.strip().lstrip("\ufeff")
+
+    def _scan(self, final: bool) -> None:
+        """Advance through the buffer as far as the available text allows."""
+        while self._result is None:
+            if self._in_object:
+                progressed = self._scan_object()
+            else:
+                progressed = self._scan_prose(final)
+            if not progressed:
+                return
+
+    def _scan_prose(self, final: bool) -> bool:
+        """Look for the opening brace of a JSON object; returns False when more text is needed."""
+        buffer = self._buffer
+        match = _PROSE_SPECIAL.search(buffer, self._pos)
+        if match is None:
+            # Keep a possible partial fence marker for the next chunk
+            self._pos = max(self._pos, len(buffer) - 2)
+            return False
+
+        index = match.start()
+        if match.group() == "```":
+            newline = buffer.find("\n", index)
+            if newline == -1 and not final:
+                self._pos = index
+                return False
+            line_end = len(buffer) if newline == -1 else newline
+            if self._in_fence:
+                self._in_fence = False
+                self._fence_allows_json = True
+            else:
+                self._in_fence = True
+                language = buffer[index + 3:line_end].strip().lower()
+                self._fence_allows_json = language in _JSON_FENCE_LANGUAGES
+            self._pos = line_end
+            return True
+
+        if not self._fence_allows_json:
+            self._pos = index + 1
+            return True
+
+        # Only a key (or an empty object) may follow the brace of a JSON object
+        following = _NON_WHITESPACE.search(buffer, index + 1)
+        if following is None:
+            if final:
+                self._pos = len(buffer)
+                return False
+            self._pos = index
+            return False
+        if buffer[following.start()] not in "\"'}":
+            self._pos = index + 1
+            return True
+
+        self._in_object = True
+        self._out = ["{"]
+        self._depth = 1
+        self._pos = index + 1
+        return True
+
+    def _scan_object(self) -> bool:
+        """Copy and clean object text up to the closing brace; returns False when more text is needed."""
+        buffer = self._buffer
+        out = self._out
+        pos = self._pos
+
+        while True:
+            pattern = _STRING_SPECIAL if self._in_string else _STRUCTURE_SPECIAL
+            match = pattern.search(buffer, pos)
+            end = match.start() if match else len(buffer)
+            segment = buffer[pos:end]
+
+            if self._pending_comma is not None:
+                if segment.strip():
+                    out.append("," + self._pending_comma)
+                    out.append(segment)
+                    self._pending_comma = None
+                else:
+                    self._pending_comma += segment
+            else:
+                out.append(segment)
+            if match is None:
+                self._consume(len(buffer))
+                return False
+
+            ch = buffer[end]
+            pos = end + 1
+            if self._in_string:
+                if ch == "\\":
+                    if end + 1 >= len(buffer):
+                        # Escape split across chunks
+                        self._consume(end)
+                        return False
+                    out.append(buffer[end:end + 2])
+                    pos = end + 2
+                elif ch == '"':
+                    out.append(ch)
+                    self._in_string = False
+                # Control characters are dropped
+                continue
+
+            if ch in "}]":
+                # A comma directly before a closer is a trailing comma: drop it
+                if self._pending_comma is not None:
+                    out.append(self._pending_comma)
+                    self._pending_comma = None
+                out.append(ch)
+                self._depth -= 1
+                if self._depth == 0:
+                    self._result = "".join(out).strip()
+                    self._pos = pos
+                    return True
+                continue
+            if ch in '{[",':
+                if self._pending_comma is not None:
+                    out.append("," + self._pending_comma)
+                    self._pending_comma = None
+                if ch == ",":
+                    self._pending_comma = ""
+                    continue
+                if ch == '"':
+                    # Fast path: copy a complete, clean string in one step
+                    string = _STRING_REST.match(buffer, pos)
+                    if string:
+                        out.append(buffer[end:string.end()])
+                        pos = string.end()
+                        continue
+                    self._in_string = True
+                else:
+                    self._depth += 1
+                out.append(ch)
+            # Control characters and BOMs are dropped
+
+
+    def _consume(self, pos: int) -> None:
+        """Drop object text already copied to the output, keeping feeds linear."""
+        self._buffer = self._buffer[pos:]
+        self._pos = 0
+
+
+def extract_json(text: str) -> str:
+    """
+    Extract and clean the first JSON object in a complete text.
+
+    Args:
+        text: Raw model output
+
+    Returns:
+        Cleaned JSON object text, or the stripped text if it holds no object
+    """
+    extractor = JsonObjectExtractor()
+    extractor.feed(text)
+    return extractor.finish()
+
+
+def extract_json_from_chunks(chunks: Iterable[str]) -> str:
+    """
+    Extract the first JSON object from streamed chunks.
+
+    Stops consuming ``chunks`` as soon as the object is complete; generators
+    are closed so the underlying stream can be released early.
+
+    Args:
+        chunks: Iterable of text deltas
+
+    Returns:
+        Cleaned JSON object text (see ``extract_json``)
+    """
+    extractor = JsonObjectExtractor()
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            if extractor.feed(chunk) is not None:
+                break
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+    return extractor.finish()
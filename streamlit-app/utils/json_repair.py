@@ -0,0 +1,228 @@
+"""
+Tolerant JSON Repair
+
+Rewrites the almost-JSON that LLM judges tend to produce into valid JSON in
+a single left-to-right pass, without calling the model again. Handles:
+    - Text or code fences around the JSON value
+    - Single-quoted strings and unquoted keys
+    - Python literals (True / False / None)
+    - Unescaped double quotes inside strings
+    - Raw newlines and control characters inside strings
+    - Trailing and doubled commas
+    - Truncated output (unterminated strings, dangling keys, unclosed braces)
+"""
+
+import json
+from typing import Any, Dict, List
+
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_STRUCTURAL = set(",:{}[]")
+_CLOSERS = {"{": "}", "[": "]"}
+_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_VALID_ESCAPES = set('"\\/bfnrtu')
+
+
+def _next_significant(text: str, index: int) -> int:
+    """Index of the next non-whitespace character at or after ``index``."""
+    while index < len(text) and text[index].isspace():
+        index += 1
+    return index
+
+
+def _is_number(word: str) -> bool:
+    """True if ``word`` is a valid JSON number."""
+    try:
+        return isinstance(json.loads(word), (int, float))
+    except ValueError:
+        return False
+
+
+def _drop_trailing_comma(out: List[str]) -> None:
+    """Remove a trailing comma (and whitespace after it) from the output."""
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _quote_closes_string(text: str, index: int, frame: Dict[str, Any]) -> bool:
+    """
+    Decide whether the quote at ``index`` terminates the current string.
+
+    A quote closes the string when what follows could only continue the
+    surrounding structure; otherwise it is treated as an unescaped quote
+    inside the string.
+    """
+    nxt = _next_significant(text, index + 1)
+    if nxt >= len(text):
+        return True
+    ch = text[nxt]
+    if ch in "}]":
+        return True
+    if ch == ":":
+        return frame is not None and frame["type"] == "{" and frame["state"] == "key"
+    if ch == ",":
+        after = _next_significant(text, nxt + 1)
+        return after >= len(text) or text[after] in "\"'{[}]-0123456789tfnTFN"
+    return False
+
+
+def repair_json(text: str) -> str:
+    """
+    Rewrite almost-JSON into valid JSON text.
+
+    Scans from the first ``{`` or ``[`` until the top-level value closes;
+    anything before or after is ignored.
+
+    Args:
+        text: Raw model output containing a (possibly malformed) JSON value
+
+    Returns:
+        JSON text that ``json.loads`` accepts if the repair succeeded
+
+    Raises:
+        ValueError: If the text contains no JSON object or array
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        raise ValueError("No JSON object found")
+
+    out: List[str] = []
+    stack: List[Dict[str, Any]] = []
+    quote = None           # active string delimiter
+    string_is_key = False
+    i = min(starts)
+
+    def value_done() -> None:
+        if stack:
+            frame = stack[-1]
+            frame["state"] = "colon" if frame["type"] == "{" and frame["state"] == "key" else "comma"
+
+    def begin_value() -> None:
+        # A value where a comma was expected means the comma was left out
+        if stack and stack[-1]["state"] == "comma":
+            out.append(",")
+            stack[-1]["state"] = "key" if stack[-1]["type"] == "{" else "value"
+        if stack and stack[-1]["type"] == "{" and stack[-1]["state"] == "key":
+            stack[-1]["key_start"] = len(out)
+
+    while i < len(text):
+        ch = text[i]
+
+        if quote is not None:
+            if ch == "\\":
+                if i + 1 < len(text):
+                    nxt = text[i + 1]
+                    if nxt == "'":
+                        out.append("'")
+                    elif nxt in _VALID_ESCAPES:
+                        out.append(ch + nxt)
+                    else:
+                        out.append("\\\\" + nxt)
+                i += 2
+                continue
+            if ch == quote and _quote_closes_string(text, i, stack[-1] if stack else None):
+                out.append('"')
+                quote = None
+                value_done()
+            elif ch == '"':
+                out.append('\\"')
+            elif ch in _ESCAPES:
+                out.append(_ESCAPES[ch])
+            elif ord(ch) >= 0x20:
+                out.append(ch)
+            i += 1
+            continue
+
+        if ch.isspace():
+            out.append(ch)
+        elif ch in "{[":
+            begin_value()
+            stack.append({"type": ch, "state": "key" if ch == "{" else "value", "key_start": None})
+            out.append(ch)
+        elif ch in "}]":
+            if not stack:
+                break
+            frame = stack.pop()
+            _drop_trailing_comma(out)
+            if frame["type"] == "{" and frame["state"] in ("colon", "value"):
+                # Key without a value
+                del out[frame["key_start"]:]
+                _drop_trailing_comma(out)
+            out.append(_CLOSERS[frame["type"]])
+            if not stack:
+                break
+            value_done()
+        elif ch == ",":
+            # Only keep commas that follow a complete value (drops doubled/leading commas)
+            if stack and stack[-1]["state"] == "comma":
+                out.append(",")
+                stack[-1]["state"] = "key" if stack[-1]["type"] == "{" else "value"
+        elif ch == ":":
+            if stack and stack[-1]["state"] == "colon":
+                out.append(":")
+                stack[-1]["state"] = "value"
+        elif ch in "\"'":
+            begin_value()
+            string_is_key = bool(stack) and stack[-1]["type"] == "{" and stack[-1]["state"] == "key"
+            quote = ch
+            out.append('"')
+        else:
+            end = i
+            while end < len(text) and not text[end].isspace() and text[end] not in _STRUCTURAL:
+                end += 1
+            word = text[i:end]
+            begin_value()
+            is_key = bool(stack) and stack[-1]["type"] == "{" and stack[-1]["state"] == "key"
+            if word in _PYTHON_LITERALS:
+                word = _PYTHON_LITERALS[word]
+            if is_key or (word not in ("true", "false", "null") and not _is_number(word)):
+                word = json.dumps(word)
+            out.append(word)
+            value_done()
+            i = end
+            continue
+        i += 1
+
+    # Truncated output: close the open string, drop dangling keys, close containers
+    if quote is not None:
+        if string_is_key and stack:
+            del out[stack[-1]["key_start"]:]
+        else:
+            out.append('"')
+            value_done()
+    while stack:
+        frame = stack.pop()
+        _drop_trailing_comma(out)
+        if frame["type"] == "{" and frame["state"] in ("colon", "value") and frame["key_start"] is not None:
+            del out[frame["key_start"]:]
+            _drop_trailing_comma(out)
+        out.append(_CLOSERS[frame["type"]])
+        if stack:
+            value_done()
+
+    return "".join(out).strip()
+
+
+def loads_tolerant(text: str) -> Any:
+    """
+    Parse JSON, repairing it locally if strict parsing fails.
+
+    Args:
+        text: Raw model output containing a (possibly malformed) JSON value
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        ValueError: If the text cannot be repaired into valid JSON
+    """
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    repaired = repair_json(text)
+    try:
+        return json.loads(repaired)
+    except ValueError as e:
+        raise ValueError(f"Could not repair JSON: {e}")
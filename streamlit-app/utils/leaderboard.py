@@ -0,0 +1,482 @@
+"""
+Leaderboard
+
+Aggregates pairwise judgements from the evaluation store into Elo and
+Bradley-Terry ratings with bootstrap confidence intervals.
+
+Ratings are updated incrementally: Elo is an online rating and is simply
+advanced by each new judgement, while the Bradley-Terry fit only depends on
+the per-pair win/tie counts, so new judgements are added to those counts and
+the previous fit is used as a warm start. Bootstrap replicates are resampled
+from the same counts and computed for all replicates at once with NumPy.
+Intervals are kept across refreshes and only recomputed once the judgement
+count has grown by ``INTERVAL_REFRESH_GROWTH`` or a new model appears.
+
+Snapshots are saved as JSON so the Leaderboard page reads precomputed
+ratings and only folds in judgements stored since the last refresh.
+
+Usage (from the streamlit-app directory):
+    python -m utils.leaderboard --bootstrap 200
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from utils.atomic_write import write_atomic
+from utils.evaluation_store import EvaluationStore
+
+# Bump whenever the snapshot layout changes; older snapshots are rebuilt
+SNAPSHOT_VERSION = 2
+
+# Elo / Bradley-Terry ratings are reported on the familiar Elo scale
+INITIAL_RATING = 1000.0
+RATING_SCALE = 400.0
+DEFAULT_K_FACTOR = 16.0
+# Growth in judgements (share of those the intervals were computed from) that
+# makes bootstrap intervals stale
+INTERVAL_REFRESH_GROWTH = 0.1
+
+
+def elo_update(
+    ratings: np.ndarray,
+    model_a: Sequence[int],
+    model_b: Sequence[int],
+    outcomes: Sequence[float],
+    k_factor: float = DEFAULT_K_FACTOR
+) -> np.ndarray:
+    """
+    Apply Elo updates for a sequence of judgements, in order.
+
+    ``ratings`` may be a single (M,) rating vector or a (B, M) batch of
+    independent replicates; with a batch, ``model_a``/``model_b``/``outcomes``
+    are (B, N) and every replicate is advanced in the same vectorized step.
+
+    Args:
+        ratings: Current ratings, updated in place
+        model_a: Model indices of response A
+        model_b: Model indices of response B
+        outcomes: 1.0 = A preferred, 0.0 = B preferred, 0.5 = tie
+        k_factor: Maximum rating change per judgement
+
+    Returns:
+        The updated ``ratings``
+    """
+    batch = ratings.ndim == 2
+    model_a = np.asarray(model_a, dtype=int)
+    model_b = np.asarray(model_b, dtype=int)
+    outcomes = np.asarray(outcomes, dtype=float)
+    rows = np.arange(ratings.shape[0]) if batch else None
+
+    for t in range(model_a.shape[-1]):
+        a = model_a[..., t]
+        b = model_b[..., t]
+        index_a = (rows, a) if batch else a
+        index_b = (rows, b) if batch else b
+        expected = 1.0 / (1.0 + 10.0 ** ((ratings[index_b] - ratings[index_a]) / RATING_SCALE))
+        delta = k_factor * (outcomes[..., t] - expected)
+        ratings[index_a] += delta
+        ratings[index_b] -= delta
+    return ratings
+
+
+def fit_bradley_terry(
+    wins: np.ndarray,
+    init: Optional[np.ndarray] = None,
+    prior: float = 0.5,
+    max_iter: int = 500,
+    tol: float = 1e-8
+) -> np.ndarray:
+    """
+    Maximum-likelihood Bradley-Terry strengths via minorize-maximize updates.
+
+    Ties are passed in as half a win for each side. Every model also plays
+    ``prior`` virtual wins and losses against an average opponent, which keeps
+    strengths finite for models that never (or always) won.
+
+    Args:
+        wins: (M, M) or batched (B, M, M) matrix; wins[..., i, j] is how often
+            model i was preferred over model j
+        init: Starting strengths of shape (M,) or (B, M), e.g. the previous fit
+        prior: Virtual wins and losses per model against strength 1
+        max_iter: Maximum number of MM iterations
+        tol: Stop once no log-strength moves by more than this
+
+    Returns:
+        Strengths normalized to a geometric mean of 1, shaped like ``init``
+    """
+    wins = np.asarray(wins, dtype=float)
+    single = wins.ndim == 2
+    if single:
+        wins = wins[None]
+    games = wins + np.swapaxes(wins, 1, 2)
+    won = wins.sum(axis=2) + prior
+
+    if init is None:
+        strengths = np.ones(wins.shape[:2])
+    else:
+        strengths = np.array(init, dtype=float).reshape(wins.shape[:2])
+    if strengths.shape[1] == 0:
+        return strengths[0] if single else strengths
+
+    for _ in range(max_iter):
+        pair_sums = strengths[:, :, None] + strengths[:, None, :]
+        denominator = (games / pair_sums).sum(axis=2) + 2.0 * prior / (strengths + 1.0)
+        updated = won / denominator
+        updated /= np.exp(np.log(updated).mean(axis=1, keepdims=True))
+        converged = np.max(np.abs(np.log(updated) - np.log(strengths))) < tol
+        strengths = updated
+        if converged:
+            break
+    return strengths[0] if single else strengths
+
+
+def strengths_to_ratings(strengths: np.ndarray) -> np.ndarray:
+    """Map Bradley-Terry strengths onto the Elo scale (strength 1 = initial rating)."""
+    return INITIAL_RATING + RATING_SCALE * np.log10(strengths)
+
+
+class Leaderboard:
+    """Incrementally updated Elo and Bradley-Terry ratings over pairwise judgements."""
+
+    def __init__(self, k_factor: float = DEFAULT_K_FACTOR, prior: float = 0.5):
+        """
+        Initialize an empty leaderboard.
+
+        Args:
+            k_factor: Elo K-factor
+            prior: Bradley-Terry virtual wins/losses per model (see fit_bradley_terry)
+        """
+        self.k_factor = k_factor
+        self.prior = prior
+        self.models: List[str] = []
+        self.last_id = 0
+        self.elo = np.zeros(0)
+        self.strengths = np.zeros(0)
+        # wins[i, j]: judgements preferring model i over model j
+        self.wins = np.zeros((0, 0), dtype=int)
+        # ties[i, j] == ties[j, i]: tied judgements between the two models
+        self.ties = np.zeros((0, 0), dtype=int)
+        self.intervals: Dict[str, np.ndarray] = {}
+        # Judgements the current intervals were computed from
+        self.interval_judgements = 0
+        self._index: Dict[str, int] = {}
+
+    @property
+    def judgements(self) -> int:
+        """Number of judgements folded into the ratings."""
+        return int(self.wins.sum() + np.triu(self.ties).sum())
+
+    def add_comparisons(self, comparisons: Sequence[Dict[str, Any]]) -> int:
+        """
+        Fold new judgements into the ratings.
+
+        Args:
+            comparisons: Dictionaries with model_a, model_b and outcome
+                (1.0 = A preferred, 0.0 = B preferred, 0.5 = tie), oldest first,
+                optionally with the evaluation id they came from
+
+        Returns:
+            Number of judgements added
+        """
+        comparisons = [c for c in comparisons if c["model_a"] != c["model_b"]]
+        if not comparisons:
+            return 0
+
+        for comparison in comparisons:
+            for model in (comparison["model_a"], comparison["model_b"]):
+                if model not in self._index:
+                    self._add_model(model)
+                    # Intervals have no row for the new model
+                    self.intervals = {}
+
+        model_a = np.array([self._index[c["model_a"]] for c in comparisons])
+        model_b = np.array([self._index[c["model_b"]] for c in comparisons])
+        outcomes = np.array([float(c["outcome"]) for c in comparisons])
+
+        elo_update(self.elo, model_a, model_b, outcomes, self.k_factor)
+
+        np.add.at(self.wins, (model_a[outcomes == 1.0], model_b[outcomes == 1.0]), 1)
+        np.add.at(self.wins, (model_b[outcomes == 0.0], model_a[outcomes == 0.0]), 1)
+        tied = outcomes == 0.5
+        np.add.at(self.ties, (model_a[tied], model_b[tied]), 1)
+        np.add.at(self.ties, (model_b[tied], model_a[tied]), 1)
+
+        self.strengths = fit_bradley_terry(self._win_matrix(), init=self.strengths, prior=self.prior)
+        self.last_id = max([self.last_id] + [int(c.get("id", 0)) for c in comparisons])
+        return len(comparisons)
+
+    def sync(self, store: EvaluationStore, rubric: Optional[str] = None) -> int:
+        """
+        Fold in judgements stored since the last sync.
+
+        Args:
+            store: Evaluation store to read from
+            rubric: Only judgements with this rubric name or hash
+
+        Returns:
+            Number of judgements added
+        """
+        return self.add_comparisons(store.comparisons(rubric=rubric, after_id=self.last_id))
+
+    def intervals_stale(self, growth: float = INTERVAL_REFRESH_GROWTH) -> bool:
+        """
+        Whether the bootstrap intervals should be recomputed.
+
+        Args:
+            growth: Share of new judgements, relative to those the intervals
+                were computed from, that makes them stale
+
+        Returns:
+            True if there are judgements but no intervals, or enough new ones
+        """
+        if not self.judgements:
+            return False
+        if not self.intervals:
+            return True
+        return self.judgements - self.interval_judgements > growth * self.interval_judgements
+
+    def bootstrap(self, samples: int = 200, confidence: float = 0.95, seed: Optional[int] = None) -> None:
+        """
+        Compute bootstrap confidence intervals for both rating systems.
+
+        Each replicate resamples the judgements with replacement (as counts
+        over distinct (model, model, outcome) cells, so the cost does not grow
+        with history length for Bradley-Terry), refits Bradley-Terry and
+        replays Elo over the resample in random order.
+
+        Args:
+            samples: Number of bootstrap replicates
+            confidence: Two-sided confidence level
+            seed: Random seed for reproducible intervals
+        """
+        total = self.judgements
+        self.interval_judgements = total
+        if total == 0:
+            self.intervals = {}
+            return
+
+        rng = np.random.default_rng(seed)
+        count = len(self.models)
+        cell_a, cell_b, cell_outcome, cell_counts = self._cells()
+        draws = rng.multinomial(total, cell_counts / cell_counts.sum(), size=samples)
+
+        # Scatter resampled cell counts into (samples, M, M) win matrices
+        flat = np.zeros((len(cell_a), count * count))
+        flat[np.arange(len(cell_a)), cell_a * count + cell_b] = cell_outcome
+        flat[np.arange(len(cell_a)), cell_b * count + cell_a] += 1.0 - cell_outcome
+        wins = (draws @ flat).reshape(samples, count, count)
+        init = np.broadcast_to(self.strengths, (samples, count))
+        bt = strengths_to_ratings(fit_bradley_terry(wins, init=init, prior=self.prior))
+
+        picks = rng.choice(len(cell_a), size=(samples, total), p=cell_counts / cell_counts.sum())
+        elo = elo_update(
+            np.full((samples, count), INITIAL_RATING),
+            cell_a[picks], cell_b[picks], cell_outcome[picks], self.k_factor
+        )
+
+        tail = (1.0 - confidence) / 2.0 * 100.0
+        self.intervals = {
+            "bradley_terry": np.percentile(bt, [tail, 100.0 - tail], axis=0).T,
+            "elo": np.percentile(elo, [tail, 100.0 - tail], axis=0).T,
+        }
+
+    def table(self) -> List[Dict[str, Any]]:
+        """
+        Leaderboard rows, best Bradley-Terry rating first.
+
+        Returns:
+            One dictionary per model with ratings, interval bounds (None if
+            not computed), games, wins, losses, ties and win rate
+        """
+        bt = strengths_to_ratings(self.strengths)
+        rows = []
+        for i, model in enumerate(self.models):
+            wins = int(self.wins[i].sum())
+            losses = int(self.wins[:, i].sum())
+            ties = int(self.ties[i].sum())
+            games = wins + losses + ties
+            row = {
+                "model": model,
+                "bradley_terry": float(bt[i]),
+                "elo": float(self.elo[i]),
+                "games": games,
+                "wins": wins,
+                "losses": losses,
+                "ties": ties,
+                "win_rate": (wins + 0.5 * ties) / games if games else None,
+            }
+            for name in ("bradley_terry", "elo"):
+                bounds = self.intervals.get(name)
+                row[f"{name}_low"] = float(bounds[i, 0]) if bounds is not None else None
+                row[f"{name}_high"] = float(bounds[i, 1]) if bounds is not None else None
+            rows.append(row)
+        return sorted(rows, key=lambda row: row["bradley_terry"], reverse=True)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the leaderboard state."""
+        return {
+            "format_version": SNAPSHOT_VERSION,
+            "k_factor": self.k_factor,
+            "prior": self.prior,
+            "models": self.models,
+            "last_id": self.last_id,
+            "elo": self.elo.tolist(),
+            "strengths": self.strengths.tolist(),
+            "wins": self.wins.tolist(),
+            "ties": self.ties.tolist(),
+            "intervals": {name: bounds.tolist() for name, bounds in self.intervals.items()},
+            "interval_judgements": self.interval_judgements,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Leaderboard":
+        """
+        Restore a leaderboard from ``to_dict`` output.
+
+        Raises:
+            ValueError: If the snapshot was written by an incompatible version
+        """
+        if data.get("format_version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported leaderboard snapshot version: {data.get('format_version')}")
+        leaderboard = cls(k_factor=data["k_factor"], prior=data["prior"])
+        count = len(data["models"])
+        leaderboard.models = list(data["models"])
+        leaderboard._index = {model: i for i, model in enumerate(leaderboard.models)}
+        leaderboard.last_id = data["last_id"]
+        leaderboard.elo = np.array(data["elo"], dtype=float)
+        leaderboard.strengths = np.array(data["strengths"], dtype=float)
+        leaderboard.wins = np.array(data["wins"], dtype=int).reshape(count, count)
+        leaderboard.ties = np.array(data["ties"], dtype=int).reshape(count, count)
+        leaderboard.intervals = {
+            name: np.array(bounds, dtype=float).reshape(count, 2)
+            for name, bounds in data.get("intervals", {}).items()
+        }
+        leaderboard.interval_judgements = data["interval_judgements"]
+        return leaderboard
+
+    def save(self, path: Path) -> Path:
+        """
+        Write a snapshot, replacing any previous one atomically.
+
+        Args:
+            path: Snapshot JSON file
+
+        Returns:
+            Path to the written snapshot
+        """
+        return write_atomic(Path(path), json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["Leaderboard"]:
+        """
+        Read a snapshot written by ``save``.
+
+        Args:
+            path: Snapshot JSON file
+
+        Returns:
+            The leaderboard, or None if the snapshot is missing or unreadable
+        """
+        try:
+            return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _add_model(self, model: str) -> None:
+        """Grow every per-model array by one model with a fresh rating."""
+        self._index[model] = len(self.models)
+        self.models.append(model)
+        self.elo = np.append(self.elo, INITIAL_RATING)
+        self.strengths = np.append(self.strengths, 1.0)
+        self.wins = np.pad(self.wins, ((0, 1), (0, 1)))
+        self.ties = np.pad(self.ties, ((0, 1), (0, 1)))
+
+    def _win_matrix(self) -> np.ndarray:
+        """Wins with ties counted as half a win for each side."""
+        return self.wins + 0.5 * self.ties
+
+    def _cells(self) -> tuple:
+        """Distinct (model_a, model_b, outcome) judgements and how often each occurred."""
+        win_i, win_j = np.nonzero(self.wins)
+        tie_i, tie_j = np.nonzero(np.triu(self.ties))
+        cell_a = np.concatenate([win_i, tie_i])
+        cell_b = np.concatenate([win_j, tie_j])
+        cell_outcome = np.concatenate([np.ones(len(win_i)), np.full(len(tie_i), 0.5)])
+        cell_counts = np.concatenate([self.wins[win_i, win_j], self.ties[tie_i, tie_j]]).astype(float)
+        return cell_a, cell_b, cell_outcome, cell_counts
+
+
+def snapshot_path(leaderboard_dir: Path, rubric: Optional[str] = None) -> Path:
+    """
+    Snapshot file for the overall leaderboard or one rubric's leaderboard.
+
+    Args:
+        leaderboard_dir: Directory holding snapshots
+        rubric: Rubric hash (None = all rubrics)
+
+    Returns:
+        Path of the snapshot JSON file
+    """
+    return Path(leaderboard_dir) / f"{rubric or 'all'}.json"
+
+
+def refresh_leaderboard(
+    store: EvaluationStore,
+    path: Path,
+    rubric: Optional[str] = None,
+    samples: int = 200,
+    growth: float = INTERVAL_REFRESH_GROWTH
+) -> Leaderboard:
+    """
+    Load a snapshot, fold in new judgements and save it if anything changed.
+
+    Bootstrap intervals are cached in the snapshot and only recomputed once
+    they are stale (see ``Leaderboard.intervals_stale``), so most refreshes
+    just fold in the new judgements.
+
+    Args:
+        store: Evaluation store to read from
+        path: Snapshot JSON file
+        rubric: Only judgements with this rubric name or hash
+        samples: Bootstrap replicates (0 = leave intervals as they are)
+        growth: Judgement growth that makes the intervals stale (0 = recompute
+            on every new judgement)
+
+    Returns:
+        Up-to-date leaderboard
+    """
+    leaderboard = Leaderboard.load(path) or Leaderboard()
+    added = leaderboard.sync(store, rubric=rubric)
+    recompute = bool(samples) and leaderboard.intervals_stale(growth)
+    if recompute:
+        leaderboard.bootstrap(samples)
+    if added or recompute:
+        leaderboard.save(path)
+    return leaderboard
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    import config
+
+    parser = argparse.ArgumentParser(description="Refresh leaderboard snapshots from the evaluation store.")
+    parser.add_argument("--bootstrap", type=int, default=200, help="Bootstrap replicates for intervals")
+    args = parser.parse_args(argv)
+
+    store = EvaluationStore(config.EVALUATION_STORE_PATH)
+    scopes = [None] + [rubric["hash"] for rubric in store.rubrics()]
+    for rubric in scopes:
+        leaderboard = refresh_leaderboard(
+            store, snapshot_path(config.LEADERBOARD_DIR, rubric), rubric=rubric, samples=args.bootstrap
+        )
+        print(f"{rubric or 'all'}: {len(leaderboard.models)} models, {leaderboard.judgements} judgements")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
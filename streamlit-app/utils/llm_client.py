@@ -1,53 +1,306 @@
-import os
-import requests
-from openai import OpenAI
-from typing import List, Dict, Optional, Tuple
-import streamlit as st
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, List, Dict, Optional, Sequence, Tuple
+
+from utils.concurrency import get_executor, run_concurrently
+from utils.metrics import CallRecord, MetricsSink
+from utils.resilience import LLMRequestError, RetryPolicy, call_with_retry
+from utils.model_catalog import ModelCatalog, get_catalog_cache
+from utils.http_transport import CONNECT_TIMEOUT, MODELS_TIMEOUT, READ_TIMEOUT, get_transport
+from utils.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Default per-request timeout (seconds) for a single completion
+DEFAULT_REQUEST_TIMEOUT = READ_TIMEOUT
+
+# Ways of getting schema-conforming JSON out of a model, best first:
+#   json_schema - response_format with a strict JSON schema (constrained decoding)
+#   tool        - a forced tool call whose parameters are the schema
+#   json_object - response_format JSON mode (valid JSON, schema not enforced)
+#   prompt      - instructions in the prompt only
+STRUCTURED_OUTPUT_MODES = ("json_schema", "tool", "json_object", "prompt")
+
+
+class ResponseStream:
+    """
+    Iterator over the text deltas of a streamed completion.
+
+    Iterating yields each non-empty delta as it arrives. Once iteration has
+    finished, ``text`` holds the full response and the timing attributes are set.
+    Errors follow the same string contract as ``LLMClient.generate_response``:
+    the error message is yielded as the final delta and recorded in ``error``.
+    """
+
+    def __init__(
+        self,
+        open_stream: Callable[[], Iterable[Any]],
+        model: str = "",
+        on_finish: Optional[Callable[["ResponseStream"], None]] = None
+    ):
+        """
+        Args:
+            open_stream: Callable that starts the request and returns the chunk iterator
+            model: Model ID, for display purposes
+            on_finish: Called with the stream once it has finished or failed
+        """
+        self._open_stream = open_stream
+        self._on_finish = on_finish
+        self.model = model
+        self.served_model: Optional[str] = None
+        self.text = ""
+        self.error: Optional[str] = None
+        self.status: Optional[int] = None
+        self.usage: Dict[str, int] = {}
+        self.time_to_first_token: Optional[float] = None
+        self.total_time: Optional[float] = None
+        self._started = False
+
+    def __iter__(self) -> Iterator[str]:
+        if self._started:
+            raise RuntimeError("ResponseStream can only be iterated once")
+        self._started = True
+
+        started = time.monotonic()
+        parts: List[str] = []
+        chunks = None
+        try:
+            chunks = self._open_stream()
+            for chunk in chunks:
+                # The final chunk carries the usage of the whole stream
+                if getattr(chunk, "usage", None) is not None:
+                    self.usage = extract_usage(chunk)
+                self.served_model = getattr(chunk, "model", None) or self.served_model
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if self.time_to_first_token is None:
+                    self.time_to_first_token = time.monotonic() - started
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            self.error = str(e)
+            self.status = getattr(e, "status_code", None)
+            message = f"Error generating response: {str(e)}"
+            if parts:
+                message = "\n\n" + message
+            parts.append(message)
+            yield message
+        finally:
+            # Closing early (e.g. consumer stopped reading) releases the connection
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            self.text = "".join(parts)
+            self.total_time = time.monotonic() - started
+            if self.error is None:
+                self.status = 200
+            if self._on_finish is not None:
+                self._on_finish(self)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """
+        Timing statistics of the finished stream.
+
+        Returns:
+            Dictionary with time_to_first_token and total_time in seconds
+        """
+        return {
+            "time_to_first_token": self.time_to_first_token,
+            "total_time": self.total_time
+        }
+
+
+def interleave_streams(streams: Sequence[ResponseStream]) -> Iterator[Tuple[int, str]]:
+    """
+    Consume several streams concurrently and yield their deltas as they arrive.
+
+    Each stream is pumped on the shared worker pool, so slow models do not hold
+    back fast ones. Closing the returned generator stops all pumps.
+
+    Args:
+        streams: Streams to consume
+
+    Returns:
+        Iterator of (stream index, delta) tuples
+    """
+    events: "queue.Queue[Tuple[int, Optional[str]]]" = queue.Queue()
+    stop = threading.Event()
+
+    def pump(index: int, stream: ResponseStream) -> None:
+        try:
+            for delta in stream:
+                if stop.is_set():
+                    break
+                events.put((index, delta))
+        finally:
+            events.put((index, None))
+
+    executor = get_executor()
+    for index, stream in enumerate(streams):
+        executor.submit(pump, index, stream)
+
+    remaining = len(streams)
+    try:
+        while remaining:
+            index, delta = events.get()
+            if delta is None:
+                remaining -= 1
+                continue
+            yield index, delta
+    finally:
+        stop.set()
+
+
+def extract_usage(response: Any) -> Dict[str, int]:
+    """
+    Read token counts from a chat completion response.
+    
+    Handles the OpenAI-style ``prompt_tokens_details.cached_tokens`` field as well
+    as provider-specific prompt-cache fields passed through by OpenRouter.
+    
+    Args:
+        response: Chat completion response object
+    
+    Returns:
+        Dictionary with prompt_tokens, completion_tokens, cached_tokens and
+        cache_write_tokens (empty if the response carries no usage)
+    """
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return {}
+    
+    def field(obj: Any, name: str) -> Any:
+        if obj is None:
+            return None
+        if isinstance(obj, dict):
+            return obj.get(name)
+        value = getattr(obj, name, None)
+        if value is None:
+            extra = getattr(obj, "model_extra", None) or {}
+            value = extra.get(name)
+        return value
+    
+    details = field(usage, "prompt_tokens_details")
+    cached = field(details, "cached_tokens") or field(usage, "cache_read_input_tokens") or 0
+    cache_write = field(details, "cache_write_tokens") or field(usage, "cache_creation_input_tokens") or 0
+    
+    return {
+        "prompt_tokens": int(field(usage, "prompt_tokens") or 0),
+        "completion_tokens": int(field(usage, "completion_tokens") or 0),
+        "cached_tokens": int(cached),
+        "cache_write_tokens": int(cache_write)
+    }
 
 
 class LLMClient:
     """OpenRouter API client for generating and comparing AI responses."""
     
-    def __init__(self, api_key: Optional[str] = None, base_url: str = "https://openrouter.ai/api/v1"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = "https://openrouter.ai/api/v1",
+        cache: Optional[ResponseCache] = None,
+        metrics: Optional[MetricsSink] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        on_error: Optional[Callable[[str], None]] = None
+    ):
         """
         Initialize the OpenRouter client.
         
         Args:
-            api_key: OpenRouter API key
+            api_key: OpenRouter API key (default: OPENROUTER_API_KEY from the
+                environment or a .env file)
             base_url: OpenRouter API base URL
+            cache: Optional persistent response cache
+            metrics: Optional sink receiving a CallRecord (tokens, timings,
+                HTTP status, cost) for every completion and stream
+            retry_policy: Backoff/retry settings for transient failures
+                (defaults to RetryPolicy())
+            on_error: Optional callback shown non-fatal errors (e.g. ``st.error``
+                in the app); they are logged when not given
         """
-        self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
+        if not api_key:
+            # Headless callers (batch runs, scripts) read .env just like the app
+            import config
+            api_key = config.OPENROUTER_API_KEY or None
+        self.api_key = api_key
         self.base_url = base_url
         self.models_url = f"{base_url}/models"
+        self.cache = cache
+        self.metrics = metrics
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.on_error = on_error
         
+        # Pooled clients are shared process-wide, so constructing an LLMClient
+        # on every Streamlit rerun keeps existing connections alive
         if self.api_key:
-            self.client = OpenAI(
-                api_key=self.api_key,
-                base_url=base_url
-            )
+            self.client, self.session = get_transport(self.api_key, base_url)
         else:
             self.client = None
+            self.session = None
     
-    @st.cache_data(ttl=300)
-    def fetch_models(_self) -> List[Dict]:
+    def get_model_catalog(self) -> ModelCatalog:
+        """
+        Return the indexed model catalog for this API key.
+        
+        The catalog is fetched once, shared process-wide, and refreshed in the
+        background every 5 minutes without blocking the caller. A failed
+        refresh is reported through ``on_error`` once per distinct error while
+        the stale catalog is served.
+        
+        Returns:
+            ModelCatalog (empty if the models could not be fetched)
+        """
+        if self.session is None:
+            return ModelCatalog([])
+        
+        cache = get_catalog_cache((self.api_key, self.base_url), self._request_models)
+        try:
+            catalog = cache.get()
+        except Exception as e:
+            self._report_error(f"Error fetching models: {str(e)}")
+            return ModelCatalog([])
+        error = cache.unreported_error()
+        if error is not None:
+            self._report_error(f"Error refreshing models, showing the cached list: {error}")
+        return catalog
+    
+    def fetch_models(self) -> List[Dict]:
         """
         Fetch all available models from OpenRouter.
-        Results are cached for 5 minutes to balance freshness with API efficiency.
+        Results come from the shared model catalog, refreshed every 5 minutes.
         
         Returns:
             List of model dictionaries with their properties
         """
+        return [model.raw for model in self.get_model_catalog().models]
+    
+    def _cached_catalog(self) -> Optional[ModelCatalog]:
+        """The shared catalog without reporting errors; None if it is unavailable."""
+        if self.session is None:
+            return None
         try:
-            headers = {
-                "Authorization": f"Bearer {_self.api_key}"
-            }
-            response = requests.get(_self.models_url, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("data", [])
-        except Exception as e:
-            st.error(f"Error fetching models: {str(e)}")
-            return []
+            return get_catalog_cache((self.api_key, self.base_url), self._request_models).get()
+        except Exception:
+            return None
+    
+    def _report_error(self, message: str) -> None:
+        """Surface a non-fatal error through the UI callback, or the log without one."""
+        if self.on_error is not None:
+            self.on_error(message)
+        else:
+            logger.warning(message)
+    
+    def _request_models(self) -> List[Dict]:
+        """Request the raw model list from the /models endpoint; raises on failure."""
+        response = self.session.get(self.models_url, timeout=MODELS_TIMEOUT)
+        response.raise_for_status()
+        return response.json().get("data", [])
     
     def get_free_models(self) -> List[Dict]:
         """
@@ -56,19 +309,33 @@ class LLMClient:
         Returns:
             List of free model dictionaries
         """
-        all_models = self.fetch_models()
-        free_models = []
+        return [model.raw for model in self.get_model_catalog().free_models]
+    
+    def structured_output_mode(self, model: str) -> str:
+        """
+        Pick the best structured-output mode a model supports.
         
-        for model in all_models:
-            pricing = model.get("pricing", {})
-            prompt_price = float(pricing.get("prompt", "1"))
-            completion_price = float(pricing.get("completion", "1"))
-            
-            # Check if both prompt and completion are free
-            if prompt_price == 0.0 and completion_price == 0.0:
-                free_models.append(model)
+        Uses the ``supported_parameters`` advertised by the /models endpoint;
+        models missing from the catalog, or no catalog at all, fall back to
+        prompt-only JSON. Runs on every judge request, so catalog errors are
+        not reported here.
+        
+        Args:
+            model: Model ID
         
-        return free_models
+        Returns:
+            One of STRUCTURED_OUTPUT_MODES
+        """
+        catalog = self._cached_catalog()
+        info = catalog.get(model) if catalog is not None else None
+        supported = info.supported_parameters if info else frozenset()
+        if "structured_outputs" in supported:
+            return "json_schema"
+        if "tools" in supported and "tool_choice" in supported:
+            return "tool"
+        if "response_format" in supported:
+            return "json_object"
+        return "prompt"
     
     def generate_response(
         self,
@@ -79,11 +346,21 @@ class LLMClient:
         top_p: float = 1.0,
         max_tokens: int = 4096,
         top_k: Optional[int] = None,
-        seed: Optional[int] = None
+        seed: Optional[int] = None,
+        timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+        use_cache: Optional[bool] = None
     ) -> str:
         """
         Generate a single response from the LLM.
         
+        When the client has a response cache, deterministic calls (temperature 0
+        or a fixed seed) are served from it automatically; ``use_cache`` forces
+        caching on or off for a single call. Errors are never cached.
+        
+        This is the string-returning compatibility wrapper around
+        ``generate_completion``: failures (after retries) are returned as an
+        "Error generating response: ..." string instead of raised.
+        
         Args:
             prompt: User prompt
             model: Model ID (e.g., "google/gemini-flash-1.5")
@@ -93,6 +370,8 @@ class LLMClient:
             max_tokens: Maximum response length
             top_k: Top-k sampling parameter (optional)
             seed: Random seed for reproducibility (optional)
+            timeout: Request timeout in seconds (None = client default)
+            use_cache: Force the response cache on/off (None = automatic)
         
         Returns:
             Generated response text
@@ -101,30 +380,306 @@ class LLMClient:
             return "Error: OPENROUTER_API_KEY not found. Please set your API key in the environment or sidebar."
         
         try:
-            # Build parameters
-            params = {
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": temperature,
-                "top_p": top_p,
-                "max_tokens": max_tokens
-            }
-            
-            # Add optional parameters
-            if top_k is not None:
-                params["top_k"] = top_k
-            if seed is not None:
-                params["seed"] = seed
-            
-            response = self.client.chat.completions.create(**params)
-            return response.choices[0].message.content
-            
+            return self.generate_completion(
+                prompt, model, system_prompt, temperature, top_p, max_tokens, top_k, seed, timeout, use_cache
+            )["content"]
         except Exception as e:
             return f"Error generating response: {str(e)}"
     
+    def generate_completion(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str = "You are a helpful AI assistant.",
+        temperature: float = 0.7,
+        top_p: float = 1.0,
+        max_tokens: int = 4096,
+        top_k: Optional[int] = None,
+        seed: Optional[int] = None,
+        timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT,
+        use_cache: Optional[bool] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+        schema_name: str = "response",
+        structured_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a single response and return it with its metadata.
+        
+        Takes the same arguments as ``generate_response`` but raises on failure
+        instead of returning an error string. Rate limits, 5xx responses and
+        connection failures are retried with backoff (see ``utils.resilience``)
+        before anything is raised. With ``json_schema`` the response
+        is constrained to that schema using the best mode the model supports;
+        if the provider rejects the structured request, it is retried once
+        with prompt-only JSON.
+        
+        Args:
+            json_schema: Optional JSON Schema the response content must follow
+            schema_name: Name of the schema / tool sent to the provider
+            structured_mode: Force one of STRUCTURED_OUTPUT_MODES
+                (None = picked from the model's supported parameters)
+        
+        Returns:
+            Dictionary containing:
+                - content: Generated response text (the JSON arguments in tool mode)
+                - model: Model that served the request
+                - usage: Token counts (prompt_tokens, completion_tokens, cached_tokens,
+                  cache_write_tokens); empty when served from the response cache
+                - from_cache: True if served from the local response cache
+                - structured_mode: Structured-output mode used ("prompt" without a schema)
+                - wall_time: Seconds spent on the request(s)
+                - cost: Cost in USD from the catalog's pricing (None if unknown)
+        
+        Raises:
+            RuntimeError: If no API key is configured
+            LLMError: Typed failure once retries are exhausted (LLMRateLimitError,
+                LLMServerError, LLMRequestError, CircuitOpenError, ...)
+        """
+        if not self.client:
+            raise RuntimeError("OPENROUTER_API_KEY not found. Please set your API key in the environment or sidebar.")
+        
+        params = self._build_params(
+            prompt, model, system_prompt, temperature, top_p, max_tokens, top_k, seed, timeout
+        )
+        
+        mode = "prompt"
+        if json_schema is not None:
+            mode = structured_mode or self.structured_output_mode(model)
+            self._add_structured_output(params, mode, json_schema, schema_name)
+        
+        cache_key = None
+        if self._should_cache(use_cache, temperature, seed):
+            cache_key = ResponseCache.make_key(params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self._record_call(CallRecord(model=model, served_model=model, from_cache=True, cost=0.0))
+                return {
+                    "content": cached, "model": model, "usage": {}, "from_cache": True,
+                    "structured_mode": mode, "wall_time": 0.0, "cost": 0.0
+                }
+        
+        started = time.monotonic()
+        retries = [0]
+        try:
+            try:
+                response = self._create(params, model, retries)
+            except LLMRequestError as e:
+                if mode == "prompt" or e.status_code != 400:
+                    raise
+                # Provider rejected the structured request; fall back to prompt-only JSON
+                for key in ("response_format", "tools", "tool_choice"):
+                    params.pop(key, None)
+                mode = "prompt"
+                cache_key = None
+                response = self._create(params, model, retries)
+        except Exception as e:
+            self._record_call(CallRecord(
+                model=model,
+                wall_time=time.monotonic() - started,
+                status=getattr(e, "status_code", None),
+                retries=retries[0],
+                error=str(e)
+            ))
+            raise
+        wall_time = time.monotonic() - started
+        usage = extract_usage(response)
+        served_model = getattr(response, "model", None) or model
+        cost = self._call_cost(served_model, usage) if usage else None
+        self._record_call(CallRecord(
+            model=model,
+            served_model=served_model,
+            wall_time=wall_time,
+            status=200,
+            retries=retries[0],
+            cost=cost,
+            **usage
+        ))
+        
+        message = response.choices[0].message
+        content = message.content
+        if mode == "tool":
+            tool_calls = getattr(message, "tool_calls", None) or []
+            if tool_calls:
+                content = tool_calls[0].function.arguments
+        
+        if cache_key is not None and content:
+            self.cache.set(cache_key, content)
+        
+        return {
+            "content": content,
+            "model": served_model,
+            "usage": usage,
+            "from_cache": False,
+            "structured_mode": mode,
+            "wall_time": wall_time,
+            "cost": cost
+        }
+    
+    def _create(self, params: Dict[str, Any], model: str, retries: Optional[List[int]] = None) -> Any:
+        """
+        Send a chat completion request through the model's guard, with retries.
+        
+        Args:
+            params: Request parameters
+            model: Model ID (selects the per-model guard)
+            retries: Optional one-element counter incremented on each retry
+        """
+        def count_retry(attempt: int, error: Exception, delay: float) -> None:
+            if retries is not None:
+                retries[0] += 1
+        
+        return call_with_retry(
+            lambda: self.client.chat.completions.create(**params),
+            model,
+            self.retry_policy,
+            on_retry=count_retry
+        )
+    
+    def _record_call(self, call: CallRecord) -> None:
+        """Send a call record to the metrics sink, if any; sink failures never break a call."""
+        if self.metrics is None:
+            return
+        try:
+            self.metrics.record(call)
+        except Exception:
+            pass
+    
+    def _call_cost(self, model: str, usage: Dict[str, int]) -> Optional[float]:
+        """Price a call from the catalog's pricing fields; None if the model is unknown."""
+        if self.metrics is None:
+            return None
+        catalog = self._cached_catalog()
+        if catalog is None:
+            return None
+        info = catalog.get(model)
+        return info.cost(usage) if info else None
+    
+    def _record_stream(self, stream: ResponseStream) -> None:
+        """Record a finished stream."""
+        if self.metrics is None:
+            return
+        served_model = stream.served_model or stream.model
+        self._record_call(CallRecord(
+            model=stream.model,
+            served_model=served_model,
+            wall_time=stream.total_time or 0.0,
+            time_to_first_token=stream.time_to_first_token,
+            status=stream.status,
+            cost=self._call_cost(served_model, stream.usage) if stream.usage else None,
+            streamed=True,
+            error=stream.error,
+            **stream.usage
+        ))
+    
+    def _add_structured_output(
+        self,
+        params: Dict[str, Any],
+        mode: str,
+        json_schema: Dict[str, Any],
+        schema_name: str
+    ) -> None:
+        """Add the request parameters for a structured-output mode."""
+        if mode == "json_schema":
+            params["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": schema_name, "strict": True, "schema": json_schema}
+            }
+        elif mode == "tool":
+            params["tools"] = [{
+                "type": "function",
+                "function": {
+                    "name": schema_name,
+                    "description": "Submit the result as structured arguments.",
+                    "parameters": json_schema
+                }
+            }]
+            params["tool_choice"] = {"type": "function", "function": {"name": schema_name}}
+        elif mode == "json_object":
+            params["response_format"] = {"type": "json_object"}
+        elif mode != "prompt":
+            raise ValueError(f"Unknown structured output mode: {mode}")
+    
+    def _should_cache(self, use_cache: Optional[bool], temperature: float, seed: Optional[int]) -> bool:
+        """Decide whether a call goes through the response cache."""
+        if self.cache is None:
+            return False
+        if use_cache is not None:
+            return use_cache
+        return temperature == 0 or seed is not None
+    
+    def stream_response(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str = "You are a helpful AI assistant.",
+        temperature: float = 0.7,
+        top_p: float = 1.0,
+        max_tokens: int = 4096,
+        top_k: Optional[int] = None,
+        seed: Optional[int] = None,
+        timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT
+    ) -> ResponseStream:
+        """
+        Stream a single response from the LLM token by token.
+        
+        The request is only sent once the returned stream is iterated. Takes the
+        same arguments as ``generate_response``.
+        
+        Returns:
+            ResponseStream yielding text deltas and recording time-to-first-token,
+            total time and (when the provider reports it) token usage
+        """
+        if not self.client:
+            def missing_key() -> Iterable[Any]:
+                raise RuntimeError("OPENROUTER_API_KEY not found. Please set your API key in the environment or sidebar.")
+            return ResponseStream(missing_key, model)
+        
+        params = self._build_params(
+            prompt, model, system_prompt, temperature, top_p, max_tokens, top_k, seed, timeout
+        )
+        params["stream"] = True
+        # Ask for a final usage chunk so streamed calls are accounted like the others
+        params["stream_options"] = {"include_usage": True}
+        # Retries cover opening the stream; a stream that fails midway is not replayed
+        return ResponseStream(lambda: self._create(params, model), model, on_finish=self._record_stream)
+    
+    def _build_params(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: str,
+        temperature: float,
+        top_p: float,
+        max_tokens: int,
+        top_k: Optional[int],
+        seed: Optional[int],
+        timeout: Optional[float]
+    ) -> Dict[str, Any]:
+        """Build chat completion request parameters."""
+        params = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature,
+            "top_p": top_p,
+            "max_tokens": max_tokens
+        }
+        
+        # Add optional parameters
+        if top_k is not None:
+            params["top_k"] = top_k
+        if seed is not None:
+            params["seed"] = seed
+        if timeout is not None:
+            from openai import Timeout
+            
+            # Keep the short connect timeout; only the read budget is per call
+            params["timeout"] = Timeout(timeout, connect=min(timeout, CONNECT_TIMEOUT))
+        
+        return params
+    
     def generate_dual_responses(
         self,
         prompt: str,
@@ -137,6 +692,11 @@ class LLMClient:
         """
         Generate two responses for comparison.
         
+        Both completions run concurrently, so wall-clock latency is roughly that
+        of the slower model rather than the sum of both. Each side may carry its
+        own ``timeout`` in its params dict; a side that times out or fails is
+        reported as an error string without affecting the other side.
+        
         Args:
             prompt: User prompt
             model_a: Model ID for Response A
@@ -148,31 +708,118 @@ class LLMClient:
         Returns:
             Tuple of (response_a, response_b)
         """
-        # Default parameters
+        params_a, params_b = self._merge_dual_params(params_a, params_b)
+        
+        # Generate both responses concurrently; the request timeout is enforced by
+        # the API client, the wait timeout guards against a hung worker
+        response_a, response_b = run_concurrently(
+            [
+                lambda: self.generate_response(prompt, model_a, system_prompt, **params_a),
+                lambda: self.generate_response(prompt, model_b, system_prompt, **params_b),
+            ],
+            timeouts=[params_a.get("timeout"), params_b.get("timeout")],
+            on_timeout=lambda index, timeout: f"Error generating response: timed out after {timeout:.0f}s"
+        )
+        
+        return response_a, response_b
+    
+    def generate_multi_responses(
+        self,
+        prompt: str,
+        models: Sequence[str],
+        system_prompt: str = "You are a helpful AI assistant.",
+        params: Optional[Dict] = None
+    ) -> List[str]:
+        """
+        Generate one response per model, all concurrently.
+        
+        The N-model counterpart of ``generate_dual_responses``: every model
+        gets the same parameters, and a model that times out or fails is
+        reported as an error string without affecting the others.
+        
+        Args:
+            prompt: User prompt
+            models: Model IDs
+            system_prompt: System prompt for context
+            params: Parameters shared by every model (temperature, top_p,
+                max_tokens, timeout, etc.)
+        
+        Returns:
+            Responses in the same order as ``models``
+        """
+        params = {
+            "temperature": 0.7,
+            "top_p": 1.0,
+            "max_tokens": 4096,
+            "top_k": None,
+            "seed": None,
+            "timeout": DEFAULT_REQUEST_TIMEOUT,
+            **(params or {})
+        }
+        return run_concurrently(
+            [lambda model=model: self.generate_response(prompt, model, system_prompt, **params) for model in models],
+            timeouts=[params.get("timeout")] * len(models),
+            on_timeout=lambda index, timeout: f"Error generating response: timed out after {timeout:.0f}s"
+        )
+    
+    def stream_dual_responses(
+        self,
+        prompt: str,
+        model_a: str,
+        model_b: str,
+        system_prompt: str = "You are a helpful AI assistant.",
+        params_a: Optional[Dict] = None,
+        params_b: Optional[Dict] = None
+    ) -> Tuple[ResponseStream, ResponseStream]:
+        """
+        Create streams for two responses for side-by-side incremental rendering.
+        
+        Pass the result to ``interleave_streams`` to consume both concurrently.
+        
+        Args:
+            prompt: User prompt
+            model_a: Model ID for Response A
+            model_b: Model ID for Response B
+            system_prompt: System prompt for context
+            params_a: Parameters for Response A
+            params_b: Parameters for Response B
+        
+        Returns:
+            Tuple of (stream_a, stream_b)
+        """
+        params_a, params_b = self._merge_dual_params(params_a, params_b)
+        return (
+            self.stream_response(prompt, model_a, system_prompt, **params_a),
+            self.stream_response(prompt, model_b, system_prompt, **params_b)
+        )
+    
+    def _merge_dual_params(
+        self,
+        params_a: Optional[Dict],
+        params_b: Optional[Dict]
+    ) -> Tuple[Dict, Dict]:
+        """Merge user-provided parameters with the per-side defaults."""
         default_params_a = {
             "temperature": 0.7,
             "top_p": 1.0,
             "max_tokens": 4096,
             "top_k": None,
-            "seed": None
+            "seed": None,
+            "timeout": DEFAULT_REQUEST_TIMEOUT
         }
         default_params_b = {
             "temperature": 1.0,
             "top_p": 1.0,
             "max_tokens": 4096,
             "top_k": None,
-            "seed": None
+            "seed": None,
+            "timeout": DEFAULT_REQUEST_TIMEOUT
         }
         
-        # Merge with user-provided parameters
-        params_a = {**default_params_a, **(params_a or {})}
-        params_b = {**default_params_b, **(params_b or {})}
-        
-        # Generate both responses
-        response_a = self.generate_response(prompt, model_a, system_prompt, **params_a)
-        response_b = self.generate_response(prompt, model_b, system_prompt, **params_b)
-        
-        return response_a, response_b
+        return (
+            {**default_params_a, **(params_a or {})},
+            {**default_params_b, **(params_b or {})}
+        )
     
     def regenerate_response(
         self,
@@ -0,0 +1,290 @@
+"""
+LLM Call Metrics
+
+Per-call accounting for LLMClient: token counts (prompt, completion, cached),
+wall time, time-to-first-token, HTTP status and cost. Records are handed to a
+pluggable sink: an in-memory ring buffer for the UI, an append-only JSONL file
+for offline analysis, or Prometheus counters rendered in the text exposition
+format.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.atomic_write import write_atomic
+
+
+@dataclass(frozen=True)
+class CallRecord:
+    """Accounting for a single LLM request."""
+
+    model: str
+    served_model: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+    wall_time: float = 0.0
+    time_to_first_token: Optional[float] = None
+    status: Optional[int] = None
+    retries: int = 0
+    cost: Optional[float] = None
+    from_cache: bool = False
+    streamed: bool = False
+    error: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def ok(self) -> bool:
+        """True when the request produced a response."""
+        return self.error is None
+
+
+class MetricsSink:
+    """Destination for call records. Subclasses must be thread-safe."""
+
+    def record(self, call: CallRecord) -> None:
+        """
+        Accept one call record.
+
+        Args:
+            call: Finished call
+        """
+        raise NotImplementedError
+
+
+class RingBufferSink(MetricsSink):
+    """Keeps the most recent call records in memory."""
+
+    def __init__(self, capacity: Optional[int] = 1000):
+        """
+        Args:
+            capacity: Maximum number of records kept; older ones are dropped
+                (None = keep every record, e.g. for a single batch run)
+        """
+        self._records: "deque[CallRecord]" = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def record(self, call: CallRecord) -> None:
+        with self._lock:
+            self._records.append(call)
+
+    def records(self) -> List[CallRecord]:
+        """Buffered records, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> Dict[str, Any]:
+        """Summary of the buffered records (see ``summarize``)."""
+        return summarize(self.records())
+
+    def clear(self) -> None:
+        """Drop every buffered record."""
+        with self._lock:
+            self._records.clear()
+
+
+class JsonlSink(MetricsSink):
+    """Appends one JSON object per call to a file."""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: JSONL file (its parent directory is created if needed)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def record(self, call: CallRecord) -> None:
+        line = json.dumps(asdict(call), ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class PrometheusSink(MetricsSink):
+    """Aggregates calls into Prometheus counters, rendered as text exposition."""
+
+    def __init__(self, prefix: str = "llm"):
+        """
+        Args:
+            prefix: Metric name prefix
+        """
+        self.prefix = prefix
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: CallRecord) -> None:
+        model = call.served_model or call.model
+        status = str(call.status) if call.status is not None else ("cache" if call.from_cache else "error")
+        updates = [
+            ("requests_total", {"model": model, "status": status}, 1.0),
+            ("request_duration_seconds_sum", {"model": model}, call.wall_time),
+            ("request_duration_seconds_count", {"model": model}, 1.0),
+            ("retries_total", {"model": model}, float(call.retries)),
+        ]
+        for kind in ("prompt", "completion", "cached"):
+            updates.append(("tokens_total", {"model": model, "type": kind}, getattr(call, f"{kind}_tokens")))
+        if call.time_to_first_token is not None:
+            updates.append(("time_to_first_token_seconds_sum", {"model": model}, call.time_to_first_token))
+            updates.append(("time_to_first_token_seconds_count", {"model": model}, 1.0))
+        if call.cost is not None:
+            updates.append(("cost_usd_total", {"model": model}, call.cost))
+
+        with self._lock:
+            for name, labels, value in updates:
+                key = (name, tuple(sorted(labels.items())))
+                self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def render(self) -> str:
+        """
+        Render every counter in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+
+        lines: List[str] = []
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{self.prefix}_{name}"
+            # Duration sums and counts belong to one summary family
+            family, kind = metric, "counter"
+            for suffix in ("_sum", "_count"):
+                if metric.endswith(suffix):
+                    family, kind = metric[:-len(suffix)], "summary"
+            if family not in declared:
+                declared.add(family)
+                lines.append(f"# TYPE {family} {kind}")
+            label_text = ",".join(f'{key}="{_escape_label(val)}"' for key, val in labels)
+            lines.append(f"{metric}{{{label_text}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> Path:
+        """
+        Write the exposition text to a file (e.g. for node_exporter's textfile collector).
+
+        Args:
+            path: Output file, replaced atomically
+
+        Returns:
+            Path to the written file
+        """
+        return write_atomic(Path(path), self.render())
+
+
+class FanoutSink(MetricsSink):
+    """Forwards every record to several sinks."""
+
+    def __init__(self, sinks: Sequence[MetricsSink]):
+        """
+        Args:
+            sinks: Sinks receiving each record
+        """
+        self.sinks = list(sinks)
+
+    def record(self, call: CallRecord) -> None:
+        for sink in self.sinks:
+            sink.record(call)
+
+
+def _escape_label(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def summarize(records: Iterable[CallRecord]) -> Dict[str, Any]:
+    """
+    Aggregate call records.
+
+    Args:
+        records: Call records
+
+    Returns:
+        Dictionary containing:
+            - calls, errors, cache_hits: Call counts
+            - retries: Requests re-sent after transient failures
+            - prompt_tokens, completion_tokens, cached_tokens: Token totals
+            - cost: Total cost in USD of the priced calls
+            - unpriced_calls: Calls whose model had no known pricing
+            - avg_wall_time, avg_time_to_first_token: Mean seconds (None without data)
+            - by_model: {model: {calls, prompt_tokens, completion_tokens, cost, avg_wall_time}}
+    """
+    summary: Dict[str, Any] = {
+        "calls": 0, "errors": 0, "cache_hits": 0, "retries": 0,
+        "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+        "cost": 0.0, "unpriced_calls": 0,
+    }
+    wall_times: List[float] = []
+    first_tokens: List[float] = []
+    by_model: Dict[str, Dict[str, Any]] = {}
+
+    for call in records:
+        summary["calls"] += 1
+        summary["errors"] += 0 if call.ok else 1
+        summary["cache_hits"] += 1 if call.from_cache else 0
+        summary["retries"] += call.retries
+        for key in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+            summary[key] += getattr(call, key)
+        if call.cost is None:
+            summary["unpriced_calls"] += 0 if call.from_cache else 1
+        else:
+            summary["cost"] += call.cost
+        if not call.from_cache:
+            wall_times.append(call.wall_time)
+        if call.time_to_first_token is not None:
+            first_tokens.append(call.time_to_first_token)
+
+        model = by_model.setdefault(call.model, {
+            "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost": 0.0, "wall_time": 0.0
+        })
+        model["calls"] += 1
+        model["prompt_tokens"] += call.prompt_tokens
+        model["completion_tokens"] += call.completion_tokens
+        model["cost"] += call.cost or 0.0
+        model["wall_time"] += call.wall_time
+
+    for model in by_model.values():
+        model["avg_wall_time"] = model.pop("wall_time") / model["calls"]
+
+    summary["avg_wall_time"] = sum(wall_times) / len(wall_times) if wall_times else None
+    summary["avg_time_to_first_token"] = sum(first_tokens) / len(first_tokens) if first_tokens else None
+    summary["by_model"] = by_model
+    return summary
+
+
+def format_summary(summary: Dict[str, Any]) -> List[str]:
+    """
+    Human-readable lines for a summary, shared by the sidebar, reports and CLI.
+
+    Args:
+        summary: Output of ``summarize``
+
+    Returns:
+        Markdown-friendly lines
+    """
+    cost = f"${summary['cost']:.4f}"
+    if summary["unpriced_calls"]:
+        cost += f" ({summary['unpriced_calls']} calls unpriced)"
+    calls = f"Calls: {summary['calls']} ({summary['errors']} failed, {summary['cache_hits']} from local cache"
+    if summary.get("retries"):
+        calls += f", {summary['retries']} retries"
+    lines = [
+        calls + ")",
+        f"Tokens: {summary['prompt_tokens']:,} prompt ({summary['cached_tokens']:,} provider-cached), "
+        f"{summary['completion_tokens']:,} completion",
+        f"Cost: {cost}",
+    ]
+    if summary["avg_wall_time"] is not None:
+        latency = f"Avg latency: {summary['avg_wall_time']:.2f}s"
+        if summary["avg_time_to_first_token"] is not None:
+            latency += f", first token {summary['avg_time_to_first_token']:.2f}s"
+        lines.append(latency)
+    return lines
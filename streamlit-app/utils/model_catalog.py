@@ -0,0 +1,299 @@
+"""
+Model Catalog
+
+Typed, indexed view of the OpenRouter /models listing. A catalog is built once
+per fetch and precomputes everything the UI needs on each rerun (free-model
+list, selectbox labels, label → id mapping), so widget interactions never
+re-parse pricing strings.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from utils.concurrency import get_executor
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a catalog is considered stale and refreshed in the background
+CATALOG_TTL = 300.0
+# Seconds to wait before retrying a failed background refresh
+REFRESH_RETRY_INTERVAL = 30.0
+
+
+def _parse_price(value: Any) -> Optional[float]:
+    """Parse an OpenRouter per-token price string; None if missing or malformed."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class ModelInfo:
+    """A single model from the catalog with typed fields."""
+
+    id: str
+    name: str
+    prompt_price: Optional[float]
+    completion_price: Optional[float]
+    context_length: Optional[int] = None
+    input_modalities: Tuple[str, ...] = ()
+    output_modalities: Tuple[str, ...] = ()
+    supported_parameters: FrozenSet[str] = frozenset()
+    cache_read_price: Optional[float] = None
+    cache_write_price: Optional[float] = None
+    request_price: Optional[float] = None
+    raw: Dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
+
+    @property
+    def is_free(self) -> bool:
+        """True when both prompt and completion tokens cost nothing."""
+        return self.prompt_price == 0.0 and self.completion_price == 0.0
+
+    def cost(self, usage: Dict[str, int]) -> Optional[float]:
+        """
+        Price one request from its token usage.
+
+        Cache reads and writes are billed at their own rates when the model
+        lists them, otherwise at the prompt rate.
+
+        Args:
+            usage: Token counts as returned by ``extract_usage``
+
+        Returns:
+            Cost in USD, or None if the model has no prompt/completion pricing
+        """
+        if self.prompt_price is None or self.completion_price is None:
+            return None
+        cached = usage.get("cached_tokens", 0)
+        cache_write = usage.get("cache_write_tokens", 0)
+        uncached = max(0, usage.get("prompt_tokens", 0) - cached - cache_write)
+        read_price = self.cache_read_price if self.cache_read_price is not None else self.prompt_price
+        write_price = self.cache_write_price if self.cache_write_price is not None else self.prompt_price
+        return (
+            uncached * self.prompt_price
+            + cached * read_price
+            + cache_write * write_price
+            + usage.get("completion_tokens", 0) * self.completion_price
+            + (self.request_price or 0.0)
+        )
+
+    @property
+    def label(self) -> str:
+        """Display label used in model selectboxes."""
+        return f"{self.name} ({self.id})"
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "ModelInfo":
+        """
+        Build a ModelInfo from one entry of the /models response.
+
+        Args:
+            data: Raw model dictionary
+
+        Returns:
+            Parsed ModelInfo
+        """
+        pricing = data.get("pricing") or {}
+        architecture = data.get("architecture") or {}
+        context_length = data.get("context_length")
+
+        return cls(
+            id=data["id"],
+            name=data.get("name") or data["id"],
+            prompt_price=_parse_price(pricing.get("prompt")),
+            completion_price=_parse_price(pricing.get("completion")),
+            context_length=int(context_length) if context_length else None,
+            input_modalities=tuple(architecture.get("input_modalities") or ()),
+            output_modalities=tuple(architecture.get("output_modalities") or ()),
+            supported_parameters=frozenset(data.get("supported_parameters") or ()),
+            cache_read_price=_parse_price(pricing.get("input_cache_read")),
+            cache_write_price=_parse_price(pricing.get("input_cache_write")),
+            request_price=_parse_price(pricing.get("request")),
+            raw=data
+        )
+
+
+class ModelCatalog:
+    """Immutable, indexed snapshot of the available models."""
+
+    def __init__(self, models: List[Dict[str, Any]], fetched_at: Optional[float] = None):
+        """
+        Build the catalog and its indexes.
+
+        Args:
+            models: Raw model dictionaries from the /models endpoint
+            fetched_at: Monotonic time of the fetch (defaults to now)
+        """
+        self.fetched_at = fetched_at if fetched_at is not None else time.monotonic()
+        self.models: List[ModelInfo] = [ModelInfo.from_api(m) for m in models if m.get("id")]
+        self.by_id: Dict[str, ModelInfo] = {m.id: m for m in self.models}
+        self.free_models: List[ModelInfo] = [m for m in self.models if m.is_free]
+
+        # Ready-made selectbox data for the free-model pickers
+        self.free_options: List[str] = [m.label for m in self.free_models]
+        self.free_label_to_id: Dict[str, str] = {m.label: m.id for m in self.free_models}
+        self._free_index: Dict[str, int] = {m.id: i for i, m in enumerate(self.free_models)}
+
+    def __len__(self) -> int:
+        return len(self.models)
+
+    def get(self, model_id: str) -> Optional[ModelInfo]:
+        """
+        Look up a model by id.
+
+        Args:
+            model_id: Model ID
+
+        Returns:
+            ModelInfo, or None if unknown
+        """
+        return self.by_id.get(model_id)
+
+    def free_option_index(self, model_id: Optional[str], default: int = 0) -> int:
+        """
+        Position of a model in ``free_options``, for selectbox defaults.
+
+        Args:
+            model_id: Model ID to look up
+            default: Index returned when the model is not a free model
+
+        Returns:
+            Index into ``free_options``
+        """
+        return self._free_index.get(model_id, default)
+
+
+class CatalogCache:
+    """
+    Holds the current catalog and refreshes it without blocking readers.
+
+    The first ``get`` fetches synchronously; if that fails, the error is
+    raised again without a new fetch for ``REFRESH_RETRY_INTERVAL``, so
+    callers on a hot path never queue up behind a failing endpoint. After the
+    TTL expires, ``get``
+    keeps returning the stale catalog while a single background refresh runs
+    on the shared worker pool. A failed refresh is logged and kept in
+    ``last_error`` until a later refresh succeeds.
+    """
+
+    def __init__(self, fetch: Callable[[], List[Dict[str, Any]]], ttl: float = CATALOG_TTL):
+        """
+        Args:
+            fetch: Callable returning raw model dictionaries; raises on failure
+            ttl: Seconds before the catalog is refreshed
+        """
+        self._fetch = fetch
+        self.ttl = ttl
+        self._catalog: Optional[ModelCatalog] = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._last_attempt = 0.0
+        self._first_error: Optional[Exception] = None
+        self._first_failed_at = 0.0
+        self.last_error: Optional[str] = None
+        self._reported_error: Optional[str] = None
+
+    def get(self) -> ModelCatalog:
+        """
+        Return the current catalog, fetching it on first use.
+
+        Returns:
+            Current ModelCatalog (possibly stale while a refresh is in flight)
+
+        Raises:
+            Exception: Whatever the fetch raised, if no catalog is available yet
+        """
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    now = time.monotonic()
+                    if self._first_error is not None and now - self._first_failed_at < REFRESH_RETRY_INTERVAL:
+                        raise self._first_error
+                    try:
+                        self._catalog = ModelCatalog(self._fetch())
+                    except Exception as e:
+                        self._first_error = e
+                        self._first_failed_at = now
+                        raise
+                    self._first_error = None
+                return self._catalog
+
+        now = time.monotonic()
+        if now - catalog.fetched_at > self.ttl:
+            self._schedule_refresh(now)
+        return catalog
+
+    def unreported_error(self) -> Optional[str]:
+        """
+        Return ``last_error`` the first time it is asked for.
+
+        Lets every rerun check for refresh failures while showing each
+        distinct error only once; a successful refresh resets it.
+
+        Returns:
+            The refresh error message, or None if there is none or it was
+            already returned
+        """
+        with self._lock:
+            if self.last_error is None or self.last_error == self._reported_error:
+                return None
+            self._reported_error = self.last_error
+            return self.last_error
+
+    def _schedule_refresh(self, now: float) -> None:
+        """Start one background refresh unless one is running or recently failed."""
+        with self._lock:
+            if self._refreshing or now - self._last_attempt < REFRESH_RETRY_INTERVAL:
+                return
+            self._refreshing = True
+            self._last_attempt = now
+        get_executor().submit(self._refresh)
+
+    def _refresh(self) -> None:
+        """Fetch a new catalog; on failure keep serving the stale one."""
+        try:
+            catalog = ModelCatalog(self._fetch())
+            with self._lock:
+                self._catalog = catalog
+                self.last_error = None
+                self._reported_error = None
+        except Exception as e:
+            logger.warning("Model catalog refresh failed: %s", e, exc_info=True)
+            with self._lock:
+                self.last_error = str(e)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+_catalog_caches: Dict[Tuple[str, str], CatalogCache] = {}
+_catalog_caches_lock = threading.Lock()
+
+
+def get_catalog_cache(
+    key: Tuple[str, str],
+    fetch: Callable[[], List[Dict[str, Any]]],
+    ttl: float = CATALOG_TTL
+) -> CatalogCache:
+    """
+    Return the process-wide catalog cache for a key, creating it on first use.
+
+    Args:
+        key: Cache key, typically (API key, base URL)
+        fetch: Fetch callable used when the cache is created
+        ttl: Refresh interval used when the cache is created
+
+    Returns:
+        Shared CatalogCache
+    """
+    with _catalog_caches_lock:
+        cache = _catalog_caches.get(key)
+        if cache is None:
+            cache = CatalogCache(fetch, ttl)
+            _catalog_caches[key] = cache
+        return cache
@@ -5,42 +5,124 @@ This module generates comprehensive markdown reports from evaluation sessions,
 including LLM-powered analysis and enhanced response versions.
 """
 
-from typing import Dict, Any
+from concurrent.futures import as_completed
+from contextlib import nullcontext
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 from datetime import datetime
+from utils.concurrency import get_executor
 from utils.llm_client import LLMClient
+from utils.metrics import format_summary
+from utils.report_writer import ReportWriter, write_report
+
+# Placeholder shown for LLM sections that are still being generated
+PENDING_SECTION = "*⏳ Generating...*"
 
 
 class ReportGenerator:
     """Generates comprehensive evaluation reports with LLM-powered analysis."""
     
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient, use_cache: Optional[bool] = None):
         """
         Initialize the report generator.
         
         Args:
             llm_client: LLMClient instance for generating analysis
+            use_cache: Force the client's response cache on/off for report calls
+                (None = client default, i.e. only deterministic calls)
         """
         self.llm_client = llm_client
+        self.use_cache = use_cache
     
-    def generate_report(self, session_data: Dict[str, Any], analysis_model: str) -> str:
+    def generate_report(
+        self,
+        session_data: Dict[str, Any],
+        analysis_model: str,
+        include_enhanced: bool = False,
+        include_critique: bool = False,
+        on_update: Optional[Callable[[str], None]] = None,
+        output_path: Optional[Path] = None
+    ) -> str:
         """
         Generate a complete evaluation report from session data.
         
+        The LLM-written sections (reasoning, enhanced response and critique) are
+        independent, so they run concurrently; export takes as long as the
+        slowest of them rather than their sum.
+        
         Args:
             session_data: Dictionary containing all evaluation session data
             analysis_model: Model ID to use for generating analysis
+            include_enhanced: Add an improved version of the preferred response
+                (one more LLM call, so off unless requested)
+            include_critique: Add a critique of the non-preferred response
+            on_update: Called with the report so far: first with the deterministic
+                sections and placeholders, then each time an LLM section completes
+            output_path: Stream the report to this file as sections become final
+                (in document order), publishing it with an atomic rename at the end
         
         Returns:
             Complete markdown report as string
         """
-        # Generate LLM-powered reasoning analysis
-        llm_reasoning = self._generate_llm_reasoning(session_data, analysis_model)
+        tasks = {"reasoning": self._generate_llm_reasoning}
+        if include_enhanced:
+            tasks["enhanced_response"] = self._generate_enhanced_response
+        if include_critique:
+            tasks["critique"] = self._generate_critique
         
-        # Format into markdown report
-        report = self._format_markdown(session_data, llm_reasoning)
+        sections: Dict[str, Optional[str]] = {name: None for name in tasks}
+        generated_at = datetime.now()
         
-        return report
+        with ReportWriter(output_path) if output_path else nullcontext() as writer:
+            written = 0
+            
+            def publish() -> List[Tuple[Optional[str], str]]:
+                nonlocal written
+                parts = self._report_sections(session_data, sections, generated_at)
+                if writer is not None:
+                    written = self._write_ready_sections(writer, parts, sections, written)
+                if on_update:
+                    on_update("".join(text for _, text in parts))
+                return parts
+            
+            parts = publish()
+            executor = get_executor()
+            futures = {
+                executor.submit(task, session_data, analysis_model): name
+                for name, task in tasks.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    sections[name] = future.result()
+                except Exception as e:
+                    sections[name] = f"Error generating response: {str(e)}"
+                parts = publish()
+        
+        return "".join(text for _, text in parts)
+    
+    @staticmethod
+    def _write_ready_sections(
+        writer: ReportWriter,
+        parts: List[Tuple[Optional[str], str]],
+        sections: Dict[str, Optional[str]],
+        start: int
+    ) -> int:
+        """
+        Write the sections from ``start`` onwards that are final, stopping at the
+        first LLM section still being generated.
+        
+        Returns:
+            Index of the first section not yet written
+        """
+        index = start
+        while index < len(parts):
+            name, text = parts[index]
+            if name is not None and sections[name] is None:
+                break
+            writer.write(text)
+            index += 1
+        return index
     
     def _generate_enhanced_response(self, session_data: Dict[str, Any], model: str) -> str:
         """
@@ -72,7 +154,8 @@ class ReportGenerator:
             model=model,
             system_prompt="You are an expert code reviewer and technical writer. Your task is to improve AI-generated responses based on specific critiques.",
             temperature=0.3,
-            max_tokens=4096
+            max_tokens=4096,
+            use_cache=self.use_cache
         )
         
         return enhanced
@@ -95,11 +178,37 @@ class ReportGenerator:
             model=model,
             system_prompt="You are an expert AI evaluator. Analyze evaluation results and identify additional issues or insights that might have been missed.",
             temperature=0.5,
-            max_tokens=2048
+            max_tokens=2048,
+            use_cache=self.use_cache
         )
         
         return reasoning
     
+    def _generate_critique(self, session_data: Dict[str, Any], model: str) -> str:
+        """
+        Generate a critique of the response that was not preferred.
+        
+        Args:
+            session_data: Session data containing responses and evaluations
+            model: Model ID for generation
+        
+        Returns:
+            Critique text
+        """
+        weaker = 'B' if session_data['preferred_response'] == 'A' else 'A'
+        prompt = self._build_critique_prompt(session_data, weaker)
+        
+        critique = self.llm_client.generate_response(
+            prompt=prompt,
+            model=model,
+            system_prompt="You are an expert AI evaluator. Give specific, actionable critiques of AI-generated responses.",
+            temperature=0.3,
+            max_tokens=2048,
+            use_cache=self.use_cache
+        )
+        
+        return critique
+    
     def _build_enhancement_prompt(
         self,
         response: str,
@@ -150,6 +259,48 @@ Provide ONLY the improved response, without meta-commentary."""
 
         return prompt
     
+    def _build_critique_prompt(self, session_data: Dict[str, Any], label: str) -> str:
+        """Build prompt for critiquing one response."""
+        response = session_data['response_a'] if label == 'A' else session_data['response_b']
+        scores = session_data['scores_a'] if label == 'A' else session_data['scores_b']
+        
+        findings = []
+        for dim in session_data['rubric'].get('dimensions', []):
+            score_data = scores.get(dim['name'], {'score': 0, 'comment': ''})
+            if not isinstance(score_data, dict):
+                score_data = {'score': score_data, 'comment': ''}
+            line = f"- **{dim['name']}**: {score_data.get('score', 0)}/3"
+            if score_data.get('comment'):
+                line += f" — {score_data['comment']}"
+            findings.append(line)
+        
+        findings_text = "\n".join(findings) if findings else "No dimension scores available"
+        
+        prompt = f"""Response {label} below was judged the weaker of two responses to the same prompt.
+
+**Prompt Given:**
+{session_data['prompt']}
+
+**Response {label}:**
+```
+{response}
+```
+
+**Dimension Scores (1 = Major Issues, 3 = No Issues):**
+{findings_text}
+
+**Evaluator's Justification:**
+{session_data['user_justification']}
+
+**Your Task:**
+Write a concise critique of Response {label}:
+
+1. **Key Weaknesses**: The most important problems, with concrete evidence from the response
+2. **Root Causes**: Why the response fell short (misread the prompt, missing knowledge, poor structure, etc.)
+3. **How to Fix**: Specific changes that would bring it to "No Issues" on every dimension"""
+
+        return prompt
+    
     def _build_reasoning_prompt(self, session_data: Dict[str, Any]) -> str:
         """Build prompt for generating LLM reasoning."""
         
@@ -236,109 +387,143 @@ Be constructive and specific. Cite evidence from the responses."""
     def _format_markdown(
         self,
         session_data: Dict[str, Any],
-        llm_reasoning: str
+        sections: Dict[str, Optional[str]],
+        generated_at: Optional[datetime] = None
     ) -> str:
         """
         Format all data into markdown report.
         
         Args:
             session_data: Session data
-            llm_reasoning: LLM-generated reasoning
+            sections: LLM-generated sections by name ("reasoning", "enhanced_response",
+                "critique"); None marks a section still being generated
+            generated_at: Report generation time (defaults to now)
         
         Returns:
             Complete markdown report
         """
+        return "".join(text for _, text in self._report_sections(session_data, sections, generated_at))
+    
+    def _report_sections(
+        self,
+        session_data: Dict[str, Any],
+        sections: Dict[str, Optional[str]],
+        generated_at: Optional[datetime] = None
+    ) -> List[Tuple[Optional[str], str]]:
+        """
+        Split the report into its top-level sections, in document order.
+        
+        Args:
+            session_data: Session data
+            sections: LLM-generated sections by name; None marks a pending section
+            generated_at: Report generation time (defaults to now)
+        
+        Returns:
+            List of (LLM section name or None for deterministic sections, markdown)
+            pairs; joining the markdown gives the complete report
+        """
         timestamp = session_data['timestamp']
         rubric = session_data['rubric']
-        evaluator_type = session_data.get('evaluator', 'User')
-        evaluator_prefix = "Judge's" if 'LLM-as-Judge' in evaluator_type else "User's"
-        
-        # Format dimension evaluation tables
-        table_a = self._format_dimension_table(
-            rubric.get('dimensions', []),
-            session_data['scores_a']
-        )
-        table_b = self._format_dimension_table(
-            rubric.get('dimensions', []),
-            session_data['scores_b']
-        )
+        generated_at = generated_at or datetime.now()
         
-        report = f"""# AI Response Evaluation Report
+        header = f"""# AI Response Evaluation Report
 
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Generated:** {generated_at.strftime('%Y-%m-%d %H:%M:%S')}  
 **Evaluator:** {session_data.get('evaluator', 'User')}  
 **Rubric:** {rubric.get('name', 'Unknown')}  
 **Report Analysis Model:** {session_data.get('report_model', 'N/A')}
 
 ---
 
-## Original Prompt
+"""
+        original_prompt = f"""## Original Prompt
 
 {session_data['prompt']}
 
 ---
 
-## Response A
-
-**Model:** `{session_data['model_a']}`  
-**Parameters:** Temperature: {session_data['params_a']['temperature']}, Top-P: {session_data['params_a']['top_p']}, Max Tokens: {session_data['params_a']['max_tokens']}
+"""
+        comparison = f"""## Comparison & User Evaluation
 
-### Full Response
+**Preferred Response:** Response {session_data['preferred_response']}
 
-{session_data['response_a']}
+### Evaluator's Comparative Justification
 
-### {evaluator_prefix} Dimension Evaluations
+{session_data['user_justification']}
 
-{table_a}
+---
 
-**Final Score:** {session_data['final_score_a']:.2f}/10
+"""
+        metadata = f"""## Report Metadata
 
----
+- **Timestamp:** `{timestamp}`
+- **Session ID:** `eval_{timestamp}`
+- **Rubric Version:** {rubric.get('name', 'N/A')}
 
-## Response B
+{_format_usage(session_data.get('usage'), "API Usage (this session)")}"""
+        parts: List[Tuple[Optional[str], str]] = [
+            (None, header),
+            (None, original_prompt),
+            (None, self._format_response_section(session_data, 'A')),
+            (None, self._format_response_section(session_data, 'B')),
+            (None, comparison),
+        ]
+        parts.extend(self._llm_section_parts(session_data, sections))
+        parts.append((None, metadata))
+        return parts
+    
+    def _format_response_section(self, session_data: Dict[str, Any], label: str) -> str:
+        """Format one response with its parameters and dimension evaluations."""
+        key = label.lower()
+        params = session_data[f'params_{key}']
+        evaluator_prefix = "Judge's" if 'LLM-as-Judge' in session_data.get('evaluator', 'User') else "User's"
+        table = self._format_dimension_table(
+            session_data['rubric'].get('dimensions', []),
+            session_data[f'scores_{key}']
+        )
+        
+        return f"""## Response {label}
 
-**Model:** `{session_data['model_b']}`  
-**Parameters:** Temperature: {session_data['params_b']['temperature']}, Top-P: {session_data['params_b']['top_p']}, Max Tokens: {session_data['params_b']['max_tokens']}
+**Model:** `{session_data[f'model_{key}']}`  
+**Parameters:** Temperature: {params['temperature']}, Top-P: {params['top_p']}, Max Tokens: {params['max_tokens']}
 
 ### Full Response
 
-{session_data['response_b']}
+{session_data[f'response_{key}']}
 
 ### {evaluator_prefix} Dimension Evaluations
 
-{table_b}
-
-**Final Score:** {session_data['final_score_b']:.2f}/10
-
----
-
-## Comparison & User Evaluation
-
-**Preferred Response:** Response {session_data['preferred_response']}
-
-### Evaluator's Comparative Justification
-
-{session_data['user_justification']}
-
----
-
-## LLM Reasoning & Additional Insights
+{table}
 
-{llm_reasoning}
+**Final Score:** {session_data[f'final_score_{key}']:.2f}/10
 
 ---
 
-## Report Metadata
-
-- **Timestamp:** `{timestamp}`
-- **Session ID:** `eval_{timestamp}`
-- **Rubric Version:** {rubric.get('name', 'N/A')}
-
 """
-        return report
     
-    def _format_dimension_table(
+    def _llm_section_parts(
         self,
+        session_data: Dict[str, Any],
+        sections: Dict[str, Optional[str]]
+    ) -> List[Tuple[str, str]]:
+        """Format the LLM-generated sections, with placeholders for pending ones."""
+        preferred = session_data['preferred_response']
+        weaker = 'B' if preferred == 'A' else 'A'
+        titles = {
+            "reasoning": "LLM Reasoning & Additional Insights",
+            "enhanced_response": f"Enhanced Response (improved Response {preferred})",
+            "critique": f"Critique of Response {weaker}"
+        }
+        
+        parts = []
+        for name, title in titles.items():
+            if name in sections:
+                content = sections[name] if sections[name] is not None else PENDING_SECTION
+                parts.append((name, f"## {title}\n\n{content}\n\n---\n\n"))
+        return parts
+    
+    @staticmethod
+    def _format_dimension_table(
         dimensions: list,
         scores: Dict[str, Any]
     ) -> str:
@@ -388,6 +573,152 @@ Be constructive and specific. Cite evidence from the responses."""
         eval_dir.mkdir(exist_ok=True)
         
         report_path = eval_dir / f"evaluation_report_{timestamp}.md"
-        report_path.write_text(content, encoding='utf-8')
+        return write_report(report_path, [content])
+
+
+def _format_usage(usage: Optional[Dict[str, Any]], title: str) -> str:
+    """Format a metrics summary as a markdown subsection (empty without calls)."""
+    if not usage or not usage.get('calls'):
+        return ""
+    lines = "\n".join(f"- {line}" for line in format_summary(usage))
+    return f"### {title}\n\n{lines}\n\n"
+
+
+def batch_report_sections(
+    records: Iterable[Dict[str, Any]],
+    rubric: Dict[str, Any],
+    judge_model: Optional[str] = None,
+    usage: Optional[Dict[str, Any]] = None
+) -> Iterator[str]:
+    """
+    Yield the sections of a consolidated report over batch evaluation results.
+    
+    Records are consumed one at a time, and only running totals are kept, so
+    the report can be streamed to disk for runs of any size.
+    
+    Args:
+        records: Batch result records (see ``utils.batch_runner``)
+        rubric: Rubric the batch was judged with
+        judge_model: Judge model ID shown in the header
+        usage: Optional metrics summary of the run (see ``utils.metrics.summarize``)
+    
+    Yields:
+        Header, one section per record, then a summary section
+    """
+    yield f"""# Batch Evaluation Report
+
+**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Rubric:** {rubric.get('name', 'Unknown')}  
+**Judge Model:** `{judge_model or 'N/A'}`
+
+---
+
+"""
+    dimensions = rubric.get('dimensions', [])
+    totals = {'pairs': 0, 'failed': 0, 'A': 0, 'B': 0, 'score_a': 0.0, 'score_b': 0.0, 'swapped': 0, 'consistent': 0}
+    # Ensemble judges: model -> answered, agreed, cancelled, failed, latency
+    judges: Dict[str, Dict[str, float]] = {}
+    
+    for record in records:
+        totals['pairs'] += 1
+        heading = f"## Pair {totals['pairs']}: `{record.get('row_id', 'unknown')}`"
+        models = f"`{record.get('model_a') or 'A'}` vs `{record.get('model_b') or 'B'}`"
         
-        return report_path
+        if record.get('status') != 'ok':
+            totals['failed'] += 1
+            yield f"""{heading}
+
+**Models:** {models}  
+**Status:** ❌ Failed — {record.get('error', 'unknown error')}
+
+---
+
+"""
+            continue
+        
+        preferred = record.get('preferred_response', '?')
+        if preferred in ('A', 'B'):
+            totals[preferred] += 1
+        score_a = record.get('final_score_a', 0.0)
+        score_b = record.get('final_score_b', 0.0)
+        totals['score_a'] += score_a
+        totals['score_b'] += score_b
+        position = ""
+        if 'position_consistent' in record:
+            totals['swapped'] += 1
+            totals['consistent'] += 1 if record['position_consistent'] else 0
+            position = "✅ Same preference in both orders" if record['position_consistent'] else "⚠️ Preference flipped when swapped"
+            position = f"  \n**Position Check:** {position} ({record.get('position_agreement', 0.0):.0%} of scores identical)"
+        for judge in record.get('judges', []):
+            stats = judges.setdefault(judge['model'], {'ok': 0, 'agreed': 0, 'cancelled': 0, 'error': 0, 'latency': 0.0})
+            stats[judge['status']] += 1
+            if judge['status'] == 'ok':
+                stats['agreed'] += 1 if judge['preferred_response'] == preferred else 0
+                stats['latency'] += judge['latency']
+        
+        yield f"""{heading}
+
+**Models:** {models}  
+**Preferred Response:** Response {preferred}  
+**Final Scores:** A: {score_a:.2f}/10, B: {score_b:.2f}/10{position}
+
+### Prompt
+
+{record.get('prompt', '')}
+
+### Response A
+
+{record.get('response_a', '')}
+
+### Response B
+
+{record.get('response_b', '')}
+
+### Judge's Dimension Evaluations — Response A
+
+{ReportGenerator._format_dimension_table(dimensions, record.get('scores_a', {}))}
+
+### Judge's Dimension Evaluations — Response B
+
+{ReportGenerator._format_dimension_table(dimensions, record.get('scores_b', {}))}
+
+### Judge's Justification
+
+{record.get('justification', '')}
+
+---
+
+"""
+    
+    judged = totals['pairs'] - totals['failed']
+    if judged:
+        averages = f"A: {totals['score_a'] / judged:.2f}/10, B: {totals['score_b'] / judged:.2f}/10"
+    else:
+        averages = "N/A"
+    summary_extras = ""
+    if totals['swapped']:
+        summary_extras = (
+            f"\n- **Position-Consistent:** {totals['consistent']} / {totals['swapped']} "
+            f"({totals['consistent'] / totals['swapped']:.0%})"
+        )
+    if judges:
+        rows = "\n".join(
+            f"| `{model}` | {stats['ok']} | {stats['agreed'] / stats['ok']:.0%} | {stats['latency'] / stats['ok']:.2f}s "
+            f"| {stats['cancelled']} | {stats['error']} |"
+            if stats['ok'] else f"| `{model}` | 0 | N/A | N/A | {stats['cancelled']} | {stats['error']} |"
+            for model, stats in judges.items()
+        )
+        summary_extras += (
+            "\n\n### Judge Ensemble\n\n"
+            "| Judge | Answered | Agreed with Ensemble | Avg Latency | Cancelled | Failed |\n"
+            "|---|---|---|---|---|---|\n" + rows
+        )
+    yield f"""## Summary
+
+- **Pairs:** {totals['pairs']}
+- **Judged:** {judged}
+- **Failed:** {totals['failed']}
+- **Preferred A / B:** {totals['A']} / {totals['B']}
+- **Average Final Scores:** {averages}{summary_extras}
+
+{_format_usage(usage, "API Usage (this run)")}"""
@@ -0,0 +1,74 @@
+"""
+Streaming Report Writer
+
+Writes markdown reports section by section instead of building them as one
+string. Sections go to a temporary file next to the target, which is moved
+into place with an atomic rename once the report is complete (see
+``utils.atomic_write``): readers never see a half-written report, and a
+failed export leaves any previous report at the same path untouched.
+"""
+
+from pathlib import Path
+from typing import Iterable
+
+from utils.atomic_write import AtomicWriter
+
+
+class ReportWriter(AtomicWriter):
+    """
+    Append-only writer for one markdown report, published atomically.
+
+    Usage:
+        with ReportWriter(path) as writer:
+            for section in sections:
+                writer.write(section)
+        # The report appears at ``path`` only if the block completed without error
+    """
+
+    def __init__(self, path: Path, encoding: str = "utf-8"):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Final report path (its parent directory is created if needed)
+            encoding: Text encoding of the report
+        """
+        super().__init__(path, encoding)
+        self.sections_written = 0
+
+    def write(self, section: str) -> None:
+        """
+        Append a section to the report.
+
+        Args:
+            section: Markdown text, including its trailing separator
+        """
+        super().write(section)
+        self.sections_written += 1
+
+    def write_all(self, sections: Iterable[str]) -> None:
+        """
+        Append every section from an iterable (e.g. a generator) as it is produced.
+
+        Args:
+            sections: Markdown sections in document order
+        """
+        for section in sections:
+            self.write(section)
+
+
+def write_report(path: Path, sections: Iterable[str]) -> Path:
+    """
+    Stream sections into a report file, publishing it atomically.
+
+    Args:
+        path: Final report path
+        sections: Markdown sections in document order; a generator is consumed
+            lazily, so the report is never held in memory as a whole
+
+    Returns:
+        Path to the written report
+    """
+    with ReportWriter(path) as writer:
+        writer.write_all(sections)
+    return writer.path
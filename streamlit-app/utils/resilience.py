@@ -0,0 +1,386 @@
+"""
+Resilient API Calls
+
+Retry, rate-limit and failure-isolation layer for LLM requests:
+
+- Typed exceptions (``LLMError`` and subclasses) instead of bare provider errors
+- Retries with exponential backoff and full jitter for 429s, 5xx responses and
+  connection failures, honoring ``Retry-After`` when the provider sends it
+- A per-model guard shared process-wide: a semaphore capping concurrent
+  requests, a rate-limit pause that holds back every caller of a model once
+  it returns 429 with ``Retry-After``, and a circuit breaker that fails fast
+  while a model keeps failing (5xx, connection errors, timeouts)
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Concurrent requests allowed per model across the whole process
+DEFAULT_MODEL_CONCURRENCY = 8
+# Statuses worth retrying besides 429 and 5xx
+RETRYABLE_STATUSES = {408, 409, 425}
+
+
+class LLMError(Exception):
+    """Base class for failed LLM requests."""
+
+    retryable = False
+
+    def __init__(self, message: str, model: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.model = model
+        self.status_code = status_code
+        self.attempts = 1
+
+
+class LLMRateLimitError(LLMError):
+    """The provider rate-limited the request (HTTP 429)."""
+
+    retryable = True
+
+    def __init__(self, message: str, model: str = "", status_code: Optional[int] = 429,
+                 retry_after: Optional[float] = None):
+        super().__init__(message, model, status_code)
+        self.retry_after = retry_after
+
+
+class LLMServerError(LLMError):
+    """The provider failed transiently (5xx and similar)."""
+
+    retryable = True
+
+
+class LLMConnectionError(LLMError):
+    """The request never got a response (connection refused, reset, DNS...)."""
+
+    retryable = True
+
+
+class LLMTimeoutError(LLMError):
+    """The request timed out. Not retried by default: the caller set the budget."""
+
+
+class LLMRequestError(LLMError):
+    """The provider rejected the request itself (4xx other than 429); retrying will not help."""
+
+
+class CircuitOpenError(LLMError):
+    """The model's circuit breaker is open after repeated failures."""
+
+
+def parse_retry_after(headers: Any, now: Optional[float] = None) -> Optional[float]:
+    """
+    Read the wait requested by a rate-limited response.
+
+    Understands ``retry-after-ms``, ``retry-after`` (seconds or HTTP date) and
+    OpenRouter's ``x-ratelimit-reset`` (epoch milliseconds).
+
+    Args:
+        headers: Response headers (case-insensitive mapping or dict)
+        now: Current epoch time, for tests
+
+    Returns:
+        Seconds to wait, or None if the response does not say
+    """
+    if not headers:
+        return None
+    now = time.time() if now is None else now
+
+    def header(name: str) -> Optional[str]:
+        value = headers.get(name)
+        if value is None and isinstance(headers, dict):
+            value = next((v for k, v in headers.items() if k.lower() == name), None)
+        return value
+
+    value = header("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000.0)
+        except ValueError:
+            pass
+
+    value = header("retry-after")
+    if value is not None:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                moment = parsedate_to_datetime(value)
+                if moment.tzinfo is None:
+                    moment = moment.replace(tzinfo=timezone.utc)
+                return max(0.0, moment.timestamp() - now)
+            except (TypeError, ValueError):
+                pass
+
+    value = header("x-ratelimit-reset")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000.0 - now)
+        except ValueError:
+            pass
+    return None
+
+
+def classify_error(error: Exception, model: str = "") -> Exception:
+    """
+    Map a provider exception onto the typed LLMError hierarchy.
+
+    Exceptions that carry no HTTP information and are not connection
+    failures are returned unchanged.
+
+    Args:
+        error: Exception raised by the API client
+        model: Model ID the request was for
+
+    Returns:
+        Typed LLMError (with the original as ``__cause__``) or ``error`` itself
+    """
+    if isinstance(error, LLMError):
+        return error
+    from openai import APIConnectionError, APITimeoutError
+
+    message = str(error)
+    status = getattr(error, "status_code", None)
+    if isinstance(error, APITimeoutError):
+        typed: LLMError = LLMTimeoutError(message, model)
+    elif isinstance(error, APIConnectionError):
+        typed = LLMConnectionError(message, model)
+    elif status == 429:
+        response = getattr(error, "response", None)
+        typed = LLMRateLimitError(
+            message, model, status, retry_after=parse_retry_after(getattr(response, "headers", None))
+        )
+    elif isinstance(status, int) and (status >= 500 or status in RETRYABLE_STATUSES):
+        typed = LLMServerError(message, model, status)
+    elif isinstance(status, int):
+        typed = LLMRequestError(message, model, status)
+    else:
+        return error
+    typed.__cause__ = error
+    return typed
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how long to retry a failed request."""
+
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    # Longest Retry-After honored before giving up on the request
+    max_retry_after: float = 120.0
+    retry_timeouts: bool = False
+
+    def should_retry(self, error: Exception, attempt: int) -> bool:
+        """Whether to try again after ``attempt`` (1-based) failed with ``error``."""
+        if attempt >= self.max_attempts or not isinstance(error, LLMError):
+            return False
+        if isinstance(error, LLMRateLimitError) and (error.retry_after or 0.0) > self.max_retry_after:
+            return False
+        return error.retryable or (self.retry_timeouts and isinstance(error, LLMTimeoutError))
+
+    def delay(self, error: Exception, attempt: int, rng: Optional[random.Random] = None) -> float:
+        """
+        Seconds to wait before the next attempt.
+
+        Uses the provider's Retry-After when given (plus a little jitter so
+        waiting callers do not return in lockstep), otherwise full jitter:
+        a uniform draw up to the capped exponential backoff.
+        """
+        uniform = (rng or random).uniform
+        retry_after = getattr(error, "retry_after", None)
+        if retry_after is not None:
+            return retry_after + uniform(0.0, min(1.0, self.base_delay))
+        return uniform(0.0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Closed: requests flow. After ``failure_threshold`` consecutive failed
+    requests it opens and rejects requests for ``reset_timeout`` seconds, then
+    lets a single trial request through (half-open); its outcome closes or
+    re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """"closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claims the trial slot when half-open)."""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold or after a failed trial."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back a trial slot whose request failed for reasons unrelated to the model."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class ModelGuard:
+    """Per-model concurrency cap, shared rate-limit pause and circuit breaker."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MODEL_CONCURRENCY,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.breaker = breaker or CircuitBreaker()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request to this model for ``seconds``."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def remaining_pause(self) -> float:
+        """Seconds left before requests to this model may be sent again."""
+        with self._lock:
+            return max(0.0, self._paused_until - time.monotonic())
+
+
+_guards: Dict[str, ModelGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_model_guard(model: str) -> ModelGuard:
+    """
+    Return the shared guard for a model, creating it on first use.
+
+    Args:
+        model: Model ID
+
+    Returns:
+        Process-wide ModelGuard
+    """
+    guard = _guards.get(model)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.setdefault(model, ModelGuard())
+    return guard
+
+
+def reset_model_guards() -> None:
+    """Forget every model guard (e.g. in tests)."""
+    with _guards_lock:
+        _guards.clear()
+
+
+def call_with_retry(
+    call: Callable[[], T],
+    model: str,
+    policy: RetryPolicy = RetryPolicy(),
+    guard: Optional[ModelGuard] = None,
+    on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+    sleep: Callable[[float], None] = time.sleep
+) -> T:
+    """
+    Run a request under the model's guard, retrying transient failures.
+
+    Args:
+        call: Zero-argument callable sending the request
+        model: Model ID (selects the guard)
+        policy: Retry policy
+        guard: Guard to use (defaults to the model's shared guard)
+        on_retry: Called with (failed attempt, typed error, delay) before each retry
+        sleep: Sleep function, for tests
+
+    Returns:
+        Result of ``call``
+
+    Raises:
+        CircuitOpenError: If the model's circuit is open
+        LLMError: The typed error of the last attempt once retries are exhausted
+        Exception: Unrecognized errors from ``call``, unchanged and not retried
+    """
+    guard = guard or get_model_guard(model)
+    attempt = 0
+    while True:
+        attempt += 1
+        if not guard.breaker.allow():
+            error: Exception = CircuitOpenError(
+                f"Circuit open for {model}: too many consecutive failures, try again later", model
+            )
+            error.attempts = attempt
+            raise error
+
+        pause = guard.remaining_pause()
+        if pause:
+            sleep(pause)
+
+        try:
+            with guard.semaphore:
+                result = call()
+        except Exception as raw:
+            error = classify_error(raw, model)
+            # Rate limits are handled by pausing, not by declaring the model unhealthy
+            if isinstance(error, (LLMServerError, LLMConnectionError, LLMTimeoutError)):
+                guard.breaker.record_failure()
+            else:
+                guard.breaker.release()
+            if isinstance(error, LLMRateLimitError) and error.retry_after:
+                guard.pause(min(error.retry_after, policy.max_retry_after))
+
+            if not policy.should_retry(error, attempt):
+                if isinstance(error, LLMError):
+                    error.attempts = attempt
+                if error is raw:
+                    raise
+                raise error from raw
+
+            delay = policy.delay(error, attempt)
+            if on_retry is not None:
+                on_retry(attempt, error, delay)
+            sleep(delay)
+            continue
+
+        guard.breaker.record_success()
+        return result
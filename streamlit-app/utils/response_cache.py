@@ -0,0 +1,158 @@
+"""
+Response Cache
+
+Persistent, content-addressed cache for LLM responses backed by SQLite.
+Entries are keyed by a hash of the full request (model, messages and sampling
+parameters), evicted least-recently-used when the cache exceeds its entry or
+size budget, and optionally expire after a TTL.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Request parameters that do not change the response and are left out of the key
+NON_KEY_PARAMS = {"timeout", "stream"}
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of LLM responses."""
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: Optional[float] = None
+    ):
+        """
+        Open (or create) a cache database.
+
+        Args:
+            path: SQLite database file
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached responses in bytes
+            ttl: Seconds after which an entry expires (None = never)
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access)"
+            )
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """
+        Build the content address for a request.
+
+        Args:
+            params: Chat completion request parameters
+
+        Returns:
+            Hex SHA-256 digest of the canonical request
+        """
+        keyed = {k: v for k, v in params.items() if k not in NON_KEY_PARAMS and v is not None}
+        canonical = json.dumps(keyed, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response, refreshing its LRU position.
+
+        Args:
+            key: Cache key from ``make_key``
+
+        Returns:
+            Cached response text, or None on a miss or expired entry
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response and evict old entries if over budget.
+
+        Args:
+            key: Cache key from ``make_key``
+            value: Response text
+        """
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least-recently-used ones until within budget."""
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            stale.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache occupancy.
+
+        Returns:
+            Dictionary with entry count and total size in bytes
+        """
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"entries": count, "bytes": total}
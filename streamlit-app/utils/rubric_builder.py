@@ -2,10 +2,12 @@
 Rubric Builder - Interface for loading and managing evaluation rubrics.
 
 Updated to work with markdown-based rubrics instead of YAML files.
+Compiled rubric artifacts (see utils.rubric_compiler) are used when fresh.
 """
 
 from pathlib import Path
 from typing import Dict, List, Any
+from utils.rubric_compiler import load_compiled_rubric
 from utils.rubric_parser import RubricParser
 
 
@@ -20,12 +22,16 @@ class RubricBuilder:
             rubrics_dir: Path to directory containing rubric markdown files
         """
         self.rubrics_dir = Path(rubrics_dir)
-        self.parser = RubricParser(self.rubrics_dir)
+        self.parser = RubricParser(self.rubrics_dir, load_compiled=load_compiled_rubric)
     
     def load_rubric(self, filename: str) -> Dict[str, Any]:
         """
         Load a rubric from markdown file.
         
+        Served from the in-memory parse cache while the file is unchanged;
+        otherwise uses the compiled artifact when it matches the markdown
+        source, and parses the markdown as a last resort.
+        
         Args:
             filename: Rubric filename (with or without extension)
         
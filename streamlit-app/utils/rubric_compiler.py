@@ -0,0 +1,234 @@
+"""
+Rubric Compiler
+
+Compiles markdown rubrics into validated, versioned canonical-JSON artifacts
+that load without running the markdown parser. Each artifact records the
+size, mtime and SHA-256 of its source, so stale artifacts are detected and
+callers fall back to parsing the markdown.
+
+Usage (from the streamlit-app directory):
+    python -m utils.rubric_compiler rubrics/ --jobs 4
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.atomic_write import write_atomic
+from utils.rubric_parser import RubricParser, rubric_fingerprint
+
+# Bump whenever the artifact layout or the parsed rubric structure changes
+ARTIFACT_VERSION = 2
+# Subdirectory of the rubrics directory holding compiled artifacts
+COMPILED_DIRNAME = "compiled"
+# Allowed deviation of the summed dimension weights from 10
+WEIGHT_SUM_TOLERANCE = 0.05
+
+
+class RubricValidationError(ValueError):
+    """Raised when a rubric source is malformed."""
+
+
+def validate_rubric(rubric: Dict[str, Any], source: str = "rubric") -> None:
+    """
+    Check that a parsed rubric is complete and consistent.
+
+    Args:
+        rubric: Parsed rubric dictionary
+        source: Name used in error messages
+
+    Raises:
+        RubricValidationError: If the rubric is malformed
+    """
+    problems = []
+    if not rubric.get("name"):
+        problems.append("missing title")
+
+    dimensions = rubric.get("dimensions") or []
+    if not dimensions:
+        problems.append("no dimensions found (expected '### N. Name' sections with Definition, "
+                        "'What to Evaluate' and 'Rating Guidelines')")
+
+    seen = set()
+    for dim in dimensions:
+        name = dim.get("name", "")
+        if not name:
+            problems.append("dimension without a name")
+        elif name in seen:
+            problems.append(f"duplicate dimension '{name}'")
+        seen.add(name)
+        if not dim.get("description"):
+            problems.append(f"dimension '{name}' has no definition")
+        if not dim.get("criteria"):
+            problems.append(f"dimension '{name}' has no evaluation criteria")
+        if set(dim.get("rating_guide", {})) != {1, 2, 3}:
+            problems.append(f"dimension '{name}' rating guide must cover scores 1, 2 and 3")
+        if not dim.get("weight", 0) > 0:
+            problems.append(f"dimension '{name}' has a non-positive weight")
+
+    if dimensions:
+        total = sum(dim.get("weight", 0) for dim in dimensions)
+        if abs(total - 10) > WEIGHT_SUM_TOLERANCE:
+            problems.append(f"weights sum to {total:.2f}, expected 10")
+
+    if problems:
+        raise RubricValidationError(f"{source}: " + "; ".join(problems))
+
+
+def artifact_path(source: Path) -> Path:
+    """
+    Location of the compiled artifact for a markdown rubric.
+
+    Args:
+        source: Markdown rubric path
+
+    Returns:
+        Path of the JSON artifact
+    """
+    return source.parent / COMPILED_DIRNAME / f"{source.stem}.json"
+
+
+def _write_artifact(target: Path, artifact: Dict[str, Any]) -> Path:
+    """Write an artifact as canonical JSON, replacing any previous one atomically."""
+    text = json.dumps(artifact, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return write_atomic(target, text)
+
+
+def compile_rubric(source: Path) -> Path:
+    """
+    Parse, validate and write the artifact for one markdown rubric.
+
+    Args:
+        source: Markdown rubric path
+
+    Returns:
+        Path of the written artifact
+
+    Raises:
+        RubricValidationError: If the rubric is malformed
+    """
+    source = Path(source)
+    raw = source.read_bytes()
+    stat = source.stat()
+
+    rubric = RubricParser(source.parent).parse_rubric_file(source.name)
+    validate_rubric(rubric, source.name)
+
+    artifact = {
+        "format_version": ARTIFACT_VERSION,
+        "source": {
+            "file": source.name,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hashlib.sha256(raw).hexdigest()
+        },
+        "fingerprint": rubric_fingerprint(rubric),
+        "rubric": rubric
+    }
+
+    return _write_artifact(artifact_path(source), artifact)
+
+
+def load_compiled_rubric(source: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load the compiled form of a markdown rubric if it is fresh.
+
+    An artifact is fresh when its version matches and the source's size and
+    mtime match; if only the mtime differs (e.g. after a checkout) the source
+    hash is compared instead, and on a match the new mtime is recorded so
+    later loads skip the hash.
+
+    Args:
+        source: Markdown rubric path
+
+    Returns:
+        Parsed rubric dictionary, or None if there is no fresh artifact
+    """
+    source = Path(source)
+    target = artifact_path(source)
+    try:
+        stat = source.stat()
+        artifact = json.loads(target.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(artifact, dict) or artifact.get("format_version") != ARTIFACT_VERSION:
+        return None
+
+    recorded = artifact.get("source", {})
+    if recorded.get("size") != stat.st_size:
+        return None
+    if recorded.get("mtime_ns") != stat.st_mtime_ns:
+        if recorded.get("sha256") != hashlib.sha256(source.read_bytes()).hexdigest():
+            return None
+        recorded["mtime_ns"] = stat.st_mtime_ns
+        try:
+            _write_artifact(target, artifact)
+        except OSError:
+            # Read-only checkout: the artifact stays valid, loads keep hashing
+            pass
+
+    rubric = artifact["rubric"]
+    # JSON object keys are strings; restore the integer rating scores
+    for dim in rubric.get("dimensions", []):
+        dim["rating_guide"] = {int(score): text for score, text in dim.get("rating_guide", {}).items()}
+    return rubric
+
+
+def _compile_one(source: str) -> Tuple[str, Optional[str]]:
+    """Worker entry point: compile one rubric, returning (source, error)."""
+    try:
+        compile_rubric(Path(source))
+        return source, None
+    except Exception as e:
+        return source, str(e)
+
+
+def compile_directory(rubrics_dir: Path, jobs: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Compile every ``*-rubric.md`` in a directory in parallel.
+
+    Args:
+        rubrics_dir: Directory containing markdown rubrics
+        jobs: Worker processes (None = one per CPU)
+
+    Returns:
+        Mapping of source file name to error message (None on success)
+    """
+    sources = sorted(str(p) for p in Path(rubrics_dir).glob("*-rubric.md"))
+    if not sources:
+        return {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = pool.map(_compile_one, sources)
+        return {Path(source).name: error for source, error in results}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    default_dir = Path(__file__).parent.parent / "rubrics"
+    parser = argparse.ArgumentParser(description="Compile markdown rubrics into JSON artifacts.")
+    parser.add_argument("rubrics_dir", type=Path, nargs="?", default=default_dir, help="Rubrics directory")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel worker processes")
+    args = parser.parse_args(argv)
+
+    results = compile_directory(args.rubrics_dir, args.jobs)
+    if not results:
+        print(f"No *-rubric.md files found in {args.rubrics_dir}", file=sys.stderr)
+        return 1
+
+    failed = 0
+    for name, error in results.items():
+        if error:
+            failed += 1
+            print(f"FAIL {name}: {error}", file=sys.stderr)
+        else:
+            print(f"ok   {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
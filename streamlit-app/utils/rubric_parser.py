@@ -4,22 +4,85 @@ Rubric Parser Utility
 Parses markdown rubric files to extract structured evaluation data.
 """
 
+import copy
+import hashlib
+import json
+import logging
 import re
+import threading
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Precompiled patterns (compiled once per process instead of on every parse)
+_TITLE_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_OVERVIEW_PATTERN = re.compile(r'##\s+Overview\s+(.*?)(?=\n##|\Z)', re.DOTALL)
+_USE_CASE_PATTERN = re.compile(r'\*\*Perfect for evaluating\*\*:?\s+(.*?)(?=\n\*\*|\n\n##|\Z)', re.DOTALL)
+_LIST_MARKER_PATTERN = re.compile(r'\n\s*-\s*')
+_DIMENSION_PATTERN = re.compile(
+    r'###\s+(\d+)\.\s+(.+?)\n\n\*\*Definition\*\*:\s*(.+?)\n\n####\s+What to Evaluate:(.*?)####\s+Rating Guidelines:(.*?)(?=\n###|\n##\s+Overall|\Z)',
+    re.DOTALL
+)
+_RATING_ROW_PATTERN = re.compile(r'\|\s*\*\*(\d+)\s*-\s*([^*]+)\*\*\s*\|\s*([^|]+)\|')
+_PRIORITY_SECTION_PATTERN = re.compile(
+    r'###\s+Step\s+\d+:\s+Prioritize.*?Dimensions.*?\n(.*?)(?=\n###|\n---|\n##\s+[A-Z]|\Z)',
+    re.DOTALL | re.IGNORECASE
+)
+_PRIORITY_LEVEL_PATTERN = re.compile(r'-\s*\*\*(\w+(?:-to-\w+)?)\*\*:\s*(.+?)(?=\n-|\Z)', re.DOTALL)
+
+# Process-wide cache of parsed rubrics: path -> (mtime_ns, size, rubric)
+_parse_cache: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+_parse_cache_lock = threading.Lock()
+
+
+def rubric_fingerprint(rubric: Dict[str, Any]) -> str:
+    """
+    Stable content hash of a parsed rubric.
+
+    Two rubrics with the same dimensions, weights and guidance produce the same
+    fingerprint regardless of where they were loaded from. Loaded rubrics
+    carry it precomputed under ``"fingerprint"``, so each load is hashed only
+    once; a rubric edited after loading must drop that key.
+
+    Args:
+        rubric: Parsed rubric dictionary
+
+    Returns:
+        Hex SHA-256 digest of the rubric's canonical JSON form
+    """
+    fingerprint = rubric.get("fingerprint")
+    if fingerprint is not None:
+        return fingerprint
+    canonical = json.dumps(rubric, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def clear_parse_cache() -> None:
+    """Forget every cached rubric parse."""
+    with _parse_cache_lock:
+        _parse_cache.clear()
 
 
 class RubricParser:
     """Parser for markdown-based rubric files."""
     
-    def __init__(self, rubrics_dir: Path):
+    def __init__(
+        self,
+        rubrics_dir: Path,
+        load_compiled: Optional[Callable[[Path], Optional[Dict[str, Any]]]] = None
+    ):
         """
         Initialize parser with rubrics directory.
         
         Args:
             rubrics_dir: Path to directory containing rubric markdown files
+            load_compiled: Optional loader tried on a parse-cache miss before
+                parsing the markdown; returns the rubric or None (see
+                ``utils.rubric_compiler.load_compiled_rubric``)
         """
         self.rubrics_dir = Path(rubrics_dir)
+        self.load_compiled = load_compiled
     
     def list_available_rubrics(self) -> List[str]:
         """
@@ -33,15 +96,15 @@ class RubricParser:
             rubric_files.append(file_path.stem)
         return sorted(rubric_files)
     
-    def parse_rubric_file(self, rubric_name: str) -> Dict[str, Any]:
+    def resolve_path(self, rubric_name: str) -> Path:
         """
-        Parse a rubric markdown file into structured data.
+        Map a rubric name to its markdown file path.
         
         Args:
-            rubric_name: Name of rubric file (with or without extension)
+            rubric_name: Name of rubric file, e.g. "coding", "coding-rubric" or "coding-rubric.md"
         
         Returns:
-            Dictionary containing rubric structure compatible with app
+            Path of the markdown file (which may not exist)
         """
         # Normalize filename
         if not rubric_name.endswith('.md'):
@@ -49,13 +112,48 @@ class RubricParser:
                 rubric_name = f"{rubric_name}-rubric"
             rubric_name = f"{rubric_name}.md"
         
-        file_path = self.rubrics_dir / rubric_name
+        return self.rubrics_dir / rubric_name
+    
+    def parse_rubric_file(self, rubric_name: str) -> Dict[str, Any]:
+        """
+        Parse a rubric markdown file into structured data.
+        
+        Parsed rubrics are cached process-wide and reused until the file's
+        modification time or size changes. On a cache miss the compiled
+        artifact is used if ``load_compiled`` finds a fresh one. Callers get
+        their own copy.
+        
+        Args:
+            rubric_name: Name of rubric file (with or without extension)
+        
+        Returns:
+            Dictionary containing rubric structure compatible with app
+        """
+        file_path = self.resolve_path(rubric_name)
         
-        if not file_path.exists():
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(f"Rubric file not found: {file_path}")
         
-        content = file_path.read_text(encoding='utf-8')
+        cache_key = file_path.resolve()
+        cached = _parse_cache.get(cache_key)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return copy.deepcopy(cached[2])
         
+        rubric_data = self.load_compiled(file_path) if self.load_compiled is not None else None
+        if rubric_data is None:
+            rubric_data = self._parse_content(file_path.read_text(encoding='utf-8'), file_path)
+        rubric_data["fingerprint"] = rubric_fingerprint(rubric_data)
+        
+        with _parse_cache_lock:
+            _parse_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, rubric_data)
+        
+        return copy.deepcopy(rubric_data)
+    
+    def _parse_content(self, content: str, file_path: Path) -> Dict[str, Any]:
+        """Parse rubric markdown content into structured data."""
+
         # Extract metadata and dimensions
         rubric_data = {
             'name': self._extract_title(content, file_path.stem),
@@ -71,7 +169,7 @@ class RubricParser:
     def _extract_title(self, content: str, filename: str) -> str:
         """Extract document title from markdown header."""
         # Look for first H1 heading
-        match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+        match = _TITLE_PATTERN.search(content)
         if match:
             return match.group(1).strip()
         
@@ -88,8 +186,7 @@ class RubricParser:
     def _extract_description(self, content: str) -> str:
         """Extract overview description."""
         # Look for Overview section
-        pattern = r'##\s+Overview\s+(.*?)(?=\n##|\Z)'
-        match = re.search(pattern, content, re.DOTALL)
+        match = _OVERVIEW_PATTERN.search(content)
         if match:
             desc = match.group(1).strip()
             # Get first paragraph
@@ -100,12 +197,11 @@ class RubricParser:
     def _extract_use_case(self, content: str) -> str:
         """Extract use case information."""
         # Look for "Use Case Examples" or "Perfect for evaluating" section
-        pattern = r'\*\*Perfect for evaluating\*\*:?\s+(.*?)(?=\n\*\*|\n\n##|\Z)'
-        match = re.search(pattern, content, re.DOTALL)
+        match = _USE_CASE_PATTERN.search(content)
         if match:
             use_cases = match.group(1).strip()
             # Clean up list markers
-            use_cases = re.sub(r'\n\s*-\s*', ', ', use_cases)
+            use_cases = _LIST_MARKER_PATTERN.sub(', ', use_cases)
             return use_cases.strip()
         return "Various evaluation scenarios"
     
@@ -119,9 +215,7 @@ class RubricParser:
         dimensions = []
         
         # Find all dimension sections (### 1. Dimension Name)
-        pattern = r'###\s+(\d+)\.\s+(.+?)\n\n\*\*Definition\*\*:\s*(.+?)\n\n####\s+What to Evaluate:(.*?)####\s+Rating Guidelines:(.*?)(?=\n###|\n##\s+Overall|\Z)'
-        
-        matches = re.finditer(pattern, content, re.DOTALL)
+        matches = _DIMENSION_PATTERN.finditer(content)
         
         for match in matches:
             dim_number = int(match.group(1))
@@ -178,8 +272,7 @@ class RubricParser:
         
         # Try to extract from markdown table
         # Pattern: | **3 - No Issues** | Description text | Examples... |
-        pattern = r'\|\s*\*\*(\d+)\s*-\s*([^*]+)\*\*\s*\|\s*([^|]+)\|'
-        matches = re.finditer(pattern, rating_section)
+        matches = _RATING_ROW_PATTERN.finditer(rating_section)
         
         for match in matches:
             score = int(match.group(1))
@@ -207,8 +300,7 @@ class RubricParser:
         priorities = {}
 
         # Find priority section (handles "Step 2" and "Step 3" variants)
-        pattern = r'###\s+Step\s+\d+:\s+Prioritize.*?Dimensions.*?\n(.*?)(?=\n###|\n---|\n##\s+[A-Z]|\Z)'
-        match = re.search(pattern, content, re.DOTALL | re.IGNORECASE)
+        match = _PRIORITY_SECTION_PATTERN.search(content)
 
         if not match:
             return priorities
@@ -216,9 +308,7 @@ class RubricParser:
         priority_section = match.group(1)
 
         # Extract: - **Critical**: Dim1, Dim2
-        priority_pattern = r'-\s*\*\*(\w+(?:-to-\w+)?)\*\*:\s*(.+?)(?=\n-|\Z)'
-
-        for level_match in re.finditer(priority_pattern, priority_section, re.DOTALL):
+        for level_match in _PRIORITY_LEVEL_PATTERN.finditer(priority_section):
             level = level_match.group(1).strip()
             dims_text = level_match.group(2).strip()
 
@@ -294,6 +384,89 @@ class RubricParser:
         return None
 
 
+class RubricWatcher:
+    """
+    Background watcher that reparses rubrics as soon as their files change.
+
+    Polls file modification times on a daemon thread (no extra dependencies)
+    and refreshes the process-wide parse cache, so page reruns always find a
+    warm cache even right after a rubric has been edited.
+    """
+
+    def __init__(
+        self,
+        parser: RubricParser,
+        interval: float = 2.0,
+        on_change: Optional[Callable[[str], None]] = None,
+        on_error: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            parser: Parser whose rubrics directory is watched
+            interval: Seconds between polls
+            on_change: Optional callback receiving the name of each reparsed rubric
+            on_error: Optional callback receiving reparse error messages; they
+                are logged as warnings without one
+        """
+        self.parser = parser
+        self.interval = interval
+        self.on_change = on_change
+        self.on_error = on_error
+        self._seen: Dict[str, Tuple[int, int]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "RubricWatcher":
+        """Parse every rubric once, then start watching. Returns self."""
+        self.poll()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="rubric-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def poll(self) -> List[str]:
+        """
+        Reparse rubrics whose files changed since the last poll.
+
+        Returns:
+            Names of the rubrics that were reparsed
+        """
+        changed = []
+        for file_path in self.parser.rubrics_dir.glob("*-rubric.md"):
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if self._seen.get(file_path.stem) == signature:
+                continue
+            self._seen[file_path.stem] = signature
+            try:
+                self.parser.parse_rubric_file(file_path.stem)
+            except Exception as e:
+                message = f"Error reparsing rubric {file_path.name}: {e}"
+                if self.on_error is not None:
+                    self.on_error(message)
+                else:
+                    logger.warning(message)
+                continue
+            changed.append(file_path.stem)
+            if self.on_change is not None:
+                self.on_change(file_path.stem)
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+
 def load_rubric(rubric_name: str, rubrics_dir: Optional[Path] = None) -> Dict[str, Any]:
     """
     Convenience function to load a rubric.
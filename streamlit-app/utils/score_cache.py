@@ -0,0 +1,133 @@
+"""
+Pointwise Score Cache
+
+Persistent cache of single-response judgements backed by SQLite. Each entry
+holds the validated per-dimension scores a judge model gave one response to
+one prompt under one rubric, keyed by (rubric fingerprint, prompt hash,
+response hash, judge model). A response compared against N others is then
+judged once instead of N times.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from utils.rubric_parser import rubric_fingerprint
+
+
+def text_hash(text: str) -> str:
+    """Hex SHA-256 digest of a prompt or response."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def score_key(rubric: Dict[str, Any], prompt: str, response: str, judge_model: str) -> Tuple[str, str, str, str]:
+    """
+    Build the cache key of a pointwise judgement.
+
+    The rubric part is the full content fingerprint, not just the scoring
+    hash: the judge sees descriptions, criteria and rating guides, so editing
+    any of them invalidates the cached scores.
+
+    Args:
+        rubric: Rubric dictionary
+        prompt: Original user prompt
+        response: Judged response
+        judge_model: Judge model ID
+
+    Returns:
+        Tuple of (rubric fingerprint, prompt hash, response hash, judge model)
+    """
+    return rubric_fingerprint(rubric), text_hash(prompt), text_hash(response), judge_model
+
+
+class ScoreCache:
+    """SQLite-backed cache of pointwise judge scores."""
+
+    def __init__(self, path: Path, ttl: Optional[float] = None):
+        """
+        Open (or create) a score cache database.
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds after which an entry expires (None = never)
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS scores (
+                    rubric_hash TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    response_hash TEXT NOT NULL,
+                    judge_model TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (rubric_hash, prompt_hash, response_hash, judge_model)
+                )"""
+            )
+
+    def get(self, key: Tuple[str, str, str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached judgement.
+
+        Args:
+            key: Key from ``score_key``
+
+        Returns:
+            Dictionary with scores and summary, or None on a miss or expired entry
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM scores WHERE rubric_hash = ? AND prompt_hash = ? "
+                "AND response_hash = ? AND judge_model = ?",
+                key
+            ).fetchone()
+        if row is None or (self.ttl is not None and time.time() - row[1] > self.ttl):
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: Tuple[str, str, str, str], value: Dict[str, Any]) -> None:
+        """
+        Store a validated judgement.
+
+        Args:
+            key: Key from ``score_key``
+            value: Dictionary with scores and summary
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scores "
+                "(rubric_hash, prompt_hash, response_hash, judge_model, value, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, json.dumps(value, ensure_ascii=False), time.time())
+            )
+
+    def clear(self) -> None:
+        """Remove every cached judgement."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM scores")
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report cache occupancy.
+
+        Returns:
+            Dictionary with the entry count
+        """
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()
+        return {"entries": count}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
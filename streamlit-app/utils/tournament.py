@@ -0,0 +1,359 @@
+"""
+Model Tournament
+
+Ranks K responses to one prompt (typically one per model) without judging
+all K(K-1)/2 pairs. Matches are scheduled in rounds of disjoint pairs:
+
+- swiss:  entrants on equal standing meet, with no rematches
+- active: the unplayed pairs whose outcome the current Bradley-Terry fit is
+  least sure about (win probability closest to 50%)
+
+With pointwise judging (the default) every response is scored once, all
+concurrently, and a match only costs a judge call when the two scores are
+within the tie margin. With pairwise judging each match is a full
+``auto_evaluate`` call. The matches of a round run concurrently.
+"""
+
+import math
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from utils.auto_evaluator import POINTWISE_TIE_MARGIN, AutoEvaluator
+from utils.concurrency import run_concurrently
+from utils.evaluation_store import EvaluationStore
+from utils.evaluator import Evaluator
+from utils.leaderboard import fit_bradley_terry, strengths_to_ratings
+
+SCHEDULES = ("swiss", "active")
+
+
+def default_rounds(entrants: int) -> int:
+    """Rounds needed for a Swiss tournament to separate ``entrants`` (ceil(log2 K))."""
+    return max(1, math.ceil(math.log2(max(entrants, 2))))
+
+
+def swiss_pairs(order: Sequence[int], played: Set[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Pair entrants ranked by standing, each with the nearest-ranked entrant it has not met.
+
+    Backtracks to avoid rematches; when none is possible the remaining
+    entrants are paired in order. With an odd count the lowest-ranked
+    entrant that can be left out sits the round out.
+
+    Args:
+        order: Entrant indices, best standing first
+        played: Pairs already played, as (low index, high index)
+
+    Returns:
+        Disjoint (i, j) pairs, higher-ranked entrant first
+    """
+    def search(remaining: List[int], bye_left: bool) -> Optional[List[Tuple[int, int]]]:
+        if not remaining:
+            return []
+        if len(remaining) == 1:
+            return [] if bye_left else None
+        first, rest = remaining[0], remaining[1:]
+        for position, other in enumerate(rest):
+            if (min(first, other), max(first, other)) in played:
+                continue
+            pairs = search(rest[:position] + rest[position + 1:], bye_left)
+            if pairs is not None:
+                return [(first, other)] + pairs
+        if bye_left and len(remaining) % 2 == 1:
+            # Let this entrant sit out only if everyone below it can still be paired
+            pairs = search(rest, False)
+            if pairs is not None:
+                return pairs
+        return None
+
+    order = list(order)
+    pairs = search(order, len(order) % 2 == 1)
+    if pairs is None:
+        pairs = [(order[i], order[i + 1]) for i in range(0, len(order) - 1, 2)]
+    return pairs
+
+
+def active_pairs(strengths: np.ndarray, played: Set[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Pick disjoint unplayed pairs with the most uncertain outcome.
+
+    Args:
+        strengths: Current Bradley-Terry strengths, one per entrant
+        played: Pairs already played, as (low index, high index)
+
+    Returns:
+        Disjoint (i, j) pairs, most informative first
+    """
+    count = len(strengths)
+    candidates = []
+    for i in range(count):
+        for j in range(i + 1, count):
+            if (i, j) in played:
+                continue
+            p = strengths[i] / (strengths[i] + strengths[j])
+            candidates.append((p * (1.0 - p), i, j))
+    # Highest p(1 - p) first; index order keeps the schedule deterministic
+    candidates.sort(key=lambda candidate: (-candidate[0], candidate[1], candidate[2]))
+
+    pairs: List[Tuple[int, int]] = []
+    busy: Set[int] = set()
+    for _, i, j in candidates:
+        if i not in busy and j not in busy:
+            pairs.append((i, j))
+            busy.update((i, j))
+    return pairs
+
+
+class Tournament:
+    """Schedules and judges pairwise matches between K responses to one prompt."""
+
+    def __init__(
+        self,
+        auto_evaluator: AutoEvaluator,
+        rubric: Dict[str, Any],
+        judge_model: str,
+        schedule: str = "swiss",
+        rounds: Optional[int] = None,
+        pointwise: bool = True,
+        tie_margin: float = POINTWISE_TIE_MARGIN,
+        store: Optional[EvaluationStore] = None
+    ):
+        """
+        Initialize the tournament.
+
+        Args:
+            auto_evaluator: AutoEvaluator used for judging
+            rubric: Parsed rubric dictionary
+            judge_model: Model ID for the judge LLM
+            schedule: Pairing schedule, one of SCHEDULES
+            rounds: Rounds to play (None = ceil(log2 K)); stops early once
+                every pair has met
+            pointwise: Score each response once and compare scores, instead
+                of one full pairwise judgement per match
+            tie_margin: Pointwise final-score gap below which a tie-break call decides
+            store: Evaluation store every judged match is also appended to
+
+        Raises:
+            ValueError: If the schedule is unknown
+        """
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown schedule '{schedule}', expected one of {SCHEDULES}")
+        self.auto_evaluator = auto_evaluator
+        self.rubric = rubric
+        self.judge_model = judge_model
+        self.schedule = schedule
+        self.rounds = rounds
+        self.pointwise = pointwise
+        self.tie_margin = tie_margin
+        self.store = store
+
+    def run(
+        self,
+        prompt: str,
+        responses: Dict[str, str],
+        on_round: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Play the tournament.
+
+        Args:
+            prompt: The prompt every response answers
+            responses: Entrant name (e.g. model ID) -> response text
+            on_round: Called with (round number, matches) after each round,
+                e.g. to show progress
+
+        Returns:
+            Dictionary containing:
+                - standings: Ranked rows (see ``standings``)
+                - matches: Every match, in play order
+                - rounds: Rounds played
+                - judge_calls: Judge requests made, including pointwise scoring
+                - pairs_possible: K(K-1)/2, the cost of a full round robin
+                - excluded: {entrant: error} for responses that could not be scored
+        """
+        entrants = list(responses)
+        excluded: Dict[str, str] = {}
+        points: Dict[str, Dict[str, Any]] = {}
+        judge_calls = 0
+
+        if self.pointwise:
+            scored = run_concurrently([
+                lambda name=name: self._attempt(
+                    lambda: self.auto_evaluator.score_response(prompt, responses[name], self.rubric, self.judge_model)
+                )
+                for name in entrants
+            ])
+            for name, (result, error) in zip(entrants, scored):
+                if error is None:
+                    points[name] = result
+                    judge_calls += result["judge_calls"]
+                else:
+                    excluded[name] = error
+            entrants = [name for name in entrants if name in points]
+
+        count = len(entrants)
+        wins = np.zeros((count, count))
+        played: Set[Tuple[int, int]] = set()
+        matches: List[Dict[str, Any]] = []
+        rounds = min(self.rounds or default_rounds(count), max(count - 1, 0)) if count > 1 else 0
+        strengths = np.ones(count)
+        round_number = 0
+
+        for round_number in range(1, rounds + 1):
+            if self.schedule == "swiss":
+                pairs = swiss_pairs(self._order(wins, strengths), played)
+            else:
+                pairs = active_pairs(strengths, played)
+            pairs = [pair for pair in pairs if (min(pair), max(pair)) not in played]
+            if not pairs:
+                round_number -= 1
+                break
+
+            results = run_concurrently([
+                lambda i=i, j=j: self._attempt(lambda: self._judge(prompt, responses, entrants, points, i, j))
+                for i, j in pairs
+            ])
+            round_matches = []
+            for (i, j), (result, error) in zip(pairs, results):
+                played.add((min(i, j), max(i, j)))
+                match = self._match_record(round_number, entrants[i], entrants[j], result, error)
+                if error is None:
+                    winner, loser = (i, j) if result["preferred_response"] == "A" else (j, i)
+                    wins[winner, loser] += 1
+                    judge_calls += match["judge_calls"]
+                    self._store_match(prompt, responses, match, result)
+                round_matches.append(match)
+            matches.extend(round_matches)
+            strengths = fit_bradley_terry(wins, init=strengths)
+            if on_round is not None:
+                on_round(round_number, round_matches)
+
+        return {
+            "standings": self.standings(entrants, wins, strengths, matches, points),
+            "matches": matches,
+            "rounds": round_number,
+            "judge_calls": judge_calls,
+            "pairs_possible": count * (count - 1) // 2,
+            "excluded": excluded
+        }
+
+    def standings(
+        self,
+        entrants: List[str],
+        wins: np.ndarray,
+        strengths: np.ndarray,
+        matches: List[Dict[str, Any]],
+        points: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank entrants by Bradley-Terry rating, then by wins.
+
+        The rating accounts for who each entrant met, which matters when the
+        schedule gives entrants different opponents.
+
+        Returns:
+            Rows with rank, entrant, rating (Elo scale), wins, losses,
+            matches and score (mean weighted rubric score, 0-10)
+        """
+        ratings = strengths_to_ratings(strengths) if len(entrants) else np.zeros(0)
+        scores: Dict[str, List[float]] = {name: [] for name in entrants}
+        for match in matches:
+            if match["error"] is None:
+                scores[match["a"]].append(match["final_score_a"])
+                scores[match["b"]].append(match["final_score_b"])
+
+        evaluator = Evaluator()
+        rows = []
+        for index, name in enumerate(entrants):
+            if name in points:
+                score = evaluator.calculate_score(self.rubric, points[name]["scores"])
+            else:
+                score = sum(scores[name]) / len(scores[name]) if scores[name] else None
+            won = int(wins[index].sum())
+            lost = int(wins[:, index].sum())
+            rows.append({
+                "entrant": name,
+                "rating": float(ratings[index]),
+                "wins": won,
+                "losses": lost,
+                "matches": won + lost,
+                "score": score,
+            })
+
+        rows.sort(key=lambda row: (-row["rating"], -row["wins"], -(row["score"] or 0.0)))
+        for rank, row in enumerate(rows, start=1):
+            row["rank"] = rank
+        return rows
+
+    @staticmethod
+    def _order(wins: np.ndarray, strengths: np.ndarray) -> List[int]:
+        """Entrant indices by standing for Swiss pairing: wins, then rating, then entry order."""
+        return sorted(range(len(strengths)), key=lambda i: (-wins[i].sum(), -strengths[i], i))
+
+    def _judge(
+        self,
+        prompt: str,
+        responses: Dict[str, str],
+        entrants: List[str],
+        points: Dict[str, Dict[str, Any]],
+        i: int,
+        j: int
+    ) -> Dict[str, Any]:
+        """Judge one match, entrant ``i`` as response A."""
+        a, b = entrants[i], entrants[j]
+        if self.pointwise:
+            return self.auto_evaluator.compare_scored(
+                prompt, responses[a], responses[b], points[a], points[b],
+                self.rubric, self.judge_model, self.tie_margin
+            )
+        return self.auto_evaluator.auto_evaluate(prompt, responses[a], responses[b], self.rubric, self.judge_model)
+
+    def _match_record(
+        self,
+        round_number: int,
+        a: str,
+        b: str,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str]
+    ) -> Dict[str, Any]:
+        """Summarize a judged (or failed) match."""
+        match = {"round": round_number, "a": a, "b": b, "winner": None, "error": error, "judge_calls": 0}
+        if error is None:
+            evaluator = Evaluator()
+            match.update({
+                "winner": a if result["preferred_response"] == "A" else b,
+                "final_score_a": evaluator.calculate_score(self.rubric, result["scores_a"]),
+                "final_score_b": evaluator.calculate_score(self.rubric, result["scores_b"]),
+                "tie_break": result.get("tie_break", False),
+                "judge_calls": result["judge_calls"],
+                "justification": result.get("justification", ""),
+            })
+        return match
+
+    def _store_match(self, prompt: str, responses: Dict[str, str], match: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Queue a judged match for the evaluation store, if any."""
+        if self.store is None:
+            return
+        self.store.submit({
+            "mode": "tournament",
+            "prompt": prompt,
+            "model_a": match["a"],
+            "model_b": match["b"],
+            "rubric": self.rubric,
+            "judge_model": self.judge_model,
+            "scores_a": result["scores_a"],
+            "scores_b": result["scores_b"],
+            "final_score_a": match["final_score_a"],
+            "final_score_b": match["final_score_b"],
+            "preferred_response": result["preferred_response"],
+            "justification": result.get("justification", ""),
+        })
+
+    @staticmethod
+    def _attempt(call: Callable[[], Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Run a judge call; a failure is returned as an error so the tournament carries on."""
+        try:
+            return call(), None
+        except Exception as e:
+            return None, str(e)